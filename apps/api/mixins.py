@@ -1,5 +1,8 @@
+from django.db.models import QuerySet
+
 from rest_framework import status
 from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
 
 
 class UniquenessConstraintViolationViewSetMixin:
@@ -18,3 +21,30 @@ class UniquenessConstraintViolationViewSetMixin:
                         exc.status_code = status.HTTP_409_CONFLICT
                         break
         return super().handle_exception(exc)
+
+
+class ProjectedListViewSetMixin:
+    """Load only the model fields the list serializer needs, and paginate lists if the view has a paginator.
+
+    The serializer declares the field paths it needs in `_ONLIES`, and if it has `SparseFieldsetSerializerMixin`, those are
+    narrowed to the fields the request asks for. Relations the paths span are selected in the same query.
+    """
+
+    def get_list_queryset(self, queryset: QuerySet) -> QuerySet:
+        serializer_class = self.get_serializer_class()
+        onlies = (
+            serializer_class.get_onlies(self.request)
+            if hasattr(serializer_class, "get_onlies")
+            else getattr(serializer_class, "_ONLIES", ())
+        )
+        if not onlies:
+            return queryset
+        related = {"__".join(x.split("__")[:i]) for x in onlies for i in range(1, x.count("__") + 1)}
+        # The relations themselves have to be loaded too, for them to be selected
+        return queryset.select_related(*related).only(*related, *onlies)
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.get_list_queryset(self.filter_queryset(self.get_queryset()))
+        if (page := self.paginate_queryset(queryset)) is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer(queryset, many=True).data)
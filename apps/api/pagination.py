@@ -1,6 +1,186 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q, QuerySet
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 
 class ApiStandardPagination(PageNumberPagination):
     page_size_query_param = "page_size"
     max_page_size = 500
+
+
+class KeysetCursorPagination(BasePagination):
+    """Keyset (a.k.a. seek) pagination over whatever ordering the queryset already has.
+
+    Unlike `ApiStandardPagination`, this doesn't run a COUNT query and doesn't use OFFSET, so response time doesn't grow with
+    page depth. Pages are located by filtering on the ordering values of the row at the edge of the previous page. The
+    primary key is appended to the ordering as a tiebreaker so that rows with equal ordering values are neither skipped nor
+    repeated, and NULLs sort last.
+
+    Unlike DRF's `CursorPagination`, this supports ordering by any number of (possibly non-unique or nullable) fields, so
+    that it can be used with the ordering our list endpoints already allow. The queryset must be ordered by field names
+    (optionally "-" prefixed), not expressions.
+
+    The response has "next", "previous", and "results" keys, but no "count".
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = ApiStandardPagination.page_size_query_param
+    max_page_size = ApiStandardPagination.max_page_size
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self):
+        self.page_size = ApiStandardPagination().page_size
+
+    def get_page_size(self, request) -> int:
+        try:
+            requested = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(requested, self.max_page_size) if requested > 0 else self.page_size
+
+    @staticmethod
+    def get_ordering(queryset: QuerySet) -> list[str]:
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+        if any(not isinstance(x, str) for x in ordering):
+            raise TypeError("KeysetCursorPagination only supports ordering by field names")
+        if not ordering or ordering[-1].lstrip("-") not in ("pk", "id"):
+            ordering.append(f"{'-' if ordering and ordering[0].startswith('-') else ''}pk")
+        return ordering
+
+    def encode_cursor(self, values: list, reverse: bool) -> str:
+        payload = json.dumps({"v": values, "r": reverse}, cls=DjangoJSONEncoder)
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, request) -> tuple[list | None, bool]:
+        if not (encoded := request.query_params.get(self.cursor_query_param)):
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            values, reverse = payload["v"], bool(payload["r"])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message) from None
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return values, reverse
+
+    @staticmethod
+    def _after(field: str, value, descending: bool, nulls_last: bool) -> Q:
+        """Condition for rows that come after `value` in `field`'s ordering."""
+        if value is None:
+            # Nothing comes after NULL when NULLs are last, and every non-NULL does when NULLs are first
+            return Q(pk__in=[]) if nulls_last else Q(**{f"{field}__isnull": False})
+        after = Q(**{f"{field}__{'lt' if descending else 'gt'}": value})
+        return after | Q(**{f"{field}__isnull": True}) if nulls_last else after
+
+    def get_seek_filter(self, values: list, reverse: bool) -> Q:
+        """Condition for rows after the row with `values` for the ordering fields, i.e. a lexicographic comparison."""
+        seek = Q(pk__in=[])
+        preceding_equal = Q()
+        for field, value in zip(self.ordering, values, strict=True):
+            name = field.lstrip("-")
+            descending = field.startswith("-") != reverse
+            seek |= preceding_equal & self._after(name, value, descending, nulls_last=not reverse)
+            preceding_equal &= Q(**{f"{name}__isnull": True}) if value is None else Q(**{name: value})
+        return seek
+
+    def get_order_by(self, reverse: bool) -> list:
+        order_by = []
+        for field in self.ordering:
+            name = F(field.lstrip("-"))
+            descending = field.startswith("-") != reverse
+            # NULLs last going forwards, so first going backwards
+            order_by.append(
+                name.desc(nulls_last=not reverse, nulls_first=reverse)
+                if descending
+                else name.asc(nulls_last=not reverse, nulls_first=reverse)
+            )
+        return order_by
+
+    def paginate_queryset(self, queryset: QuerySet, request, view=None) -> list:
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+        values, reverse = self.decode_cursor(request)
+        if values is not None:
+            try:
+                queryset = queryset.filter(self.get_seek_filter(values, reverse))
+            except (TypeError, ValueError, ValidationError):
+                # A well-formed cursor whose values don't fit the ordering fields
+                raise NotFound(self.invalid_cursor_message) from None
+        rows = list(queryset.order_by(*self.get_order_by(reverse))[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        self.page = rows[: self.page_size]
+        if reverse:
+            self.page.reverse()
+        # Going forwards, there's a previous page if we came from a cursor, and a next page if there are more rows.
+        # Going backwards, it's the other way around.
+        self.has_next = has_more if not reverse else values is not None
+        self.has_previous = values is not None if not reverse else has_more
+        return self.page
+
+    def _get_row_values(self, row) -> list:
+        values = []
+        for field in self.ordering:
+            value = row
+            for attr in field.lstrip("-").split("__"):
+                value = getattr(value, attr) if value is not None else None
+            values.append(value)
+        return values
+
+    def get_next_link(self) -> str | None:
+        if not (self.has_next and self.page):
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self._get_row_values(self.page[-1]), False)
+        )
+
+    def get_previous_link(self) -> str | None:
+        if not (self.has_previous and self.page):
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self._get_row_values(self.page[0]), True)
+        )
+
+    def get_paginated_response(self, data) -> Response:
+        return Response(
+            OrderedDict([("next", self.get_next_link()), ("previous", self.get_previous_link()), ("results", data)])
+        )
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class OptInCursorPaginationMixin:
+    """Use `KeysetCursorPagination` instead of the view's usual paginator when the request has a `cursor` parameter.
+
+    Clients opt in by requesting the first page with an empty cursor (`?cursor=`), then follow the "next" and "previous"
+    links in responses.
+    """
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            if KeysetCursorPagination.cursor_query_param in self.request.query_params:
+                self._paginator = KeysetCursorPagination()
+            else:
+                return super().paginator
+        return self._paginator
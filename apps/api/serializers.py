@@ -3,6 +3,7 @@ import logging
 from django.conf import settings
 
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
 
 # Import error messages to set defaults for fields
 import apps.api.error_messages  # noqa
@@ -43,3 +44,47 @@ class ContributorObtainTokenSerializer(serializers.Serializer):
             contributor,
         )
         self.validated_data["access"] = str(self.get_token(contributor).short_lived_access_token)
+
+
+class SparseFieldsetSerializerMixin:
+    """Let clients limit a serializer's output to the fields named in a comma-separated `fields` query parameter.
+
+    Unknown field names are ignored, and if none are known, all fields are returned. This only applies to reads, and only
+    to the top-level serializer (or the child of a top-level list serializer), because nested serializers share its
+    context.
+
+    Serializers with this mixin declare the model field paths they need in `_ONLIES`, for use with `QuerySet.only()`.
+    Paths are attributed to the field their first component names, and `_ONLIES_BY_FIELD` maps fields whose paths don't
+    start with their name (for instance, method fields) to the paths they need, so that `get_onlies()` can project a
+    queryset down to the requested fields.
+    """
+
+    fields_query_param = "fields"
+
+    _ONLIES: tuple[str, ...] = ()
+    _ONLIES_BY_FIELD: dict[str, tuple[str, ...]] = {}
+
+    @classmethod
+    def get_requested_fields(cls, request) -> set[str]:
+        if not request or request.method not in SAFE_METHODS:
+            return set()
+        return {x.strip() for x in request.query_params.get(cls.fields_query_param, "").split(",") if x.strip()}
+
+    @classmethod
+    def get_onlies(cls, request) -> tuple[str, ...]:
+        """Return the field paths to load for the fields the request asks for, or for all fields if it doesn't ask."""
+        requested = cls.get_requested_fields(request)
+        onlies = [x for x in cls._ONLIES if x.split("__")[0] in requested]
+        onlies += [x for field in requested for x in cls._ONLIES_BY_FIELD.get(field, ())]
+        if not onlies:
+            onlies = [*cls._ONLIES, *(x for paths in cls._ONLIES_BY_FIELD.values() for x in paths)]
+        return tuple(dict.fromkeys(onlies))
+
+    def get_fields(self) -> dict:
+        fields = super().get_fields()
+        if self.root is not self and not (
+            isinstance(self.root, serializers.ListSerializer) and self.parent is self.root
+        ):
+            return fields
+        requested = self.get_requested_fields(self.context.get("request"))
+        return {k: v for k, v in fields.items() if k in requested} or fields
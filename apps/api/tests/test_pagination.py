@@ -0,0 +1,134 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+import pytest
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.api.pagination import ApiStandardPagination, KeysetCursorPagination, OptInCursorPaginationMixin
+from apps.contributions.models import Contribution
+from apps.contributions.tests.factories import ContributionFactory
+from apps.pages.tests.factories import DonationPageFactory
+
+
+def _request(url="/", **params):
+    return Request(APIRequestFactory().get(url, params))
+
+
+@pytest.mark.django_db
+class TestKeysetCursorPagination:
+    @pytest.fixture
+    def contributions(self):
+        page = DonationPageFactory()
+        # Duplicate amounts and NULL last payment dates, so that ordering by either needs the tiebreaker and NULL handling
+        contributions = [ContributionFactory(donation_page=page, amount=(i % 3) * 100 + 100) for i in range(7)]
+        Contribution.objects.filter(pk__in=[x.pk for x in contributions[::2]]).update(last_payment_at=None)
+        return contributions
+
+    def _walk(self, queryset, page_size, backwards_from=None):
+        """Follow next (or previous) links from the first page (or `backwards_from`) and return the IDs seen, in order."""
+        seen = []
+        url = backwards_from
+        params = {} if backwards_from else {"cursor": "", "page_size": page_size}
+        while True:
+            paginator = KeysetCursorPagination()
+            page = paginator.paginate_queryset(queryset, _request(url or "/", **params))
+            seen = [x.pk for x in page] + seen if backwards_from else seen + [x.pk for x in page]
+            assert len(page) <= page_size
+            url = paginator.get_previous_link() if backwards_from else paginator.get_next_link()
+            if not url:
+                return seen
+            params = {}
+
+    @pytest.mark.parametrize(
+        "ordering",
+        [
+            (),
+            ("amount",),
+            ("-amount",),
+            ("last_payment_at",),
+            ("-last_payment_at", "amount"),
+            ("amount", "-last_payment_at", "-created"),
+        ],
+    )
+    @pytest.mark.parametrize("page_size", [1, 2, 3, 10])
+    def test_walks_every_row_once_in_order(self, ordering, page_size, contributions):
+        queryset = Contribution.objects.order_by(*ordering)
+        paginator = KeysetCursorPagination()
+        paginator.ordering = paginator.get_ordering(queryset)
+        expected = list(queryset.order_by(*paginator.get_order_by(reverse=False)).values_list("pk", flat=True))
+        assert self._walk(queryset, page_size) == expected
+
+    @pytest.mark.parametrize("ordering", [("amount",), ("-last_payment_at", "amount")])
+    def test_previous_links_walk_back_to_start(self, ordering, contributions):
+        queryset = Contribution.objects.order_by(*ordering)
+        paginator = KeysetCursorPagination()
+        paginator.ordering = paginator.get_ordering(queryset)
+        expected = list(queryset.order_by(*paginator.get_order_by(reverse=False)).values_list("pk", flat=True))
+        url = None
+        while True:
+            paginator = KeysetCursorPagination()
+            page = paginator.paginate_queryset(queryset, _request(url) if url else _request(cursor="", page_size=2))
+            if not (url := paginator.get_next_link()):
+                break
+        assert [x.pk for x in page] == expected[-1:]
+        assert self._walk(queryset, 2, backwards_from=paginator.get_previous_link()) == expected[:-1]
+
+    def test_does_not_count(self, contributions):
+        paginator = KeysetCursorPagination()
+        with CaptureQueriesContext(connection) as context:
+            page = paginator.paginate_queryset(Contribution.objects.all(), _request(cursor="", page_size=2))
+        assert len(page) == 2
+        assert len(context.captured_queries) == 1
+        assert "COUNT(" not in context.captured_queries[0]["sql"].upper()
+        assert "OFFSET" not in context.captured_queries[0]["sql"].upper()
+        response = paginator.get_paginated_response([])
+        assert response.data.keys() == {"next", "previous", "results"}
+        assert response.data["previous"] is None
+        assert response.data["next"]
+
+    def test_page_size(self):
+        assert KeysetCursorPagination().get_page_size(_request()) == ApiStandardPagination().page_size
+        assert KeysetCursorPagination().get_page_size(_request(page_size="nope")) == ApiStandardPagination().page_size
+        assert KeysetCursorPagination().get_page_size(_request(page_size=0)) == ApiStandardPagination().page_size
+        assert (
+            KeysetCursorPagination().get_page_size(_request(page_size=100_000)) == KeysetCursorPagination.max_page_size
+        )
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", "e30=", "eyJ2IjogWzFdLCAiciI6IGZhbHNlfQ=="])
+    def test_invalid_cursor(self, cursor):
+        with pytest.raises(NotFound):
+            KeysetCursorPagination().paginate_queryset(Contribution.objects.all(), _request(cursor=cursor))
+
+    @pytest.mark.parametrize(
+        ("ordering", "values"),
+        [
+            (("amount",), ["nope", 1]),
+            (("amount",), [{}, 1]),
+            (("created",), ["not-a-date", 1]),
+            (("amount",), [100, "nope"]),
+        ],
+    )
+    def test_cursor_with_values_of_wrong_type(self, ordering, values):
+        paginator = KeysetCursorPagination()
+        cursor = paginator.encode_cursor(values, False)
+        with pytest.raises(NotFound, match=paginator.invalid_cursor_message):
+            paginator.paginate_queryset(Contribution.objects.order_by(*ordering), _request(cursor=cursor))
+
+
+class TestOptInCursorPaginationMixin:
+    class Base:
+        paginator = "standard"
+
+    class View(OptInCursorPaginationMixin, Base):
+        def __init__(self, request):
+            self.request = request
+
+    def test_without_cursor(self):
+        assert self.View(_request()).paginator == "standard"
+
+    def test_with_cursor(self):
+        view = self.View(_request(cursor=""))
+        assert isinstance(view.paginator, KeysetCursorPagination)
+        assert view.paginator is view.paginator
@@ -1,8 +1,11 @@
 import faker
 import pytest
+from rest_framework import serializers
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
 
 import apps
-from apps.api.serializers import ContributorObtainTokenSerializer
+from apps.api.serializers import ContributorObtainTokenSerializer, SparseFieldsetSerializerMixin
 
 
 fake = faker.Faker()
@@ -46,3 +49,64 @@ def test_good_ContributorObtainTokenSerializer(data):
 def test_bad_ContributorObtainTokenSerializer(data):
     t = ContributorObtainTokenSerializer(data=data)
     assert not t.is_valid(), t.errors
+
+
+class TestSparseFieldsetSerializerMixin:
+    class Nested(SparseFieldsetSerializerMixin, serializers.Serializer):
+        a = serializers.IntegerField()
+        b = serializers.IntegerField()
+
+    class Serializer(SparseFieldsetSerializerMixin, serializers.Serializer):
+        a = serializers.IntegerField()
+        b = serializers.IntegerField()
+        c = serializers.SerializerMethodField()
+
+        _ONLIES = ("a", "b__x", "b__y")
+        _ONLIES_BY_FIELD = {"c": ("z",)}
+
+        def get_c(self, obj):
+            return obj["a"] + obj["b"]
+
+    @staticmethod
+    def _request(method="get", **params):
+        return Request(getattr(APIRequestFactory(), method)("/", params))
+
+    @pytest.mark.parametrize(
+        ("fields", "expected"),
+        [
+            (None, {"a", "b", "c"}),
+            ("a", {"a"}),
+            ("a, c,nope", {"a", "c"}),
+            ("nope", {"a", "b", "c"}),
+        ],
+    )
+    def test_fields(self, fields, expected):
+        request = self._request(**({"fields": fields} if fields else {}))
+        instance = {"a": 1, "b": 2}
+        assert set(self.Serializer(instance, context={"request": request}).data) == expected
+        assert all(
+            set(x) == expected for x in self.Serializer([instance], many=True, context={"request": request}).data
+        )
+
+    def test_fields_only_apply_to_reads(self):
+        request = Request(APIRequestFactory().patch("/?fields=a"))
+        assert set(self.Serializer(context={"request": request}).fields) == {"a", "b", "c"}
+
+    def test_fields_do_not_apply_to_nested_serializers(self):
+        request = self._request(fields="b")
+        parent = serializers.Serializer(context={"request": request})
+        nested = self.Nested()
+        nested.bind("nested", parent)
+        assert set(nested.fields) == {"a", "b"}
+
+    @pytest.mark.parametrize(
+        ("fields", "expected"),
+        [
+            (None, ("a", "b__x", "b__y", "z")),
+            ("b", ("b__x", "b__y")),
+            ("a,c", ("a", "z")),
+            ("nope", ("a", "b__x", "b__y", "z")),
+        ],
+    )
+    def test_get_onlies(self, fields, expected):
+        assert self.Serializer.get_onlies(self._request(**({"fields": fields} if fields else {}))) == expected
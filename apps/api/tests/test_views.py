@@ -258,7 +258,7 @@ def test_magic_link_custom_email_template(rf, mocker, revenue_program, has_defau
     """
     from apps.emails import tasks as email_tasks  # noqa: PLC0415
 
-    spy = mocker.spy(email_tasks, "send_mail")
+    spy = mocker.spy(email_tasks, "make_message")
 
     if has_default_donation_page:
         style = StyleFactory()
@@ -286,13 +286,11 @@ def test_magic_link_custom_email_template(rf, mocker, revenue_program, has_defau
     response = RequestContributorTokenEmailView.as_view()(request)
     assert response.status_code == 200
     assert spy.call_count == 1
-    subject, text_body, _, to_email_list = spy.call_args_list[0][0]
-    html_body = spy.call_args_list[0][1]["html_message"]
+    to, subject, text_body, html_body, _ = spy.call_args_list[0][0]
     html_magic_link = bs4(html_body, "html.parser").find("a", {"data-testid": "magic-link"}).attrs["href"]
     assert html_magic_link in text_body
     assert subject == "Manage your contributions"
-    assert to_email_list[0] == email
-    assert len(to_email_list) == 1
+    assert to == email
 
     default_logo = f"{settings.SITE_URL}/static/nre-logo-white.png"
     default_alt_text = "News Revenue Hub"
@@ -352,7 +350,7 @@ def test_request_contributor_token_creates_usable_magic_links(mocker, api_client
     """
     from apps.emails import tasks as email_tasks  # noqa: PLC0415
 
-    spy = mocker.spy(email_tasks, "send_mail")
+    spy = mocker.spy(email_tasks, "make_message")
     rp = RevenueProgramFactory()
     if preexisting_email:
         ContributorFactory(email=preexisting_email)
@@ -360,13 +358,11 @@ def test_request_contributor_token_creates_usable_magic_links(mocker, api_client
     response = api_client.post(reverse("contributor-token-request"), {"email": request_email, "subdomain": rp.slug})
     assert response.status_code == 200
     assert spy.call_count == 1
-    subject, text_body, _, to_email_list = spy.call_args_list[0][0]
-    html_body = spy.call_args_list[0][1]["html_message"]
+    to, subject, text_body, html_body, _ = spy.call_args_list[0][0]
     html_magic_link = bs4(html_body, "html.parser").find("a", {"data-testid": "magic-link"}).attrs["href"]
     assert html_magic_link in text_body
     assert subject == "Manage your contributions"
-    assert to_email_list[0] == expected
-    assert len(to_email_list) == 1
+    assert to == expected
     assert expected in html_body
     params = parse_qs(urlparse(html_magic_link).query)
     response = api_client.post(
@@ -5,8 +5,8 @@ from urllib.parse import quote_plus, urlparse
 
 from django.conf import settings
 from django.contrib.auth import login
+from django.http import Http404
 from django.middleware import csrf
-from django.shortcuts import get_object_or_404
 from django.template.loader import render_to_string
 from django.utils.safestring import mark_safe
 
@@ -176,7 +176,8 @@ class RequestContributorTokenEmailView(APIView):
             return Response({"detail": "Missing Revenue Program subdomain"}, status=status.HTTP_404_NOT_FOUND)
         logger.info("Trying to retrieve revenue program by slug: %s", serializer.validated_data.get("subdomain"))
 
-        revenue_program = get_object_or_404(RevenueProgram, slug=serializer.validated_data.get("subdomain"))
+        if not (revenue_program := RevenueProgram.get_cached_by_slug(serializer.validated_data.get("subdomain"))):
+            raise Http404("No RevenueProgram matches the given query.")
         magic_link = self.get_magic_link(domain, serializer.validated_data["access"], canonical_email)
         logger.info("Sending magic link email to [%s] | magic link: [%s]", canonical_email, magic_link)
         data = {
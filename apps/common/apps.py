@@ -3,3 +3,8 @@ from django.apps import AppConfig
 
 class ApiConfig(AppConfig):
     name = "apps.common"
+
+    def ready(self):
+        from apps.common.metrics import install_stripe_request_counter  # noqa: PLC0415 vs. importing models too early
+
+        install_stripe_request_counter()
@@ -0,0 +1,71 @@
+from collections.abc import Callable, Iterable
+from functools import partial
+from typing import TypeVar
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.db import transaction
+
+
+T = TypeVar("T")
+
+
+# Values are cached wrapped in a tuple, so that a cached None (for something that doesn't exist) is distinguishable from a
+# cache miss. With `local`, they're also cached in process (see `settings.LOCAL_CACHE`) in front of Redis.
+
+
+def cache_get(key: str, *, local: bool = False) -> tuple | None:
+    """Return the `(value,)` cached under the key, or None if nothing is."""
+    local_cache = caches[settings.LOCAL_CACHE]
+    if local and (cached := local_cache.get(key)) is not None:
+        return cached
+    if (cached := cache.get(key)) is not None and local:
+        local_cache.set(key, cached)
+    return cached
+
+
+def cache_get_many(keys: Iterable[str], *, local: bool = False) -> dict[str, tuple]:
+    """Return the `(value,)` cached under each of the keys that something is cached under."""
+    keys = set(keys)
+    local_cache = caches[settings.LOCAL_CACHE]
+    found = local_cache.get_many(keys) if local else {}
+    if missing := keys - set(found):
+        found_in_redis = cache.get_many(missing)
+        if local:
+            local_cache.set_many(found_in_redis)
+        found |= found_in_redis
+    return found
+
+
+def cache_set(key: str, value, timeout: int, *, none_timeout: int | None = None, local: bool = False) -> None:
+    """Cache a value (which may be None) for `timeout` seconds, or for `none_timeout` seconds if it's None and given."""
+    if value is None and none_timeout is not None:
+        timeout = none_timeout
+    cache.set(key, (value,), timeout=timeout)
+    if local:
+        caches[settings.LOCAL_CACHE].set(key, (value,), timeout=min(timeout, settings.LOCAL_CACHE_TTL))
+
+
+def cache_get_or_set(
+    key: str, load: Callable[[], T | None], timeout: int, *, none_timeout: int | None = None, local: bool = False
+) -> T | None:
+    """Return the value cached under the key, or load and cache it."""
+    if (cached := cache_get(key, local=local)) is not None:
+        return cached[0]
+    cache_set(key, value := load(), timeout, none_timeout=none_timeout, local=local)
+    return value
+
+
+def cache_delete_many(keys: Iterable[str], *, local: bool = False) -> None:
+    cache.delete_many(keys := list(keys))
+    if local:
+        caches[settings.LOCAL_CACHE].delete_many(keys)
+
+
+def invalidate_now_and_on_commit(invalidate: Callable, *args, **kwargs) -> None:
+    """Call `invalidate` now, and again once the current transaction (if any) commits.
+
+    The second call covers cache entries re-populated by concurrent requests from the not-yet-committed data.
+    """
+    invalidate(*args, **kwargs)
+    transaction.on_commit(partial(invalidate, *args, **kwargs))
@@ -0,0 +1,141 @@
+"""Lightweight metrics reporting.
+
+Metrics are sent to a StatsD agent over UDP when `settings.STATSD_HOST` is set, and otherwise are only logged at debug
+level. Tags are sent in the DogStatsD format (`|#key:value`), which is understood by the Datadog agent and by Telegraf's
+StatsD input.
+
+We send StatsD packets ourselves rather than adding a client library since the protocol is a single line of text per
+metric, and sending is fire-and-forget: a missing or unreachable agent must never break the code being measured.
+"""
+
+import logging
+import socket
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import connection
+
+import stripe
+from stripe import http_client
+
+
+logger = logging.getLogger(f"{settings.DEFAULT_LOGGER}.{__name__}")
+
+_socket: socket.socket | None = None
+
+
+def _get_socket() -> socket.socket:
+    global _socket  # noqa: PLW0603 lazily created once per process
+    if _socket is None:
+        _socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        _socket.setblocking(False)
+    return _socket
+
+
+def _send(name: str, value: float | int, metric_type: str, tags: dict[str, str] | None = None) -> None:
+    name = f"{settings.STATSD_PREFIX}.{name}" if settings.STATSD_PREFIX else name
+    line = f"{name}:{value}|{metric_type}"
+    if tags:
+        line += "|#" + ",".join(f"{k}:{v}" for k, v in tags.items())
+    logger.debug("Metric %s", line)
+    if not settings.STATSD_HOST:
+        return
+    try:
+        _get_socket().sendto(line.encode(), (settings.STATSD_HOST, settings.STATSD_PORT))
+    except OSError:
+        logger.warning("Unable to send metric %s to StatsD", name, exc_info=True)
+
+
+def incr(name: str, value: int = 1, tags: dict[str, str] | None = None) -> None:
+    """Increment a counter."""
+    _send(name, value, "c", tags)
+
+
+def timing(name: str, milliseconds: float, tags: dict[str, str] | None = None) -> None:
+    """Record a duration, which StatsD aggregates into a histogram."""
+    _send(name, round(milliseconds, 3), "ms", tags)
+
+
+def histogram(name: str, value: float | int, tags: dict[str, str] | None = None) -> None:
+    """Record a value (such as a count per operation) to be aggregated into a histogram."""
+    _send(name, value, "h", tags)
+
+
+_stripe_request_count: ContextVar[list[int] | None] = ContextVar("stripe_request_count", default=None)
+
+
+class _CountingHTTPClient:
+    """Wrap a stripe-python HTTP client to count the requests made through it in `measure()` blocks."""
+
+    def __init__(self, client: http_client.HTTPClient):
+        self.client = client
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+    def _count(self) -> None:
+        if (counter := _stripe_request_count.get()) is not None:
+            counter[0] += 1
+
+    def request_with_retries(self, *args, **kwargs):
+        self._count()
+        return self.client.request_with_retries(*args, **kwargs)
+
+    def request_stream_with_retries(self, *args, **kwargs):
+        self._count()
+        return self.client.request_stream_with_retries(*args, **kwargs)
+
+
+def install_stripe_request_counter() -> None:
+    """Wrap `stripe.default_http_client`, which stripe-python uses for requests unless given a client, to count requests.
+
+    The wrapper is installed once per process (see `apps.common.apps`), and only counts requests made in `measure()`
+    blocks. Calling this again is a no-op.
+    """
+    if isinstance(stripe.default_http_client, _CountingHTTPClient):
+        return
+    stripe.default_http_client = _CountingHTTPClient(
+        # As stripe-python does on its first request if no client has been set
+        stripe.default_http_client
+        or http_client.new_default_http_client(verify_ssl_certs=stripe.verify_ssl_certs, proxy=stripe.proxy)
+    )
+
+
+@dataclass
+class Measurement:
+    """What happened while in a `measure()` block."""
+
+    duration_ms: float = 0.0
+    db_queries: int = 0
+    stripe_requests: int = 0
+
+
+@contextmanager
+def measure() -> Iterator[Measurement]:
+    """Measure wall time, DB queries on the default connection, and Stripe API requests made in the block.
+
+    Stripe API requests are counted by the wrapper `install_stripe_request_counter` installs, into a context-local
+    counter, so blocks running concurrently in other threads each count only their own requests.
+
+    The returned measurement is populated when the block exits, including when it raises.
+    """
+    measurement = Measurement()
+    stripe_counter = [0]
+    token = _stripe_request_count.set(stripe_counter)
+
+    def _count_query(execute, sql, params, many, context):
+        measurement.db_queries += 1
+        return execute(sql, params, many, context)
+
+    start = time.monotonic()
+    try:
+        with connection.execute_wrapper(_count_query):
+            yield measurement
+    finally:
+        measurement.duration_ms = (time.monotonic() - start) * 1000
+        measurement.stripe_requests = stripe_counter[0]
+        _stripe_request_count.reset(token)
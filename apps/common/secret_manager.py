@@ -1,10 +1,14 @@
 import logging
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 
 from django.conf import settings
 
 from google.api_core.exceptions import NotFound, PermissionDenied
 from google.cloud.secretmanager import SecretManagerServiceClient
 
+from apps.common.cache import cache_get, cache_get_many, cache_set
+
 
 logger = logging.getLogger(f"{settings.DEFAULT_LOGGER}.{__name__}")
 
@@ -40,7 +44,14 @@ def get_secret_manager_client() -> SecretManagerServiceClient | None:
 
 
 class GoogleCloudSecretProvider(SecretProvider):
-    """A descriptor that retrieves a secret from Google Cloud Secret Manager."""
+    """A descriptor that retrieves a secret from Google Cloud Secret Manager.
+
+    Values are cached in Redis for `settings.GOOGLE_CLOUD_SECRET_CACHE_TTL` seconds, and in process in front of that
+    for `settings.LOCAL_CACHE_TTL` seconds. Setting or deleting a secret through the descriptor updates the cache.
+    """
+
+    # Maximum number of secrets `prefetch` retrieves at once
+    prefetch_concurrency = 8
 
     def __init__(
         self,
@@ -65,17 +76,14 @@ class GoogleCloudSecretProvider(SecretProvider):
     def get_secret_version_path(self, obj) -> str:
         return f"{self.get_secret_path(obj)}/versions/{self.version_id}"
 
-    def __get__(self, obj, type_=None) -> str | None:
-        logger.info("GoogleCloudSecretProvider retrieving secret %s", (secret_name := self.get_secret_name(obj)))
-        if not settings.ENABLE_GOOGLE_CLOUD_SECRET_MANAGER:
-            logger.info("GoogleCloudSecretProvider not enabled")
-            return None
-        client = get_secret_manager_client()
-        if not client:
-            logger.warning(
-                "GoogleCloudSecretProvider cannot get secret %s because client is not initialized", secret_name
-            )
-            return None
+    def get_cache_key(self, obj) -> str:
+        return f"google-cloud-secret:{self.get_secret_version_path(obj)}"
+
+    def set_cached(self, obj, value: str | None) -> None:
+        cache_set(self.get_cache_key(obj), value, settings.GOOGLE_CLOUD_SECRET_CACHE_TTL, local=True)
+
+    def access_secret_version(self, client: SecretManagerServiceClient, obj) -> str | None:
+        secret_name = self.get_secret_name(obj)
         try:
             secret = client.access_secret_version(
                 request={"name": (secret_version_path := self.get_secret_version_path(obj))}
@@ -97,6 +105,41 @@ class GoogleCloudSecretProvider(SecretProvider):
 
         return secret.payload.data.decode("UTF-8") if secret else None
 
+    def __get__(self, obj, type_=None) -> "str | None | GoogleCloudSecretProvider":
+        if obj is None:
+            return self
+        logger.info("GoogleCloudSecretProvider retrieving secret %s", (secret_name := self.get_secret_name(obj)))
+        if not settings.ENABLE_GOOGLE_CLOUD_SECRET_MANAGER:
+            logger.info("GoogleCloudSecretProvider not enabled")
+            return None
+        if (cached := cache_get(self.get_cache_key(obj), local=True)) is not None:
+            return cached[0]
+        if not (client := get_secret_manager_client()):
+            logger.warning(
+                "GoogleCloudSecretProvider cannot get secret %s because client is not initialized", secret_name
+            )
+            return None
+        self.set_cached(obj, value := self.access_secret_version(client, obj))
+        return value
+
+    def prefetch(self, objs: Iterable) -> None:
+        """Cache the secrets of many objects, retrieving those that aren't cached already concurrently.
+
+        This is for code that reads the secrets of many objects in turn (for instance, to serialize a list), so that it
+        doesn't wait on a round trip to Secret Manager for each of them.
+        """
+        if not settings.ENABLE_GOOGLE_CLOUD_SECRET_MANAGER:
+            return
+        objs_by_key = {self.get_cache_key(x): x for x in objs}
+        missing = set(objs_by_key) - set(cache_get_many(objs_by_key, local=True))
+        if not missing or not (client := get_secret_manager_client()):
+            return
+        logger.info("GoogleCloudSecretProvider prefetching %s secrets", len(missing))
+        with ThreadPoolExecutor(max_workers=min(len(missing), self.prefetch_concurrency)) as executor:
+            values = executor.map(lambda key: self.access_secret_version(client, objs_by_key[key]), missing)
+            for key, value in zip(missing, values, strict=True):
+                self.set_cached(objs_by_key[key], value)
+
     def __set__(self, obj, value) -> None:
         logger.info("GoogleCloudSecretProvider setting secret %s", (secret_name := self.get_secret_name(obj)))
         if not settings.ENABLE_GOOGLE_CLOUD_SECRET_MANAGER:
@@ -150,6 +193,7 @@ class GoogleCloudSecretProvider(SecretProvider):
                         "payload": {"data": value.encode("UTF-8")},
                     }
                 )
+                self.set_cached(obj, value)
             except PermissionDenied:
                 logger.exception(
                     "`GoogleCloudSecretProvider cannot add secret version for secret %s because permission denied",
@@ -179,12 +223,14 @@ class GoogleCloudSecretProvider(SecretProvider):
         try:
             client.delete_secret(request={"name": (secret_path := self.get_secret_path(obj))})
             logger.info("GoogleCloudSecretProvider deleted secret %s", secret_name)
+            self.set_cached(obj, None)
         except NotFound:
             logger.info(
                 "GoogleCloudSecretProvider couldn't delete secret %s at path %s because not found",
                 secret_name,
                 secret_path,
             )
+            self.set_cached(obj, None)
             return
         except PermissionDenied:
             logger.exception("GoogleCloudSecretProvider cannot delete secret %s because permission denied", secret_name)
@@ -0,0 +1,72 @@
+from unittest.mock import Mock
+
+from django.conf import settings
+from django.core.cache import cache, caches
+
+import pytest
+
+from apps.common.cache import (
+    cache_delete_many,
+    cache_get,
+    cache_get_many,
+    cache_get_or_set,
+    cache_set,
+    invalidate_now_and_on_commit,
+)
+
+
+@pytest.mark.usefixtures("_clear_cache")
+class TestTwoLevelCache:
+    @pytest.mark.parametrize("value", [None, "value"])
+    def test_cache_set_and_get(self, value):
+        assert cache_get("key") is None
+        cache_set("key", value, 60)
+        assert cache_get("key") == (value,)
+        assert caches[settings.LOCAL_CACHE].get("key") is None
+
+    def test_local(self):
+        cache_set("key", "value", 60, local=True)
+        assert caches[settings.LOCAL_CACHE].get("key") == ("value",)
+        cache.delete("key")
+        assert cache_get("key", local=True) == ("value",)
+        assert cache_get("key") is None
+        caches[settings.LOCAL_CACHE].clear()
+        cache_set("key", "value", 60)
+        assert cache_get("key", local=True) == ("value",)
+        assert caches[settings.LOCAL_CACHE].get("key") == ("value",)
+        cache_delete_many(["key"], local=True)
+        assert cache_get("key", local=True) is None
+
+    def test_none_timeout(self, mocker):
+        cache_set_spy = mocker.spy(cache, "set")
+        cache_set("found", "value", 60, none_timeout=5)
+        cache_set("not-found", None, 60, none_timeout=5)
+        assert cache_set_spy.call_args_list == [
+            mocker.call("found", ("value",), timeout=60),
+            mocker.call("not-found", (None,), timeout=5),
+        ]
+
+    def test_cache_get_many(self):
+        cache_set("in-process", "a", 60, local=True)
+        cache_set("in-redis", None, 60)
+        assert cache_get_many(["in-process", "in-redis", "missing"], local=True) == {
+            "in-process": ("a",),
+            "in-redis": (None,),
+        }
+        assert caches[settings.LOCAL_CACHE].get("in-redis") == (None,)
+
+    def test_cache_get_or_set(self):
+        load = Mock(return_value=None)
+        assert cache_get_or_set("key", load, 60) is None
+        assert cache_get_or_set("key", load, 60) is None
+        load.assert_called_once()
+
+
+@pytest.mark.django_db
+def test_invalidate_now_and_on_commit(django_capture_on_commit_callbacks):
+    invalidate = Mock()
+    with django_capture_on_commit_callbacks(execute=True):
+        invalidate_now_and_on_commit(invalidate, {1}, page_ids={2})
+        invalidate.assert_called_once_with({1}, page_ids={2})
+    assert invalidate.call_count == 2
+    invalidate.assert_called_with({1}, page_ids={2})
@@ -0,0 +1,142 @@
+import threading
+
+from django.contrib.auth import get_user_model
+
+import pytest
+import stripe
+
+from apps.common import metrics
+
+
+class TestSend:
+    def test_when_statsd_not_configured(self, settings, mocker):
+        settings.STATSD_HOST = ""
+        mock_socket = mocker.patch("apps.common.metrics._get_socket")
+        mock_logger = mocker.patch("apps.common.metrics.logger.debug")
+        metrics.incr("foo", tags={"bar": "baz"})
+        mock_socket.assert_not_called()
+        mock_logger.assert_called_once_with("Metric %s", "revengine.foo:1|c|#bar:baz")
+
+    @pytest.mark.parametrize(
+        ("call", "expected"),
+        [
+            (lambda: metrics.incr("foo"), b"revengine.foo:1|c"),
+            (lambda: metrics.timing("foo", 1.23456), b"revengine.foo:1.235|ms"),
+            (lambda: metrics.histogram("foo", 3, tags={"a": "b", "c": "d"}), b"revengine.foo:3|h|#a:b,c:d"),
+        ],
+    )
+    def test_sends_to_statsd(self, call, expected, settings, mocker):
+        settings.STATSD_HOST = "statsd"
+        settings.STATSD_PORT = 8125
+        mock_socket = mocker.patch("apps.common.metrics._get_socket")
+        call()
+        mock_socket.return_value.sendto.assert_called_once_with(expected, ("statsd", 8125))
+
+    def test_without_prefix(self, settings, mocker):
+        settings.STATSD_HOST = "statsd"
+        settings.STATSD_PREFIX = ""
+        mock_socket = mocker.patch("apps.common.metrics._get_socket")
+        metrics.incr("foo")
+        mock_socket.return_value.sendto.assert_called_once_with(b"foo:1|c", ("statsd", settings.STATSD_PORT))
+
+    def test_when_send_fails(self, settings, mocker):
+        settings.STATSD_HOST = "statsd"
+        mocker.patch("apps.common.metrics._get_socket").return_value.sendto.side_effect = OSError("nope")
+        mock_logger = mocker.patch("apps.common.metrics.logger.warning")
+        metrics.incr("foo")
+        mock_logger.assert_called_once_with("Unable to send metric %s to StatsD", "revengine.foo", exc_info=True)
+
+
+@pytest.mark.django_db
+class TestMeasure:
+    @pytest.fixture
+    def http_client(self, mocker):
+        client = mocker.Mock()
+        # stripe-python puts the client name in its user agent header
+        client.name = "mock"
+        client.request_with_retries.return_value = ("{}", 200, {})
+        mocker.patch.object(stripe, "default_http_client", client)
+        metrics.install_stripe_request_counter()
+        return client
+
+    @staticmethod
+    def _request():
+        stripe.api_requestor.APIRequestor(key="sk_test").request_raw("get", "/v1/customers/cus_1")
+
+    def test_counts_queries_and_stripe_requests(self, http_client):
+        with metrics.measure() as measurement:
+            get_user_model().objects.count()
+            get_user_model().objects.count()
+            self._request()
+        assert measurement.db_queries == 2
+        assert measurement.stripe_requests == 1
+        assert measurement.duration_ms > 0
+        http_client.request_with_retries.assert_called_once()
+
+    def test_does_not_count_outside_block(self, http_client):
+        with metrics.measure() as measurement:
+            pass
+        self._request()
+        get_user_model().objects.count()
+        assert measurement.db_queries == 0
+        assert measurement.stripe_requests == 0
+        http_client.request_with_retries.assert_called_once()
+
+    def test_overlapping_blocks_in_threads(self, http_client):
+        measurements = {}
+        a_entered, b_entered, a_exited = threading.Event(), threading.Event(), threading.Event()
+
+        def _a():
+            with metrics.measure() as measurements["a"]:
+                a_entered.set()
+                b_entered.wait(5)
+                self._request()
+            a_exited.set()
+
+        def _b():
+            a_entered.wait(5)
+            with metrics.measure() as measurements["b"]:
+                b_entered.set()
+                a_exited.wait(5)
+                self._request()
+                self._request()
+
+        threads = [threading.Thread(target=_a), threading.Thread(target=_b)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        assert measurements["a"].stripe_requests == 1
+        assert measurements["b"].stripe_requests == 2
+        with metrics.measure() as measurement:
+            self._request()
+        assert measurement.stripe_requests == 1
+        assert stripe.default_http_client.client is http_client
+
+    def test_populated_when_block_raises(self):
+        def _measure_and_raise():
+            with metrics.measure() as measurement:
+                get_user_model().objects.count()
+                raise RuntimeError(measurement)
+
+        with pytest.raises(RuntimeError) as exc_info:
+            _measure_and_raise()
+        measurement = exc_info.value.args[0]
+        assert measurement.db_queries == 1
+        assert measurement.duration_ms > 0
+
+
+class TestInstallStripeRequestCounter:
+    def test_is_idempotent(self, mocker):
+        client = mocker.patch.object(stripe, "default_http_client", mocker.Mock())
+        metrics.install_stripe_request_counter()
+        metrics.install_stripe_request_counter()
+        assert stripe.default_http_client.client is client
+
+    def test_creates_default_client(self, mocker):
+        mocker.patch.object(stripe, "default_http_client", None)
+        metrics.install_stripe_request_counter()
+        assert isinstance(stripe.default_http_client.client, stripe.http_client.HTTPClient)
+
+    def test_installed_on_startup(self):
+        assert isinstance(stripe.default_http_client, metrics._CountingHTTPClient)
@@ -1,3 +1,6 @@
+from django.conf import settings as django_settings
+from django.core.cache import caches
+
 import pytest
 from google.api_core.exceptions import NotFound, PermissionDenied
 from google.cloud.secretmanager import SecretManagerServiceClient
@@ -50,8 +53,96 @@ def make_my_object(secret_provider: GoogleCloudSecretProvider):
 
 
 @pytest.mark.django_db
-@pytest.mark.usefixtures("_valid_gs_credentials")
+@pytest.mark.usefixtures("_valid_gs_credentials", "_clear_cache")
 class TestGoogleCloudSecretProvider:
+    def test_get_from_class(self):
+        MyObject = make_my_object(GoogleCloudSecretProvider)
+        assert isinstance(MyObject.val, GoogleCloudSecretProvider)
+
+    @pytest.mark.parametrize("found", [True, False])
+    def test_get_is_cached(self, found, settings, mocker):
+        settings.ENABLE_GOOGLE_CLOUD_SECRET_MANAGER = True
+        mock_client = mocker.patch("apps.common.secret_manager.SecretManagerServiceClient")
+        mock_access = mock_client.return_value.access_secret_version
+        mock_access.return_value.payload.data = b"something"
+        if not found:
+            mock_access.side_effect = NotFound("Not found")
+        MyObject = make_my_object(GoogleCloudSecretProvider)
+        expected = "something" if found else None
+        assert MyObject(**{MODEL_ATTR: "some-secret-name"}).val == expected
+        assert MyObject(**{MODEL_ATTR: "some-secret-name"}).val == expected
+        caches[django_settings.LOCAL_CACHE].clear()
+        assert MyObject(**{MODEL_ATTR: "some-secret-name"}).val == expected
+        mock_access.assert_called_once()
+        assert MyObject(**{MODEL_ATTR: "other-secret-name"}).val == expected
+        assert mock_access.call_count == 2
+
+    def test_set_updates_cache(self, settings, mocker):
+        settings.ENABLE_GOOGLE_CLOUD_SECRET_MANAGER = True
+        mock_client = mocker.patch("apps.common.secret_manager.SecretManagerServiceClient")
+        mock_client.return_value.access_secret_version.return_value.payload.data = b"old-value"
+        MyObject = make_my_object(GoogleCloudSecretProvider)
+        instance = MyObject(**{MODEL_ATTR: "something"})
+        assert instance.val == "old-value"
+        instance.val = "new-value"
+        assert instance.val == "new-value"
+        caches[django_settings.LOCAL_CACHE].clear()
+        assert instance.val == "new-value"
+        mock_client.return_value.access_secret_version.assert_called_once()
+
+    def test_set_when_permission_denied_does_not_update_cache(self, settings, mocker):
+        settings.ENABLE_GOOGLE_CLOUD_SECRET_MANAGER = True
+        mock_client = mocker.patch("apps.common.secret_manager.SecretManagerServiceClient")
+        mock_client.return_value.access_secret_version.return_value.payload.data = b"old-value"
+        mock_client.return_value.add_secret_version.side_effect = PermissionDenied("Nah-uh!")
+        MyObject = make_my_object(GoogleCloudSecretProvider)
+        instance = MyObject(**{MODEL_ATTR: "something"})
+        assert instance.val == "old-value"
+        with pytest.raises(SecretProviderException):
+            instance.val = "new-value"
+        assert instance.val == "old-value"
+
+    @pytest.mark.parametrize("found", [True, False])
+    def test_delete_updates_cache(self, found, settings, mocker):
+        settings.ENABLE_GOOGLE_CLOUD_SECRET_MANAGER = True
+        mock_client = mocker.patch("apps.common.secret_manager.SecretManagerServiceClient")
+        mock_client.return_value.access_secret_version.return_value.payload.data = b"something"
+        if not found:
+            mock_client.return_value.delete_secret.side_effect = NotFound("Not found")
+        MyObject = make_my_object(GoogleCloudSecretProvider)
+        instance = MyObject(**{MODEL_ATTR: "something"})
+        assert instance.val == "something"
+        del instance.val
+        assert instance.val is None
+        mock_client.return_value.access_secret_version.assert_called_once()
+
+    def test_prefetch(self, settings, mocker):
+        settings.ENABLE_GOOGLE_CLOUD_SECRET_MANAGER = True
+        mock_client = mocker.patch("apps.common.secret_manager.SecretManagerServiceClient")
+        mock_access = mock_client.return_value.access_secret_version
+        mock_access.side_effect = lambda request: mocker.Mock(
+            payload=mocker.Mock(data=request["name"].split("/")[3].encode("utf-8"))
+        )
+        MyObject = make_my_object(GoogleCloudSecretProvider)
+        instances = [MyObject(**{MODEL_ATTR: f"secret-{i}"}) for i in range(5)]
+        assert instances[0].val == "secret-0"
+        # In Redis but not in process
+        instances[1].val = "secret-1"
+        caches[django_settings.LOCAL_CACHE].delete(MyObject.val.get_cache_key(instances[1]))
+        MyObject.val.prefetch(instances)
+        assert mock_access.call_count == 4
+        assert [x.val for x in instances] == [f"secret-{i}" for i in range(5)]
+        assert mock_access.call_count == 4
+        MyObject.val.prefetch(instances)
+        assert mock_access.call_count == 4
+
+    def test_prefetch_when_not_enabled(self, settings, mocker):
+        settings.ENABLE_GOOGLE_CLOUD_SECRET_MANAGER = False
+        mock_client = mocker.patch("apps.common.secret_manager.SecretManagerServiceClient")
+        MyObject = make_my_object(GoogleCloudSecretProvider)
+        MyObject.val.prefetch([MyObject(**{MODEL_ATTR: "something"})])
+        mock_client.return_value.access_secret_version.assert_not_called()
+
     @pytest.mark.parametrize("enabled", [True, False])
     def test_get_happy_path(self, enabled, settings, mocker):
         settings.ENABLE_GOOGLE_CLOUD_SECRET_MANAGER = enabled
@@ -1,14 +1,22 @@
 import logging
 import re
+from collections.abc import Iterable
 
 from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core import serializers
+from django.db import router
 from django.db.models import Model
+from django.utils import timezone
+from django.utils.encoding import force_str
 from django.utils.text import slugify
 
 import CloudFlare
 import requests
 import reversion
 import stripe
+from reversion.models import Revision, Version
+from reversion.revisions import _follow_relations, _get_options
 
 
 logger = logging.getLogger(f"{settings.DEFAULT_LOGGER}.{__name__}")
@@ -236,6 +244,47 @@ def upsert_with_diff_check(
         return instance, CREATED if created else UPDATED if bool(fields_to_update) else LEFT_UNCHANGED
 
 
+def bulk_create_revisions(objs: Iterable[Model], comment: str) -> None:
+    """Record a revision for each object, as saving each one in its own `reversion.create_revision()` block would.
+
+    Each revision has a version of its object and of the objects that the object's reversion registration follows (for
+    instance, a contribution's payments), which should be prefetched. Rather than saving each revision in turn, the
+    revisions and then their versions are bulk created.
+    """
+    objs = list(objs)
+    now = timezone.now()
+    revisions = Revision.objects.bulk_create([Revision(date_created=now, comment=comment) for _ in objs])
+    versions = []
+    for obj, revision in zip(objs, revisions, strict=True):
+        seen = set()
+        to_version = [obj]
+        while to_version:
+            x = to_version.pop(0)
+            options = _get_options(x.__class__)
+            content_type = ContentType.objects.get_for_model(x.__class__, for_concrete_model=options.for_concrete_model)
+            if (key := (content_type.id, force_str(x.pk))) in seen:
+                continue
+            seen.add(key)
+            versions.append(
+                Version(
+                    revision=revision,
+                    content_type=content_type,
+                    object_id=key[1],
+                    db=router.db_for_write(x.__class__, instance=x),
+                    format=options.format,
+                    serialized_data=serializers.serialize(
+                        options.format,
+                        (x,),
+                        fields=options.fields,
+                        use_natural_foreign_keys=options.use_natural_foreign_keys,
+                    ),
+                    object_repr=force_str(x),
+                )
+            )
+            to_version.extend(_follow_relations(x))
+    Version.objects.bulk_create(versions)
+
+
 def get_stripe_accounts_and_their_connection_status(account_ids: list[str]) -> dict[str, bool]:
     """Given a list of stripe accounts.
 
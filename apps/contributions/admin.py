@@ -4,7 +4,7 @@ from datetime import timedelta
 from django.conf import settings
 from django.contrib import admin, messages
 from django.contrib.admin import ModelAdmin
-from django.db.models import Min, QuerySet
+from django.db.models import QuerySet
 from django.http import HttpRequest, HttpResponseRedirect
 from django.urls import re_path, reverse
 from django.urls.resolvers import URLPattern
@@ -143,7 +143,7 @@ class FirstPaymentDateFilter(admin.SimpleListFilter):
         ]
 
     def queryset(self, request: HttpRequest, queryset: QuerySet[Contribution]):
-        queryset = queryset.annotate(first_payment_date=Min("payment__transaction_time"))
+        queryset = queryset.with_first_payment_date()
         filter_value = self.value()
         match filter_value:
             case "today":
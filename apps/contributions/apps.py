@@ -12,3 +12,5 @@ class ContributionsConfig(AppConfig):
     def ready(self):
         stripe.api_key = get_hub_stripe_api_key()
         stripe.api_version = settings.STRIPE_API_VERSION
+        # Implicitly connect signal handlers decorated with @receiver.
+        import apps.contributions.signals  # noqa F401
@@ -23,6 +23,13 @@ class ContributionStatus(TextChoices):
     ABANDONED = "abandoned", "abandoned"
 
 
+class ExportJobStatus(TextChoices):
+    PENDING = "pending", "pending"
+    RUNNING = "running", "running"
+    SUCCEEDED = "succeeded", "succeeded"
+    FAILED = "failed", "failed"
+
+
 class BadActorScores(IntegerChoices):
     INFORMATION = 0, "0 - Information"
     UNKNOWN = 1, "1 - Unknown"
@@ -3,11 +3,11 @@ from django.db.models import Q
 import django_filters
 
 from apps.contributions.choices import ContributionInterval
-from apps.contributions.models import Contribution, ContributionStatus
+from apps.contributions.models import Contribution, ContributionStatus, Contributor
 
 
 class ContributionFilter(django_filters.FilterSet):
-    contributor_email = django_filters.CharFilter(field_name="contributor__email", lookup_expr="icontains")
+    contributor_email = django_filters.CharFilter(method="filter_contributor_email")
     status = django_filters.MultipleChoiceFilter(choices=ContributionStatus.choices)
     status__not = django_filters.MultipleChoiceFilter(
         choices=ContributionStatus.choices, field_name="status", exclude=True, lookup_expr="iexact"
@@ -33,10 +33,18 @@ class ContributionFilter(django_filters.FilterSet):
             ("status__not", "status__not"),
             ("interval", "interval"),
             ("auto_accept_on", "auto_accept_on"),
-            ("donation_page__revenue_program__name", "revenue_program__name"),
+            ("effective_revenue_program__name", "revenue_program__name"),
         )
     )
 
+    def filter_contributor_email(self, queryset, name, value):
+        """Limit to contributions whose contributor's email contains `value`, case-insensitively.
+
+        Matching contributors are found in a subquery, which Postgres can answer from the trigram index on contributor
+        email (see `Contributor.Meta.indexes`), rather than by scanning contributions joined to contributors.
+        """
+        return queryset.filter(contributor__in=Contributor.objects.filter(email__icontains=value))
+
     class Meta:
         model = Contribution
         fields = {
@@ -58,10 +66,9 @@ class PortalContributionFilter(django_filters.rest_framework.DjangoFilterBackend
     RECURRING = "recurring"
 
     def filter_queryset_by_rp(self, queryset, revenue_program_id: str):
+        # Legacy contributions can also be attributed to a revenue program through their metadata
         return queryset.filter(
-            Q(donation_page__revenue_program__id=revenue_program_id)
-            | Q(_revenue_program__id=revenue_program_id)
-            | Q(contribution_metadata__contains={"revenue_program_id": revenue_program_id})
+            Q(effective_revenue_program_id=revenue_program_id) | Q(metadata_revenue_program_id=revenue_program_id)
         )
 
     def filter_intervals(self, queryset, request):
@@ -28,11 +28,7 @@ class Command(BaseCommand):
             self.style.HTTP_INFO(f"Getting recurring contributions for stripe account `{stripe_account_id}`")
         )
         return Contribution.objects.with_stripe_account().filter(
-            ~Q(interval=ContributionInterval.ONE_TIME),
-            Q(
-                Q(donation_page__revenue_program__payment_provider__stripe_account_id=stripe_account_id)
-                | Q(_revenue_program__payment_provider__stripe_account_id=stripe_account_id)
-            ),
+            ~Q(interval=ContributionInterval.ONE_TIME), effective_stripe_account_id=stripe_account_id
         )
 
     def get_stripe_subscriptions_for_account(self, stripe_account_id: str) -> list[stripe.Subscription]:
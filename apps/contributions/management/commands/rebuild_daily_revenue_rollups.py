@@ -0,0 +1,43 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from apps.contributions.models import DailyRevenueRollup
+from apps.organizations.models import RevenueProgram
+
+
+class Command(BaseCommand):
+    """Rebuild daily revenue rollups from payments.
+
+    Rollups are backfilled by the migration that adds them, and maintained as payments and contributions are written, so
+    this is for repairing drift (for instance, from payments or contributions written with queryset `.update()` or raw
+    SQL, which bypass the signal handlers). This command is idempotent.
+    """
+
+    help = "Rebuild daily revenue rollups for revenue programs from their payments."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--revenue-program",
+            type=int,
+            action="append",
+            dest="revenue_programs",
+            help="ID of a revenue program to rebuild rollups for. Can be given more than once. Defaults to all.",
+        )
+        parser.add_argument(
+            "--since",
+            type=datetime.date.fromisoformat,
+            help="Only rebuild rollups from this date (YYYY-MM-DD) on",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.HTTP_INFO("Running `rebuild_daily_revenue_rollups`"))
+        revenue_programs = RevenueProgram.objects.order_by("id")
+        if options["revenue_programs"]:
+            revenue_programs = revenue_programs.filter(id__in=options["revenue_programs"])
+        ids = list(revenue_programs.values_list("id", flat=True))
+        total = 0
+        for count, revenue_program_id in enumerate(ids, start=1):
+            total += DailyRevenueRollup.refresh(revenue_program_id, since=options["since"])
+            self.stdout.write(self.style.HTTP_INFO(f"Rebuilt rollups for {count} of {len(ids)} revenue programs"))
+        self.stdout.write(self.style.SUCCESS(f"`rebuild_daily_revenue_rollups` is done, wrote {total} rollups"))
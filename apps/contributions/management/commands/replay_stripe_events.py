@@ -0,0 +1,70 @@
+from django.core.management.base import BaseCommand, CommandParser
+
+import dateparser
+
+from apps.contributions.stripe_import import StripeEventReplayer
+
+
+class Command(BaseCommand):
+    """Allows user to replay Stripe events for an account over a time window using our webhook handler.
+
+    Events that have already been processed are skipped unless `--include-processed` is passed.
+    """
+
+    help = "Replay Stripe events for an account using our webhook handler."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--stripe-account", required=True)
+        parser.add_argument(
+            "--event-types",
+            type=lambda s: [x.strip() for x in s.split(",")],
+            default=None,
+            help="Optional comma-separated list of event types to limit to. Defaults to all types we handle.",
+        )
+        parser.add_argument(
+            "--gte",
+            type=lambda s: dateparser.parse(s),
+            help="Optional start date(time) for events (inclusive). Tries to parse whatever it's given.",
+        )
+        parser.add_argument(
+            "--lte",
+            type=lambda s: dateparser.parse(s),
+            help="Optional end date(time) for events (inclusive). Tries to parse whatever it's given.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=4,
+            help="Number of Stripe objects whose events are processed at once (ignored in async mode)",
+        )
+        parser.add_argument("--async-mode", action="store_true", default=False)
+        parser.add_argument(
+            "--include-processed",
+            action="store_true",
+            default=False,
+            help="Replay events even if they have already been processed",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.HTTP_INFO("Running `replay_stripe_events`"))
+        report = StripeEventReplayer(
+            stripe_account_id=options["stripe_account"],
+            event_types=options["event_types"],
+            from_date=options["gte"],
+            to_date=options["lte"],
+            concurrency=options["concurrency"],
+            async_mode=options["async_mode"],
+            include_processed=options["include_processed"],
+        ).replay()
+        self.stdout.write(
+            self.style.HTTP_INFO(
+                f"Listed {report.listed} events, skipped {report.skipped_as_processed} already processed, "
+                f"{'enqueued' if options['async_mode'] else 'replayed'} {report.replayed} in "
+                f"{report.duration_seconds:.1f} seconds ({report.events_per_second:.1f} events/second)"
+            )
+        )
+        if report.failed_event_ids:
+            self.stdout.write(
+                self.style.ERROR(f"{len(report.failed_event_ids)} events failed: {', '.join(report.failed_event_ids)}")
+            )
+        self.stdout.write(self.style.SUCCESS("`replay_stripe_events` is done"))
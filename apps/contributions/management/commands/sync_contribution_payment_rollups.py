@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandParser
+
+from apps.contributions.models import Contribution, Contributor
+
+
+class Command(BaseCommand):
+    """Find contributions whose payment rollup fields don't match their payments, and fix them.
+
+    The rollup fields (see `Contribution.PAYMENT_ROLLUP_FIELDS`) are maintained as payments are written, so this is for
+    backfilling them after they are first added, and for checking and repairing drift (for instance, from payments
+    written with queryset `.update()` or raw SQL, which bypass the signal handlers). This command is idempotent.
+    """
+
+    help = "Backfill and check payment rollup fields on contributions."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            default=False,
+            help="Only report contributions with inconsistent payment rollups, without fixing them",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000, help="Number of contributions to update at once")
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.HTTP_INFO("Running `sync_contribution_payment_rollups`"))
+        ids = list(Contribution.objects.with_inconsistent_payment_rollups().values_list("id", flat=True).order_by("id"))
+        self.stdout.write(self.style.HTTP_INFO(f"Found {len(ids)} contributions with inconsistent payment rollups"))
+        if options["dry_run"]:
+            if ids:
+                self.stdout.write(self.style.ERROR(f"Inconsistent contribution IDs: {', '.join(map(str, ids))}"))
+            return
+        updated = 0
+        for start in range(0, len(ids), batch_size := options["batch_size"]):
+            batch = Contribution.objects.filter(id__in=ids[start : start + batch_size])
+            updated += batch.update_payment_rollups()
+            Contributor.invalidate_cached_impact(batch.values_list("contributor_id", flat=True))
+            self.stdout.write(self.style.HTTP_INFO(f"Updated {updated} of {len(ids)} contributions"))
+        self.stdout.write(self.style.SUCCESS("`sync_contribution_payment_rollups` is done"))
@@ -0,0 +1,66 @@
+# Generated by Django 4.2.23 on 2026-10-19 00:22
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_payment_rollups(apps, schema_editor):
+    """Set the payment rollup fields from payments in a single UPDATE, rather than row by row.
+
+    This mirrors `ContributionQuerySet.update_payment_rollups`, which isn't available on historical models.
+    """
+    Contribution = apps.get_model("contributions", "Contribution")
+    Payment = apps.get_model("contributions", "Payment")
+    payments = Payment.objects.filter(contribution=OuterRef("pk")).order_by().values("contribution")
+
+    def _aggregate(aggregate):
+        return Subquery(payments.annotate(value=aggregate).values("value"))
+
+    Contribution.objects.filter(pk__in=Payment.objects.values("contribution_id")).update(
+        first_payment_at=_aggregate(Min("transaction_time")),
+        last_payment_at=_aggregate(Max("transaction_time")),
+        payment_count=Coalesce(_aggregate(Count("id")), 0),
+        total_paid=Coalesce(_aggregate(Sum("net_amount_paid")), 0),
+        total_refunded=Coalesce(_aggregate(Sum("amount_refunded")), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contributions", "0020_DEV-5528_alter_contribution_quarantine_status"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="contribution",
+            name="first_payment_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="contribution",
+            name="last_payment_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="contribution",
+            name="payment_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="contribution",
+            name="total_paid",
+            field=models.IntegerField(
+                default=0, editable=False, help_text="Sum of payments' net amount paid, in cents"
+            ),
+        ),
+        migrations.AddField(
+            model_name="contribution",
+            name="total_refunded",
+            field=models.IntegerField(
+                default=0, editable=False, help_text="Sum of payments' amount refunded, in cents"
+            ),
+        ),
+        migrations.RunPython(backfill_payment_rollups, migrations.RunPython.noop),
+    ]
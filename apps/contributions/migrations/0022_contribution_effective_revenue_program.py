@@ -0,0 +1,57 @@
+# Generated by Django 4.2.23 on 2026-10-19 00:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, NullIf
+
+
+def backfill_effective_revenue_program(apps, schema_editor):
+    """Set the effective revenue program and Stripe account fields in a single UPDATE, rather than row by row.
+
+    This mirrors `ContributionQuerySet.update_effective_revenue_program`, which isn't available on historical models.
+    """
+    Contribution = apps.get_model("contributions", "Contribution")
+    DonationPage = apps.get_model("pages", "DonationPage")
+    RevenueProgram = apps.get_model("organizations", "RevenueProgram")
+    page = DonationPage.objects.filter(pk=OuterRef("donation_page_id"))
+    revenue_program = RevenueProgram.objects.filter(pk=OuterRef("_revenue_program_id"))
+    Contribution.objects.update(
+        effective_revenue_program_id=Coalesce(Subquery(page.values("revenue_program_id")), "_revenue_program_id"),
+        effective_stripe_account_id=NullIf(
+            Coalesce(
+                Subquery(page.values("revenue_program__payment_provider__stripe_account_id")),
+                Subquery(revenue_program.values("payment_provider__stripe_account_id")),
+            ),
+            Value(""),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("organizations", "0030_DEV-5977_organization_disable_reminder_emails"),
+        ("contributions", "0021_contribution_payment_rollups"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="contribution",
+            name="effective_revenue_program",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="organizations.revenueprogram",
+            ),
+        ),
+        migrations.AddField(
+            model_name="contribution",
+            name="effective_stripe_account_id",
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=255, null=True),
+        ),
+        migrations.RunPython(backfill_effective_revenue_program, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,129 @@
+# Generated by Django 4.2.23 on 2026-10-19 01:32
+
+from itertools import islice
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import Count, F, Q, Sum, Value
+from django.db.models.functions import Coalesce, TruncDate
+
+import model_utils.fields
+
+
+def backfill_daily_revenue_rollups(apps, schema_editor):
+    """Roll up all payments in a single aggregate query, rather than revenue program by revenue program.
+
+    This mirrors `DailyRevenueRollup.aggregate_payments`, which isn't available on historical models.
+    """
+    DailyRevenueRollup = apps.get_model("contributions", "DailyRevenueRollup")
+    Payment = apps.get_model("contributions", "Payment")
+    rows = (
+        Payment.objects.filter(contribution__effective_revenue_program__isnull=False)
+        .order_by()
+        .values(
+            revenue_program_id=F("contribution__effective_revenue_program_id"),
+            date=TruncDate("transaction_time"),
+            interval=F("contribution__interval"),
+            status=Coalesce("contribution__status", Value("")),
+            currency=F("contribution__currency"),
+        )
+        .annotate(
+            total_payment_count=Count("id"),
+            total_refund_count=Count("id", filter=Q(amount_refunded__gt=0)),
+            total_gross_amount_paid=Sum("gross_amount_paid"),
+            total_net_amount_paid=Sum("net_amount_paid"),
+            total_amount_refunded=Sum("amount_refunded"),
+        )
+        .iterator()
+    )
+    amount_fields = ("payment_count", "refund_count", "gross_amount_paid", "net_amount_paid", "amount_refunded")
+    while batch := list(islice(rows, 1000)):
+        DailyRevenueRollup.objects.bulk_create(
+            DailyRevenueRollup(
+                **{k: row[k] for k in ("revenue_program_id", "date", "interval", "status", "currency")},
+                **{k: row[f"total_{k}"] for k in amount_fields},
+            )
+            for row in batch
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("organizations", "0030_DEV-5977_organization_disable_reminder_emails"),
+        ("contributions", "0023_exportjob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyRevenueRollup",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "created",
+                    model_utils.fields.AutoCreatedField(
+                        db_index=True, default=django.utils.timezone.now, editable=False, verbose_name="created"
+                    ),
+                ),
+                (
+                    "modified",
+                    model_utils.fields.AutoLastModifiedField(
+                        db_index=True, default=django.utils.timezone.now, editable=False, verbose_name="modified"
+                    ),
+                ),
+                ("date", models.DateField()),
+                (
+                    "interval",
+                    models.CharField(
+                        choices=[("one_time", "One-time"), ("month", "Monthly"), ("year", "Yearly")], max_length=8
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        blank=True,
+                        choices=[
+                            ("processing", "processing"),
+                            ("paid", "paid"),
+                            ("canceled", "canceled"),
+                            ("failed", "failed"),
+                            ("flagged", "flagged"),
+                            ("rejected", "rejected"),
+                            ("refunded", "refunded"),
+                            ("abandoned", "abandoned"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("currency", models.CharField(max_length=3)),
+                ("payment_count", models.PositiveIntegerField(default=0)),
+                (
+                    "refund_count",
+                    models.PositiveIntegerField(default=0, help_text="Number of payments with an amount refunded"),
+                ),
+                ("gross_amount_paid", models.BigIntegerField(default=0, help_text="In cents")),
+                ("net_amount_paid", models.BigIntegerField(default=0, help_text="In cents")),
+                ("amount_refunded", models.BigIntegerField(default=0, help_text="In cents")),
+            ],
+            options={
+                "ordering": ["revenue_program", "date", "interval", "status", "currency"],
+            },
+        ),
+        migrations.AddField(
+            model_name="dailyrevenuerollup",
+            name="revenue_program",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="daily_revenue_rollups",
+                to="organizations.revenueprogram",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="dailyrevenuerollup",
+            constraint=models.UniqueConstraint(
+                fields=("revenue_program", "date", "interval", "status", "currency"), name="unique_daily_revenue_rollup"
+            ),
+        ),
+        migrations.RunPython(backfill_daily_revenue_rollups, migrations.RunPython.noop),
+    ]
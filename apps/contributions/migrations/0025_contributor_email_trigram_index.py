@@ -0,0 +1,29 @@
+# Generated by Django 4.2.23 on 2026-10-19 01:44
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # Building the index concurrently so as not to block writes to contributors, which can't be done in a transaction
+    atomic = False
+
+    dependencies = [
+        ("contributions", "0024_daily_revenue_rollups"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddIndexConcurrently(
+            model_name="contributor",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("email"),
+                    name="gin_trgm_ops",
+                ),
+                name="contributor_email_trgm_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,42 @@
+from itertools import islice
+
+from django.db import migrations, models
+
+
+BATCH_SIZE = 1000
+
+
+def get_email_key(email: str) -> str:
+    """Mirror `Contributor.get_email_key`, which isn't available on historical models."""
+    return email.strip().lower()
+
+
+def backfill_email_key(apps, schema_editor):
+    """Set the email key in batches.
+
+    This is done in Python rather than in SQL, as Postgres' TRIM and LOWER don't normalize exactly as `str.strip` and
+    `str.lower` do, and keys must match the ones lookups compute.
+    """
+    Contributor = apps.get_model("contributions", "Contributor")
+    contributors = Contributor.objects.only("id", "email").iterator(chunk_size=BATCH_SIZE)
+    while batch := list(islice(contributors, BATCH_SIZE)):
+        for contributor in batch:
+            contributor.email_key = get_email_key(contributor.email)
+        Contributor.objects.bulk_update(batch, ["email_key"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contributions", "0025_contributor_email_trigram_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="contributor",
+            name="email_key",
+            field=models.CharField(default="", editable=False, max_length=254),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_email_key, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Building the index concurrently so as not to block writes to payments, which can't be done in a transaction
+    atomic = False
+
+    dependencies = [
+        ("contributions", "0026_contributor_email_key"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="payment",
+            index=models.Index(fields=["transaction_time"], name="payment_transaction_time_idx"),
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 4.2.23 on 2026-10-19 09:12
+
+from itertools import islice
+
+from django.db import migrations, models
+from django.db.models import Q
+
+
+BATCH_SIZE = 1000
+
+
+def get_metadata_revenue_program_id(metadata: dict | None) -> int | None:
+    """Mirror `Contribution.get_metadata_revenue_program_id`, which isn't available on historical models."""
+    for key in ("revenue_program_id", "revenue_program"):
+        value = (metadata or {}).get(key)
+        if isinstance(value, str) and value.isascii() and value.isdigit():
+            value = int(value)
+        if type(value) is int and 0 < value < 2**31:
+            return value
+    return None
+
+
+def backfill_metadata_revenue_program_id(apps, schema_editor):
+    """Set the metadata revenue program ID in batches.
+
+    This is done in Python rather than in SQL so that the result is exactly what `Contribution.save()` sets.
+    """
+    Contribution = apps.get_model("contributions", "Contribution")
+    contributions = (
+        Contribution.objects.filter(
+            Q(contribution_metadata__has_key="revenue_program_id") | Q(contribution_metadata__has_key="revenue_program")
+        )
+        .only("id", "contribution_metadata")
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+    while batch := list(islice(contributions, BATCH_SIZE)):
+        for contribution in batch:
+            contribution.metadata_revenue_program_id = get_metadata_revenue_program_id(
+                contribution.contribution_metadata
+            )
+        Contribution.objects.bulk_update(
+            [x for x in batch if x.metadata_revenue_program_id is not None], ["metadata_revenue_program_id"]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contributions", "0027_payment_transaction_time_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="contribution",
+            name="metadata_revenue_program_id",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_metadata_revenue_program_id, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Building the index concurrently so as not to block writes to contributions, which can't be done in a transaction
+    atomic = False
+
+    dependencies = [
+        ("contributions", "0028_contribution_metadata_revenue_program_id"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="contribution",
+            index=models.Index(
+                condition=models.Q(metadata_revenue_program_id__isnull=False),
+                fields=["metadata_revenue_program_id"],
+                name="contribution_metadata_rp_idx",
+            ),
+        ),
+    ]
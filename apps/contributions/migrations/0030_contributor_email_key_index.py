@@ -0,0 +1,18 @@
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Building the index concurrently so as not to block writes to contributors, which can't be done in a transaction
+    atomic = False
+
+    dependencies = [
+        ("contributions", "0029_contribution_metadata_rp_index"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="contributor",
+            index=models.Index(fields=["email_key"], name="contributor_email_key_idx"),
+        ),
+    ]
@@ -2,11 +2,12 @@ from __future__ import annotations
 
 import contextlib
 import datetime
+import hashlib
 import json
 import logging
 import uuid
-from collections.abc import Callable, Generator
-from functools import cached_property, reduce, wraps
+from collections.abc import Callable, Generator, Iterable
+from functools import cached_property, partial, reduce, wraps
 from operator import or_
 from typing import Any, Literal, TypedDict
 from zoneinfo import ZoneInfo
@@ -14,8 +15,12 @@ from zoneinfo import ZoneInfo
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericRelation
 from django.contrib.contenttypes.models import ContentType
-from django.db import models
-from django.db.models import Count, Min, Q, Sum
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.core.cache import cache
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, Max, Min, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, NullIf, TruncDate, Upper
+from django.http import QueryDict
 from django.template.loader import render_to_string
 from django.utils import timezone
 
@@ -29,7 +34,13 @@ from stripe.error import CardError, StripeError
 from apps.activity_log.models import ActivityLog
 from apps.common.models import IndexedTimeStampedModel
 from apps.common.utils import CREATED, LEFT_UNCHANGED, get_stripe_accounts_and_their_connection_status
-from apps.contributions.choices import BadActorScores, ContributionInterval, ContributionStatus, QuarantineStatus
+from apps.contributions.choices import (
+    BadActorScores,
+    ContributionInterval,
+    ContributionStatus,
+    ExportJobStatus,
+    QuarantineStatus,
+)
 from apps.contributions.exceptions import InvalidMetadataError
 from apps.contributions.typings import (
     STRIPE_PAYMENT_METADATA_SCHEMA_VERSIONS,
@@ -61,6 +72,10 @@ class ContributionStatusError(Exception):
     pass
 
 
+class ExportJobError(Exception):
+    pass
+
+
 class BillingHistoryItem(TypedDict):
     payment_date: datetime.datetime
     payment_amount: int
@@ -70,6 +85,10 @@ class BillingHistoryItem(TypedDict):
 class Contributor(IndexedTimeStampedModel):
     uuid = models.UUIDField(default=uuid.uuid4, primary_key=False, editable=False)
     email = models.EmailField(unique=True)
+    # The contributor's email, normalized so that emails differing only by case have the same key (see `get_email_key`).
+    # Contributors are identified by this rather than by comparing emails case-insensitively, so that finding a person's
+    # contributor records is an indexed equality lookup. It's set in `.save()`.
+    email_key = models.CharField(max_length=254, editable=False)
     # TODO @BW: Rename to `email`, replacing current `email` and make non nullable and blank=False
     # DEV-5782
     email_future = models.EmailField(blank=True, null=True, unique=True, db_collation="case_insensitive")
@@ -82,11 +101,38 @@ class Contributor(IndexedTimeStampedModel):
         related_query_name="actor",
     )
 
+    class Meta:
+        indexes = [
+            # A trigram index over the expression Django compiles `email__icontains` to on Postgres
+            # (`UPPER("email"::text) LIKE UPPER('%...%')`), so that substring searches on email don't scan the table.
+            GinIndex(
+                OpClass(Upper("email"), name="gin_trgm_ops"),
+                name="contributor_email_trgm_idx",
+            ),
+            models.Index(fields=["email_key"], name="contributor_email_key_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        """Save, first setting `email_key` from `email`."""
+        self.email_key = self.get_email_key(self.email)
+        if (update_fields := kwargs.get("update_fields")) is not None and "email" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "email_key"}
+        super().save(*args, **kwargs)
+
+    @staticmethod
+    def get_email_key(email: str) -> str:
+        """Normalize an email for case-insensitive identity comparison."""
+        return email.strip().lower()
+
     @staticmethod
     def get_or_create_contributor_by_email(email: str) -> tuple[Contributor, str]:
         """Get existing contributor for email (case insensitive) or create a new one."""
         stripped = email.strip()
-        if existing := Contributor.objects.filter(email__iexact=stripped).order_by("created").first():
+        if (
+            existing := Contributor.objects.filter(email_key=Contributor.get_email_key(stripped))
+            .order_by("created")
+            .first()
+        ):
             return existing, LEFT_UNCHANGED
 
         logger.info("Creating new contributor for email %s", stripped)
@@ -97,20 +143,52 @@ class Contributor(IndexedTimeStampedModel):
             kwargs["email_future"] = stripped
         return Contributor.objects.create(**kwargs), CREATED
 
+    @staticmethod
+    def get_impact_cache_key(contributor_id: int) -> str:
+        return f"contributor-impact-{contributor_id}"
+
+    @classmethod
+    def invalidate_cached_impact(cls, contributor_ids: Iterable[int | None]) -> None:
+        """Forget the cached impact of the given contributors, so that it's recalculated when next requested."""
+        if keys := [cls.get_impact_cache_key(x) for x in set(contributor_ids) if x is not None]:
+            cache.delete_many(keys)
+
+    def get_impact_by_revenue_program(self) -> dict[tuple[int | None, int | None], tuple[int, int]]:
+        """Return (total paid, total refunded) for the contributor by revenue program, caching the result.
+
+        Totals are keyed by (effective revenue program ID, metadata revenue program ID), as legacy
+        contributions can also be attributed to a revenue program through their metadata (see
+        `ContributionQuerySet.filter_by_revenue_programs`).
+
+        The cache is invalidated by signal handlers in `apps.contributions.signals` when the contributor's contributions
+        or their payments change.
+        """
+        key = self.get_impact_cache_key(self.id)
+        if (totals := cache.get(key)) is None:
+            totals = {
+                (row["effective_revenue_program"], row["metadata_revenue_program_id"]): (
+                    row["paid"] or 0,
+                    row["refunded"] or 0,
+                )
+                for row in self.contribution_set.exclude_hidden_statuses()
+                .order_by()
+                .values("effective_revenue_program", "metadata_revenue_program_id")
+                .annotate(paid=Sum("total_paid"), refunded=Sum("total_refunded"))
+            }
+            cache.set(key, totals, timeout=settings.CONTRIBUTOR_IMPACT_CACHE_TTL)
+        return totals
+
     def get_impact(self, revenue_program_ids: list[int] | None = None):
         """Calculate the total impact of a contributor across multiple revenue programs."""
-        totals = (
-            self.contribution_set.filter_by_revenue_programs(revenue_program_ids)
-            .exclude_hidden_statuses()
-            .annotate(total_payments=Sum("payment__net_amount_paid"), total_refunded=Sum("payment__amount_refunded"))
-            .aggregate(
-                total_amount_paid=Sum("total_payments", default=0),
-                total_amount_refunded=Sum("total_refunded", default=0),
-            )
-        )
+        revenue_program_ids = {int(x) for x in revenue_program_ids} if revenue_program_ids else None
+        total_paid = total_refunded = 0
+        for attributed_to, (paid, refunded) in self.get_impact_by_revenue_program().items():
+            if revenue_program_ids is None or revenue_program_ids.intersection(attributed_to):
+                total_paid += paid
+                total_refunded += refunded
         return {
-            "total_paid": (total_paid := totals["total_amount_paid"] or 0),
-            "total_refunded": (total_refunded := totals["total_amount_refunded"] or 0),
+            "total_paid": total_paid,
+            "total_refunded": total_refunded,
             "total": total_paid - total_refunded,
         }
 
@@ -141,7 +219,7 @@ class Contributor(IndexedTimeStampedModel):
         NB: We return contributions that can be connected by case insensitive email on contributor.
         See DEV-5494 for more context.
         """
-        return Contribution.objects.filter(contributor__email__iexact=self.email)
+        return Contribution.objects.filter(contributor__email_key=self.email_key)
 
 
 class ContributionQuerySet(models.QuerySet):
@@ -162,15 +240,88 @@ class ContributionQuerySet(models.QuerySet):
         self, revenue_programs: list[int] | models.QuerySet[RevenueProgram] | None
     ) -> models.QuerySet[Contribution]:
         if revenue_programs:
+            # Legacy contributions can also be attributed to a revenue program through their metadata
             return self.filter(
-                Q(donation_page__revenue_program__in=revenue_programs)
-                | Q(contribution_metadata__revenue_program__in=revenue_programs)
+                Q(effective_revenue_program__in=revenue_programs) | Q(metadata_revenue_program_id__in=revenue_programs)
             )
         return self
 
     def with_first_payment_date(self):
         """Annotate the earliest Payment belonging to each contribution as "first_payment_date"."""
-        return self.annotate(first_payment_date=Min("payment__transaction_time"))
+        return self.annotate(first_payment_date=F("first_payment_at"))
+
+    @staticmethod
+    def _payment_rollup_expressions() -> dict[str, models.Expression]:
+        """Expressions deriving each of `Contribution.PAYMENT_ROLLUP_FIELDS` from the contribution's payments."""
+        payments = Payment.objects.filter(contribution=OuterRef("pk")).order_by().values("contribution")
+
+        def _aggregate(aggregate: models.Aggregate) -> Subquery:
+            return Subquery(payments.annotate(value=aggregate).values("value"))
+
+        return {
+            "first_payment_at": _aggregate(Min("transaction_time")),
+            "last_payment_at": _aggregate(Max("transaction_time")),
+            "payment_count": Coalesce(_aggregate(Count("id")), 0),
+            "total_paid": Coalesce(_aggregate(Sum("net_amount_paid")), 0),
+            "total_refunded": Coalesce(_aggregate(Sum("amount_refunded")), 0),
+        }
+
+    def with_actual_payment_rollups(self) -> models.QuerySet[Contribution]:
+        """Annotate each of `Contribution.PAYMENT_ROLLUP_FIELDS` as derived from payments, prefixed with "actual_"."""
+        return self.annotate(**{f"actual_{k}": v for k, v in self._payment_rollup_expressions().items()})
+
+    def with_inconsistent_payment_rollups(self) -> models.QuerySet[Contribution]:
+        """Limit to contributions whose payment rollup fields don't match their payments."""
+        # Comparing via Coalesce so that NULL vs. NULL is consistent and NULL vs. a value is not
+        never = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+        return (
+            self.with_actual_payment_rollups()
+            .annotate(
+                first_payment_at_or_never=Coalesce("first_payment_at", Value(never)),
+                actual_first_payment_at_or_never=Coalesce("actual_first_payment_at", Value(never)),
+                last_payment_at_or_never=Coalesce("last_payment_at", Value(never)),
+                actual_last_payment_at_or_never=Coalesce("actual_last_payment_at", Value(never)),
+            )
+            .filter(
+                ~Q(first_payment_at_or_never=F("actual_first_payment_at_or_never"))
+                | ~Q(last_payment_at_or_never=F("actual_last_payment_at_or_never"))
+                | ~Q(payment_count=F("actual_payment_count"))
+                | ~Q(total_paid=F("actual_total_paid"))
+                | ~Q(total_refunded=F("actual_total_refunded"))
+            )
+        )
+
+    def update_payment_rollups(self) -> int:
+        """Set `Contribution.PAYMENT_ROLLUP_FIELDS` from payments in a single UPDATE, returning the number of rows updated."""
+        return self.update(**self._payment_rollup_expressions())
+
+    def update_effective_revenue_program(self) -> int:
+        """Set `effective_revenue_program` and `effective_stripe_account_id` from the contributions' pages or revenue programs.
+
+        This is for when those fields can't be set by `Contribution.save()`, for instance after updating pages in bulk. It
+        uses a single UPDATE, and returns the number of rows updated.
+        """
+        return self.update(**self._effective_revenue_program_expressions())
+
+    @staticmethod
+    def _effective_revenue_program_expressions() -> dict[str, models.Expression]:
+        from apps.pages.models import DonationPage  # noqa: PLC0415 vs. circular import
+
+        page = DonationPage.objects.filter(pk=OuterRef("donation_page_id"))
+        revenue_program = RevenueProgram.objects.filter(pk=OuterRef("_revenue_program_id"))
+        # Only one of donation_page and _revenue_program is ever set
+        return {
+            "effective_revenue_program_id": Coalesce(
+                Subquery(page.values("revenue_program_id")), "_revenue_program_id"
+            ),
+            "effective_stripe_account_id": NullIf(
+                Coalesce(
+                    Subquery(page.values("revenue_program__payment_provider__stripe_account_id")),
+                    Subquery(revenue_program.values("payment_provider__stripe_account_id")),
+                ),
+                Value(""),
+            ),
+        }
 
     def with_stripe_account(self):
         """Annotate stripe_account_id as "stripe_account".
@@ -178,12 +329,7 @@ class ContributionQuerySet(models.QuerySet):
         stripe_account even though it is the id and not object instead of *_id because Contribution had existing
         property "stripe_account_id."
         """
-        return self.annotate(
-            stripe_account=models.functions.Coalesce(
-                "_revenue_program__payment_provider__stripe_account_id",
-                "donation_page__revenue_program__payment_provider__stripe_account_id",
-            ),
-        )
+        return self.annotate(stripe_account=F("effective_stripe_account_id"))
 
     def having_org_viewable_status(self) -> models.QuerySet:
         """Exclude contributions with statuses that should not be seen by org users from the queryset."""
@@ -203,13 +349,11 @@ class ContributionQuerySet(models.QuerySet):
                 return self.having_org_viewable_status()
             case Roles.ORG_ADMIN:
                 return self.having_org_viewable_status().filter(
-                    models.Q(donation_page__revenue_program__organization=role_assignment.organization)
-                    | models.Q(_revenue_program__organization=role_assignment.organization)
+                    effective_revenue_program__organization=role_assignment.organization
                 )
             case Roles.RP_ADMIN:
                 return self.having_org_viewable_status().filter(
-                    models.Q(donation_page__revenue_program__in=role_assignment.revenue_programs.all())
-                    | models.Q(_revenue_program__in=role_assignment.revenue_programs.all())
+                    effective_revenue_program__in=role_assignment.revenue_programs.all()
                 )
             case _:
                 return self.none()
@@ -229,9 +373,7 @@ class ContributionQuerySet(models.QuerySet):
         )
 
     def exclude_paymentless_canceled(self) -> models.QuerySet[Contribution]:
-        return self.annotate(num_payments=models.Count("payment")).exclude(
-            num_payments=0, status=ContributionStatus.CANCELED
-        )
+        return self.exclude(payment_count=0, status=ContributionStatus.CANCELED)
 
     def exclude_dummy_payment_method_id(self) -> models.QuerySet[Contribution]:
         return self.exclude(provider_payment_method_id=settings.DUMMY_PAYMENT_METHOD_ID)
@@ -286,7 +428,7 @@ class ContributionQuerySet(models.QuerySet):
         b. would happen when a contributor completes first page of checkout and their contribution is flagged, and then they
         cancel the contribution before completing the payment form.
         """
-        return self.annotate(payment_count=Count("payment")).filter(
+        return self.filter(
             Q(
                 Q(status=ContributionStatus.CANCELED, payment_count=0)
                 | Q(
@@ -338,6 +480,17 @@ class Contribution(IndexedTimeStampedModel):
     last_payment_date = models.DateTimeField(null=True)
     contributor = models.ForeignKey("contributions.Contributor", on_delete=models.PROTECT)
 
+    # Rollups of this contribution's payments, so that listing, ordering, and impact calculations don't need to aggregate
+    # over payments. These are kept up to date by the `Payment` post-save and post-delete signal handlers in
+    # `apps.contributions.signals`. They can be checked and repaired with the `sync_contribution_payment_rollups` command.
+    first_payment_at = models.DateTimeField(null=True, blank=True, editable=False)
+    last_payment_at = models.DateTimeField(null=True, blank=True, editable=False)
+    payment_count = models.PositiveIntegerField(default=0, editable=False)
+    total_paid = models.IntegerField(default=0, editable=False, help_text="Sum of payments' net amount paid, in cents")
+    total_refunded = models.IntegerField(
+        default=0, editable=False, help_text="Sum of payments' amount refunded, in cents"
+    )
+
     # Further down, we add a constraint that requires that either donation page or _revenue_program
     # be set but not both. This is to allow importing legacy contribution data that cannot be attributed
     # to a specific donation page. We only allow one or the other because if there is a donation page defined,
@@ -348,6 +501,23 @@ class Contribution(IndexedTimeStampedModel):
     _revenue_program = models.ForeignKey(
         "organizations.RevenueProgram", on_delete=models.PROTECT, null=True, blank=True
     )
+    # These materialize the polymorphic `.revenue_program` (and its Stripe account), so that we can filter on a single
+    # indexed column instead of OR-ing over both of the join paths above. They are set in `.save()` when donation_page or
+    # _revenue_program change, and updated by signal handlers in `apps.contributions.signals` when a page moves to another
+    # revenue program or a revenue program's Stripe account changes.
+    effective_revenue_program = models.ForeignKey(
+        "organizations.RevenueProgram",
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+",
+    )
+    effective_stripe_account_id = models.CharField(max_length=255, null=True, blank=True, editable=False, db_index=True)
+    # Legacy contributions can also be attributed to a revenue program through their metadata. This materializes that
+    # revenue program's ID (which isn't a foreign key, as metadata can name revenue programs that no longer exist), so
+    # that it too can be filtered on with an indexed column. It's set in `.save()` from `contribution_metadata`.
+    metadata_revenue_program_id = models.PositiveIntegerField(null=True, blank=True, editable=False)
 
     bad_actor_score = models.IntegerField(null=True, choices=BadActorScores.choices)
     bad_actor_response = models.JSONField(null=True)
@@ -363,6 +533,8 @@ class Contribution(IndexedTimeStampedModel):
 
     objects = ContributionManager.from_queryset(ContributionQuerySet)()
 
+    PAYMENT_ROLLUP_FIELDS = ("first_payment_at", "last_payment_at", "payment_count", "total_paid", "total_refunded")
+
     ACTIVE_SUBSCRIPTION_STATUSES = ("active",)
 
     CANCELABLE_SUBSCRIPTION_STATUSES = (
@@ -400,6 +572,69 @@ class Contribution(IndexedTimeStampedModel):
                 ),
             ),
         ]
+        indexes = [
+            models.Index(
+                fields=["metadata_revenue_program_id"],
+                name="contribution_metadata_rp_idx",
+                condition=models.Q(metadata_revenue_program_id__isnull=False),
+            ),
+        ]
+
+    @staticmethod
+    def get_metadata_revenue_program_id(metadata: dict | None) -> int | None:
+        """Return the ID of the revenue program named in contribution metadata, if any."""
+        for key in ("revenue_program_id", "revenue_program"):
+            value = (metadata or {}).get(key)
+            if isinstance(value, str) and value.isascii() and value.isdigit():
+                value = int(value)
+            if type(value) is int and 0 < value < 2**31:
+                return value
+        return None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Going via __dict__ so as not to trigger a query if either field is deferred
+        instance._loaded_revenue_program_source = (
+            instance.__dict__.get("donation_page_id"),
+            instance.__dict__.get("_revenue_program_id"),
+        )
+        instance._loaded_contributor_id = instance.__dict__.get("contributor_id")
+        instance._loaded_revenue_rollup_fields = {
+            k: instance.__dict__[k] for k in DailyRevenueRollup.CONTRIBUTION_FIELDS if k in instance.__dict__
+        }
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Save, first setting the effective and metadata revenue program fields from the fields they're derived from."""
+        revenue_program_source = (self.donation_page_id, self._revenue_program_id)
+        update_fields = kwargs.get("update_fields")
+        saving_source = update_fields is None or bool(
+            {"donation_page", "donation_page_id", "_revenue_program", "_revenue_program_id"}.intersection(update_fields)
+        )
+        if saving_source and (
+            self._state.adding or revenue_program_source != getattr(self, "_loaded_revenue_program_source", None)
+        ):
+            self.effective_revenue_program = self.revenue_program
+            self.effective_stripe_account_id = self.stripe_account_id
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "effective_revenue_program", "effective_stripe_account_id"}
+        if update_fields is None or "contribution_metadata" in update_fields:
+            self.metadata_revenue_program_id = self.get_metadata_revenue_program_id(self.contribution_metadata)
+            if update_fields is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "metadata_revenue_program_id"}
+        if update_fields is None and not self._state.adding and not kwargs.get("force_insert"):
+            # Payment rollup fields are only written by `update_payment_rollups`, so that saving a contribution loaded
+            # before a payment changed doesn't overwrite the totals with stale ones
+            deferred = self.get_deferred_fields()
+            kwargs["update_fields"] = {
+                x.attname
+                for x in self._meta.concrete_fields
+                if not x.primary_key and x.attname not in deferred and x.name not in self.PAYMENT_ROLLUP_FIELDS
+            }
+        super().save(*args, **kwargs)
+        if saving_source:
+            self._loaded_revenue_program_source = revenue_program_source
 
     def __str__(self):
         return f"Contribution #{self.id} {self.formatted_amount}, {self.created.strftime('%Y-%m-%d %H:%M:%S')}"
@@ -939,8 +1174,7 @@ class Contribution(IndexedTimeStampedModel):
 
         This is used as a source for serializer fields elsewhere.
         """
-        last_payment = self.payment_set.order_by("-transaction_time").first()
-        return last_payment.transaction_time if last_payment else None
+        return self.last_payment_at
 
     @property
     def paid_fees(self) -> bool:
@@ -1469,12 +1703,28 @@ class Payment(IndexedTimeStampedModel):
     # Ultimately, this field gives us a way to sort by recency.
     transaction_time = models.DateTimeField(db_index=False, blank=False, null=False)
 
+    class Meta:
+        indexes = [
+            # For finding a day's payments when refreshing `DailyRevenueRollup`s
+            models.Index(fields=["transaction_time"], name="payment_transaction_time_idx"),
+        ]
+
     MISSING_EVENT_KW_ERROR_MSG = "Expected a keyword argument called `event`"
     ARG_IS_NOT_EVENT_TYPE_ERROR_MSG = "Expected `event` to be an instance of `StripeEventData`"
     EVENT_IS_UNEXPECTED_TYPE_ERROR_MSG_TEMPLATE = (
         "Expected `event` to be in the following list of event types: {event_types}"
     )
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # So that if either changes, the daily revenue rollup the payment used to count towards can be refreshed
+        instance._loaded_revenue_rollup_source = (
+            instance.__dict__.get("contribution_id"),
+            instance.__dict__.get("transaction_time"),
+        )
+        return instance
+
     def __str__(self):
         return f"Payment {self.id} for contribution {self.contribution.id} and balance transaction {self.stripe_balance_transaction_id}"
 
@@ -1514,18 +1764,25 @@ class Payment(IndexedTimeStampedModel):
     @classmethod
     @ensure_stripe_event(["invoice.payment_succeeded"])
     def get_contribution_and_balance_transaction_for_invoice_payment_succeeded_event(
-        cls, event: StripeEventData
+        cls, event: StripeEventData, payment_intent: stripe.PaymentIntent | None = None
     ) -> (Contribution | None, stripe.BalanceTransaction | None):
-        pi = stripe.PaymentIntent.retrieve(
+        """Get the contribution and balance transaction for an invoice.payment_succeeded event.
+
+        If the caller has already retrieved the event's payment intent (with `invoice` and, optionally,
+        `charges.data.balance_transaction` expanded), it can be passed as `payment_intent` to avoid retrieving it again.
+        """
+        pi = payment_intent or stripe.PaymentIntent.retrieve(
             event.data["object"]["payment_intent"],
             stripe_account=event.account,
             expand=["invoice"],
         )
-        bt = stripe.BalanceTransaction.retrieve(
-            pi.charges.data[0].balance_transaction,
-            stripe_account=event.account,
-            expand=["source.invoice"],
-        )
+        bt = pi.charges.data[0].balance_transaction
+        if not isinstance(bt, stripe.BalanceTransaction):
+            bt = stripe.BalanceTransaction.retrieve(
+                bt,
+                stripe_account=event.account,
+                expand=["source.invoice"],
+            )
         try:
             contribution = Contribution.objects.get(provider_subscription_id=pi.invoice.subscription)
         except Contribution.DoesNotExist:
@@ -1612,13 +1869,276 @@ class Payment(IndexedTimeStampedModel):
 
     @classmethod
     @ensure_stripe_event(["invoice.payment_succeeded"])
-    def from_stripe_invoice_payment_succeeded_event(cls, event: StripeEventData) -> Payment:
+    def from_stripe_invoice_payment_succeeded_event(
+        cls, event: StripeEventData, payment_intent: stripe.PaymentIntent | None = None
+    ) -> Payment:
         (
             contribution,
             balance_transaction,
-        ) = cls.get_contribution_and_balance_transaction_for_invoice_payment_succeeded_event(event=event)
+        ) = cls.get_contribution_and_balance_transaction_for_invoice_payment_succeeded_event(
+            event=event, payment_intent=payment_intent
+        )
         return cls._handle_create_payment(
             contribution=contribution,
             balance_transaction=balance_transaction,
             event_id=event.id,
         )
+
+
+class ExportJob(IndexedTimeStampedModel):
+    """A request by a user to have contributions exported to CSV and emailed to them.
+
+    Rather than the contributions themselves, this captures what's needed to find them again when the export runs: the
+    user, the scope of their role assignment at the time of the request, and the filter query params they used. The job
+    is run asynchronously, and tracks its own status and progress.
+
+    Identical requests (same user, role scope, and filters) made while an export is still pending or running resolve to
+    the same job, rather than queuing another export.
+    """
+
+    ACTIVE_STATUSES = (ExportJobStatus.PENDING, ExportJobStatus.RUNNING)
+
+    user = models.ForeignKey("users.User", on_delete=models.CASCADE, related_name="export_jobs")
+    role_scope = models.JSONField(null=True, blank=True, help_text="The user's role assignment at the time of request")
+    query_params = models.JSONField(default=dict, blank=True)
+    fingerprint = models.CharField(max_length=64, db_index=True, editable=False)
+    show_upgrade_prompt = models.BooleanField(default=False)
+    status = models.CharField(max_length=20, choices=ExportJobStatus.choices, default=ExportJobStatus.PENDING)
+    total_count = models.PositiveIntegerField(null=True, blank=True)
+    exported_count = models.PositiveIntegerField(default=0)
+    file_name = models.CharField(max_length=255, blank=True)
+    error = models.TextField(blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["fingerprint"],
+                condition=models.Q(status__in=[ExportJobStatus.PENDING, ExportJobStatus.RUNNING]),
+                name="unique_active_export_job_fingerprint",
+            )
+        ]
+
+    def __str__(self):
+        return f"ExportJob #{self.id} for {self.user} ({self.status})"
+
+    @staticmethod
+    def get_role_scope(user: User) -> dict | None:
+        if user.is_superuser or not (ra := user.get_role_assignment()):
+            return None
+        return {
+            "role_type": ra.role_type,
+            "organization": ra.organization_id,
+            "revenue_programs": sorted(ra.revenue_programs.values_list("id", flat=True)),
+        }
+
+    @staticmethod
+    def get_fingerprint(user: User, role_scope: dict | None, query_params: dict) -> str:
+        return hashlib.sha256(
+            json.dumps(
+                {"user": user.id, "role_scope": role_scope, "query_params": query_params}, sort_keys=True
+            ).encode()
+        ).hexdigest()
+
+    @classmethod
+    def get_or_create_active(
+        cls, user: User, query_params: dict[str, list[str]], show_upgrade_prompt: bool
+    ) -> tuple[ExportJob, bool]:
+        """Get the user's pending or running export job for these query params, or create one.
+
+        Active jobs that haven't been modified in `settings.EXPORT_JOB_STALE_AFTER` seconds (for instance because a
+        worker died mid-export) are marked as failed, so that they don't block new requests forever.
+        """
+        role_scope = cls.get_role_scope(user)
+        fingerprint = cls.get_fingerprint(user, role_scope, query_params)
+        if stale_count := cls.objects.filter(
+            fingerprint=fingerprint,
+            status__in=cls.ACTIVE_STATUSES,
+            modified__lt=timezone.now() - datetime.timedelta(seconds=settings.EXPORT_JOB_STALE_AFTER),
+        ).update(status=ExportJobStatus.FAILED, error="Timed out", modified=timezone.now()):
+            logger.warning("Marked %s stale export jobs with fingerprint %s as failed", stale_count, fingerprint)
+        try:
+            with transaction.atomic():
+                return (
+                    cls.objects.create(
+                        user=user,
+                        role_scope=role_scope,
+                        query_params=query_params,
+                        fingerprint=fingerprint,
+                        show_upgrade_prompt=show_upgrade_prompt,
+                    ),
+                    True,
+                )
+        except IntegrityError:
+            return cls.objects.get(fingerprint=fingerprint, status__in=cls.ACTIVE_STATUSES), False
+
+    def get_contributions(self) -> models.QuerySet[Contribution]:
+        """Re-evaluate the contributions to export, as the requesting user would see them in the contributions list.
+
+        Raises `ExportJobError` if the user's role assignment has changed since the export was requested.
+        """
+        from apps.contributions.filters import ContributionFilter  # noqa: PLC0415 avoid circular import
+
+        if self.get_role_scope(self.user) != self.role_scope:
+            raise ExportJobError("User's role assignment has changed since the export was requested")
+        if self.user.is_superuser:
+            contributions = Contribution.objects.all()
+        elif ra := self.user.get_role_assignment():
+            contributions = Contribution.objects.filtered_by_role_assignment(ra)
+        else:
+            raise ExportJobError("User has no role assignment")
+        data = QueryDict(mutable=True)
+        for key, values in self.query_params.items():
+            data.setlist(key, values)
+        return ContributionFilter(data, queryset=contributions.with_first_payment_date()).qs
+
+    def update_progress(self, exported_count: int) -> None:
+        self.exported_count = exported_count
+        self.save(update_fields={"exported_count", "modified"})
+
+
+class DailyRevenueRollup(IndexedTimeStampedModel):
+    """Totals of a revenue program's payments on a given day, by contribution interval, status, and currency.
+
+    Payments are attributed to the day of their transaction time (in `settings.TIME_ZONE`), and to their contribution's
+    effective revenue program, interval, status, and currency. This lets dashboard summaries be served without aggregating
+    over payments and contributions.
+
+    Rollups are recomputed for the affected revenue program and days by a task that signal handlers in
+    `apps.contributions.signals` queue once payment and contribution writes commit. They can be rebuilt with the
+    `rebuild_daily_revenue_rollups` command.
+    """
+
+    revenue_program = models.ForeignKey(
+        "organizations.RevenueProgram", on_delete=models.CASCADE, related_name="daily_revenue_rollups"
+    )
+    date = models.DateField()
+    interval = models.CharField(max_length=8, choices=ContributionInterval.choices)
+    status = models.CharField(max_length=10, choices=ContributionStatus.choices, blank=True)
+    currency = models.CharField(max_length=3)
+    payment_count = models.PositiveIntegerField(default=0)
+    refund_count = models.PositiveIntegerField(default=0, help_text="Number of payments with an amount refunded")
+    gross_amount_paid = models.BigIntegerField(default=0, help_text="In cents")
+    net_amount_paid = models.BigIntegerField(default=0, help_text="In cents")
+    amount_refunded = models.BigIntegerField(default=0, help_text="In cents")
+
+    # Fields of the contribution that determine which rollup its payments count towards
+    CONTRIBUTION_FIELDS = ("effective_revenue_program_id", "interval", "status", "currency")
+    AMOUNT_FIELDS = ("payment_count", "refund_count", "gross_amount_paid", "net_amount_paid", "amount_refunded")
+
+    class Meta:
+        ordering = ["revenue_program", "date", "interval", "status", "currency"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["revenue_program", "date", "interval", "status", "currency"],
+                name="unique_daily_revenue_rollup",
+            )
+        ]
+
+    def __str__(self):
+        return f"Daily revenue for revenue program {self.revenue_program_id} on {self.date} ({self.interval}, {self.status})"
+
+    @staticmethod
+    def get_day_range(date: datetime.date) -> tuple[datetime.datetime, datetime.datetime]:
+        """Return the start (inclusive) and end (exclusive) of `date` in the current time zone."""
+        start = timezone.make_aware(datetime.datetime.combine(date, datetime.time.min))
+        return start, timezone.make_aware(
+            datetime.datetime.combine(date + datetime.timedelta(days=1), datetime.time.min)
+        )
+
+    @staticmethod
+    def aggregate_payments(payments: models.QuerySet[Payment]) -> models.QuerySet:
+        """Group payments into rollups, returning dicts of field values for each."""
+        return (
+            payments.order_by()
+            .values(
+                revenue_program_id=F("contribution__effective_revenue_program_id"),
+                date=TruncDate("transaction_time"),
+                interval=F("contribution__interval"),
+                status=Coalesce("contribution__status", Value("")),
+                currency=F("contribution__currency"),
+            )
+            .annotate(
+                total_payment_count=Count("id"),
+                total_refund_count=Count("id", filter=Q(amount_refunded__gt=0)),
+                total_gross_amount_paid=Sum("gross_amount_paid"),
+                total_net_amount_paid=Sum("net_amount_paid"),
+                total_amount_refunded=Sum("amount_refunded"),
+            )
+        )
+
+    @staticmethod
+    def get_refresh_pending_cache_key(revenue_program_id: int, date: datetime.date | None) -> str:
+        return f"daily-revenue-rollup-refresh-pending:{revenue_program_id}:{date or 'all'}"
+
+    @classmethod
+    def schedule_refresh(cls, revenue_program_id: int, dates: Iterable[datetime.date] | None = None) -> None:
+        """Refresh a revenue program's rollups for `dates` (or for all time) in a task, once the current transaction commits.
+
+        Days that already have a refresh queued are skipped, so that a burst of payment writes is rolled up once per day.
+        """
+        transaction.on_commit(partial(cls._enqueue_refresh, revenue_program_id, None if dates is None else set(dates)))
+
+    @classmethod
+    def _enqueue_refresh(cls, revenue_program_id: int, dates: set[datetime.date] | None) -> None:
+        from apps.contributions.tasks import refresh_daily_revenue_rollups  # noqa: PLC0415 vs. circular import
+
+        pending = [
+            x
+            for x in ([None] if dates is None else sorted(dates))
+            if cache.add(
+                cls.get_refresh_pending_cache_key(revenue_program_id, x),
+                True,
+                timeout=settings.DAILY_REVENUE_ROLLUP_REFRESH_PENDING_TTL,
+            )
+        ]
+        if not pending:
+            logger.debug("Daily revenue rollup refresh already queued for revenue program %s", revenue_program_id)
+            return
+        refresh_daily_revenue_rollups.delay(
+            revenue_program_id, None if dates is None else [x.isoformat() for x in pending]
+        )
+
+    @classmethod
+    def refresh(
+        cls, revenue_program_id: int, dates: Iterable[datetime.date] | None = None, since: datetime.date | None = None
+    ) -> int:
+        """Recompute a revenue program's rollups, returning the number written.
+
+        Rollups are recomputed for `dates` if given, otherwise from `since` if given, otherwise for all time. This locks
+        the revenue program row for the rest of the transaction, so that concurrent refreshes for the same revenue program
+        are serialized, and whichever runs last sees every payment committed before it.
+        """
+        if dates is not None and not (dates := set(dates)):
+            return 0
+        with transaction.atomic():
+            list(RevenueProgram.objects.select_for_update().filter(pk=revenue_program_id).values_list("pk"))
+            rollups = cls.objects.filter(revenue_program_id=revenue_program_id)
+            payments = Payment.objects.filter(contribution__effective_revenue_program_id=revenue_program_id)
+            if dates is not None:
+                rollups = rollups.filter(date__in=dates)
+                # Range conditions rather than __date, so that the transaction_time index can be used
+                payments = payments.filter(
+                    reduce(
+                        or_,
+                        (
+                            Q(transaction_time__gte=start, transaction_time__lt=end)
+                            for start, end in map(cls.get_day_range, dates)
+                        ),
+                    )
+                )
+            if since is not None:
+                rollups = rollups.filter(date__gte=since)
+                payments = payments.filter(transaction_time__gte=cls.get_day_range(since)[0])
+            rollups.delete()
+            created = cls.objects.bulk_create(
+                cls(
+                    **{k: row[k] for k in ("revenue_program_id", "date", "interval", "status", "currency")},
+                    **{k: row[f"total_{k}"] for k in cls.AMOUNT_FIELDS},
+                )
+                for row in cls.aggregate_payments(payments)
+            )
+        logger.debug("Refreshed %s daily revenue rollups for revenue program %s", len(created), revenue_program_id)
+        return len(created)
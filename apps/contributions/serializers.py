@@ -66,6 +66,37 @@ class ContributionSerializer(serializers.ModelSerializer):
     provider_customer_url = serializers.SerializerMethodField()
     revenue_program = RevenueProgramSerializer(read_only=True)
 
+    # These are used in view layer db queries so that serializing a page of contributions takes a constant number of
+    # queries. The revenue program is reached through either the donation page or `_revenue_program`, and
+    # `RevenueProgramSerializer` needs its organization and default page styles. `stripe_account_id` (used by
+    # `is_cancelable`) needs its payment provider.
+    _SELECT_RELATED = (
+        "contributor",
+        "donation_page__revenue_program__default_donation_page__styles",
+        "donation_page__revenue_program__organization",
+        "donation_page__revenue_program__payment_provider",
+        "_revenue_program__default_donation_page__styles",
+        "_revenue_program__organization",
+        "_revenue_program__payment_provider",
+    )
+    _ONLIES = (
+        "amount",
+        "bad_actor_score",
+        "contributor",
+        "created",
+        "currency",
+        "donation_page__revenue_program",
+        "_revenue_program",
+        "flagged_date",
+        "interval",
+        "last_payment_date",
+        "payment_provider_used",
+        "provider_customer_id",
+        "provider_payment_id",
+        "provider_subscription_id",
+        "status",
+    )
+
     def get_auto_accepted_on(self, obj):
         """Note.
 
@@ -736,6 +767,15 @@ class PortalContributionBaseSerializer(serializers.ModelSerializer):
     next_payment_date = serializers.DateTimeField(read_only=True, allow_null=True)
     revenue_program = serializers.PrimaryKeyRelatedField(read_only=True)
 
+    # These are used in view layer db queries so that serializing contributions takes a constant number of queries.
+    # `stripe_account_id` (used to retrieve the subscription and payment method) needs the revenue program's payment
+    # provider.
+    _SELECT_RELATED = (
+        "donation_page__revenue_program__payment_provider",
+        "_revenue_program__payment_provider",
+    )
+    _PREFETCH_RELATED = ()
+
     class Meta:
         model = Contribution
         fields = PORTAL_CONTRIBUTION_BASE_SERIALIZER_FIELDS
@@ -832,6 +872,8 @@ class PortalContributionDetailSerializer(PortalContributionBaseSerializer):
         write_only=True,
     )
 
+    _PREFETCH_RELATED = ("payment_set",)
+
     class Meta:
         model = Contribution
         fields = [
@@ -886,12 +928,60 @@ class PortalContributionDetailSerializer(PortalContributionBaseSerializer):
 
 
 class PortalContributionListSerializer(PortalContributionBaseSerializer):
+    # Unlike the detail serializer, this is read-only, so we can also limit fields loaded.
+    _ONLIES = (
+        "amount",
+        "contribution_metadata",
+        "created",
+        "donation_page__revenue_program",
+        "_revenue_program",
+        "interval",
+        "last_payment_at",
+        "provider_payment_method_details",
+        "provider_payment_method_id",
+        "provider_subscription_id",
+        "status",
+    )
+
     class Meta:
         model = Contribution
         fields = PORTAL_CONTRIBUTION_BASE_SERIALIZER_FIELDS
         read_only_fields = PORTAL_CONTRIBUTION_BASE_SERIALIZER_FIELDS
 
 
+class RevenueSummaryQuerySerializer(serializers.Serializer):
+    """Validates query params for the contributions revenue summary endpoint."""
+
+    DEFAULT_DAYS = 30
+
+    revenue_program = serializers.IntegerField(required=False)
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    granularity = serializers.ChoiceField(choices=["day", "month"], default="day")
+
+    def validate(self, data):
+        end = data.setdefault("end", timezone.localdate())
+        start = data.setdefault("start", end - timedelta(days=self.DEFAULT_DAYS - 1))
+        if start > end:
+            raise serializers.ValidationError({"start": "Start must not be after end"})
+        return data
+
+
+class RevenueSummarySerializer(serializers.Serializer):
+    """Serializes a row of daily revenue rollups summed over a day or month. Amounts are in cents."""
+
+    period = serializers.DateField()
+    revenue_program = serializers.IntegerField()
+    interval = serializers.CharField()
+    status = serializers.CharField()
+    currency = serializers.CharField()
+    payment_count = serializers.IntegerField(source="total_payment_count")
+    refund_count = serializers.IntegerField(source="total_refund_count")
+    gross_amount_paid = serializers.IntegerField(source="total_gross_amount_paid")
+    net_amount_paid = serializers.IntegerField(source="total_net_amount_paid")
+    amount_refunded = serializers.IntegerField(source="total_amount_refunded")
+
+
 class SwitchboardContributionRevenueProgramSourceValues(str, Enum):
     VIA_PAGE = "via_page"
     DIRECT = "direct"
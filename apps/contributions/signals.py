@@ -0,0 +1,180 @@
+import datetime
+import logging
+from collections import defaultdict
+from collections.abc import Iterable
+
+from django.conf import settings
+from django.db import models
+from django.db.models.functions import TruncDate
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.common.cache import invalidate_now_and_on_commit
+from apps.contributions.models import Contribution, Contributor, DailyRevenueRollup, Payment
+from apps.organizations.models import PaymentProvider, RevenueProgram
+from apps.pages.models import DonationPage
+
+
+logger = logging.getLogger(f"{settings.DEFAULT_LOGGER}.{__name__}")
+
+
+@receiver(post_save, sender=Payment)
+@receiver(post_delete, sender=Payment)
+def update_contribution_payment_rollups(sender, instance: Payment, **kwargs) -> None:
+    """Keep the payment rollup fields on a payment's contribution up to date.
+
+    This runs in the same transaction as the payment write, so the rollups can't drift from the payments that webhooks,
+    the Stripe importer, or the switchboard API create and change.
+    """
+    logger.debug("Updating payment rollups for contribution %s", instance.contribution_id)
+    Contribution.objects.filter(pk=instance.contribution_id).update_payment_rollups()
+    # Keep an in-memory contribution that the caller might go on to use (for instance, to serialize) in sync too
+    if Payment.contribution.is_cached(instance):
+        instance.contribution.refresh_from_db(fields=Contribution.PAYMENT_ROLLUP_FIELDS)
+
+
+def _invalidate_contributor_impact(contributor_ids: Iterable[int | None]) -> None:
+    invalidate_now_and_on_commit(Contributor.invalidate_cached_impact, set(contributor_ids))
+
+
+@receiver(post_save, sender=Payment)
+@receiver(post_delete, sender=Payment)
+def invalidate_contributor_impact_for_payment(sender, instance: Payment, **kwargs) -> None:
+    """Forget the cached impact of a payment's contributor, since the payment changes their contribution's totals."""
+    if Payment.contribution.is_cached(instance):
+        contributor_id = instance.contribution.contributor_id
+    else:
+        contributor_id = (
+            Contribution.objects.filter(pk=instance.contribution_id).values_list("contributor_id", flat=True).first()
+        )
+    _invalidate_contributor_impact([contributor_id])
+
+
+@receiver(post_save, sender=Contribution)
+@receiver(post_delete, sender=Contribution)
+def invalidate_contributor_impact_for_contribution(sender, instance: Contribution, **kwargs) -> None:
+    """Forget the cached impact of a contribution's contributor (and its previous contributor, if that changed).
+
+    This is cheaper than working out whether the save changed anything that impact depends on (status, revenue program,
+    or payment totals).
+    """
+    _invalidate_contributor_impact([instance.contributor_id, getattr(instance, "_loaded_contributor_id", None)])
+    instance._loaded_contributor_id = instance.contributor_id
+
+
+def _schedule_daily_revenue_rollups_refresh(days: Iterable[tuple[int | None, datetime.date]]) -> None:
+    """Queue a refresh of daily revenue rollups for each of (revenue program ID, date), once the transaction commits.
+
+    Refreshing is deferred so that payment writes don't lock the revenue program, and wait on re-aggregating its rollups,
+    in the webhook or import transaction.
+    """
+    dates_by_revenue_program = defaultdict(set)
+    for revenue_program_id, date in days:
+        if revenue_program_id is not None:
+            dates_by_revenue_program[revenue_program_id].add(date)
+    for revenue_program_id, dates in dates_by_revenue_program.items():
+        DailyRevenueRollup.schedule_refresh(revenue_program_id, dates)
+
+
+@receiver(post_save, sender=Payment)
+@receiver(post_delete, sender=Payment)
+def update_daily_revenue_rollups_for_payment(sender, instance: Payment, **kwargs) -> None:
+    """Refresh the daily revenue rollup a payment counts towards, and the one it used to if it moved."""
+    sources = {(instance.contribution_id, instance.transaction_time)}
+    if (loaded := getattr(instance, "_loaded_revenue_rollup_source", None)) and None not in loaded:
+        sources.add(loaded)
+    revenue_program_ids = dict(
+        Contribution.objects.filter(pk__in={x[0] for x in sources}).values_list("pk", "effective_revenue_program_id")
+    )
+    _schedule_daily_revenue_rollups_refresh(
+        (revenue_program_ids.get(contribution_id), timezone.localdate(transaction_time))
+        for contribution_id, transaction_time in sources
+    )
+    instance._loaded_revenue_rollup_source = (instance.contribution_id, instance.transaction_time)
+
+
+@receiver(post_save, sender=Contribution)
+def update_daily_revenue_rollups_for_contribution(sender, instance: Contribution, created: bool, **kwargs) -> None:
+    """Refresh the daily revenue rollups for a contribution's payments if it changed which rollups they count towards."""
+    loaded = getattr(instance, "_loaded_revenue_rollup_fields", {})
+    current = {k: instance.__dict__[k] for k in DailyRevenueRollup.CONTRIBUTION_FIELDS if k in instance.__dict__}
+    instance._loaded_revenue_rollup_fields = current
+    if created or all(k in loaded and loaded[k] == v for k, v in current.items()):
+        return
+    dates = set(
+        Payment.objects.filter(contribution=instance)
+        .annotate(date=TruncDate("transaction_time"))
+        .values_list("date", flat=True)
+        .distinct()
+    )
+    logger.debug("Refreshing daily revenue rollups on %s days for contribution %s", len(dates), instance.id)
+    _schedule_daily_revenue_rollups_refresh(
+        (revenue_program_id, date)
+        for revenue_program_id in {loaded.get("effective_revenue_program_id"), instance.effective_revenue_program_id}
+        for date in dates
+    )
+
+
+def _saved_any(update_fields: frozenset[str] | None, *fields: str) -> bool:
+    return update_fields is None or bool(update_fields.intersection(fields))
+
+
+def _sync_effective_stripe_account_id(
+    contributions: models.QuerySet[Contribution], stripe_account_id: str | None
+) -> None:
+    stripe_account_id = stripe_account_id or None
+    if stripe_account_id:
+        stale = contributions.exclude(effective_stripe_account_id=stripe_account_id)
+    else:
+        stale = contributions.filter(effective_stripe_account_id__isnull=False)
+    if updated := stale.update(effective_stripe_account_id=stripe_account_id):
+        logger.info("Updated effective Stripe account ID to %s for %s contributions", stripe_account_id, updated)
+
+
+@receiver(post_save, sender=RevenueProgram)
+def update_contributions_for_revenue_program_payment_provider(
+    sender, instance: RevenueProgram, created: bool, update_fields: frozenset[str] | None = None, **kwargs
+) -> None:
+    """Keep `Contribution.effective_stripe_account_id` in sync when a revenue program's payment provider changes."""
+    if created or not _saved_any(update_fields, "payment_provider", "payment_provider_id"):
+        return
+    _sync_effective_stripe_account_id(
+        Contribution.objects.filter(effective_revenue_program=instance),
+        instance.payment_provider.stripe_account_id if instance.payment_provider else None,
+    )
+
+
+@receiver(post_save, sender=PaymentProvider)
+def update_contributions_for_payment_provider_stripe_account(
+    sender, instance: PaymentProvider, created: bool, update_fields: frozenset[str] | None = None, **kwargs
+) -> None:
+    """Keep `Contribution.effective_stripe_account_id` in sync when a payment provider's Stripe account changes."""
+    if created or not _saved_any(update_fields, "stripe_account_id"):
+        return
+    _sync_effective_stripe_account_id(
+        Contribution.objects.filter(effective_revenue_program__payment_provider=instance), instance.stripe_account_id
+    )
+
+
+@receiver(post_save, sender=DonationPage)
+def update_contributions_for_page_revenue_program(
+    sender, instance: DonationPage, created: bool, update_fields: frozenset[str] | None = None, **kwargs
+) -> None:
+    """Keep `Contribution.effective_revenue_program` in sync when a page moves to another revenue program."""
+    if created or not _saved_any(update_fields, "revenue_program", "revenue_program_id"):
+        return
+    stale = Contribution.objects.filter(donation_page=instance).exclude(
+        effective_revenue_program_id=instance.revenue_program_id
+    )
+    previous_revenue_program_ids = set(
+        stale.filter(payment_count__gt=0).values_list("effective_revenue_program_id", flat=True).distinct()
+    )
+    contributor_ids = set(stale.values_list("contributor_id", flat=True).distinct())
+    if updated := stale.update_effective_revenue_program():
+        logger.info("Updated effective revenue program for %s contributions to page %s", updated, instance.id)
+        _invalidate_contributor_impact(contributor_ids)
+    if previous_revenue_program_ids:
+        # The moved contributions' payments could be on any day, so rebuild the affected revenue programs' rollups in full
+        for revenue_program_id in {*previous_revenue_program_ids, instance.revenue_program_id} - {None}:
+            DailyRevenueRollup.schedule_refresh(revenue_program_id)
@@ -2,21 +2,24 @@ import datetime
 import itertools
 import json
 import logging
+import time
 from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import nullcontext
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from functools import cached_property
 from typing import Any, Literal
 from urllib.parse import urlparse
 
 from django.conf import settings
 from django.core.serializers.json import DjangoJSONEncoder
-from django.db import IntegrityError, transaction
+from django.db import IntegrityError, connection, transaction
 
 import backoff
 import sentry_sdk
 import stripe
 import tldextract
+from celery import chain
 from django_redis import get_redis_connection
 from pydantic import BaseModel, ValidationError
 from redis import Redis
@@ -40,6 +43,7 @@ from apps.contributions.typings import (
     STRIPE_PAYMENT_METADATA_SCHEMA_VERSIONS,
     validate_stripe_metadata,
 )
+from apps.contributions.webhooks import get_processed_stripe_event_ids
 from apps.organizations.models import PaymentProvider, RevenueProgram
 from apps.pages.models import DonationPage
 
@@ -1235,7 +1239,7 @@ class StripeEventProcessor:
 
     def process(self) -> None:
         # vs. circular import
-        from .tasks import process_stripe_webhook_task  # noqa: PLC0415
+        from .tasks import enqueue_stripe_webhook, process_stripe_webhook_task  # noqa: PLC0415
 
         if not (event := self.get_event()):
             logger.warning("No event found for event id %s", self.event_id)
@@ -1244,6 +1248,163 @@ class StripeEventProcessor:
             logger.warning("Event type %s is not supported", event.type)
             return
         if self.async_mode:
-            process_stripe_webhook_task.delay(raw_event_data=event)
+            enqueue_stripe_webhook(event)
         else:
             process_stripe_webhook_task(raw_event_data=event)
+
+
+@dataclass
+class StripeEventReplayReport:
+    """Summary of a `StripeEventReplayer.replay` run."""
+
+    listed: int = 0
+    skipped_as_processed: int = 0
+    # In async mode, this is the number of events sent to Celery rather than the number processed.
+    replayed: int = 0
+    failed_event_ids: list[str] = field(default_factory=list)
+    duration_seconds: float = 0.0
+
+    @property
+    def events_per_second(self) -> float:
+        return self.replayed / self.duration_seconds if self.duration_seconds else 0.0
+
+
+@dataclass(frozen=True)
+class StripeEventReplayer:
+    """Class for replaying Stripe events for an account over a time window using our webhook handler.
+
+    This is meant for recovering after an outage. Events that were already processed are skipped (unless
+    `include_processed` is set). The rest are replayed in chronological order per Stripe object, so for instance a
+    subscription's events are never handled out of order, while events for different objects are handled concurrently.
+
+    In sync mode, events are processed in this process by up to `concurrency` threads, and the report includes failures.
+    If an event fails, later events for the same object are not processed and are reported as failed too. In async mode,
+    each object's events are sent to Celery as a chain on the bulk webhook queue, so that replays don't compete with
+    time-sensitive live webhooks, and concurrency is bounded by that queue's worker pool.
+    """
+
+    stripe_account_id: str
+    from_date: datetime.datetime | None = None
+    to_date: datetime.datetime | None = None
+    event_types: list[str] | None = None
+    concurrency: int = 4
+    async_mode: bool = False
+    include_processed: bool = False
+
+    def __post_init__(self) -> None:
+        if unsupported := set(self.event_types or []).difference(settings.STRIPE_WEBHOOK_EVENTS_CONTRIBUTIONS):
+            raise ValueError(f"Unsupported event types: {', '.join(sorted(unsupported))}")
+        if self.concurrency < 1:
+            raise ValueError("Concurrency must be at least 1")
+
+    @property
+    def list_kwargs(self) -> dict:
+        kwargs = {"types": self.event_types or settings.STRIPE_WEBHOOK_EVENTS_CONTRIBUTIONS}
+        if created := {
+            k: int(v.timestamp()) for k, v in {"gte": self.from_date, "lte": self.to_date}.items() if v is not None
+        }:
+            kwargs["created"] = created
+        return kwargs
+
+    @backoff.on_exception(backoff.expo, stripe.error.RateLimitError, **STRIPE_API_BACKOFF_ARGS)
+    def list_events_page(self, starting_after: str | None = None) -> stripe.ListObject:
+        kwargs = {"starting_after": starting_after} if starting_after else {}
+        return stripe.Event.list(
+            stripe_account=self.stripe_account_id, limit=MAX_STRIPE_RESPONSE_LIMIT, **self.list_kwargs, **kwargs
+        )
+
+    def list_events(self) -> Iterable[stripe.Event]:
+        """List events page by page, so that each page is retried if rate limited, and not just the first one."""
+        logger.info("Listing events for account %s with params %s", self.stripe_account_id, self.list_kwargs)
+        starting_after = None
+        while True:
+            page = self.list_events_page(starting_after)
+            yield from page.data
+            if not (page.has_more and page.data):
+                return
+            starting_after = page.data[-1]["id"]
+
+    @staticmethod
+    def get_object_key(event: stripe.Event) -> str:
+        """Key identifying the Stripe object an event is about.
+
+        invoice.upcoming events have no object ID, so we fall back to their subscription, and failing that, the event itself.
+        """
+        obj = event["data"]["object"]
+        return obj.get("id") or obj.get("subscription") or event["id"]
+
+    def group_events_by_object(self, events: list[stripe.Event]) -> list[list[stripe.Event]]:
+        """Group events by Stripe object, with each group in chronological order."""
+        groups = {}
+        # Stripe lists events newest first. Reversing before the (stable) sort keeps events that share a `created`
+        # timestamp in the order Stripe created them.
+        oldest_first = events[::-1]
+        for event in sorted(oldest_first, key=lambda x: x["created"]):
+            groups.setdefault(self.get_object_key(event), []).append(event)
+        return list(groups.values())
+
+    @staticmethod
+    def process_event_group(events: list[stripe.Event]) -> tuple[int, list[str]]:
+        """Process a group of events in order, returning the number processed and the IDs of those that failed."""
+        from .tasks import process_stripe_webhook_task  # noqa: PLC0415 vs. circular import
+
+        try:
+            for i, event in enumerate(events):
+                try:
+                    process_stripe_webhook_task(raw_event_data=event)
+                except Exception:  # we want to report any failure and carry on with other objects
+                    logger.exception("Failed to replay event %s", event["id"])
+                    return i, [x["id"] for x in events[i:]]
+            return len(events), []
+        finally:
+            # This runs in its own thread, which has its own DB connection
+            connection.close()
+
+    def enqueue_event_group(self, events: list[stripe.Event]) -> None:
+        from .tasks import process_stripe_webhook_task  # noqa: PLC0415 vs. circular import
+
+        route = settings.STRIPE_WEBHOOK_ROUTE_BULK
+        chain(
+            *[
+                process_stripe_webhook_task.si(raw_event_data=event).set(
+                    queue=route["queue"], priority=route["priority"]
+                )
+                for event in events
+            ]
+        ).apply_async()
+
+    def replay(self) -> StripeEventReplayReport:
+        start = time.monotonic()
+        events = list(self.list_events())
+        report = StripeEventReplayReport(listed=len(events))
+        if not self.include_processed:
+            processed = get_processed_stripe_event_ids(x["id"] for x in events)
+            events = [x for x in events if x["id"] not in processed]
+            report.skipped_as_processed = len(processed)
+        groups = self.group_events_by_object(events)
+        logger.info(
+            "Replaying %s events for %s objects for account %s (%s skipped as already processed)",
+            len(events),
+            len(groups),
+            self.stripe_account_id,
+            report.skipped_as_processed,
+        )
+        if self.async_mode:
+            for group in groups:
+                self.enqueue_event_group(group)
+            report.replayed = len(events)
+        else:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                for processed_count, failed_ids in executor.map(self.process_event_group, groups):
+                    report.replayed += processed_count
+                    report.failed_event_ids.extend(failed_ids)
+        report.duration_seconds = time.monotonic() - start
+        logger.info(
+            "Replayed %s events for account %s in %.1f seconds (%.1f events/second); %s failed",
+            report.replayed,
+            self.stripe_account_id,
+            report.duration_seconds,
+            report.events_per_second,
+            len(report.failed_event_ids),
+        )
+        return report
@@ -1,8 +1,9 @@
 import time
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from types import TracebackType
 
 from django.conf import settings
+from django.core.cache import cache
 from django.db.models import Q
 from django.db.utils import OperationalError
 from django.template.loader import render_to_string
@@ -16,25 +17,45 @@ from celery.utils.log import get_task_logger
 from requests.exceptions import RequestException
 from stripe.error import APIConnectionError, RateLimitError
 
-from apps.contributions.choices import QuarantineStatus
-from apps.contributions.models import Contribution, ContributionStatus
+from apps.common import metrics
+from apps.contributions.choices import ExportJobStatus, QuarantineStatus
+from apps.contributions.models import (
+    Contribution,
+    ContributionStatus,
+    DailyRevenueRollup,
+    ExportJob,
+    ExportJobError,
+)
 from apps.contributions.payment_managers import PaymentProviderError
 from apps.contributions.stripe_import import StripeTransactionsImporter
 from apps.contributions.typings import StripeEventData
-from apps.contributions.utils import export_contributions_to_csv
-from apps.contributions.webhooks import StripeWebhookProcessor
-from apps.emails.tasks import send_templated_email_with_attachment
+from apps.contributions.utils import (
+    export_contributions_to_csv_file,
+    get_contribution_export_download_url,
+    get_contribution_export_storage,
+)
+from apps.contributions.webhooks import StripeWebhookProcessor, record_stripe_event_processed
+from apps.emails.tasks import send_templated_email
 from apps.organizations.models import RevenueProgram
 
 
 logger = get_task_logger(f"{settings.DEFAULT_LOGGER}.{__name__}")
 
 
-def ping_healthchecks(check_name, healthcheck_url):
-    """Attempt to ping a healthchecks.io to enable monitoring of tasks."""
+def ping_healthchecks(check_name, healthcheck_url, min_interval_seconds: int | None = None):
+    """Attempt to ping a healthchecks.io to enable monitoring of tasks.
+
+    If `min_interval_seconds` is given, the check is pinged at most once per that interval (across processes, via the
+    cache), which is what we want for tasks that run far more often than their healthcheck needs to hear about them.
+    """
     if not healthcheck_url:
         logger.warning("URL for %s not available in this environment", check_name)
         return
+    if min_interval_seconds and not cache.add(f"healthcheck-pinged-{check_name}", True, timeout=min_interval_seconds):
+        logger.debug(
+            "Skipping %s healthcheck ping as it was pinged in the last %s seconds", check_name, min_interval_seconds
+        )
+        return
     for attempt in range(1, 4):
         try:
             requests.get(healthcheck_url, timeout=1)
@@ -96,43 +117,111 @@ def auto_accept_flagged_contributions():
     return successful_captures, failed_captures
 
 
-@shared_task(bind=True, autoretry_for=(RateLimitError,), retry_backoff=True, retry_kwargs={"max_retries": 3})
+@shared_task
+def run_contribution_export_job(export_job_id: int) -> None:
+    """Export an export job's contributions to CSV, and email the requesting user a link to download it.
+
+    The contributions are found by re-evaluating the job's filters within the requesting user's role scope, rather than
+    being passed to the task, so that task arguments stay small regardless of export size. The gzipped CSV is streamed to
+    file storage rather than attached, so that neither worker memory nor email size limit the size of the export.
+    """
+    job = ExportJob.objects.select_related("user").get(pk=export_job_id)
+    if job.status != ExportJobStatus.PENDING:
+        logger.info("Export job %s has status %s, so not running it", job.id, job.status)
+        return
+    job.status = ExportJobStatus.RUNNING
+    job.started_at = timezone.now()
+    job.save(update_fields={"status", "started_at", "modified"})
+    try:
+        contributions = job.get_contributions()
+        job.total_count = contributions.count()
+        job.save(update_fields={"total_count", "modified"})
+        job.file_name = export_contributions_to_csv_file(contributions, on_progress=job.update_progress)
+        _email_contribution_export(job.user.email, job.file_name, job.show_upgrade_prompt)
+    except ExportJobError as exc:
+        logger.warning("Export job %s failed: %s", job.id, exc)
+        _finish_export_job(job, ExportJobStatus.FAILED, error=str(exc))
+    except Exception as exc:
+        _finish_export_job(job, ExportJobStatus.FAILED, error=repr(exc))
+        raise
+    else:
+        logger.info("Export job %s exported %s contributions", job.id, job.exported_count)
+        _finish_export_job(job, ExportJobStatus.SUCCEEDED)
+
+
+@shared_task
 def email_contribution_csv_export_to_user(
-    self, contribution_ids: list[int], to_email: str, show_upgrade_prompt: bool
+    contribution_ids: list[int], to_email: str, show_upgrade_prompt: bool
 ) -> None:
-    """Email a CSV containing data about a set of contributions.
+    """Email a link to download a CSV of the contributions to `to_email`.
 
-    Note that this task is intentionally "dumb". It implicitly assumes that it is safe to send data about contribution ids
-    to person at `to_email`. Permissions-related restrictions therefore need to be handled in the calling context.
+    Deprecated in favor of `run_contribution_export_job`, and to be removed in the next release. This is only kept so that
+    tasks queued before upgrading still run. It assumes that the caller checked that `to_email` may see the contributions.
     """
+    logger.warning("`email_contribution_csv_export_to_user` is deprecated, use `run_contribution_export_job` instead")
     contributions = Contribution.objects.filter(id__in=contribution_ids)
-    if diff := set(contribution_ids).difference(set(contributions.values_list("id", flat=True))):
-        logger.warning(
-            "`email_contribution_csv_export_to_user` was unable to locate %s of %s requested contributions. The following"
-            " IDs could not be found: %s",
-            len(diff),
-            len(contribution_ids),
-            ", ".join(str(x) for x in diff),
-        )
-    send_templated_email_with_attachment(
+    _email_contribution_export(to_email, export_contributions_to_csv_file(contributions), show_upgrade_prompt)
+
+
+def _email_contribution_export(to_email: str, file_name: str, show_upgrade_prompt: bool) -> None:
+    send_templated_email(
         to=to_email,
         subject="Check out your Contributions",
         message_as_text=render_to_string(
             "nrh-contribution-csv-email-body.txt",
             (
                 context := {
+                    "download_url": get_contribution_export_download_url(file_name),
+                    "link_expiry_hours": settings.CONTRIBUTION_EXPORT_LINK_EXPIRY,
                     "logo_url": f"{settings.SITE_URL}/static/nre_logo_black_yellow.png",
                     "show_upgrade_prompt": show_upgrade_prompt,
                 }
             ),
         ),
         message_as_html=render_to_string("nrh-contribution-csv-email-body.html", context),
-        attachment=export_contributions_to_csv(contributions),
-        content_type="text/csv",
-        filename="contributions.csv",
     )
 
 
+def _finish_export_job(job: ExportJob, job_status: ExportJobStatus, error: str = "") -> None:
+    job.status = job_status
+    job.error = error
+    job.finished_at = timezone.now()
+    job.save(update_fields={"status", "error", "file_name", "finished_at", "modified"})
+
+
+@shared_task
+def delete_expired_contribution_exports() -> None:
+    """Delete stored contribution exports whose download links have expired.
+
+    Exports hold contributors' personal data, so they're only kept for as long as they can be downloaded. This is meant to
+    be scheduled periodically with django-celery-beat.
+    """
+    expired = ExportJob.objects.exclude(file_name="").filter(
+        finished_at__lt=timezone.now() - timedelta(hours=settings.CONTRIBUTION_EXPORT_LINK_EXPIRY)
+    )
+    storage = get_contribution_export_storage()
+    deleted = []
+    for job_id, file_name in expired.values_list("id", "file_name").iterator():
+        storage.delete(file_name)
+        deleted.append(job_id)
+    ExportJob.objects.filter(id__in=deleted).update(file_name="", modified=timezone.now())
+    logger.info("Deleted %s expired contribution exports", len(deleted))
+
+
+@shared_task
+def refresh_daily_revenue_rollups(revenue_program_id: int, dates: list[str] | None = None) -> None:
+    """Refresh a revenue program's daily revenue rollups for `dates` (as ISO dates), or for all time if not given."""
+    parsed = None if dates is None else [date.fromisoformat(x) for x in dates]
+    # Cleared before refreshing, so that payments committed from here on queue another refresh rather than being missed
+    cache.delete_many(
+        [
+            DailyRevenueRollup.get_refresh_pending_cache_key(revenue_program_id, x)
+            for x in ([None] if parsed is None else parsed)
+        ]
+    )
+    DailyRevenueRollup.refresh(revenue_program_id, parsed)
+
+
 @shared_task(bind=True, autoretry_for=(RateLimitError,), retry_backoff=True, retry_kwargs={"max_retries": 3})
 def task_verify_apple_domain(self, revenue_program_slug: str):
     logger.info("[task_verify_apple_domain] called with revenue_program_slug %s.", revenue_program_slug)
@@ -164,8 +253,19 @@ def on_process_stripe_webhook_task_failure(self, task: Task, exc: Exception, tra
     retry_kwargs={"max_retries": 3},
     link_error=on_process_stripe_webhook_task_failure.s(),
 )
-def process_stripe_webhook_task(self, raw_event_data: dict) -> None:
+def process_stripe_webhook_task(self, raw_event_data: dict, enqueued_at: float | None = None) -> None:
     logger.info("Processing Stripe webhook event with ID %s", raw_event_data["id"])
+    metric_tags = {"event_type": raw_event_data.get("type")}
+    if enqueued_at is not None:
+        waited = time.time() - enqueued_at
+        logger.info(
+            "Stripe webhook event %s of type %s waited %.3f seconds on queue %s",
+            raw_event_data["id"],
+            raw_event_data.get("type"),
+            waited,
+            (self.request.delivery_info or {}).get("routing_key"),
+        )
+        metrics.timing("stripe_webhook.queue_wait", waited * 1000, tags=metric_tags)
     processor = StripeWebhookProcessor(
         event=(
             event := StripeEventData(
@@ -182,16 +282,45 @@ def process_stripe_webhook_task(self, raw_event_data: dict) -> None:
             )
         )
     )
+    outcome = "error"
     try:
-        processor.process()
+        with metrics.measure() as measurement:
+            processor.process()
+        outcome = "processed"
     except Contribution.DoesNotExist:
         # there's an entire class of customer subscriptions for which we do not expect to have a Contribution object.
         # Specifically, we expect this to be the case for import legacy recurring contributions, which may have a future
-        # first/next(in NRE platform) payment date.
-        # TODO @BW: Add some sort of analytics / telemetry to track how often this happens
-        # DEV-4151
+        # first/next(in NRE platform) payment date. The outcome metric lets us track how often this happens.
+        outcome = "contribution_not_found"
         logger.info("Could not find contribution. Here's the event data: %s", event, exc_info=True)
-    ping_healthchecks("process_stripe_webhook_task", settings.HEALTHCHECK_URL_PROCESS_STRIPE_WEBHOOK_TASK)
+    else:
+        record_stripe_event_processed(event.id)
+    finally:
+        metrics.timing("stripe_webhook.handler", measurement.duration_ms, tags=metric_tags)
+        metrics.histogram("stripe_webhook.stripe_requests", measurement.stripe_requests, tags=metric_tags)
+        metrics.histogram("stripe_webhook.db_queries", measurement.db_queries, tags=metric_tags)
+        metrics.incr("stripe_webhook.outcome", tags={**metric_tags, "outcome": outcome})
+    ping_healthchecks(
+        "process_stripe_webhook_task",
+        settings.HEALTHCHECK_URL_PROCESS_STRIPE_WEBHOOK_TASK,
+        min_interval_seconds=settings.HEALTHCHECK_PROCESS_STRIPE_WEBHOOK_TASK_MIN_INTERVAL,
+    )
+
+
+def enqueue_stripe_webhook(raw_event_data: dict) -> None:
+    """Send a Stripe webhook event to `process_stripe_webhook_task` on the queue and with the priority configured for its type.
+
+    See `settings.STRIPE_WEBHOOK_EVENT_ROUTES`.
+    """
+    route = settings.STRIPE_WEBHOOK_EVENT_ROUTES.get(raw_event_data["type"], settings.STRIPE_WEBHOOK_ROUTE_BULK)
+    logger.debug(
+        "Routing Stripe webhook event %s of type %s to %s", raw_event_data["id"], raw_event_data["type"], route
+    )
+    process_stripe_webhook_task.apply_async(
+        kwargs={"raw_event_data": raw_event_data, "enqueued_at": time.time()},
+        queue=route["queue"],
+        priority=route["priority"],
+    )
 
 
 @shared_task(bind=True)
@@ -8,3 +8,12 @@ import pytest
 def invoice_payment_succeeded_for_recurring_payment_event():
     with Path("apps/contributions/tests/fixtures/invoice-payment-succeeded-for-recurring-event.json").open() as f:
         return json.load(f)
+
+
+@pytest.fixture
+def _in_memory_storage(settings):
+    """Use in-memory file storage, so that files saved in tests don't end up on disk."""
+    settings.STORAGES = settings.STORAGES | {
+        "default": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+        "contribution_exports": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+    }
@@ -1,9 +1,11 @@
+from django.db import connection
+
 import pytest
 
 from apps.contributions.choices import ContributionInterval, ContributionStatus
-from apps.contributions.filters import PortalContributionFilter
-from apps.contributions.models import Contribution
-from apps.contributions.tests.factories import ContributionFactory
+from apps.contributions.filters import ContributionFilter, PortalContributionFilter
+from apps.contributions.models import Contribution, Contributor
+from apps.contributions.tests.factories import ContributionFactory, ContributorFactory
 from apps.organizations.tests.factories import RevenueProgramFactory
 
 
@@ -91,3 +93,32 @@ class TestPortalContributionFilter:
         filtered = filter_.filter_queryset(request, unfiltered)
         assert filtered.count() == 2
         assert set(filtered.values_list("id", flat=True)) == {paid.id, by_metadata.id}
+
+    def test_filter_queryset_by_rp_matches_contribution_metadata(self, contributions, filter_, mocker):
+        paid, by_rp, _, other = contributions
+        other.contribution_metadata = {"revenue_program_id": str(paid.revenue_program.id)}
+        other.status = ContributionStatus.PAID
+        other.save(update_fields={"contribution_metadata", "status", "modified"})
+        request = mocker.Mock(query_params={"status": "paid", "revenue_program": str(paid.revenue_program.id)})
+        assert set(filter_.filter_queryset(request, Contribution.objects.all())) == {paid, by_rp, other}
+
+
+@pytest.mark.django_db
+class TestContributionFilter:
+    def test_contributor_email(self):
+        expected = ContributionFactory(contributor=ContributorFactory(email="Someone@Example.com"))
+        ContributionFactory(contributor=ContributorFactory(email="someone-else@example.org"))
+        queryset = Contribution.objects.all()
+        assert list(ContributionFilter({"contributor_email": "one@exa"}, queryset=queryset).qs) == [expected]
+        assert list(ContributionFilter({"contributor_email": "ONE@EXAMPLE.COM"}, queryset=queryset).qs) == [expected]
+        assert ContributionFilter({"contributor_email": ""}, queryset=queryset).qs.count() == 2
+
+    def test_contributor_email_search_can_use_trigram_index(self):
+        ContributorFactory.create_batch(3)
+        sql, params = Contributor.objects.filter(email__icontains="exa").values("id").query.sql_with_params()
+        with connection.cursor() as cursor:
+            # So that the planner uses the index if it can, even on a tiny table
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute(f"EXPLAIN {sql}", params)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+        assert "contributor_email_trgm_idx" in plan
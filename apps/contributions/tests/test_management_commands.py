@@ -1,3 +1,4 @@
+import datetime
 import uuid
 from copy import deepcopy
 
@@ -26,10 +27,12 @@ from apps.contributions.management.commands.fix_incident_2445 import (
 from apps.contributions.management.commands.fix_incident_2445 import (
     ContributionOutcome as Incident2445Outcome,
 )
-from apps.contributions.models import Contribution
+from apps.contributions.models import Contribution, DailyRevenueRollup
+from apps.contributions.stripe_import import StripeEventReplayReport
 from apps.contributions.tests.factories import (
     ContributionFactory,
     ContributorFactory,
+    PaymentFactory,
 )
 from apps.organizations.tests.factories import PaymentProviderFactory, RevenueProgramFactory
 from apps.pages.tests.factories import DonationPageFactory
@@ -53,6 +56,61 @@ def test_process_stripe_event(mocker):
     mock_processor.return_value.process.assert_called_once()
 
 
+@pytest.mark.parametrize("failed_event_ids", [[], ["evt_1"]])
+def test_replay_stripe_events(failed_event_ids, mocker):
+    mock_replayer = mocker.patch("apps.contributions.management.commands.replay_stripe_events.StripeEventReplayer")
+    mock_replayer.return_value.replay.return_value = StripeEventReplayReport(
+        listed=2, replayed=2 - len(failed_event_ids), failed_event_ids=failed_event_ids, duration_seconds=1.0
+    )
+    call_command(
+        "replay_stripe_events",
+        stripe_account="acct_1",
+        event_types=["payment_intent.succeeded"],
+        gte=(gte := datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)),
+        concurrency=2,
+    )
+    mock_replayer.assert_called_once_with(
+        stripe_account_id="acct_1",
+        event_types=["payment_intent.succeeded"],
+        from_date=gte,
+        to_date=None,
+        concurrency=2,
+        async_mode=False,
+        include_processed=False,
+    )
+    mock_replayer.return_value.replay.assert_called_once()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("dry_run", [False, True])
+def test_sync_contribution_payment_rollups(dry_run):
+    contributions = ContributionFactory.create_batch(3, one_time=True)
+    for contribution in contributions:
+        PaymentFactory(contribution=contribution)
+    Contribution.objects.filter(id__in=[x.id for x in contributions[:2]]).update(payment_count=0)
+    call_command("sync_contribution_payment_rollups", dry_run=dry_run, batch_size=1)
+    assert Contribution.objects.with_inconsistent_payment_rollups().count() == (2 if dry_run else 0)
+
+
+@pytest.mark.django_db
+def test_rebuild_daily_revenue_rollups():
+    old, new = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc), datetime.datetime.now(datetime.timezone.utc)
+    payments = [PaymentFactory(transaction_time=old), PaymentFactory(transaction_time=new)]
+    revenue_program_ids = [x.contribution.effective_revenue_program_id for x in payments]
+    DailyRevenueRollup.objects.all().delete()
+    call_command("rebuild_daily_revenue_rollups", revenue_programs=revenue_program_ids[:1])
+    assert list(DailyRevenueRollup.objects.values_list("revenue_program_id", "date")) == [
+        (revenue_program_ids[0], old.date())
+    ]
+    call_command("rebuild_daily_revenue_rollups", since=new.date())
+    assert set(DailyRevenueRollup.objects.values_list("revenue_program_id", "date")) == {
+        (revenue_program_ids[0], old.date()),
+        (revenue_program_ids[1], new.date()),
+    }
+    call_command("rebuild_daily_revenue_rollups")
+    assert DailyRevenueRollup.objects.count() == 2
+
+
 @pytest.mark.parametrize("dry_run", [False, True])
 def test_sync_missing_contribution_data_from_stripe(dry_run, monkeypatch, mocker):
     mock_fix_processing = mocker.Mock()
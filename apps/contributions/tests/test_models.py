@@ -7,8 +7,10 @@ from zoneinfo import ZoneInfo
 
 from django.conf import settings
 from django.core import mail
-from django.db import IntegrityError
+from django.db import IntegrityError, connection
 from django.template.loader import render_to_string
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
 import pytest
 import pytest_mock
@@ -30,6 +32,10 @@ from apps.contributions.models import (
     ContributionStatus,
     ContributionStatusError,
     Contributor,
+    DailyRevenueRollup,
+    ExportJob,
+    ExportJobError,
+    ExportJobStatus,
     Payment,
     ensure_stripe_event,
     logger,
@@ -244,6 +250,53 @@ class TestContributorModel:
         )
         assert contributions.count() == 2
 
+    def test_get_impact_is_cached(self, django_assert_num_queries):
+        contribution = ContributionFactory(one_time=True, status=ContributionStatus.PAID)
+        PaymentFactory(contribution=contribution, net_amount_paid=1000, amount_refunded=0)
+        contributor = Contributor.objects.get(pk=contribution.contributor_id)
+        rp_id = contribution.effective_revenue_program_id
+        expected = {"total_paid": 1000, "total_refunded": 0, "total": 1000}
+        with django_assert_num_queries(1):
+            assert contributor.get_impact() == expected
+        with django_assert_num_queries(0):
+            assert contributor.get_impact() == expected
+            assert contributor.get_impact([str(rp_id)]) == expected
+            assert contributor.get_impact([rp_id + 1]) == {"total_paid": 0, "total_refunded": 0, "total": 0}
+        assert contributor.get_impact_by_revenue_program() == {
+            (rp_id, contribution.metadata_revenue_program_id): (1000, 0)
+        }
+
+    def test_get_impact_includes_contributions_attributed_by_metadata(self):
+        contribution = ContributionFactory(one_time=True, status=ContributionStatus.PAID)
+        other_rp = RevenueProgramFactory()
+        contribution.contribution_metadata = {"revenue_program": other_rp.id}
+        contribution.save(update_fields={"contribution_metadata", "modified"})
+        PaymentFactory(contribution=contribution, net_amount_paid=1000, amount_refunded=0)
+        contributor = Contributor.objects.get(pk=contribution.contributor_id)
+        expected = {"total_paid": 1000, "total_refunded": 0, "total": 1000}
+        assert contributor.get_impact([other_rp.id]) == expected
+        assert contributor.get_impact([contribution.effective_revenue_program_id]) == expected
+        assert set(Contribution.objects.filter_by_revenue_programs([other_rp.id])) == {contribution}
+
+    def test_email_key(self):
+        contributor = ContributorFactory(email=" Someone@Example.com")
+        assert contributor.email_key == "someone@example.com"
+        contributor.email = "Someone.Else@Example.com"
+        contributor.save(update_fields={"email"})
+        contributor.refresh_from_db()
+        assert contributor.email_key == "someone.else@example.com"
+
+    def test_get_or_create_contributor_by_email_uses_email_key(self):
+        contributor = ContributorFactory(email="someone@example.com")
+        with CaptureQueriesContext(connection) as context:
+            assert Contributor.get_or_create_contributor_by_email(" SOMEONE@example.com ") == (
+                contributor,
+                LEFT_UNCHANGED,
+            )
+        assert len(context.captured_queries) == 1
+        assert '"email_key" =' in context.captured_queries[0]["sql"]
+        assert "UPPER(" not in context.captured_queries[0]["sql"]
+
 
 test_key = "test_key"
 
@@ -912,6 +965,25 @@ class TestContributionModel:
         assert contribution.donor_selected_amount
         assert contribution.donor_selected_amount == float(contribution.contribution_metadata["donor_selected_amount"])
 
+    @pytest.mark.parametrize(
+        ("metadata", "expected"),
+        [
+            (None, None),
+            ({}, None),
+            ({"revenue_program_id": "12"}, 12),
+            ({"revenue_program_id": 12}, 12),
+            ({"revenue_program": "12"}, 12),
+            ({"revenue_program_id": "12", "revenue_program": "13"}, 12),
+            ({"revenue_program_id": "", "revenue_program": "13"}, 13),
+            ({"revenue_program_id": "abc"}, None),
+            ({"revenue_program_id": "١٢"}, None),
+            ({"revenue_program_id": True}, None),
+            ({"revenue_program_id": str(2**31)}, None),
+        ],
+    )
+    def test_get_metadata_revenue_program_id(self, metadata, expected):
+        assert Contribution.get_metadata_revenue_program_id(metadata) == expected
+
     @pytest.mark.parametrize(
         "metadata",
         [{"donor_selected_amount": "cats"}, {"donor_selected_amount": ""}, {"donor_selected_amount": None}, {}, None],
@@ -2187,6 +2259,49 @@ class TestContributionQuerySetMethods:
         assert Payment.objects.filter(contribution_id=contributions.first().id).count() == 0
         assert contributions.first().first_payment_date is None
 
+    def test_with_inconsistent_payment_rollups_and_update_payment_rollups(self):
+        consistent = ContributionFactory(one_time=True)
+        PaymentFactory(contribution=consistent)
+        paymentless = ContributionFactory(one_time=True)
+        inconsistent = [ContributionFactory(one_time=True), ContributionFactory(one_time=True)]
+        for contribution in inconsistent:
+            PaymentFactory(contribution=contribution)
+        # Queryset updates bypass the signal handlers that maintain the rollups
+        Contribution.objects.filter(id=inconsistent[0].id).update(payment_count=0, total_paid=0)
+        Contribution.objects.filter(id=inconsistent[1].id).update(first_payment_at=None)
+        assert set(Contribution.objects.with_inconsistent_payment_rollups()) == set(inconsistent)
+        assert Contribution.objects.filter(id__in=[x.id for x in inconsistent]).update_payment_rollups() == 2
+        assert not Contribution.objects.with_inconsistent_payment_rollups().exists()
+        paymentless.refresh_from_db()
+        assert paymentless.payment_count == 0
+
+    def test_effective_revenue_program_set_on_save(self):
+        with_page = ContributionFactory(one_time=True)
+        with_rp = ContributionFactory(one_time=True, donation_page=None, _revenue_program=RevenueProgramFactory())
+        for contribution in (with_page, with_rp):
+            contribution.refresh_from_db()
+            assert contribution.effective_revenue_program == contribution.revenue_program
+            assert contribution.effective_stripe_account_id == contribution.stripe_account_id
+        with_rp.donation_page = with_page.donation_page
+        with_rp._revenue_program = None
+        with_rp.save(update_fields={"donation_page", "_revenue_program", "modified"})
+        with_rp.refresh_from_db()
+        assert with_rp.effective_revenue_program == with_page.revenue_program
+
+    def test_effective_revenue_program_not_recomputed_when_source_unchanged(self, django_assert_num_queries):
+        contribution = Contribution.objects.get(id=ContributionFactory(one_time=True).id)
+        with django_assert_num_queries(1):
+            contribution.save(update_fields={"status"})
+
+    def test_update_effective_revenue_program(self):
+        contributions = ContributionFactory.create_batch(2, one_time=True)
+        Contribution.objects.update(effective_revenue_program=None, effective_stripe_account_id=None)
+        assert Contribution.objects.update_effective_revenue_program() == 2
+        for contribution in contributions:
+            contribution.refresh_from_db()
+            assert contribution.effective_revenue_program == contribution.revenue_program
+            assert contribution.effective_stripe_account_id == contribution.stripe_account_id
+
     def test_with_stripe_account(self):
         contribution_1 = ContributionFactory(one_time=True)
         contribution_2 = ContributionFactory(
@@ -2593,3 +2708,149 @@ class TestPayment:
         Contribution.objects.all().delete()
         with pytest.raises(ValueError, match=re.escape("Could not find a contribution for this event (no match)")):
             Payment.from_stripe_charge_refunded_event(event=StripeEventData(**charge_refunded_one_time_event))
+
+
+@pytest.mark.django_db
+class TestExportJob:
+    def test_get_role_scope(self, superuser, hub_admin_user, rp_user, user_no_role_assignment):
+        assert ExportJob.get_role_scope(superuser) is None
+        assert ExportJob.get_role_scope(user_no_role_assignment) is None
+        assert ExportJob.get_role_scope(hub_admin_user) == {
+            "role_type": Roles.HUB_ADMIN,
+            "organization": hub_admin_user.roleassignment.organization_id,
+            "revenue_programs": [],
+        }
+        assert ExportJob.get_role_scope(rp_user) == {
+            "role_type": Roles.RP_ADMIN,
+            "organization": rp_user.roleassignment.organization.id,
+            "revenue_programs": [rp_user.roleassignment.revenue_programs.get().id],
+        }
+
+    def test_get_or_create_active_dedupes_active_jobs(self, hub_admin_user, superuser):
+        job, created = ExportJob.get_or_create_active(hub_admin_user, {"status": ["paid"]}, show_upgrade_prompt=False)
+        assert created
+        assert job.status == ExportJobStatus.PENDING
+        assert job.role_scope == ExportJob.get_role_scope(hub_admin_user)
+        assert ExportJob.get_or_create_active(hub_admin_user, {"status": ["paid"]}, False) == (job, False)
+        job.status = ExportJobStatus.RUNNING
+        job.save()
+        assert ExportJob.get_or_create_active(hub_admin_user, {"status": ["paid"]}, False) == (job, False)
+        # Different filters or user get a different job
+        assert ExportJob.get_or_create_active(hub_admin_user, {"status": ["failed"]}, False)[1]
+        assert ExportJob.get_or_create_active(superuser, {"status": ["paid"]}, False)[1]
+        job.status = ExportJobStatus.SUCCEEDED
+        job.save()
+        new_job, created = ExportJob.get_or_create_active(hub_admin_user, {"status": ["paid"]}, False)
+        assert created
+        assert new_job != job
+
+    def test_get_or_create_active_fails_stale_jobs(self, hub_admin_user, settings):
+        settings.EXPORT_JOB_STALE_AFTER = 60
+        job = ExportJob.get_or_create_active(hub_admin_user, {}, False)[0]
+        ExportJob.objects.filter(pk=job.pk).update(modified=timezone.now() - datetime.timedelta(seconds=61))
+        new_job, created = ExportJob.get_or_create_active(hub_admin_user, {}, False)
+        assert created
+        job.refresh_from_db()
+        assert job.status == ExportJobStatus.FAILED
+        assert job.error == "Timed out"
+
+    def test_unique_active_fingerprint(self, hub_admin_user):
+        job = ExportJob.get_or_create_active(hub_admin_user, {}, False)[0]
+        with pytest.raises(IntegrityError):
+            ExportJob.objects.create(user=hub_admin_user, fingerprint=job.fingerprint)
+
+    def test_get_contributions(self, rp_user):
+        rp = rp_user.roleassignment.revenue_programs.get()
+        expected = ContributionFactory(status=ContributionStatus.PAID, donation_page__revenue_program=rp, amount=500)
+        ContributionFactory(status=ContributionStatus.PAID, donation_page__revenue_program=rp, amount=100)
+        ContributionFactory(status=ContributionStatus.PAID, amount=500)
+        job = ExportJob.get_or_create_active(rp_user, {"amount__gt": ["200"]}, False)[0]
+        assert list(job.get_contributions()) == [expected]
+
+    def test_get_contributions_for_superuser(self, superuser):
+        contributions = ContributionFactory.create_batch(2, status=ContributionStatus.FLAGGED)
+        job = ExportJob.get_or_create_active(superuser, {"ordering": ["id"]}, False)[0]
+        assert list(job.get_contributions()) == contributions
+
+    def test_get_contributions_when_role_scope_changed(self, rp_user):
+        job = ExportJob.get_or_create_active(rp_user, {}, False)[0]
+        rp_user.roleassignment.revenue_programs.clear()
+        with pytest.raises(ExportJobError, match="role assignment has changed"):
+            job.get_contributions()
+
+    def test_update_progress(self, hub_admin_user):
+        job = ExportJob.get_or_create_active(hub_admin_user, {}, False)[0]
+        job.update_progress(10)
+        job.refresh_from_db()
+        assert job.exported_count == 10
+
+
+@pytest.mark.django_db
+class TestDailyRevenueRollup:
+    DAY = datetime.datetime(2024, 3, 1, 23, 59, tzinfo=datetime.timezone.utc)
+
+    @pytest.fixture
+    def revenue_program(self):
+        return RevenueProgramFactory()
+
+    @pytest.fixture
+    def payments(self, revenue_program):
+        one_time = ContributionFactory(
+            one_time=True, status=ContributionStatus.PAID, donation_page__revenue_program=revenue_program
+        )
+        monthly = ContributionFactory(
+            monthly_subscription=True, status=ContributionStatus.PAID, donation_page__revenue_program=revenue_program
+        )
+        next_day = self.DAY + datetime.timedelta(minutes=1)
+        return [
+            PaymentFactory(
+                contribution=one_time, transaction_time=self.DAY, gross_amount_paid=1000, net_amount_paid=900
+            ),
+            PaymentFactory(
+                contribution=one_time,
+                transaction_time=self.DAY,
+                gross_amount_paid=0,
+                net_amount_paid=0,
+                amount_refunded=400,
+            ),
+            PaymentFactory(contribution=monthly, transaction_time=self.DAY, gross_amount_paid=500, net_amount_paid=450),
+            PaymentFactory(contribution=monthly, transaction_time=next_day, gross_amount_paid=500, net_amount_paid=450),
+            # Another revenue program's payment on the same day
+            PaymentFactory(transaction_time=self.DAY),
+        ]
+
+    def test_refresh(self, revenue_program, payments):
+        DailyRevenueRollup.objects.all().delete()
+        assert DailyRevenueRollup.refresh(revenue_program.id) == 3
+        rollups = DailyRevenueRollup.objects.filter(revenue_program=revenue_program)
+        assert [
+            (x.date, x.interval, x.currency, *(getattr(x, field) for field in DailyRevenueRollup.AMOUNT_FIELDS))
+            for x in rollups
+        ] == [
+            (self.DAY.date(), ContributionInterval.MONTHLY, "usd", 1, 0, 500, 450, 0),
+            (self.DAY.date(), ContributionInterval.ONE_TIME, "usd", 2, 1, 1000, 900, 400),
+            (self.DAY.date() + datetime.timedelta(days=1), ContributionInterval.MONTHLY, "usd", 1, 0, 500, 450, 0),
+        ]
+        assert not DailyRevenueRollup.objects.exclude(revenue_program=revenue_program).exists()
+        assert {x.status for x in rollups} == {ContributionStatus.PAID}
+
+    def test_refresh_dates_and_since(self, revenue_program, payments):
+        DailyRevenueRollup.objects.all().delete()
+        assert DailyRevenueRollup.refresh(revenue_program.id, dates=[self.DAY.date() + datetime.timedelta(days=1)]) == 1
+        assert DailyRevenueRollup.refresh(revenue_program.id, dates=[]) == 0
+        assert DailyRevenueRollup.objects.count() == 1
+        assert DailyRevenueRollup.refresh(revenue_program.id, since=self.DAY.date()) == 3
+        assert DailyRevenueRollup.objects.count() == 3
+
+    def test_refresh_replaces_stale_rollups(self, revenue_program, payments):
+        DailyRevenueRollup.objects.filter(revenue_program=revenue_program).update(net_amount_paid=0)
+        DailyRevenueRollup.objects.create(
+            revenue_program=revenue_program,
+            date=self.DAY.date() - datetime.timedelta(days=1),
+            interval=ContributionInterval.ONE_TIME,
+            currency="usd",
+        )
+        DailyRevenueRollup.refresh(revenue_program.id)
+        assert list(
+            DailyRevenueRollup.objects.filter(revenue_program=revenue_program).values_list("net_amount_paid", flat=True)
+        ) == [450, 900, 450]
@@ -0,0 +1,252 @@
+import datetime
+
+from django.core.cache import cache
+from django.db import transaction
+
+import pytest
+
+from apps.contributions.choices import ContributionStatus
+from apps.contributions.models import Contribution, ContributionQuerySet, Contributor, DailyRevenueRollup, Payment
+from apps.contributions.tasks import refresh_daily_revenue_rollups
+from apps.contributions.tests.factories import ContributionFactory, ContributorFactory, PaymentFactory
+from apps.organizations.tests.factories import PaymentProviderFactory, RevenueProgramFactory
+
+
+@pytest.mark.django_db
+class TestUpdateContributionPaymentRollups:
+    def test_on_create_update_and_delete(self):
+        contribution = ContributionFactory(one_time=True)
+        assert contribution.payment_count == 0
+        first = PaymentFactory(contribution=contribution, net_amount_paid=1000, amount_refunded=0)
+        second = PaymentFactory(contribution=contribution, net_amount_paid=0, amount_refunded=500)
+        contribution.refresh_from_db()
+        assert contribution.payment_count == 2
+        assert contribution.total_paid == 1000
+        assert contribution.total_refunded == 500
+        assert contribution.first_payment_at == min(first.transaction_time, second.transaction_time)
+        assert contribution.last_payment_at == max(first.transaction_time, second.transaction_time)
+
+        second.amount_refunded = 700
+        second.save()
+        contribution.refresh_from_db()
+        assert contribution.total_refunded == 700
+
+        first.delete()
+        second.delete()
+        contribution.refresh_from_db()
+        assert contribution.payment_count == 0
+        assert contribution.total_paid == contribution.total_refunded == 0
+        assert contribution.first_payment_at is None
+        assert contribution.last_payment_at is None
+        assert not Contribution.objects.with_inconsistent_payment_rollups().exists()
+
+    def test_refreshes_cached_contribution(self):
+        contribution = ContributionFactory(one_time=True)
+        payment = PaymentFactory(contribution=contribution)
+        assert payment.contribution is contribution
+        assert contribution.payment_count == 1
+        assert contribution._last_payment_date == payment.transaction_time
+
+    def test_saving_stale_contribution_keeps_rollups(self):
+        contribution = ContributionFactory(one_time=True)
+        stale = Contribution.objects.get(pk=contribution.pk)
+        PaymentFactory(contribution=contribution, net_amount_paid=1000)
+        stale.status = ContributionStatus.CANCELED
+        stale.save()
+        contribution.refresh_from_db()
+        assert contribution.status == ContributionStatus.CANCELED
+        assert contribution.payment_count == 1
+        assert contribution.total_paid == 1000
+
+
+@pytest.mark.django_db
+class TestEffectiveRevenueProgramSync:
+    def test_when_page_moves_to_another_revenue_program(self):
+        contribution = ContributionFactory(one_time=True)
+        page = contribution.donation_page
+        new_rp = RevenueProgramFactory()
+        page.revenue_program = new_rp
+        page.save()
+        contribution.refresh_from_db()
+        assert contribution.effective_revenue_program == new_rp
+        assert contribution.effective_stripe_account_id == new_rp.payment_provider.stripe_account_id
+
+    def test_when_page_saved_without_revenue_program(self, mocker):
+        contribution = ContributionFactory(one_time=True)
+        spy = mocker.spy(ContributionQuerySet, "update_effective_revenue_program")
+        contribution.donation_page.save(update_fields={"name"})
+        spy.assert_not_called()
+
+    def test_when_revenue_program_payment_provider_changes(self):
+        contribution = ContributionFactory(one_time=True)
+        rp = contribution.revenue_program
+        rp.payment_provider = PaymentProviderFactory()
+        rp.save(update_fields={"payment_provider"})
+        contribution.refresh_from_db()
+        assert contribution.effective_stripe_account_id == rp.payment_provider.stripe_account_id
+
+    @pytest.mark.parametrize("new_stripe_account_id", ["acct_new", None, ""])
+    def test_when_payment_provider_stripe_account_changes(self, new_stripe_account_id):
+        contribution = ContributionFactory(one_time=True)
+        payment_provider = contribution.revenue_program.payment_provider
+        payment_provider.stripe_account_id = new_stripe_account_id
+        payment_provider.save()
+        contribution.refresh_from_db()
+        assert contribution.effective_stripe_account_id == (new_stripe_account_id or None)
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures("_clear_cache")
+class TestDailyRevenueRollupSync:
+    DAY = datetime.datetime(2024, 3, 1, 12, tzinfo=datetime.timezone.utc)
+
+    @pytest.fixture(autouse=True)
+    def refresh_delay(self, mocker):
+        return mocker.patch(
+            "apps.contributions.tasks.refresh_daily_revenue_rollups.delay", side_effect=refresh_daily_revenue_rollups
+        )
+
+    def _rollups(self):
+        return list(
+            DailyRevenueRollup.objects.values_list(
+                "revenue_program_id", "date", "status", "payment_count", "net_amount_paid", "amount_refunded"
+            )
+        )
+
+    def test_on_payment_create_update_and_delete(self):
+        contribution = ContributionFactory(one_time=True, status=ContributionStatus.PAID)
+        rp_id = contribution.effective_revenue_program_id
+        first = PaymentFactory(contribution=contribution, transaction_time=self.DAY, net_amount_paid=1000)
+        second = PaymentFactory(contribution=contribution, transaction_time=self.DAY, net_amount_paid=500)
+        assert self._rollups() == [(rp_id, self.DAY.date(), "paid", 2, 1500, 0)]
+        second.amount_refunded = 200
+        second.save()
+        assert self._rollups() == [(rp_id, self.DAY.date(), "paid", 2, 1500, 200)]
+        first.delete()
+        assert self._rollups() == [(rp_id, self.DAY.date(), "paid", 1, 500, 200)]
+        second.delete()
+        assert self._rollups() == []
+
+    def test_when_payment_moves_to_another_day_or_contribution(self):
+        contribution = ContributionFactory(one_time=True, status=ContributionStatus.PAID)
+        other = ContributionFactory(one_time=True, status=ContributionStatus.PAID)
+        PaymentFactory(contribution=contribution, transaction_time=self.DAY, net_amount_paid=1000)
+        payment = Payment.objects.get(contribution=contribution)
+        payment.transaction_time = self.DAY + datetime.timedelta(days=1)
+        payment.save()
+        assert self._rollups() == [
+            (
+                contribution.effective_revenue_program_id,
+                self.DAY.date() + datetime.timedelta(days=1),
+                "paid",
+                1,
+                1000,
+                0,
+            )
+        ]
+        payment.contribution = other
+        payment.save()
+        assert self._rollups() == [
+            (other.effective_revenue_program_id, self.DAY.date() + datetime.timedelta(days=1), "paid", 1, 1000, 0)
+        ]
+
+    def test_when_contribution_status_changes(self):
+        contribution = ContributionFactory(monthly_subscription=True, status=ContributionStatus.PAID)
+        for days in (0, 31):
+            PaymentFactory(contribution=contribution, transaction_time=self.DAY + datetime.timedelta(days=days))
+        contribution = Contribution.objects.get(pk=contribution.pk)
+        contribution.status = ContributionStatus.CANCELED
+        contribution.save()
+        assert {x[2] for x in self._rollups()} == {"canceled"}
+        assert len(self._rollups()) == 2
+
+    def test_when_contribution_saved_without_changes(self, mocker):
+        contribution = ContributionFactory(one_time=True)
+        PaymentFactory(contribution=contribution)
+        spy = mocker.spy(DailyRevenueRollup, "refresh")
+        contribution = Contribution.objects.get(pk=contribution.pk)
+        contribution.save()
+        contribution.save(update_fields={"status"})
+        spy.assert_not_called()
+
+    def test_when_page_moves_to_another_revenue_program(self):
+        contribution = ContributionFactory(one_time=True, status=ContributionStatus.PAID)
+        PaymentFactory(contribution=contribution, transaction_time=self.DAY, net_amount_paid=1000)
+        page = contribution.donation_page
+        new_rp = RevenueProgramFactory()
+        page.revenue_program = new_rp
+        page.save()
+        assert self._rollups() == [(new_rp.id, self.DAY.date(), "paid", 1, 1000, 0)]
+
+    def test_refresh_is_queued_on_commit_once_per_day(self, refresh_delay):
+        contribution = ContributionFactory(one_time=True, status=ContributionStatus.PAID)
+        rp_id = contribution.effective_revenue_program_id
+        refresh_delay.side_effect = None
+        with transaction.atomic():
+            for _ in range(3):
+                PaymentFactory(
+                    contribution=contribution, transaction_time=self.DAY, net_amount_paid=1000, amount_refunded=0
+                )
+            refresh_delay.assert_not_called()
+        refresh_delay.assert_called_once_with(rp_id, [self.DAY.date().isoformat()])
+        PaymentFactory(contribution=contribution, transaction_time=self.DAY, net_amount_paid=1000, amount_refunded=0)
+        refresh_delay.assert_called_once()
+        assert self._rollups() == []
+        refresh_daily_revenue_rollups(rp_id, [self.DAY.date().isoformat()])
+        assert self._rollups() == [(rp_id, self.DAY.date(), "paid", 4, 4000, 0)]
+        PaymentFactory(contribution=contribution, transaction_time=self.DAY, net_amount_paid=1000, amount_refunded=0)
+        assert refresh_delay.call_count == 2
+
+
+@pytest.mark.django_db
+class TestContributorImpactInvalidation:
+    @pytest.fixture
+    def contribution(self):
+        contribution = ContributionFactory(one_time=True, status=ContributionStatus.PAID)
+        PaymentFactory(contribution=contribution, net_amount_paid=1000, amount_refunded=0)
+        return contribution
+
+    def _impact(self, contribution):
+        return Contributor.objects.get(pk=contribution.contributor_id).get_impact()["total"]
+
+    def test_when_payment_created_updated_or_deleted(self, contribution):
+        assert self._impact(contribution) == 1000
+        payment = PaymentFactory(contribution=contribution, net_amount_paid=500, amount_refunded=0)
+        assert self._impact(contribution) == 1500
+        payment = Payment.objects.get(pk=payment.pk)
+        payment.amount_refunded = 500
+        payment.save()
+        assert self._impact(contribution) == 1000
+        payment.delete()
+        assert self._impact(contribution) == 1000
+
+    def test_when_contribution_status_changes(self, contribution):
+        assert self._impact(contribution) == 1000
+        contribution.status = ContributionStatus.ABANDONED
+        contribution.save()
+        assert self._impact(contribution) == 0
+
+    def test_when_contribution_moves_to_another_contributor(self, contribution):
+        previous = Contributor.objects.get(pk=contribution.contributor_id)
+        assert previous.get_impact()["total"] == 1000
+        contribution = Contribution.objects.get(pk=contribution.pk)
+        contribution.contributor = ContributorFactory()
+        contribution.save()
+        assert previous.get_impact()["total"] == 0
+        assert self._impact(contribution) == 1000
+
+    def test_when_page_moves_to_another_revenue_program(self, contribution):
+        contributor = Contributor.objects.get(pk=contribution.contributor_id)
+        assert contributor.get_impact([contribution.effective_revenue_program_id])["total"] == 1000
+        page = contribution.donation_page
+        page.revenue_program = RevenueProgramFactory()
+        page.save()
+        assert contributor.get_impact([page.revenue_program_id])["total"] == 1000
+
+    def test_invalidated_again_on_commit(self, contribution, django_capture_on_commit_callbacks):
+        key = Contributor.get_impact_cache_key(contribution.contributor_id)
+        with django_capture_on_commit_callbacks(execute=True):
+            PaymentFactory(contribution=contribution, net_amount_paid=500, amount_refunded=0)
+            # As a concurrent request would, from the totals before the payment commits
+            cache.set(key, {contribution.effective_revenue_program_id: (1000, 0)})
+        assert cache.get(key) is None
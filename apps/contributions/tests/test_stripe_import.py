@@ -26,6 +26,7 @@ from apps.contributions.stripe_import import (
     TTL_WARNING_THRESHOLD_PERCENT,
     RedisCachePipeline,
     StripeEventProcessor,
+    StripeEventReplayer,
     StripeTransactionsImporter,
     log_backoff,
     parse_slug_from_url,
@@ -1298,10 +1299,14 @@ class TestStripeEventProcessor:
         processor.process()
         if async_mode:
             mock_process_webhook.assert_not_called()
-            mock_process_webhook.delay.assert_called_once_with(raw_event_data=supported_event)
+            mock_process_webhook.apply_async.assert_called_once_with(
+                kwargs={"raw_event_data": supported_event, "enqueued_at": mocker.ANY},
+                queue=settings.STRIPE_WEBHOOK_EVENT_ROUTES[supported_event.type]["queue"],
+                priority=settings.STRIPE_WEBHOOK_EVENT_ROUTES[supported_event.type]["priority"],
+            )
         else:
             mock_process_webhook.assert_called_once_with(raw_event_data=supported_event)
-            mock_process_webhook.delay.assert_not_called()
+            mock_process_webhook.apply_async.assert_not_called()
         mock_retrieve_event.assert_called_once_with(id=event_id, stripe_account=stripe_account)
 
     def test_when_event_not_supported(self, unsupported_event, mocker):
@@ -1311,7 +1316,7 @@ class TestStripeEventProcessor:
         StripeEventProcessor(stripe_account_id="test", event_id="evt_1", async_mode=False).process()
         logger_spy.assert_called_once_with("Event type %s is not supported", unsupported_event.type)
         mock_process_webhook.assert_not_called()
-        mock_process_webhook.delay.assert_not_called()
+        mock_process_webhook.apply_async.assert_not_called()
 
     def test_when_event_not_found(self, supported_event, mocker):
         logger_spy = mocker.patch("apps.contributions.stripe_import.logger.warning")
@@ -1320,7 +1325,140 @@ class TestStripeEventProcessor:
         StripeEventProcessor(stripe_account_id="test", event_id="evt_1", async_mode=False).process()
         assert logger_spy.call_args == mocker.call("No event found for event id %s", supported_event.id)
         mock_process_webhook.assert_not_called()
-        mock_process_webhook.delay.assert_not_called()
+        mock_process_webhook.apply_async.assert_not_called()
+
+
+class TestStripeEventReplayer:
+    @pytest.fixture
+    def events(self):
+        """Events as Stripe lists them, newest first."""
+        return [
+            stripe.Event.construct_from(
+                {
+                    "id": f"evt_{i}",
+                    "type": "customer.subscription.updated",
+                    "created": created,
+                    "data": {"object": {"id": obj_id}},
+                },
+                key="test",
+            )
+            for i, (created, obj_id) in enumerate(
+                [(300, "sub_1"), (200, "sub_2"), (200, "sub_1"), (100, "sub_1")], start=1
+            )
+        ]
+
+    @pytest.fixture
+    def mock_list(self, events, mocker):
+        return mocker.patch("stripe.Event.list", return_value=mocker.Mock(data=events, has_more=False))
+
+    def test_rejects_unsupported_event_types(self):
+        with pytest.raises(ValueError, match="Unsupported event types: unsupported"):
+            StripeEventReplayer(stripe_account_id="acct_1", event_types=["unsupported"])
+
+    def test_rejects_zero_concurrency(self):
+        with pytest.raises(ValueError, match="Concurrency must be at least 1"):
+            StripeEventReplayer(stripe_account_id="acct_1", concurrency=0)
+
+    def test_list_events(self, mock_list, events):
+        from_date = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+        replayer = StripeEventReplayer(
+            stripe_account_id="acct_1", from_date=from_date, event_types=["customer.subscription.updated"]
+        )
+        assert list(replayer.list_events()) == events
+        mock_list.assert_called_once_with(
+            stripe_account="acct_1",
+            limit=stripe_import.MAX_STRIPE_RESPONSE_LIMIT,
+            types=["customer.subscription.updated"],
+            created={"gte": int(from_date.timestamp())},
+        )
+
+    def test_list_events_retries_each_page(self, events, mocker, stripe_rate_limit_error):
+        mocker.patch("time.sleep")
+        mock_list = mocker.patch(
+            "stripe.Event.list",
+            side_effect=[
+                mocker.Mock(data=events[:2], has_more=True),
+                stripe_rate_limit_error,
+                mocker.Mock(data=events[2:], has_more=False),
+            ],
+        )
+        assert list(StripeEventReplayer(stripe_account_id="acct_1").list_events()) == events
+        assert [x.kwargs.get("starting_after") for x in mock_list.call_args_list] == [None, "evt_2", "evt_2"]
+
+    def test_list_events_defaults_to_supported_types(self, mock_list):
+        list(StripeEventReplayer(stripe_account_id="acct_1").list_events())
+        assert mock_list.call_args.kwargs["types"] == settings.STRIPE_WEBHOOK_EVENTS_CONTRIBUTIONS
+        assert "created" not in mock_list.call_args.kwargs
+
+    @pytest.mark.parametrize(
+        ("obj", "expected"),
+        [
+            ({"id": "pi_1", "subscription": "sub_1"}, "pi_1"),
+            ({"subscription": "sub_1"}, "sub_1"),
+            ({}, "evt_1"),
+        ],
+    )
+    def test_get_object_key(self, obj, expected):
+        event = stripe.Event.construct_from({"id": "evt_1", "data": {"object": obj}}, key="test")
+        assert StripeEventReplayer.get_object_key(event) == expected
+
+    def test_group_events_by_object(self, events):
+        groups = StripeEventReplayer(stripe_account_id="acct_1").group_events_by_object(events)
+        assert [[x.id for x in group] for group in groups] == [["evt_4", "evt_3", "evt_1"], ["evt_2"]]
+
+    def test_replay_sync(self, mock_list, mocker):
+        mocker.patch("apps.contributions.stripe_import.get_processed_stripe_event_ids", return_value={"evt_4"})
+        mock_process = mocker.patch("apps.contributions.tasks.process_stripe_webhook_task")
+        report = StripeEventReplayer(stripe_account_id="acct_1").replay()
+        assert report.listed == 4
+        assert report.skipped_as_processed == 1
+        assert report.replayed == 3
+        assert report.failed_event_ids == []
+        assert report.events_per_second > 0
+        processed = [x.kwargs["raw_event_data"].id for x in mock_process.call_args_list]
+        assert sorted(processed) == ["evt_1", "evt_2", "evt_3"]
+        assert processed.index("evt_3") < processed.index("evt_1")
+
+    def test_replay_sync_include_processed(self, mock_list, mocker):
+        mock_get_processed = mocker.patch("apps.contributions.stripe_import.get_processed_stripe_event_ids")
+        mock_process = mocker.patch("apps.contributions.tasks.process_stripe_webhook_task")
+        report = StripeEventReplayer(stripe_account_id="acct_1", include_processed=True).replay()
+        mock_get_processed.assert_not_called()
+        assert report.replayed == mock_process.call_count == 4
+
+    def test_replay_sync_when_event_fails(self, mock_list, mocker):
+        mocker.patch("apps.contributions.stripe_import.get_processed_stripe_event_ids", return_value=set())
+        logger_spy = mocker.patch("apps.contributions.stripe_import.logger.exception")
+
+        def _process(raw_event_data):
+            if raw_event_data.id == "evt_3":
+                raise stripe.error.APIConnectionError("oops")
+
+        mock_process = mocker.patch("apps.contributions.tasks.process_stripe_webhook_task", side_effect=_process)
+        report = StripeEventReplayer(stripe_account_id="acct_1", concurrency=1).replay()
+        assert report.replayed == 2
+        assert report.failed_event_ids == ["evt_3", "evt_1"]
+        assert [x.kwargs["raw_event_data"].id for x in mock_process.call_args_list] == ["evt_4", "evt_3", "evt_2"]
+        logger_spy.assert_called_once_with("Failed to replay event %s", "evt_3")
+
+    def test_replay_async(self, mock_list, mocker):
+        mocker.patch("apps.contributions.stripe_import.get_processed_stripe_event_ids", return_value=set())
+        mock_chain = mocker.patch("apps.contributions.stripe_import.chain")
+        mock_process = mocker.patch("apps.contributions.tasks.process_stripe_webhook_task")
+        report = StripeEventReplayer(stripe_account_id="acct_1", async_mode=True).replay()
+        assert report.replayed == 4
+        mock_process.assert_not_called()
+        assert mock_chain.call_count == 2
+        assert mock_chain.return_value.apply_async.call_count == 2
+        assert [x.kwargs["raw_event_data"].id for x in mock_process.si.call_args_list] == [
+            "evt_4",
+            "evt_3",
+            "evt_1",
+            "evt_2",
+        ]
+        mock_process.si.return_value.set.assert_called_with(
+            queue=settings.STRIPE_WEBHOOK_ROUTE_BULK["queue"], priority=settings.STRIPE_WEBHOOK_ROUTE_BULK["priority"]
+        )
 
 
 class Test_log_backoff:
@@ -1,8 +1,10 @@
+import gzip
 from csv import DictReader
 from datetime import timedelta
 from typing import Any
 
 from django.conf import settings
+from django.core.files.base import ContentFile
 from django.template.loader import render_to_string
 from django.utils import timezone
 
@@ -12,14 +14,20 @@ import stripe.error
 from pytest_django.fixtures import SettingsWrapper
 from requests.exceptions import RequestException
 
+from apps.common.metrics import Measurement
 from apps.contributions import tasks as contribution_tasks
-from apps.contributions.choices import QuarantineStatus
-from apps.contributions.models import Contribution, ContributionStatus
+from apps.contributions.choices import ExportJobStatus, QuarantineStatus
+from apps.contributions.models import Contribution, ContributionStatus, ExportJob
 from apps.contributions.payment_managers import PaymentProviderError
 from apps.contributions.tests.factories import ContributionFactory
 from apps.contributions.typings import StripeEventData
-from apps.contributions.utils import CONTRIBUTION_EXPORT_CSV_HEADERS
+from apps.contributions.utils import (
+    CONTRIBUTION_EXPORT_CSV_HEADERS,
+    get_contribution_export_name_from_token,
+    get_contribution_export_storage,
+)
 from apps.contributions.webhooks import StripeWebhookProcessor
+from apps.users.choices import Roles
 
 
 @pytest.fixture
@@ -34,122 +42,140 @@ def non_expiring_flagged_contributions(now):
     return ContributionFactory.create_batch(2, status=ContributionStatus.FLAGGED, flagged_date=flagged_date)
 
 
+def _get_exported_rows(download_url: str) -> list[dict]:
+    name = get_contribution_export_name_from_token(download_url.rstrip("/").rsplit("/", 1)[-1])
+    with get_contribution_export_storage().open(name, "rb") as f:
+        return list(DictReader(gzip.decompress(f.read()).decode().splitlines()))
+
+
+def _assert_export_emailed(send_email, to_email: str, show_upgrade_prompt: bool) -> list[dict]:
+    send_email.assert_called_once()
+    download_url = send_email.call_args[1]["message_as_text"].split("compressed CSV file: ")[1].split()[0]
+    context = {
+        "download_url": download_url,
+        "link_expiry_hours": settings.CONTRIBUTION_EXPORT_LINK_EXPIRY,
+        "logo_url": f"{settings.SITE_URL}/static/nre_logo_black_yellow.png",
+        "show_upgrade_prompt": show_upgrade_prompt,
+    }
+    send_email.assert_called_once_with(
+        to=to_email,
+        subject="Check out your Contributions",
+        message_as_text=render_to_string("nrh-contribution-csv-email-body.txt", context),
+        message_as_html=render_to_string("nrh-contribution-csv-email-body.html", context),
+    )
+    return _get_exported_rows(download_url)
+
+
 @pytest.mark.django_db
-class TestEmailContributionCsvExportToUser:
-    def test_when_all_requested_contributions_found(self, monkeypatch, mocker, org_user_free_plan):
-        """Show happy path behavior when all of requested contributions are found and included in export.
+@pytest.mark.usefixtures("_in_memory_storage")
+class TestRunContributionExportJob:
+    @pytest.fixture
+    def send_email(self, mocker):
+        return mocker.patch("apps.contributions.tasks.send_templated_email")
+
+    @pytest.fixture
+    def export_job(self, hub_admin_user):
+        return ExportJob.get_or_create_active(hub_admin_user, {}, show_upgrade_prompt=False)[0]
 
-        Note that we rely on narrow unit testing of export_contributions_to_csv elsewhere. We only assert that
-        expected rows show up based on value for contribution id, but we don't test any other attributes at row
-        level in this test.
+    def test_happy_path(self, settings, send_email, export_job):
+        """Show that the job's contributions are exported, the user is emailed a link, and the job records progress.
+
+        Note that we rely on narrow unit testing of the CSV export elsewhere. We only assert that expected rows show up
+        based on value for contribution id, but we don't test any other attributes at row level in this test.
         """
-        contributions = ContributionFactory.create_batch(size=10)
-        monkeypatch.setattr(
-            "apps.contributions.tasks.send_templated_email_with_attachment", lambda *args, **kwargs: None
-        )
-        send_email_spy = mocker.spy(contribution_tasks, "send_templated_email_with_attachment")
-        make_csv_spy = mocker.spy(contribution_tasks, "export_contributions_to_csv")
-        contribution_tasks.email_contribution_csv_export_to_user(
-            [x.id for x in contributions], org_user_free_plan.email, (show_upgrade_prompt := True)
-        )
-        make_csv_spy.assert_called_once()
-        assert set(make_csv_spy.call_args[0][0]) == set(
-            Contribution.objects.filter(id__in=[x.id for x in contributions])
-        )
-        send_email_spy.assert_called_once_with(
-            to=org_user_free_plan.email,
-            subject="Check out your Contributions",
-            message_as_text=render_to_string(
-                "nrh-contribution-csv-email-body.txt",
-                context := {
-                    "logo_url": f"{settings.SITE_URL}/static/nre_logo_black_yellow.png",
-                    "show_upgrade_prompt": show_upgrade_prompt,
-                },
-            ),
-            message_as_html=render_to_string("nrh-contribution-csv-email-body.html", context),
-            attachment=mocker.ANY,
-            content_type="text/csv",
-            filename="contributions.csv",
-        )
-        data = list(DictReader(send_email_spy.call_args[1]["attachment"].splitlines()))
+        settings.CONTRIBUTION_EXPORT_CHUNK_SIZE = 2
+        contributions = ContributionFactory.create_batch(size=5, status=ContributionStatus.PAID)
+        contribution_tasks.run_contribution_export_job(export_job.id)
+        data = _assert_export_emailed(send_email, export_job.user.email, False)
         assert set(data[0].keys()) == set(CONTRIBUTION_EXPORT_CSV_HEADERS)
         assert {str(_.pk) for _ in contributions} == {_["Contribution ID"] for _ in data}
+        export_job.refresh_from_db()
+        assert export_job.status == ExportJobStatus.SUCCEEDED
+        assert export_job.total_count == export_job.exported_count == 5
+        assert export_job.file_name
+        assert export_job.started_at < export_job.finished_at
+        assert export_job.error == ""
+
+    def test_applies_filters_and_role_scope(self, org_user_free_plan, send_email):
+        rp = org_user_free_plan.roleassignment.organization.revenueprogram_set.first()
+        ContributionFactory(status=ContributionStatus.FLAGGED, donation_page__revenue_program=rp)
+        expected = ContributionFactory(status=ContributionStatus.PAID, donation_page__revenue_program=rp)
+        ContributionFactory(status=ContributionStatus.PAID)
+        job = ExportJob.get_or_create_active(org_user_free_plan, {"status": ["paid"]}, show_upgrade_prompt=True)[0]
+        contribution_tasks.run_contribution_export_job(job.id)
+        data = _assert_export_emailed(send_email, org_user_free_plan.email, True)
+        assert [x["Contribution ID"] for x in data] == [str(expected.id)]
+
+    def test_when_no_contributions(self, send_email, export_job):
+        contribution_tasks.run_contribution_export_job(export_job.id)
+        assert _assert_export_emailed(send_email, export_job.user.email, False) == []
+        export_job.refresh_from_db()
+        assert export_job.status == ExportJobStatus.SUCCEEDED
+        assert export_job.total_count == export_job.exported_count == 0
+
+    def test_when_role_scope_changed(self, org_user_free_plan, send_email):
+        job = ExportJob.get_or_create_active(org_user_free_plan, {}, show_upgrade_prompt=True)[0]
+        org_user_free_plan.roleassignment.role_type = Roles.HUB_ADMIN
+        org_user_free_plan.roleassignment.save()
+        contribution_tasks.run_contribution_export_job(job.id)
+        send_email.assert_not_called()
+        job.refresh_from_db()
+        assert job.status == ExportJobStatus.FAILED
+        assert job.error == "User's role assignment has changed since the export was requested"
+
+    @pytest.mark.parametrize("job_status", [ExportJobStatus.RUNNING, ExportJobStatus.SUCCEEDED, ExportJobStatus.FAILED])
+    def test_when_not_pending(self, job_status, send_email, export_job, mocker):
+        export_job.status = job_status
+        export_job.save()
+        mock_export = mocker.patch("apps.contributions.tasks.export_contributions_to_csv_file")
+        contribution_tasks.run_contribution_export_job(export_job.id)
+        mock_export.assert_not_called()
+        send_email.assert_not_called()
+        export_job.refresh_from_db()
+        assert export_job.status == job_status
+
+    def test_when_unexpected_error(self, send_email, export_job):
+        send_email.side_effect = RuntimeError("Boom")
+        with pytest.raises(RuntimeError):
+            contribution_tasks.run_contribution_export_job(export_job.id)
+        export_job.refresh_from_db()
+        assert export_job.status == ExportJobStatus.FAILED
+        assert export_job.error == "RuntimeError('Boom')"
+        assert export_job.file_name
 
-    def test_when_some_requested_contributions_missing(self, org_user_free_plan, monkeypatch, mocker):
-        """Show behavior when some requested contributions are not found.
 
-        In this case, the task should still succeed, generating a CSV with a subset of the requested contributions.
-
-        Additionally, it will log a warning.
-        """
-        contributions = ContributionFactory.create_batch(size=10)
-        ids = [x.id for x in contributions]
-        deleted = contributions.pop(0)
-        deleted_id = deleted.id
-        deleted.delete()
-        monkeypatch.setattr(
-            "apps.contributions.tasks.send_templated_email_with_attachment", lambda *args, **kwargs: None
-        )
-        send_email_spy = mocker.spy(contribution_tasks, "send_templated_email_with_attachment")
-        make_csv_spy = mocker.spy(contribution_tasks, "export_contributions_to_csv")
-        logger_spy = mocker.spy(contribution_tasks.logger, "warning")
-        contribution_tasks.email_contribution_csv_export_to_user(ids, org_user_free_plan.email, True)
-        make_csv_spy.assert_called_once()
-        send_email_spy.assert_called_once_with(
-            to=org_user_free_plan.email,
-            subject="Check out your Contributions",
-            message_as_text=render_to_string(
-                "nrh-contribution-csv-email-body.txt",
-                (
-                    context := {
-                        "logo_url": f"{settings.SITE_URL}/static/nre_logo_black_yellow.png",
-                        "show_upgrade_prompt": True,
-                    }
-                ),
-            ),
-            message_as_html=render_to_string("nrh-contribution-csv-email-body.html", context),
-            attachment=mocker.ANY,
-            content_type="text/csv",
-            filename="contributions.csv",
-        )
-        data = list(DictReader(send_email_spy.call_args[1]["attachment"].splitlines()))
-        assert {str(x) for x in ids}.difference({x["Contribution ID"] for x in data}) == {str(deleted_id)}
-        logger_spy.assert_called_once_with(
-            "`email_contribution_csv_export_to_user` was unable to locate %s of %s requested contributions. The following"
-            " IDs could not be found: %s",
-            1,
-            len(ids),
-            str(deleted_id),
-        )
+@pytest.mark.django_db
+@pytest.mark.usefixtures("_in_memory_storage")
+def test_email_contribution_csv_export_to_user(mocker):
+    send_email = mocker.patch("apps.contributions.tasks.send_templated_email")
+    expected = ContributionFactory.create_batch(size=2, status=ContributionStatus.PAID)
+    ContributionFactory(status=ContributionStatus.PAID)
+    contribution_tasks.email_contribution_csv_export_to_user(
+        [x.id for x in expected], "someone@example.com", show_upgrade_prompt=True
+    )
+    data = _assert_export_emailed(send_email, "someone@example.com", True)
+    assert {str(x.id) for x in expected} == {x["Contribution ID"] for x in data}
+    assert not ExportJob.objects.exists()
 
-    def test_when_contribution_ids_is_empty_list(self, org_user_free_plan, monkeypatch, mocker):
-        """Show behavior when task called with empty list for contributions ids.
 
-        In this case, a CSV with only headers will be sent.
-        """
-        ids = []
-        monkeypatch.setattr(
-            "apps.contributions.tasks.send_templated_email_with_attachment", lambda *args, **kwargs: None
-        )
-        send_email_spy = mocker.spy(contribution_tasks, "send_templated_email_with_attachment")
-        make_csv_spy = mocker.spy(contribution_tasks, "export_contributions_to_csv")
-        contribution_tasks.email_contribution_csv_export_to_user(ids, org_user_free_plan.email, True)
-        send_email_spy.assert_called_once()
-        make_csv_spy.assert_called_once()
-        context = {
-            "logo_url": f"{settings.SITE_URL}/static/nre_logo_black_yellow.png",
-            "show_upgrade_prompt": True,
-        }
-        assert set(make_csv_spy.call_args[0][0]) == set(Contribution.objects.none())
-        assert send_email_spy.call_args[1]["to"] == org_user_free_plan.email
-        assert send_email_spy.call_args[1]["subject"] == "Check out your Contributions"
-        assert send_email_spy.call_args[1]["message_as_text"] == render_to_string(
-            "nrh-contribution-csv-email-body.txt", context
-        )
-        assert send_email_spy.call_args[1]["message_as_html"] == render_to_string(
-            "nrh-contribution-csv-email-body.html", context
-        )
-        assert len(list(DictReader(send_email_spy.call_args[1]["attachment"].splitlines()))) == 0
+@pytest.mark.django_db
+@pytest.mark.usefixtures("_in_memory_storage")
+def test_delete_expired_contribution_exports(hub_admin_user, settings):
+    storage = get_contribution_export_storage()
+    jobs = {}
+    for name, hours_ago in (("expired", settings.CONTRIBUTION_EXPORT_LINK_EXPIRY + 1), ("current", 1)):
+        job = ExportJob.get_or_create_active(hub_admin_user, {"name": [name]}, show_upgrade_prompt=False)[0]
+        job.file_name = storage.save(f"{name}/contributions.csv.gz", ContentFile(b"exported"))
+        job.status = ExportJobStatus.SUCCEEDED
+        job.finished_at = timezone.now() - timedelta(hours=hours_ago)
+        job.save()
+        jobs[name] = job
+    contribution_tasks.delete_expired_contribution_exports()
+    for job in jobs.values():
+        job.refresh_from_db()
+    assert jobs["expired"].file_name == ""
+    assert not storage.exists("expired/contributions.csv.gz")
+    assert storage.exists(jobs["current"].file_name)
 
 
 class TestTaskverifyAppleDomain:
@@ -185,6 +211,17 @@ class TestPingHealthChecks:
         contribution_tasks.ping_healthchecks(check_name="foo", healthcheck_url=(url := "https://foo"))
         mock_requests_get.assert_called_once_with(url, timeout=1)
 
+    def test_when_min_interval(self, mocker, settings):
+        settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+        mock_requests_get = mocker.patch("requests.get")
+        for _ in range(3):
+            contribution_tasks.ping_healthchecks(
+                check_name="foo", healthcheck_url=(url := "https://foo"), min_interval_seconds=60
+            )
+        mock_requests_get.assert_called_once_with(url, timeout=1)
+        contribution_tasks.ping_healthchecks(check_name="bar", healthcheck_url=url, min_interval_seconds=60)
+        assert mock_requests_get.call_count == 2
+
     def test_when_request_exception(self, mocker):
         logger_spy = mocker.spy(contribution_tasks.logger, "warning")
         mocker.patch("requests.get", side_effect=RequestException("Uh oh"))
@@ -220,6 +257,7 @@ class TestProcessStripeWebhookTask:
     def test_synchronously(self, contribution_found, payment_intent_payment_failed, mocker):
         mock_process = mocker.patch("apps.contributions.webhooks.StripeWebhookProcessor.process")
         mock_logger = mocker.patch("apps.contributions.tasks.logger.info")
+        mock_record = mocker.patch("apps.contributions.tasks.record_stripe_event_processed")
         if not contribution_found:
             mock_process.side_effect = Contribution.DoesNotExist
         contribution_tasks.process_stripe_webhook_task(raw_event_data=payment_intent_payment_failed)
@@ -227,7 +265,9 @@ class TestProcessStripeWebhookTask:
         if contribution_found:
             assert mock_logger.call_count == 1
             assert mock_logger.call_args == mocker.call("Processing Stripe webhook event with ID %s", mocker.ANY)
+            mock_record.assert_called_once_with(payment_intent_payment_failed["id"])
         else:
+            mock_record.assert_not_called()
             assert mock_logger.call_args == mocker.call(
                 "Could not find contribution. Here's the event data: %s", mocker.ANY, exc_info=True
             )
@@ -269,9 +309,93 @@ class TestProcessStripeWebhookTask:
         mock_ping_healthchecks = mocker.patch("apps.contributions.tasks.ping_healthchecks")
         contribution_tasks.process_stripe_webhook_task(payment_intent_payment_failed)
         mock_ping_healthchecks.assert_called_once_with(
-            "process_stripe_webhook_task", settings.HEALTHCHECK_URL_PROCESS_STRIPE_WEBHOOK_TASK
+            "process_stripe_webhook_task",
+            settings.HEALTHCHECK_URL_PROCESS_STRIPE_WEBHOOK_TASK,
+            min_interval_seconds=settings.HEALTHCHECK_PROCESS_STRIPE_WEBHOOK_TASK_MIN_INTERVAL,
+        )
+
+    def test_logs_queue_wait_when_enqueued_at(self, mocker: pytest_mock.MockerFixture, payment_intent_payment_failed):
+        mocker.patch.object(StripeWebhookProcessor, "__new__")
+        mocker.patch("apps.contributions.tasks.time.time", return_value=110.0)
+        mock_logger = mocker.patch("apps.contributions.tasks.logger.info")
+        contribution_tasks.process_stripe_webhook_task(raw_event_data=payment_intent_payment_failed, enqueued_at=100.0)
+        assert (
+            mocker.call(
+                "Stripe webhook event %s of type %s waited %.3f seconds on queue %s",
+                payment_intent_payment_failed["id"],
+                payment_intent_payment_failed["type"],
+                10.0,
+                None,
+            )
+            in mock_logger.call_args_list
         )
 
+    @pytest.mark.parametrize(
+        ("side_effect", "outcome"),
+        [(None, "processed"), (Contribution.DoesNotExist, "contribution_not_found"), (RuntimeError, "error")],
+    )
+    def test_records_metrics(
+        self, side_effect, outcome, mocker: pytest_mock.MockerFixture, payment_intent_payment_failed
+    ):
+        mocker.patch.object(StripeWebhookProcessor, "__new__").return_value.process.side_effect = side_effect
+        mocker.patch("apps.contributions.tasks.time.time", return_value=110.0)
+        mock_metrics = mocker.patch("apps.contributions.tasks.metrics")
+        mock_metrics.measure.return_value.__enter__.return_value = (
+            measurement := Measurement(duration_ms=5.0, db_queries=2, stripe_requests=1)
+        )
+        tags = {"event_type": payment_intent_payment_failed["type"]}
+        if side_effect is RuntimeError:
+            with pytest.raises(RuntimeError):
+                contribution_tasks.process_stripe_webhook_task(
+                    raw_event_data=payment_intent_payment_failed, enqueued_at=100.0
+                )
+        else:
+            contribution_tasks.process_stripe_webhook_task(
+                raw_event_data=payment_intent_payment_failed, enqueued_at=100.0
+            )
+        mock_metrics.timing.assert_has_calls(
+            [
+                mocker.call("stripe_webhook.queue_wait", 10000.0, tags=tags),
+                mocker.call("stripe_webhook.handler", measurement.duration_ms, tags=tags),
+            ]
+        )
+        mock_metrics.histogram.assert_has_calls(
+            [
+                mocker.call("stripe_webhook.stripe_requests", 1, tags=tags),
+                mocker.call("stripe_webhook.db_queries", 2, tags=tags),
+            ]
+        )
+        mock_metrics.incr.assert_called_once_with("stripe_webhook.outcome", tags={**tags, "outcome": outcome})
+
+
+class TestEnqueueStripeWebhook:
+    @pytest.mark.parametrize(
+        ("event_type", "expected_route"),
+        [
+            ("invoice.payment_succeeded", "STRIPE_WEBHOOK_ROUTE_TIME_SENSITIVE"),
+            ("payment_intent.canceled", "STRIPE_WEBHOOK_ROUTE_TIME_SENSITIVE"),
+            ("invoice.upcoming", "STRIPE_WEBHOOK_ROUTE_BULK"),
+            ("unexpected.event", "STRIPE_WEBHOOK_ROUTE_BULK"),
+        ],
+    )
+    def test_routes_by_event_type(self, event_type, expected_route, mocker: pytest_mock.MockerFixture):
+        mock_apply_async = mocker.patch("apps.contributions.tasks.process_stripe_webhook_task.apply_async")
+        mocker.patch("apps.contributions.tasks.time.time", return_value=(now := 123.0))
+        contribution_tasks.enqueue_stripe_webhook(event := {"id": "evt_1", "type": event_type})
+        route = getattr(settings, expected_route)
+        mock_apply_async.assert_called_once_with(
+            kwargs={"raw_event_data": event, "enqueued_at": now},
+            queue=route["queue"],
+            priority=route["priority"],
+        )
+
+    def test_respects_configured_queues(self, mocker: pytest_mock.MockerFixture, settings: SettingsWrapper):
+        settings.STRIPE_WEBHOOK_EVENT_ROUTES = {"invoice.upcoming": {"queue": "slow", "priority": 7}}
+        mock_apply_async = mocker.patch("apps.contributions.tasks.process_stripe_webhook_task.apply_async")
+        contribution_tasks.enqueue_stripe_webhook({"id": "evt_1", "type": "invoice.upcoming"})
+        assert mock_apply_async.call_args.kwargs["queue"] == "slow"
+        assert mock_apply_async.call_args.kwargs["priority"] == 7
+
 
 def test_on_process_stripe_webhook_task_failure(mocker):
     mock_logger = mocker.patch("apps.contributions.tasks.logger.error")
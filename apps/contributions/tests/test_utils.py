@@ -1,19 +1,32 @@
+import gzip
 import hashlib
 import io
 from csv import DictReader
 
+from django.core import signing
+
 import pytest
 
 from apps.contributions.models import Contribution
 from apps.contributions.tests.factories import ContributionFactory
 from apps.contributions.utils import (
     CONTRIBUTION_EXPORT_CSV_HEADERS,
-    export_contributions_to_csv,
+    export_contributions_to_csv_file,
+    get_contribution_export_download_url,
+    get_contribution_export_name_from_token,
+    get_contribution_export_storage,
     get_hub_stripe_api_key,
     get_sha256_hash,
+    write_contributions_csv,
 )
 
 
+def _render_csv(contributions) -> str:
+    with io.StringIO() as csv_file:
+        write_contributions_csv(contributions, csv_file)
+        return csv_file.getvalue()
+
+
 class TestUtils:
     def test_get_hub_stripe_api_key_returns_live_key_when_proper_setting(self, settings):
         settings.STRIPE_LIVE_MODE = True
@@ -36,7 +49,7 @@ def test_hash_is_salted(settings):
 
 
 @pytest.mark.django_db
-def test_export_contributions_to_csv():
+def test_write_contributions_csv():
     contributions = []
     for _ in range(5):
         contributions.extend(
@@ -46,7 +59,7 @@ def test_export_contributions_to_csv():
                 ContributionFactory(monthly_subscription=True),
             ]
         )
-    data = list(DictReader(io.StringIO(export_contributions_to_csv(contributions))))
+    data = list(DictReader(io.StringIO(_render_csv(contributions))))
     assert set(data[0].keys()) == set(CONTRIBUTION_EXPORT_CSV_HEADERS)
     assert {str(_.pk) for _ in contributions} == {_["Contribution ID"] for _ in data}
     for row in data:
@@ -82,3 +95,46 @@ def test_export_contributions_to_csv():
         assert row[CONTRIBUTION_EXPORT_CSV_HEADERS[15]] == (
             (contribution.contribution_metadata or {}).get("in_memory_of", "") or ""
         )
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("_in_memory_storage")
+def test_export_contributions_to_csv_file(settings, django_assert_num_queries):
+    settings.CONTRIBUTION_EXPORT_CHUNK_SIZE = 2
+    ContributionFactory.create_batch(3, one_time=True)
+    ContributionFactory(monthly_subscription=True)
+    contributions = Contribution.objects.order_by("id")
+    # The contributor is selected with each chunk of contributions, rather than queried per contribution
+    with django_assert_num_queries(1):
+        name = export_contributions_to_csv_file(contributions)
+    assert name.endswith("/contributions.csv.gz")
+    with get_contribution_export_storage().open(name, "rb") as f:
+        exported = gzip.decompress(f.read()).decode()
+    assert exported == _render_csv(contributions)
+    assert len(list(DictReader(io.StringIO(exported)))) == 4
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("_in_memory_storage")
+def test_export_contributions_to_csv_file_when_no_contributions():
+    name = export_contributions_to_csv_file(Contribution.objects.none())
+    with get_contribution_export_storage().open(name, "rb") as f:
+        assert gzip.decompress(f.read()).decode().strip() == ",".join(CONTRIBUTION_EXPORT_CSV_HEADERS)
+
+
+class TestContributionExportDownloadUrl:
+    def test_round_trip(self, settings):
+        settings.SITE_URL = "https://example.com"
+        url = get_contribution_export_download_url("exports/foo/contributions.csv.gz")
+        assert url.startswith("https://example.com/api/v1/contributions/exports/")
+        assert get_contribution_export_name_from_token(url.rstrip("/").rsplit("/", 1)[-1]) == (
+            "exports/foo/contributions.csv.gz"
+        )
+
+    def test_when_tampered(self):
+        token = signing.dumps("exports/foo/contributions.csv.gz", salt="some-other-salt")
+        assert get_contribution_export_name_from_token(token) is None
+
+    def test_when_expired(self, mocker):
+        mocker.patch("apps.contributions.utils.signing.loads", side_effect=signing.SignatureExpired("expired"))
+        assert get_contribution_export_name_from_token("token") is None
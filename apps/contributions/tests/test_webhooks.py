@@ -8,9 +8,13 @@ processor class that are worth unit testing in isolation.
 
 import json
 
+from django.contrib.contenttypes.models import ContentType
+
 import pytest
+import reversion
+from reversion.models import Revision, Version
 
-from apps.contributions.models import Contribution
+from apps.contributions.models import Contribution, Payment
 from apps.contributions.tests.factories import ContributionFactory, PaymentFactory
 from apps.contributions.typings import (
     STRIPE_PAYMENT_METADATA_SCHEMA_VERSIONS,
@@ -18,7 +22,11 @@ from apps.contributions.typings import (
     StripeEventData,
     cast_metadata_to_stripe_payment_metadata_schema,
 )
-from apps.contributions.webhooks import StripeWebhookProcessor
+from apps.contributions.webhooks import (
+    StripeWebhookProcessor,
+    get_processed_stripe_event_ids,
+    record_stripe_event_processed,
+)
 
 
 @pytest.mark.django_db
@@ -183,6 +191,72 @@ class TestStripeWebhookProcessor:
         mocker.patch.object(processor, "contribution", return_value=None, new_callable=mocker.PropertyMock)
         processor._add_pm_id_and_payment_method_details(pm_id="pm_id", update_data={})
 
+    def test__handle_pm_update_event_history_matches_per_row_save(
+        self, payment_method_attached_event, payment_method, mocker, django_assert_num_queries
+    ):
+        """Show that bulk updating contributions records the same version history that saving each one would."""
+        customer_id = payment_method_attached_event["data"]["object"]["customer"]
+        contributions = ContributionFactory.create_batch(
+            3, provider_customer_id=customer_id, provider_payment_method_id=None, provider_payment_method_details=None
+        )
+        for contribution in contributions[1:]:
+            PaymentFactory.create_batch(2, contribution=contribution)
+        unrelated = ContributionFactory(provider_customer_id="cus_unrelated")
+        save_spy = mocker.spy(Contribution, "save")
+        processor = StripeWebhookProcessor(event=StripeEventData(**payment_method_attached_event))
+        # Content types are cached once looked up
+        ContentType.objects.get_for_models(Contribution, Payment)
+        # Loading the contributions and their payments, updating them, and creating revisions and versions
+        with django_assert_num_queries(5):
+            processor._handle_pm_update_event(
+                query={"provider_customer_id": customer_id},
+                pm_id=payment_method.id,
+                caller=(caller := "test"),
+                payment_method=payment_method,
+            )
+        save_spy.assert_not_called()
+        assert not Version.objects.get_for_object(unrelated).exists()
+        assert len({Version.objects.get_for_object(x).get().revision_id for x in contributions}) == len(contributions)
+        for contribution in contributions:
+            bulk_version = Version.objects.get_for_object(contribution).get()
+            # this is what `_handle_pm_update_event` used to do for each contribution
+            contribution.refresh_from_db()
+            with reversion.create_revision():
+                contribution.save(
+                    update_fields={"provider_payment_method_id", "provider_payment_method_details", "modified"}
+                )
+                reversion.set_comment(f"Payment method data updated on behalf of {caller}")
+            per_row_version = Version.objects.get_for_object(contribution).first()
+            assert per_row_version != bulk_version
+            bulk_data = {k: v for k, v in bulk_version.field_dict.items() if k != "modified"}
+            per_row_data = {k: v for k, v in per_row_version.field_dict.items() if k != "modified"}
+            assert bulk_data == per_row_data
+            assert bulk_data["provider_payment_method_id"] == payment_method.id
+            assert bulk_data["provider_payment_method_details"] == payment_method
+            assert bulk_version.object_repr == per_row_version.object_repr
+            assert bulk_version.revision.comment == per_row_version.revision.comment
+            # Each revision also has versions of its contribution's payments, since contributions' registration follows them
+            bulk_followed, per_row_followed = (
+                {(x.content_type_id, x.object_id, x.serialized_data) for x in version.revision.version_set.all()}
+                - {(version.content_type_id, version.object_id, version.serialized_data)}
+                for version in (bulk_version, per_row_version)
+            )
+            assert bulk_followed == per_row_followed
+            assert len(bulk_followed) == contribution.payment_set.count()
+
+    def test__handle_pm_update_event_when_no_matching_contributions(
+        self, payment_method_attached_event, payment_method
+    ):
+        processor = StripeWebhookProcessor(event=StripeEventData(**payment_method_attached_event))
+        revision_count = Revision.objects.count()
+        processor._handle_pm_update_event(
+            query={"provider_customer_id": "cus_nonexistent"},
+            pm_id=payment_method.id,
+            caller="test",
+            payment_method=payment_method,
+        )
+        assert Revision.objects.count() == revision_count
+
     def test_handle_payment_method_attached_when_no_customer_id(self, mocker, payment_method_attached_event):
         payment_method_attached_event["data"]["object"]["customer"] = None
         processor = StripeWebhookProcessor(event=StripeEventData(**payment_method_attached_event))
@@ -357,3 +431,50 @@ class TestStripeWebhookProcessor:
             mock_send_receipt.assert_called_once_with(contribution=contribution, show_billing_history=False)
         else:
             mock_send_receipt.assert_not_called()
+
+    def test_handle_invoice_payment_succeeded_makes_single_stripe_call(
+        self,
+        invoice_payment_succeeded_for_recurring_payment_event,
+        payment_intent_for_recurring_charge,
+        balance_transaction_for_recurring_charge,
+        payment_method,
+        mocker,
+    ):
+        """Show that the payment method and balance transaction are derived from the expanded payment intent."""
+        event = invoice_payment_succeeded_for_recurring_payment_event
+        payment_intent_for_recurring_charge.payment_method = payment_method
+        payment_intent_for_recurring_charge.charges.data[0].balance_transaction = (
+            balance_transaction_for_recurring_charge
+        )
+        contribution = ContributionFactory(
+            provider_subscription_id=payment_intent_for_recurring_charge.invoice.subscription,
+            provider_payment_method_id=None,
+        )
+        event["data"]["object"]["subscription"] = contribution.provider_subscription_id
+        mock_pi_retrieve = mocker.patch(
+            "stripe.PaymentIntent.retrieve", return_value=payment_intent_for_recurring_charge
+        )
+        mock_pm_retrieve = mocker.patch("stripe.PaymentMethod.retrieve")
+        mock_bt_retrieve = mocker.patch("stripe.BalanceTransaction.retrieve")
+        mocker.patch("apps.emails.models.TransactionalEmailRecord.handle_receipt_email")
+        StripeWebhookProcessor(event=StripeEventData(**event)).handle_invoice_payment_succeeded()
+        mock_pi_retrieve.assert_called_once_with(
+            event["data"]["object"]["payment_intent"],
+            stripe_account=event["account"],
+            expand=["invoice", "payment_method", "charges.data.balance_transaction"],
+        )
+        mock_pm_retrieve.assert_not_called()
+        mock_bt_retrieve.assert_not_called()
+        contribution.refresh_from_db()
+        assert contribution.provider_payment_method_id == payment_method.id
+        assert contribution.provider_payment_method_details == payment_method
+        assert (
+            contribution.payment_set.get().stripe_balance_transaction_id == balance_transaction_for_recurring_charge.id
+        )
+
+
+def test_processed_stripe_event_record(settings):
+    settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    assert get_processed_stripe_event_ids(["evt_1", "evt_2"]) == set()
+    record_stripe_event_processed("evt_1")
+    assert get_processed_stripe_event_ids(["evt_1", "evt_2"]) == {"evt_1"}
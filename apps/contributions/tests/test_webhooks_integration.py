@@ -76,16 +76,15 @@ def test_payment_method_attached(client, mocker, payment_method_attached_event):
         provider_payment_method_id=None,
         provider_payment_method_details=None,
     )
-    mocker.patch(
-        "stripe.PaymentMethod.retrieve",
-        return_value=(pm := {"card": {"brand": "Visa", "last4": "4242"}}),
-    )
+    mock_pm_retrieve = mocker.patch("stripe.PaymentMethod.retrieve")
     header = {"HTTP_STRIPE_SIGNATURE": "testing", "content_type": "application/json"}
     response = client.post(reverse("stripe-webhooks-contributions"), data=payment_method_attached_event, **header)
     assert response.status_code == status.HTTP_200_OK
     contribution.refresh_from_db()
     assert contribution.provider_payment_method_id == payment_method_attached_event["data"]["object"]["id"]
-    assert contribution.provider_payment_method_details == pm
+    # the payment method is the event's object, so we don't need to retrieve it
+    assert contribution.provider_payment_method_details == payment_method_attached_event["data"]["object"]
+    mock_pm_retrieve.assert_not_called()
 
 
 @pytest.mark.django_db
@@ -481,7 +480,9 @@ class TestInvoicePaymentSucceeded:
         header = {"HTTP_STRIPE_SIGNATURE": "testing", "content_type": "application/json"}
         response = client.post(reverse("stripe-webhooks-contributions"), data=event, **header)
         assert response.status_code == status.HTTP_200_OK
-        Payment.from_stripe_invoice_payment_succeeded_event.assert_called_once_with(event=StripeEventData(**event))
+        Payment.from_stripe_invoice_payment_succeeded_event.assert_called_once_with(
+            event=StripeEventData(**event), payment_intent=mocker.ANY
+        )
         assert Payment.objects.count() == count + 1
         contribution.refresh_from_db()
         assert contribution.status == ContributionStatus.PAID
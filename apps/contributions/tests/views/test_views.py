@@ -6,8 +6,12 @@ from zoneinfo import ZoneInfo
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
+from django.core.files.base import ContentFile
 from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
 from django.db.models import Q
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
 import dateparser
 import pytest
@@ -31,18 +35,22 @@ from apps.contributions.models import (
     ContributionStatus,
     ContributionStatusError,
     Contributor,
+    DailyRevenueRollup,
+    ExportJob,
+    ExportJobStatus,
     Payment,
 )
 from apps.contributions.serializers import (
     PORTAL_CONTRIBUTION_DETAIL_SERIALIZER_DB_FIELDS,
     ContributionSerializer,
 )
-from apps.contributions.tasks import email_contribution_csv_export_to_user
+from apps.contributions.tasks import run_contribution_export_job
 from apps.contributions.tests.factories import (
     ContributionFactory,
     ContributorFactory,
     PaymentFactory,
 )
+from apps.contributions.utils import get_contribution_export_download_url, get_contribution_export_storage
 from apps.contributions.views.portal import PortalContributorsViewSet
 from apps.organizations.tests.factories import (
     OrganizationFactory,
@@ -367,6 +375,50 @@ class TestContributionsViewSet:
             else status.HTTP_401_UNAUTHORIZED
         )
 
+    @pytest.mark.parametrize("ordering", [None, "contributor_email,-amount", "-first_payment_date"])
+    def test_list_with_cursor(self, ordering, superuser, api_client):
+        """Show that the list is cursor paginated, following the requested ordering, when a cursor is passed."""
+        api_client.force_authenticate(superuser)
+        ContributionFactory.create_batch(size=5, status=ContributionStatus.PAID)
+        params = {"cursor": "", "page_size": 2} | ({"ordering": ordering} if ordering else {})
+        response = api_client.get(reverse("contribution-list"), params)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json().keys() == {"next", "previous", "results"}
+        assert response.json()["previous"] is None
+        seen = [x["id"] for x in response.json()["results"]]
+        while next_url := response.json()["next"]:
+            response = api_client.get(next_url)
+            assert response.status_code == status.HTTP_200_OK
+            seen.extend(x["id"] for x in response.json()["results"])
+        assert sorted(seen) == sorted(Contribution.objects.values_list("id", flat=True))
+
+    @pytest.mark.parametrize("action", ["list", "retrieve"])
+    def test_query_count_does_not_grow_with_contributions(self, action, superuser, api_client, mocker):
+        mocker.patch("stripe.Subscription.retrieve", return_value=AttrDict(status="active"))
+        api_client.force_authenticate(superuser)
+
+        def _count_queries() -> int:
+            with CaptureQueriesContext(connection) as context:
+                if action == "list":
+                    response = api_client.get(reverse("contribution-list"), {"page_size": 100})
+                    assert len(response.json()["results"]) == Contribution.objects.count()
+                else:
+                    response = api_client.get(reverse("contribution-detail", args=(Contribution.objects.last().id,)))
+            assert response.status_code == status.HTTP_200_OK
+            return len(context.captured_queries)
+
+        ContributionFactory(one_time=True)
+        expected = _count_queries()
+        ContributionFactory(monthly_subscription=True, donation_page__revenue_program__default_donation_page=None)
+        ContributionFactory(annual_subscription=True, donation_page=None, _revenue_program=RevenueProgramFactory())
+        ContributionFactory.create_batch(3, flagged=True)
+        assert _count_queries() == expected
+
+    def test_list_with_invalid_cursor(self, superuser, api_client):
+        api_client.force_authenticate(superuser)
+        response = api_client.get(reverse("contribution-list"), {"cursor": "nope"})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
     def test_excludes_statuses_correctly_for_expected_non_contributor_users(
         self,
         non_contributor_user,
@@ -395,6 +447,7 @@ class TestContributionsViewSet:
         if not (non_contributor_user.is_superuser or non_contributor_user.roleassignment.role_type == Roles.HUB_ADMIN):
             # ensure all contributions are owned by user so we're narrowly viewing behavior around status inclusion/exclusion
             DonationPage.objects.update(revenue_program=non_contributor_user.roleassignment.revenue_programs.first())
+            Contribution.objects.update_effective_revenue_program()
         api_client.force_authenticate(non_contributor_user)
         response = api_client.get(reverse("contribution-list"))
         assert response.status_code == status.HTTP_200_OK
@@ -690,16 +743,45 @@ class TestContributionsViewSetExportCSV:
         )
         assert expected.count()
         assert (not_expected.count() == 0) if user.is_staff else (not_expected.count() > 0)
-        filter_spy = mocker.spy(Contribution.objects, "filtered_by_role_assignment")
-        email_export_spy = mocker.spy(email_contribution_csv_export_to_user, "delay")
+        mock_delay = mocker.patch.object(run_contribution_export_job, "delay")
         response = api_client.post(reverse("contribution-email-contributions"))
         assert response.status_code == status.HTTP_200_OK
-        email_export_spy.assert_called_once()
-        assert set(email_export_spy.call_args[0][0]) == set(expected.values_list("id", flat=True))
-        assert email_export_spy.call_args[0][1] == user.email
-        if (ra := user.get_role_assignment()) is not None:
+        job = ExportJob.objects.get(pk=response.json()["export_job"])
+        mock_delay.assert_called_once_with(job.id)
+        assert job.user == user
+        assert job.status == ExportJobStatus.PENDING
+        filter_spy = mocker.spy(Contribution.objects, "filtered_by_role_assignment")
+        assert set(job.get_contributions().values_list("id", flat=True)) == set(expected.values_list("id", flat=True))
+        if (ra := user.get_role_assignment()) is not None and not user.is_superuser:
             filter_spy.assert_called_once_with(ra)
 
+    def test_stores_filters_and_dedupes(self, hub_admin_user, api_client, mocker):
+        api_client.force_authenticate(hub_admin_user)
+        paid = ContributionFactory(one_time=True, status=ContributionStatus.PAID)
+        ContributionFactory(one_time=True, status=ContributionStatus.FAILED)
+        mock_delay = mocker.patch.object(run_contribution_export_job, "delay")
+        url = f"{reverse('contribution-email-contributions')}?status=paid&page=2&page_size=5"
+        response = api_client.post(url)
+        assert response.status_code == status.HTTP_200_OK
+        job = ExportJob.objects.get(pk=response.json()["export_job"])
+        assert job.query_params == {"status": ["paid"]}
+        assert list(job.get_contributions()) == [paid]
+        # An identical request while the first is still pending doesn't start another export
+        assert api_client.post(url).json()["export_job"] == job.id
+        mock_delay.assert_called_once_with(job.id)
+        # But a different one does
+        assert api_client.post(reverse("contribution-email-contributions")).json()["export_job"] != job.id
+        assert mock_delay.call_count == 2
+
+    def test_when_invalid_filter(self, hub_admin_user, api_client, mocker):
+        api_client.force_authenticate(hub_admin_user)
+        mock_delay = mocker.patch.object(run_contribution_export_job, "delay")
+        response = api_client.post(f"{reverse('contribution-email-contributions')}?amount__gt=abc")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "amount__gt" in response.json()
+        mock_delay.assert_not_called()
+        assert not ExportJob.objects.exists()
+
     @pytest.fixture(
         params=[
             ("contributor_user", status.HTTP_403_FORBIDDEN),
@@ -717,6 +799,95 @@ class TestContributionsViewSetExportCSV:
         assert api_client.get(reverse("contribution-email-contributions")).status_code == expected_status
 
 
+@pytest.mark.django_db
+class TestContributionsViewSetRevenueSummary:
+    DAY = datetime.date(2024, 3, 1)
+
+    @pytest.fixture
+    def payments(self, rp_user):
+        owned = rp_user.roleassignment.revenue_programs.first()
+        times = [
+            datetime.datetime.combine(
+                self.DAY + datetime.timedelta(days=x), datetime.time(12), tzinfo=datetime.timezone.utc
+            )
+            for x in (0, 0, 1)
+        ]
+        payments = [
+            *(
+                PaymentFactory(
+                    contribution__donation_page__revenue_program=owned,
+                    contribution__status=ContributionStatus.PAID,
+                    contribution__interval=ContributionInterval.ONE_TIME,
+                    transaction_time=x,
+                    net_amount_paid=100,
+                )
+                for x in times
+            ),
+            PaymentFactory(transaction_time=times[0]),
+        ]
+        # Rollups are otherwise refreshed by a task queued once the payments commit
+        for revenue_program_id in {x.contribution.effective_revenue_program_id for x in payments}:
+            DailyRevenueRollup.refresh(revenue_program_id)
+        return payments
+
+    def _get(self, api_client, user, **params):
+        api_client.force_authenticate(user)
+        return api_client.get(reverse("contribution-revenue-summary"), params)
+
+    def test_by_day(self, rp_user, payments, api_client):
+        response = self._get(api_client, rp_user, start=self.DAY, end=self.DAY + datetime.timedelta(days=1))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["granularity"] == "day"
+        owned = rp_user.roleassignment.revenue_programs.first().id
+        assert [
+            (x["period"], x["revenue_program"], x["payment_count"], x["net_amount_paid"])
+            for x in response.json()["results"]
+        ] == [
+            (str(self.DAY), owned, 2, 200),
+            (str(self.DAY + datetime.timedelta(days=1)), owned, 1, 100),
+        ]
+
+    def test_by_month(self, hub_admin_user, payments, api_client):
+        response = self._get(
+            api_client, hub_admin_user, start=self.DAY, end=self.DAY + datetime.timedelta(days=1), granularity="month"
+        )
+        assert response.status_code == status.HTTP_200_OK
+        results = response.json()["results"]
+        assert {x["period"] for x in results} == {str(self.DAY)}
+        assert sum(x["payment_count"] for x in results) == 4
+        revenue_program = payments[-1].contribution.effective_revenue_program_id
+        response = self._get(
+            api_client,
+            hub_admin_user,
+            start=self.DAY,
+            end=self.DAY,
+            granularity="month",
+            revenue_program=revenue_program,
+        )
+        assert [x["revenue_program"] for x in response.json()["results"]] == [revenue_program]
+
+    def test_defaults_to_recent_days(self, hub_admin_user, payments, api_client):
+        response = self._get(api_client, hub_admin_user)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["end"] == str(timezone.localdate())
+        assert response.json()["results"] == []
+
+    def test_does_not_aggregate_payments(self, hub_admin_user, payments, api_client):
+        with CaptureQueriesContext(connection) as context:
+            self._get(api_client, hub_admin_user, start=self.DAY, end=self.DAY)
+        assert not any("contributions_payment" in x["sql"] for x in context.captured_queries)
+
+    @pytest.mark.parametrize(
+        "params",
+        [{"start": "nope"}, {"granularity": "year"}, {"start": "2024-03-02", "end": "2024-03-01"}],
+    )
+    def test_when_invalid_params(self, hub_admin_user, api_client, params):
+        assert self._get(api_client, hub_admin_user, **params).status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_when_unauthorized(self, contributor_user, api_client):
+        assert self._get(api_client, contributor_user).status_code == status.HTTP_403_FORBIDDEN
+
+
 @pytest.mark.parametrize(
     (
         "is_active_for_everyone",
@@ -1007,6 +1178,34 @@ class TestPaymentViewset:
         assert response.json() == {"detail": "Something went wrong"}
 
 
+@pytest.mark.usefixtures("_in_memory_storage")
+class TestDownloadContributionExport:
+    @pytest.fixture
+    def export_name(self):
+        return get_contribution_export_storage().save("abc/contributions.csv.gz", ContentFile(b"exported"))
+
+    def test_happy_path(self, client, export_name):
+        response = client.get(get_contribution_export_download_url(export_name))
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "application/gzip"
+        assert response["Content-Disposition"] == 'attachment; filename="contributions.csv.gz"'
+        assert b"".join(response.streaming_content) == b"exported"
+
+    def test_when_invalid_token(self, client, export_name):
+        response = client.get(reverse("contribution-export-download", kwargs={"token": "not-a-token"}))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_when_file_missing(self, client, export_name):
+        url = get_contribution_export_download_url(export_name)
+        get_contribution_export_storage().delete(export_name)
+        assert client.get(url).status_code == status.HTTP_404_NOT_FOUND
+
+    def test_when_not_get(self, client, export_name):
+        assert client.post(get_contribution_export_download_url(export_name)).status_code == (
+            status.HTTP_405_METHOD_NOT_ALLOWED
+        )
+
+
 class TestProcessStripeWebhook:
     """Additional tests.
 
@@ -1020,20 +1219,20 @@ class TestProcessStripeWebhook:
 
     def test_happy_path(self, api_client, mocker):
         mocker.patch("stripe.Webhook.construct_event", return_value=(event := mocker.Mock()))
-        mock_process_task = mocker.patch("apps.contributions.views.webhooks.process_stripe_webhook_task.delay")
+        mock_enqueue = mocker.patch("apps.contributions.views.webhooks.enqueue_stripe_webhook")
         header = {"HTTP_STRIPE_SIGNATURE": "testing", "content_type": "application/json"}
         response = api_client.post(reverse("stripe-webhooks-contributions"), data={}, **header)
         assert response.status_code == status.HTTP_200_OK
-        mock_process_task.assert_called_once_with(raw_event_data=event)
+        mock_enqueue.assert_called_once_with(event)
 
     def test_when_value_error_on_construct_event(self, api_client, mocker):
         logger_spy = mocker.patch("apps.contributions.views.webhooks.logger.warning")
         mocker.patch("stripe.Webhook.construct_event", side_effect=ValueError("ruh roh"))
-        mock_process_task = mocker.patch("apps.contributions.views.webhooks.process_stripe_webhook_task.delay")
+        mock_enqueue = mocker.patch("apps.contributions.views.webhooks.enqueue_stripe_webhook")
         header = {"HTTP_STRIPE_SIGNATURE": "testing", "content_type": "application/json"}
         response = api_client.post(reverse("stripe-webhooks-contributions"), data={"foo": "bar"}, **header)
         assert response.status_code == status.HTTP_400_BAD_REQUEST
-        mock_process_task.assert_not_called()
+        mock_enqueue.assert_not_called()
         logger_spy.assert_called_once_with("Invalid payload from Stripe webhook request")
 
     def test_when_signature_verification_error(self, api_client, mocker):
@@ -1041,11 +1240,11 @@ class TestProcessStripeWebhook:
         mocker.patch(
             "stripe.Webhook.construct_event", side_effect=stripe.error.SignatureVerificationError("ruh roh", "sig")
         )
-        mock_process_task = mocker.patch("apps.contributions.views.webhooks.process_stripe_webhook_task.delay")
+        mock_enqueue = mocker.patch("apps.contributions.views.webhooks.enqueue_stripe_webhook")
         header = {"HTTP_STRIPE_SIGNATURE": "testing", "content_type": "application/json"}
         response = api_client.post(reverse("stripe-webhooks-contributions"), data={"foo": "bar"}, **header)
         assert response.status_code == status.HTTP_400_BAD_REQUEST
-        mock_process_task.assert_not_called()
+        mock_enqueue.assert_not_called()
         logger_spy.assert_called_once_with(
             "Invalid signature on Stripe webhook request. Is STRIPE_WEBHOOK_SECRET_CONTRIBUTIONS set correctly?"
         )
@@ -1422,6 +1621,85 @@ class TestPortalContributorsViewSet:
         response = api_client.get(response.json()["next"])
         assert response.status_code == status.HTTP_200_OK
 
+    def test_contributions_list_query_count_does_not_grow_with_contributions(self, api_client, mocker):
+        mocker.patch(
+            "stripe.Subscription.retrieve", return_value=AttrDict(status="active", current_period_end=1_700_000_000)
+        )
+        mocker.patch("stripe.PaymentMethod.retrieve", return_value=AttrDict(type="card"))
+        contributor = ContributorFactory()
+        api_client.force_authenticate(contributor)
+
+        def _count_queries() -> int:
+            with CaptureQueriesContext(connection) as context:
+                response = api_client.get(
+                    reverse("portal-contributor-contributions-list", args=(contributor.id,)), {"page_size": 100}
+                )
+            assert response.status_code == status.HTTP_200_OK
+            assert len(response.json()["results"]) == contributor.contribution_set.count()
+            return len(context.captured_queries)
+
+        ContributionFactory(one_time=True, contributor=contributor)
+        expected = _count_queries()
+        ContributionFactory.create_batch(2, monthly_subscription=True, contributor=contributor)
+        ContributionFactory(
+            one_time=True, contributor=contributor, donation_page=None, _revenue_program=RevenueProgramFactory()
+        )
+        assert _count_queries() == expected
+
+    def test_contribution_detail_query_count_does_not_grow_with_payments(self, api_client, mocker):
+        mocker.patch(
+            "stripe.Subscription.retrieve", return_value=AttrDict(status="active", current_period_end=1_700_000_000)
+        )
+        mocker.patch("stripe.PaymentMethod.retrieve", return_value=AttrDict(type="card"))
+        contribution = ContributionFactory(monthly_subscription=True)
+        api_client.force_authenticate(contribution.contributor)
+
+        def _count_queries() -> int:
+            with CaptureQueriesContext(connection) as context:
+                response = api_client.get(
+                    reverse(
+                        "portal-contributor-contribution-detail", args=(contribution.contributor.id, contribution.id)
+                    )
+                )
+            assert response.status_code == status.HTTP_200_OK
+            assert len(response.json()["payments"]) == contribution.payment_set.count()
+            return len(context.captured_queries)
+
+        PaymentFactory(contribution=contribution)
+        expected = _count_queries()
+        PaymentFactory.create_batch(3, contribution=contribution)
+        assert _count_queries() == expected
+
+    def test_contributions_list_cursor_pagination_behavior(
+        self, api_client, mocker, stripe_customer_default_source_expanded, stripe_payment_method
+    ):
+        mocker.patch(
+            "stripe.Customer.retrieve",
+            stripe.Customer.construct_from(stripe_customer_default_source_expanded, "some-id"),
+        )
+        mocker.patch(
+            "stripe.PaymentMethod.retrieve",
+            return_value=stripe.PaymentMethod.construct_from(stripe_payment_method, "some-id"),
+        )
+        contributor = ContributorFactory()
+        ContributionFactory.create_batch(
+            25, contributor=contributor, donation_page=DonationPageFactory(), status=ContributionStatus.PAID
+        )
+        api_client.force_authenticate(contributor)
+        url = reverse("portal-contributor-contributions-list", args=(contributor.id,))
+        response = api_client.get(url, {"cursor": "", "ordering": "-amount", "page_size": 3})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json().keys() == {"next", "previous", "results"}
+        seen = response.json()["results"]
+        while next_url := response.json()["next"]:
+            response = api_client.get(next_url)
+            assert response.status_code == status.HTTP_200_OK
+            seen.extend(response.json()["results"])
+        assert response.json()["previous"]
+        expected = api_client.get(url, {"page_size": 25}).json()["results"]
+        assert sorted(x["id"] for x in seen) == sorted(x["id"] for x in expected)
+        assert [x["amount"] for x in seen] == sorted((x["amount"] for x in seen), reverse=True)
+
     @pytest.fixture(params=["superuser", "hub_admin_user", "org_user_free_plan", "rp_user"])
     def non_contributor_user(self, request):
         return request.getfixturevalue(request.param)
@@ -3,7 +3,7 @@ from django.urls import path, re_path
 
 from rest_framework import routers
 
-from apps.contributions.views import checkout, orgs, portal, webhooks
+from apps.contributions.views import checkout, exports, orgs, portal, webhooks
 
 
 router = routers.DefaultRouter()
@@ -12,6 +12,11 @@ router.register(r"payments", checkout.PaymentViewset, basename="payment")
 router.register(r"contributors", portal.PortalContributorsViewSet, basename="portal-contributor")
 urlpatterns = [
     path("stripe/oauth/", orgs.stripe_oauth, name="stripe-oauth"),
+    path(
+        "contributions/exports/<str:token>/",
+        exports.download_contribution_export,
+        name="contribution-export-download",
+    ),
     re_path(
         settings.WEBHOOK_URL,
         webhooks.process_stripe_webhook,
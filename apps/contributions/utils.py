@@ -1,11 +1,19 @@
 import csv
+import gzip
 import hashlib
+import io
 import logging
-from io import StringIO
-from typing import TYPE_CHECKING
+import tempfile
+import uuid
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING, TextIO
 
 from django.conf import settings
+from django.core import signing
+from django.core.files import File
+from django.core.files.storage import Storage, storages
 from django.db.models import QuerySet
+from django.urls import reverse
 
 
 if TYPE_CHECKING:
@@ -70,43 +78,115 @@ CONTRIBUTION_EXPORT_CSV_HEADERS = (
 )
 
 
-def export_contributions_to_csv(contributions: QuerySet["Contribution"]):
-    data = []
+def get_contribution_export_row(contribution: "Contribution") -> dict:
+    contributor = contribution.contributor
+    if not contributor:
+        logger.warning(
+            "`get_contribution_export_row` encountered a contribution (ID %s) that does not have an associated contributor."
+            " This contribution will be included in the export, but will have a missing value for the %s field.",
+            contribution.id,
+            CSV_HEADER_EMAIL,
+        )
+    metadata = contribution.contribution_metadata or {}
+    return {
+        CSV_HEADER_CONTRIBUTION_ID: contribution.id,
+        CSV_HEADER_CONTRIBUTOR: contribution.billing_name,
+        CSV_HEADER_CURRENCY: contribution.currency.upper(),
+        CSV_HEADER_AMOUNT: f"{contribution.amount / 100:.2f}",
+        CSV_HEADER_DONOR_SELECTED_AMOUNT: (
+            f"{contribution.donor_selected_amount:.2f}" if contribution.donor_selected_amount else ""
+        ),
+        CSV_HEADER_AGREED_TO_PAY_FEES: metadata.get("agreed_to_pay_fees", ""),
+        CSV_HEADER_FREQUENCY: contribution.interval,
+        CSV_HEADER_PAYMENT_DATE: contribution.created,
+        CSV_HEADER_PAYMENT_STATUS: contribution.status,
+        CSV_HEADER_ADDRESS: contribution.billing_address,
+        CSV_HEADER_EMAIL: contributor.email if contributor else None,
+        CSV_HEADER_PHONE: contribution.billing_phone,
+        CSV_HEADER_PAGE_URL: metadata.get("referer"),
+        CSV_HEADER_REASON_FOR_GIVING: metadata.get("reason_for_giving", ""),
+        CSV_HEADER_HONOREE: metadata.get("honoree", ""),
+        CSV_HEADER_IN_MEMORY_OF: metadata.get("in_memory_of", ""),
+    }
+
+
+def write_contributions_csv(
+    contributions: Iterable["Contribution"],
+    csv_file: TextIO,
+    on_progress: Callable[[int], None] | None = None,
+    progress_every: int = 1000,
+) -> int:
+    """Write a CSV of contributions to a file one row at a time, returning the number of rows written.
+
+    If given, `on_progress` is called with the number of rows written so far after every `progress_every` rows, and once
+    all rows are written.
+    """
+    csv_writer = csv.DictWriter(csv_file, fieldnames=CONTRIBUTION_EXPORT_CSV_HEADERS)
+    csv_writer.writeheader()
+    count = 0
     for contribution in contributions:
-        contributor = contribution.contributor
-        if not contributor:
-            logger.warning(
-                "`export_contributions_to_csv` encountered a contribution (ID %s) that does not have an associated contributor."
-                " This contribution will be included in the export, but will have a missing value for the %s field.",
-                contribution.id,
-                CSV_HEADER_EMAIL,
-            )
-        metadata = contribution.contribution_metadata or {}
-        data.append(
-            {
-                CSV_HEADER_CONTRIBUTION_ID: contribution.id,
-                CSV_HEADER_CONTRIBUTOR: contribution.billing_name,
-                CSV_HEADER_CURRENCY: contribution.currency.upper(),
-                CSV_HEADER_AMOUNT: f"{contribution.amount / 100:.2f}",
-                CSV_HEADER_DONOR_SELECTED_AMOUNT: (
-                    f"{contribution.donor_selected_amount:.2f}" if contribution.donor_selected_amount else ""
+        csv_writer.writerow(get_contribution_export_row(contribution))
+        count += 1
+        if on_progress and count % progress_every == 0:
+            on_progress(count)
+    if on_progress and count % progress_every:
+        on_progress(count)
+    return count
+
+
+def get_contribution_export_storage() -> Storage:
+    """Return the storage contribution exports are written to, which is kept apart from publicly served media."""
+    return storages["contribution_exports"]
+
+
+def export_contributions_to_csv_file(
+    contributions: QuerySet["Contribution"], on_progress: Callable[[int], None] | None = None
+) -> str:
+    """Write a gzipped CSV of contributions to file storage, returning the stored file's name.
+
+    Contributions are read from the database in chunks and each row is compressed to a temporary file as it's written,
+    which is then uploaded to storage in chunks, so memory use doesn't grow with the number of contributions.
+
+    If given, `on_progress` is called with the number of contributions written so far after each chunk, and at the end.
+    """
+    with tempfile.TemporaryFile() as temp_file:
+        with (
+            gzip.GzipFile(fileobj=temp_file, mode="wb") as gzip_file,
+            io.TextIOWrapper(gzip_file, encoding="utf-8", errors="backslashreplace", newline="") as csv_file,
+        ):
+            count = write_contributions_csv(
+                contributions.select_related("contributor").iterator(
+                    chunk_size=settings.CONTRIBUTION_EXPORT_CHUNK_SIZE
                 ),
-                CSV_HEADER_AGREED_TO_PAY_FEES: metadata.get("agreed_to_pay_fees", ""),
-                CSV_HEADER_FREQUENCY: contribution.interval,
-                CSV_HEADER_PAYMENT_DATE: contribution.created,
-                CSV_HEADER_PAYMENT_STATUS: contribution.status,
-                CSV_HEADER_ADDRESS: contribution.billing_address,
-                CSV_HEADER_EMAIL: contributor.email if contributor else None,
-                CSV_HEADER_PHONE: contribution.billing_phone,
-                CSV_HEADER_PAGE_URL: metadata.get("referer"),
-                CSV_HEADER_REASON_FOR_GIVING: metadata.get("reason_for_giving", ""),
-                CSV_HEADER_HONOREE: metadata.get("honoree", ""),
-                CSV_HEADER_IN_MEMORY_OF: metadata.get("in_memory_of", ""),
-            }
-        )
+                csv_file,
+                on_progress=on_progress,
+                progress_every=settings.CONTRIBUTION_EXPORT_CHUNK_SIZE,
+            )
+        temp_file.seek(0)
+        name = get_contribution_export_storage().save(f"{uuid.uuid4()}/contributions.csv.gz", File(temp_file))
+    logger.info("Exported %s contributions to %s", count, name)
+    return name
+
+
+CONTRIBUTION_EXPORT_SIGNING_SALT = "contribution-export-download"
 
-    with StringIO() as csv_file:
-        csv_writer = csv.DictWriter(csv_file, fieldnames=CONTRIBUTION_EXPORT_CSV_HEADERS)
-        csv_writer.writeheader()
-        csv_writer.writerows(data)
-        return csv_file.getvalue()
+
+def get_contribution_export_download_url(name: str) -> str:
+    """Get an absolute URL from which a stored contributions export can be downloaded, without logging in.
+
+    The URL is signed, and expires after `settings.CONTRIBUTION_EXPORT_LINK_EXPIRY` hours.
+    """
+    token = signing.dumps(name, salt=CONTRIBUTION_EXPORT_SIGNING_SALT)
+    return f"{settings.SITE_URL}{reverse('contribution-export-download', kwargs={'token': token})}"
+
+
+def get_contribution_export_name_from_token(token: str) -> str | None:
+    """Get the stored file name from a download token, or None if the token is invalid or expired."""
+    try:
+        return signing.loads(
+            token, salt=CONTRIBUTION_EXPORT_SIGNING_SALT, max_age=60 * 60 * settings.CONTRIBUTION_EXPORT_LINK_EXPIRY
+        )
+    except signing.BadSignature:
+        # NB: SignatureExpired is a subclass of BadSignature
+        logger.info("Invalid or expired contribution export download token")
+        return None
@@ -0,0 +1,31 @@
+"""Contains views for downloading contribution exports."""
+
+import logging
+
+from django.conf import settings
+from django.http import FileResponse, Http404
+from django.views.decorators.http import require_GET
+
+from apps.contributions.utils import get_contribution_export_name_from_token, get_contribution_export_storage
+
+
+logger = logging.getLogger(f"{settings.DEFAULT_LOGGER}.{__name__}")
+
+
+@require_GET
+def download_contribution_export(request, token: str) -> FileResponse:
+    """Stream a stored contributions export to the client.
+
+    This doesn't require authentication: the link is emailed to the user who requested the export, and the token in it is
+    signed and expires. See `apps.contributions.utils.get_contribution_export_download_url`.
+    """
+    storage = get_contribution_export_storage()
+    if not (name := get_contribution_export_name_from_token(token)) or not storage.exists(name):
+        raise Http404("Export not found or link expired")
+    logger.info("Serving contribution export %s", name)
+    return FileResponse(
+        storage.open(name, "rb"),
+        as_attachment=True,
+        filename="contributions.csv.gz",
+        content_type="application/gzip",
+    )
@@ -3,6 +3,8 @@
 import logging
 
 from django.conf import settings
+from django.db.models import F, Sum
+from django.db.models.functions import TruncMonth
 
 import stripe
 from django_filters.rest_framework import DjangoFilterBackend
@@ -14,6 +16,7 @@ from reversion.views import create_revision
 
 from apps.activity_log.models import ActivityLog
 from apps.api.exceptions import ApiConfigurationError
+from apps.api.pagination import OptInCursorPaginationMixin
 from apps.api.permissions import (
     HasFlaggedAccessToContributionsApiResource,
     HasRoleAssignment,
@@ -21,9 +24,15 @@ from apps.api.permissions import (
 )
 from apps.contributions import serializers
 from apps.contributions.filters import ContributionFilter
-from apps.contributions.models import Contribution, ContributionInterval, ContributionStatusError
+from apps.contributions.models import (
+    Contribution,
+    ContributionInterval,
+    ContributionStatusError,
+    DailyRevenueRollup,
+    ExportJob,
+)
 from apps.contributions.tasks import (
-    email_contribution_csv_export_to_user,
+    run_contribution_export_job,
     task_verify_apple_domain,
 )
 from apps.emails.models import TransactionalEmailRecord
@@ -104,10 +113,13 @@ def stripe_oauth(request):
     return Response({"detail": "success"}, status=status.HTTP_200_OK)
 
 
-class ContributionsViewSet(viewsets.ReadOnlyModelViewSet):
+class ContributionsViewSet(OptInCursorPaginationMixin, viewsets.ReadOnlyModelViewSet):
     """Contributions API resource.
 
     NB: There are bespoke actions on this viewset that override the default permission classes set here.
+
+    The list is paginated by page number by default, or by cursor when the `cursor` query parameter is present, which
+    avoids counting and offsetting through an org's full set of contributions.
     """
 
     permission_classes = [
@@ -116,20 +128,32 @@ class ContributionsViewSet(viewsets.ReadOnlyModelViewSet):
     ]
     model = Contribution
     filterset_class = ContributionFilter
+    # Query params that don't affect which contributions are returned, so aren't recorded for exports
+    PAGINATION_QUERY_PARAMS = ("page", "page_size", "cursor")
     filter_backends = [DjangoFilterBackend]
     serializer_class = serializers.ContributionSerializer
 
     def get_queryset(self):
-        """Return the right results to the right user."""
+        """Return the right results to the right user.
+
+        When listing or retrieving, we apply the query plan declared on the serializer so that the number of queries
+        doesn't grow with the number of contributions serialized.
+        """
         ra = getattr((user := self.request.user), "get_role_assignment", lambda: None)()
         if user.is_anonymous:
-            return self.model.objects.none().with_first_payment_date()
-        if user.is_superuser:
-            return self.model.objects.all().with_first_payment_date()
-        if ra:
-            return self.model.objects.filtered_by_role_assignment(ra).with_first_payment_date()
-        logger.warning("Encountered unexpected user %s", user.id)
-        raise ApiConfigurationError
+            qs = self.model.objects.none()
+        elif user.is_superuser:
+            qs = self.model.objects.all()
+        elif ra:
+            qs = self.model.objects.filtered_by_role_assignment(ra)
+        else:
+            logger.warning("Encountered unexpected user %s", user.id)
+            raise ApiConfigurationError
+        qs = qs.with_first_payment_date()
+        if self.action in ("list", "retrieve"):
+            serializer = self.get_serializer_class()
+            qs = qs.select_related(*serializer._SELECT_RELATED).only(*serializer._ONLIES)
+        return qs
 
     def destroy(self, request, pk: int) -> Response:
         """Cancel a recurring contribution.
@@ -186,6 +210,48 @@ class ContributionsViewSet(viewsets.ReadOnlyModelViewSet):
         )
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    @action(methods=["get"], detail=False, url_path="revenue-summary")
+    def revenue_summary(self, request) -> Response:
+        """Summarize payments to the revenue programs the user has access to, by day or month.
+
+        Totals are broken down by revenue program and contribution interval, status, and currency. They're served from
+        `DailyRevenueRollup`s, so this doesn't aggregate over payments or contributions.
+        """
+        params = serializers.RevenueSummaryQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        revenue_programs = (
+            RevenueProgram.objects.all()
+            if request.user.is_superuser
+            else RevenueProgram.objects.filtered_by_role_assignment(request.user.get_role_assignment())
+        )
+        rollups = DailyRevenueRollup.objects.filter(
+            revenue_program__in=revenue_programs,
+            date__gte=params.validated_data["start"],
+            date__lte=params.validated_data["end"],
+        )
+        if (revenue_program_id := params.validated_data.get("revenue_program")) is not None:
+            rollups = rollups.filter(revenue_program_id=revenue_program_id)
+        dimensions = ("period", "revenue_program", "interval", "status", "currency")
+        rows = (
+            rollups.values(
+                "revenue_program",
+                "interval",
+                "status",
+                "currency",
+                period=TruncMonth("date") if params.validated_data["granularity"] == "month" else F("date"),
+            )
+            .annotate(**{f"total_{x}": Sum(x) for x in DailyRevenueRollup.AMOUNT_FIELDS})
+            .order_by(*dimensions)
+        )
+        return Response(
+            {
+                "start": params.validated_data["start"],
+                "end": params.validated_data["end"],
+                "granularity": params.validated_data["granularity"],
+                "results": serializers.RevenueSummarySerializer(rows, many=True).data,
+            }
+        )
+
     @action(
         methods=["post"],
         url_path="email-contributions",
@@ -198,25 +264,33 @@ class ContributionsViewSet(viewsets.ReadOnlyModelViewSet):
         Any user who has role and authenticated will be able to call the endpoint.
         Contributor will not be able to access this endpoint as it's being integrated with the Contribution Dashboard
         as contributors will be able to access only Contributor Portal via magic link.
+
+        Contributions can be filtered with the same query params as the list endpoint. Rather than finding the
+        contributions here, we record an export job with the filters, which the worker re-evaluates. If the user
+        already has an identical export pending or running, we don't start another.
         """
-        logger.info(
-            "enqueueing email_contribution_csv_export_to_user task for user %s",
-            request.user,
-        )
-        logger.debug(
-            "enqueueing email_contribution_csv_export_to_user task for request: %s",
-            request,
-        )
+        filterset = ContributionFilter(request.query_params, queryset=Contribution.objects.none())
+        if not filterset.is_valid():
+            return Response(filterset.errors, status=status.HTTP_400_BAD_REQUEST)
         ra = request.user.get_role_assignment()
-        show_upgrade_prompt = (
+        show_upgrade_prompt = bool(
             not request.user.is_superuser
             and ra
             and (org := getattr(ra, "organization", None))
             and org.plan.name == "FREE"
         )
-        email_contribution_csv_export_to_user.delay(
-            list(self.get_queryset().values_list("id", flat=True)),
-            request.user.email,
-            show_upgrade_prompt,
+        job, created = ExportJob.get_or_create_active(
+            user=request.user,
+            query_params={k: v for k, v in request.query_params.lists() if k not in self.PAGINATION_QUERY_PARAMS},
+            show_upgrade_prompt=show_upgrade_prompt,
         )
-        return Response(data={"detail": "success"}, status=status.HTTP_200_OK)
+        if created:
+            logger.info(
+                "Enqueueing run_contribution_export_job task for export job %s for user %s", job.id, request.user
+            )
+            run_contribution_export_job.delay(job.id)
+        else:
+            logger.info(
+                "User %s already has export job %s %s, not enqueueing another", request.user, job.id, job.status
+            )
+        return Response(data={"detail": "success", "export_job": job.id}, status=status.HTTP_200_OK)
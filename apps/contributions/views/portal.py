@@ -13,6 +13,7 @@ from rest_framework.filters import OrderingFilter
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from apps.api.pagination import OptInCursorPaginationMixin
 from apps.api.permissions import (
     IsContributor,
     IsHubAdmin,
@@ -32,7 +33,7 @@ from apps.emails.models import TransactionalEmailRecord
 logger = logging.getLogger(f"{settings.DEFAULT_LOGGER}.{__name__}")
 
 
-class PortalContributorsViewSet(viewsets.GenericViewSet):
+class PortalContributorsViewSet(OptInCursorPaginationMixin, viewsets.GenericViewSet):
     """Furnish contributions data to the (new) contributor portal."""
 
     permission_classes = [IsAuthenticated, IsContributor, UserIsRequestedContributor]
@@ -67,10 +68,9 @@ class PortalContributorsViewSet(viewsets.GenericViewSet):
         )
 
     def paginate_results(self, queryset, request):
-        paginator = self.pagination_class()
-        page = paginator.paginate_queryset(queryset, request)
+        page = self.paginate_queryset(queryset)
         serializer = self.get_serializer(page, many=True)
-        return paginator.get_paginated_response(serializer.data)
+        return self.get_paginated_response(serializer.data)
 
     @action(
         methods=["get"],
@@ -110,7 +110,13 @@ class PortalContributorsViewSet(viewsets.GenericViewSet):
     def contributions_list(self, request, pk=None):
         """Endpoint to get all contributions for a given contributor."""
         contributor = self._get_contributor_and_check_permissions(request, pk)
-        qs = self.get_contributor_contributions(contributor)
+        serializer_class = self.get_serializer_class()
+        qs = (
+            self.get_contributor_contributions(contributor)
+            .select_related(*serializer_class._SELECT_RELATED)
+            .prefetch_related(*serializer_class._PREFETCH_RELATED)
+            .only(*serializer_class._ONLIES)
+        )
         filtered_qs = PortalContributionFilter().filter_queryset(request, qs)
         ordered_qs = self.handle_ordering(filtered_qs, request)
         return self.paginate_results(ordered_qs, request)
@@ -146,8 +152,14 @@ class PortalContributorsViewSet(viewsets.GenericViewSet):
     def contribution_detail(self, request, pk=None, contribution_id=None) -> Response:
         """Endpoint to get or update a contribution for a given contributor."""
         contributor = self._get_contributor_and_check_permissions(request, pk)
+        serializer_class = self.get_serializer_class()
         try:
-            contribution = self.get_contributor_contributions(contributor).get(pk=contribution_id)
+            contribution = (
+                self.get_contributor_contributions(contributor)
+                .select_related(*serializer_class._SELECT_RELATED)
+                .prefetch_related(*serializer_class._PREFETCH_RELATED)
+                .get(pk=contribution_id)
+            )
         except Contribution.DoesNotExist:
             return Response({"detail": "Contribution not found"}, status=status.HTTP_404_NOT_FOUND)
 
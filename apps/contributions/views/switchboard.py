@@ -35,7 +35,10 @@ class SwitchboardContributionFilter(django_filters.FilterSet):
     contributor_id = django_filters.NumberFilter(field_name="contributor__id")
     # TODO @leo: clean this up after below ticket is complete, we will not have duplicates at that point
     #  https://news-revenue-hub.atlassian.net/browse/DEV-5782
-    contributor_email = django_filters.CharFilter(field_name="contributor__email", lookup_expr="iexact")
+    contributor_email = django_filters.CharFilter(method="filter_contributor_email")
+
+    def filter_contributor_email(self, queryset, name, value):
+        return queryset.filter(contributor__email_key=Contributor.get_email_key(value))
 
     class Meta:
         model = Contribution
@@ -142,7 +145,7 @@ class SwitchboardContributorsViewSet(
 
     @action(methods=["get"], url_path="email/(?P<email>[^/]+)", detail=False)
     def get_by_email(self, request: HttpRequest, email: str) -> Response:
-        contributor = get_object_or_404(Contributor.objects.all(), email__iexact=email.strip())
+        contributor = get_object_or_404(Contributor.objects.all(), email_key=Contributor.get_email_key(email))
         serializer = serializers.SwitchboardContributorSerializer(contributor)
         return Response(serializer.data)
 
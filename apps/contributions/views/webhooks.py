@@ -9,7 +9,7 @@ from rest_framework import status
 from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from rest_framework.response import Response
 
-from apps.contributions.tasks import process_stripe_webhook_task
+from apps.contributions.tasks import enqueue_stripe_webhook
 
 
 logger = logging.getLogger(f"{settings.DEFAULT_LOGGER}.{__name__}")
@@ -33,5 +33,5 @@ def process_stripe_webhook(request):
             "Invalid signature on Stripe webhook request. Is STRIPE_WEBHOOK_SECRET_CONTRIBUTIONS set correctly?"
         )
         return Response(data={"error": "Invalid signature"}, status=status.HTTP_400_BAD_REQUEST)
-    process_stripe_webhook_task.delay(raw_event_data=raw_data)
+    enqueue_stripe_webhook(raw_data)
     return Response(status=status.HTTP_200_OK)
@@ -1,17 +1,21 @@
 import datetime
 import json
 import logging
+from collections.abc import Iterable
 from dataclasses import dataclass
 from functools import cached_property
 from typing import Any
 
 from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
+from django.utils import timezone
 from django.utils.timezone import make_aware
 
 import reversion
 import stripe
 
+from apps.common.utils import bulk_create_revisions
 from apps.contributions.models import (
     Contribution,
     ContributionInterval,
@@ -28,6 +32,27 @@ from apps.emails.models import TransactionalEmailRecord
 
 logger = logging.getLogger(f"{settings.DEFAULT_LOGGER}.{__name__}")
 
+PROCESSED_STRIPE_EVENT_CACHE_KEY_PREFIX = "stripe-event-processed"
+
+
+def _get_processed_stripe_event_cache_key(event_id: str) -> str:
+    return f"{PROCESSED_STRIPE_EVENT_CACHE_KEY_PREFIX}-{event_id}"
+
+
+def record_stripe_event_processed(event_id: str) -> None:
+    """Record that a Stripe event has been processed, so that replays of events can skip it.
+
+    Records expire after `settings.STRIPE_PROCESSED_EVENT_RECORD_TTL`, which by default matches how long Stripe keeps
+    events around.
+    """
+    cache.set(_get_processed_stripe_event_cache_key(event_id), True, timeout=settings.STRIPE_PROCESSED_EVENT_RECORD_TTL)
+
+
+def get_processed_stripe_event_ids(event_ids: Iterable[str]) -> set[str]:
+    """Return the subset of `event_ids` that have been recorded as processed."""
+    keys = {_get_processed_stripe_event_cache_key(x): x for x in event_ids}
+    return {keys[key] for key in cache.get_many(list(keys))}
+
 
 @dataclass
 class StripeWebhookProcessor:
@@ -84,6 +109,19 @@ class StripeWebhookProcessor:
         except Contribution.DoesNotExist:
             return None
 
+    @cached_property
+    def payment_intent(self) -> stripe.PaymentIntent:
+        """Payment intent for an invoice event.
+
+        This is retrieved once per event, with the invoice, payment method, and charge balance transaction expanded, so
+        that handling the event requires no further calls to Stripe.
+        """
+        return stripe.PaymentIntent.retrieve(
+            self.obj_data["payment_intent"],
+            stripe_account=self.event.account,
+            expand=["invoice", "payment_method", "charges.data.balance_transaction"],
+        )
+
     @property
     def rejected(self):
         # Not all Stripe entities in webhooks will have a cancellation_reason (for instance, invoice-related events do not).
@@ -194,26 +232,45 @@ class StripeWebhookProcessor:
             self.contribution.save(update_fields={*update_data.keys(), "modified"})
             reversion.set_comment(revision_comment)
 
-    def _add_pm_id_and_payment_method_details(self, pm_id: str, update_data: dict) -> dict:
+    def _add_pm_id_and_payment_method_details(
+        self, pm_id: str, update_data: dict, payment_method: dict | None = None
+    ) -> dict:
+        """Add payment method ID and details to update data.
+
+        If the payment method has already been retrieved (or is in the event payload), pass it as `payment_method` to
+        avoid fetching it from Stripe again.
+        """
         data = {**update_data}
         if pm_id:
             data["provider_payment_method_id"] = pm_id
-            data["provider_payment_method_details"] = self.contribution.fetch_stripe_payment_method(pm_id)
+            data["provider_payment_method_details"] = payment_method or self.contribution.fetch_stripe_payment_method(
+                pm_id
+            )
         return data
 
-    def _handle_pm_update_event(self, query: dict, pm_id: str, caller: str) -> None:
+    def _handle_pm_update_event(self, query: dict, pm_id: str, caller: str, payment_method: dict | None = None) -> None:
+        """Update payment method data on all contributions matching `query`.
+
+        A customer can have many contributions, so rather than saving each in its own revision, we update them in a single
+        query and then bulk create the revisions that saving each would have recorded.
+        """
         logger.info("Updating contributions matching query %s with payment method data for id %s", query, pm_id)
-        updated = 0
         # TODO @BW: Make this a .get() instead of .filter() once provider_payment_id is unique
         # DEV-5661
-        details = stripe.PaymentMethod.retrieve(pm_id, stripe_account=self.event.account)
-        for x in Contribution.objects.filter(**query):
-            x.provider_payment_method_id = pm_id
-            x.provider_payment_method_details = details
-            with reversion.create_revision():
-                x.save(update_fields={"provider_payment_method_id", "provider_payment_method_details", "modified"})
-                updated += 1
-                reversion.set_comment(f"Payment method data updated on behalf of {caller}")
+        details = payment_method or stripe.PaymentMethod.retrieve(pm_id, stripe_account=self.event.account)
+        contributions = list(Contribution.objects.filter(**query).prefetch_related("payment_set"))
+        update_data = {
+            "provider_payment_method_id": pm_id,
+            "provider_payment_method_details": details,
+            # `.update()` bypasses `save()`, so the auto-updating `modified` field has to be set explicitly
+            "modified": timezone.now(),
+        }
+        updated = Contribution.objects.filter(id__in=[x.id for x in contributions]).update(**update_data)
+        if updated:
+            for contribution in contributions:
+                for k, v in update_data.items():
+                    setattr(contribution, k, v)
+            bulk_create_revisions(contributions, f"Payment method data updated on behalf of {caller}")
         logger.info("Updated %s contributions with provider payment method ID", updated)
 
     @transaction.atomic
@@ -231,6 +288,8 @@ class StripeWebhookProcessor:
                 query={"provider_customer_id": self.customer_id},
                 pm_id=self.obj_data["id"],
                 caller="StripeWebhookProcessor.handle_payment_method_attached",
+                # The event's object is the payment method itself, so there's no need to retrieve it from Stripe.
+                payment_method=self.obj_data,
             )
 
     @transaction.atomic
@@ -335,17 +394,18 @@ class StripeWebhookProcessor:
         - If it's the first payment, and if it's v1.4 metadata, send a receipt email
         """
         with transaction.atomic():
-            payment = Payment.from_stripe_invoice_payment_succeeded_event(event=self.event)
-            pi = stripe.PaymentIntent.retrieve(
-                self.obj_data["payment_intent"],
-                stripe_account=self.event.account,
+            payment = Payment.from_stripe_invoice_payment_succeeded_event(
+                event=self.event, payment_intent=self.payment_intent
             )
+            pm = self.payment_intent.payment_method
+            expanded = isinstance(pm, stripe.PaymentMethod)
             update_data = self._add_pm_id_and_payment_method_details(
-                pm_id=pi.payment_method,
+                pm_id=pm.id if expanded else pm,
                 update_data={
                     "last_payment_date": payment.created,
                     "status": ContributionStatus.PAID,
                 },
+                payment_method=pm if expanded else None,
             )
             self._handle_contribution_update(
                 update_data,
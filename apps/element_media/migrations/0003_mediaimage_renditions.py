@@ -0,0 +1,22 @@
+# Generated by Django 4.2.23 on 2026-10-19 03:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("element_media", "0002_mediaimage_page_id"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="mediaimage",
+            name="renditions",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text="Names of the image's responsive renditions, by width and then format",
+            ),
+        ),
+    ]
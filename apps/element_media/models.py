@@ -1,10 +1,14 @@
 import json
+import logging
 import os.path
+from functools import partial
 from io import BytesIO
 
+from django.conf import settings
 from django.core.files.base import ContentFile
 from django.core.files.images import ImageFile
-from django.db import models
+from django.core.files.storage import default_storage
+from django.db import models, transaction
 from django.http.request import QueryDict
 
 from PIL import Image
@@ -13,18 +17,64 @@ from apps.common.models import IndexedTimeStampedModel
 from apps.pages.models import DonationPage
 
 
-THUMBNAIL_SIZE = 300, 300
+logger = logging.getLogger(f"{settings.DEFAULT_LOGGER}.{__name__}")
 
+# Widths of the responsive renditions generated for uploaded images. The smallest is used as the thumbnail.
+RENDITION_WIDTHS = 300, 600, 1200
+RENDITION_QUALITY = 80
 
-def get_thumbnail(image):
-    filename, ext = os.path.splitext(image.name)  # noqa: PTH122 pathlib version is horrible
-    with Image.open(image) as thumb:
-        if not ext:
-            ext = thumb.format.lower()
-        thumb.thumbnail(THUMBNAIL_SIZE)
-        thumb_io = BytesIO()
-        thumb.save(thumb_io, thumb.format, quality=80)
-    return ContentFile(thumb_io.getvalue(), name=f"{filename}_thumbnail{ext}")
+
+def _encode_image(image: Image.Image, image_format: str) -> bytes:
+    if image_format == "WEBP" and image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "A" in image.mode or "transparency" in image.info else "RGB")
+    buffer = BytesIO()
+    image.save(buffer, image_format, quality=RENDITION_QUALITY)
+    return buffer.getvalue()
+
+
+def generate_renditions(image, location: str) -> dict[str, dict[str, str]]:
+    """Save copies of an image scaled to each of `RENDITION_WIDTHS`, in its original format and as WebP.
+
+    Images are never scaled up, so the first of `RENDITION_WIDTHS` at or past the image's own width gets a full-size
+    rendition instead, and larger ones get none.
+
+    :return: The names of the saved files, by their actual width and then by "original" or "webp".
+    """
+    filename, ext = os.path.splitext(os.path.basename(image.name))  # noqa: PTH122 PTH119 pathlib version is horrible
+    renditions = {}
+    with Image.open(image) as source:
+        ext = ext or f".{source.format.lower()}"
+        for width in RENDITION_WIDTHS:
+            resized = source.copy()
+            resized.thumbnail((width, source.height))
+            renditions[str(resized.width)] = {
+                "original": default_storage.save(
+                    f"{location}/{filename}_{resized.width}w{ext}", ContentFile(_encode_image(resized, source.format))
+                ),
+                "webp": default_storage.save(
+                    f"{location}/{filename}_{resized.width}w.webp", ContentFile(_encode_image(resized, "WEBP"))
+                ),
+            }
+            if width >= source.width:
+                break
+    return renditions
+
+
+def get_smallest_rendition(renditions: dict[str, dict[str, str]]) -> dict[str, str]:
+    return renditions[min(renditions, key=int)]
+
+
+def delete_renditions(renditions: dict[str, dict[str, str]]) -> None:
+    for formats in renditions.values():
+        for name in formats.values():
+            default_storage.delete(name)
+
+
+def get_rendition_urls(renditions: dict[str, dict[str, str]]) -> dict[str, dict[str, str]]:
+    return {
+        width: {fmt: default_storage.url(name) for fmt, name in formats.items()}
+        for width, formats in renditions.items()
+    }
 
 
 class MediaImage(IndexedTimeStampedModel):
@@ -33,24 +83,48 @@ class MediaImage(IndexedTimeStampedModel):
     image = models.ImageField(upload_to="images", null=True)
     thumbnail = models.ImageField(upload_to="thumbs", null=True, blank=True)
     image_attrs = models.JSONField(blank=True, null=True)
+    renditions = models.JSONField(
+        default=dict, blank=True, help_text="Names of the image's responsive renditions, by width and then format"
+    )
 
     def __str__(self):
         return self.image.name
 
     def get_as_dict(self, image_key="DImage"):
-        return {
-            "uuid": str(self.spa_key),
-            "type": str(image_key),
-            "content": {
-                "url": self.image.storage.url(name=self.image.name),
-                "thumbnail": self.thumbnail.storage.url(name=self.thumbnail.name),
-            },
+        # Until renditions are generated, the original image stands in for the thumbnail
+        thumbnail = self.thumbnail or self.image
+        content = {
+            "url": self.image.storage.url(name=self.image.name),
+            "thumbnail": thumbnail.storage.url(name=thumbnail.name),
         }
+        if self.renditions:
+            content["renditions"] = get_rendition_urls(self.renditions)
+        return {"uuid": str(self.spa_key), "type": str(image_key), "content": content}
+
+    def update_renditions(self) -> None:
+        """Generate the image's renditions and thumbnail, and point its page's sidebar element at them."""
+        if self.renditions:
+            return
+        self.renditions = generate_renditions(self.image, self.thumbnail.field.upload_to)
+        self.thumbnail.name = get_smallest_rendition(self.renditions)["original"]
+        self.save(update_fields=["renditions", "thumbnail", "modified"])
+        with transaction.atomic():
+            # Locked so that a concurrent update of the page's sidebar elements isn't lost
+            page = DonationPage.objects.select_for_update().get(pk=self.page_id_id)
+            elements = [
+                self.get_as_dict(x["type"]) if x.get("uuid") == str(self.spa_key) else x for x in page.sidebar_elements
+            ]
+            if elements != page.sidebar_elements:
+                page.sidebar_elements = elements
+                page.save(update_fields=["sidebar_elements", "modified"])
+        logger.info("Generated renditions for media image %s", self.id)
 
     @classmethod
     def create_from_request(cls, data: QueryDict, files: dict, donation_page_id: int, image_key="DImage") -> [dict]:
         """Build MediaImage instance from the json blob data found in the files dict of request.data.
 
+        Images are stored as uploaded, and their renditions are generated asynchronously once the transaction commits.
+
         Expected Schemas:
             data = [{"uuid": str, "type": "DImage", "content": {}, n...]
             files = {"str(<UUID>)": Blob}
@@ -58,23 +132,23 @@ class MediaImage(IndexedTimeStampedModel):
         :param files: A list of dicts. Key=UUID in the request.data for the image element
         :param donation_page_id: the pk of the page that these images are referenced on.
         :param image_key: The key that identifies an Image element.
-        :return: The data["sidebar_elements"] updated with the storage locations for the image and the thumbnail.
+        :return: The data["sidebar_elements"] updated with the storage location for the image.
         """
+        from apps.element_media.tasks import generate_media_image_renditions  # noqa: PLC0415 vs. circular import
+
         mutable = data.copy()
         if sbe := mutable.get("sidebar_elements"):
             elements = json.loads(sbe)
             for index, element in enumerate(elements):
                 if element.get("type") == image_key and (f := files.get(element.get("uuid"), None)):
-                    img = ImageFile(f)
-                    thumb = get_thumbnail(img)
                     media_image = cls(
                         spa_key=element.get("uuid"),
-                        image=img,
-                        thumbnail=thumb,
+                        image=ImageFile(f),
                         page_id=DonationPage.objects.get(pk=donation_page_id),
                         image_attrs={},
                     )
                     media_image.save()
+                    transaction.on_commit(partial(generate_media_image_renditions.delay, media_image.id))
                     elements[index] = media_image.get_as_dict()
             mutable["sidebar_elements"] = elements
         return mutable
@@ -0,0 +1,17 @@
+from django.conf import settings
+
+from celery import shared_task
+from celery.utils.log import get_task_logger
+
+from apps.element_media.models import MediaImage
+
+
+logger = get_task_logger(f"{settings.DEFAULT_LOGGER}.{__name__}")
+
+
+@shared_task
+def generate_media_image_renditions(media_image_id: int) -> None:
+    if not (media_image := MediaImage.objects.filter(pk=media_image_id).first()):
+        logger.warning("Media image %s no longer exists, not generating renditions", media_image_id)
+        return
+    media_image.update_renditions()
@@ -1,11 +1,22 @@
 import json
+from io import BytesIO
 from uuid import uuid4
 
+from django.core.files.images import ImageFile
+from django.core.files.storage import default_storage
+
+import PIL.Image
 import pytest
 
 from apps.pages.tests.factories import DonationPageFactory
 
-from .models import MediaImage, get_thumbnail
+from .models import MediaImage, generate_renditions
+from .tasks import generate_media_image_renditions
+
+
+@pytest.fixture(autouse=True)
+def _media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
 
 
 @pytest.fixture
@@ -14,10 +25,40 @@ def dummy_image_no_extension(test_jpeg_file):
     return test_jpeg_file
 
 
-@pytest.mark.parametrize("image", ["test_jpeg_file", "dummy_image_no_extension"])
-def test_get_thumbnail(request, image):
-    img_file = request.getfixturevalue(image)
-    get_thumbnail(img_file)
+@pytest.fixture
+def palette_png_file():
+    f = BytesIO()
+    PIL.Image.new("P", (2000, 100)).save(f, "PNG", transparency=0)
+    return ImageFile(f, name="palette.png")
+
+
+@pytest.mark.parametrize(
+    ("image", "expected_widths", "expected_ext"),
+    [
+        ("test_jpeg_file", {"300", "600", "640"}, ".jpg"),
+        ("dummy_image_no_extension", {"300", "600", "640"}, ".jpeg"),
+        ("palette_png_file", {"300", "600", "1200"}, ".png"),
+    ],
+)
+def test_generate_renditions(request, image, expected_widths, expected_ext):
+    renditions = generate_renditions(request.getfixturevalue(image), "renditions")
+    assert {x: set(y.keys()) for x, y in renditions.items()} == {x: {"original", "webp"} for x in expected_widths}
+    for width, formats in renditions.items():
+        assert formats["original"].startswith("renditions/")
+        assert formats["original"].endswith(expected_ext)
+        assert formats["webp"].endswith(".webp")
+        for name in formats.values():
+            with default_storage.open(name) as f, PIL.Image.open(f) as rendition:
+                assert rendition.width == int(width)
+
+
+def test_generate_renditions_does_not_scale_up():
+    f = BytesIO()
+    PIL.Image.new("RGB", (100, 50)).save(f, "JPEG")
+    renditions = generate_renditions(ImageFile(f, name="small.jpg"), "renditions")
+    assert list(renditions) == ["100"]
+    with default_storage.open(renditions["100"]["webp"]) as f, PIL.Image.open(f) as rendition:
+        assert rendition.size == (100, 50)
 
 
 @pytest.mark.django_db
@@ -29,19 +70,52 @@ class TestMediaImage:
             spa_key=uuid4(),
             page_id=DonationPageFactory(),
             image=test_jpeg_file,
-            thumbnail=get_thumbnail(test_jpeg_file),
         )
 
     def test__str__(self, image_instance):
         assert str(image_instance) == image_instance.image.name
 
+    def test_get_as_dict(self, image_instance):
+        as_dict = image_instance.get_as_dict()
+        assert as_dict["content"] == {"url": image_instance.image.url, "thumbnail": image_instance.image.url}
+        image_instance.update_renditions()
+        as_dict = image_instance.get_as_dict()
+        assert as_dict["content"]["thumbnail"] == image_instance.thumbnail.url
+        assert as_dict["content"]["renditions"]["300"]["webp"] == default_storage.url(
+            image_instance.renditions["300"]["webp"]
+        )
+
+    def test_update_renditions(self, image_instance):
+        page = image_instance.page_id
+        page.sidebar_elements = [
+            {"uuid": f"{uuid4()}", "type": "DReason", "content": ""},
+            image_instance.get_as_dict(),
+        ]
+        page.save()
+        image_instance.update_renditions()
+        image_instance.refresh_from_db()
+        assert image_instance.renditions.keys() == {"300", "600", "640"}
+        assert image_instance.thumbnail.name == image_instance.renditions["300"]["original"]
+        page.refresh_from_db()
+        assert page.sidebar_elements[1] == image_instance.get_as_dict()
+        assert page.sidebar_elements[1]["content"]["renditions"]
+
+    def test_generate_media_image_renditions(self, image_instance):
+        generate_media_image_renditions(image_instance.id)
+        image_instance.refresh_from_db()
+        assert image_instance.renditions
+        generate_media_image_renditions(image_instance.id + 1)
+
     def test_create_from_request_when_no_sidebar_elements(self, image_instance, donation_page):
         count = MediaImage.objects.count()
         donation_page = image_instance.page_id
         MediaImage.create_from_request({}, {}, donation_page.id)
         assert MediaImage.objects.count() == count
 
-    def test_create_from_request_when_sidebar_elements(self, image_instance, donation_page):
+    def test_create_from_request_when_sidebar_elements(
+        self, image_instance, donation_page, mocker, django_capture_on_commit_callbacks
+    ):
+        mock_delay = mocker.patch("apps.element_media.tasks.generate_media_image_renditions.delay")
         count = MediaImage.objects.count()
         donation_page = image_instance.page_id
         data = {
@@ -53,8 +127,14 @@ class TestMediaImage:
             )
         }
         files = {img_id: image_instance.image}
-        MediaImage.create_from_request(data, files, donation_page.id)
+        with django_capture_on_commit_callbacks(execute=True):
+            result = MediaImage.create_from_request(data, files, donation_page.id)
+            mock_delay.assert_not_called()
         assert MediaImage.objects.count() == count + 1
+        media_image = MediaImage.objects.get(spa_key=img_id)
+        assert not media_image.thumbnail
+        assert result["sidebar_elements"][1] == media_image.get_as_dict()
+        mock_delay.assert_called_once_with(media_image.id)
 
     def test_create_from_request_when_no_image_files(self, donation_page):
         data = {
@@ -5,19 +5,22 @@ from __future__ import annotations
 import datetime
 from dataclasses import asdict
 from enum import Enum
-from smtplib import SMTPException
+from smtplib import SMTPException, SMTPServerDisconnected
 from typing import TYPE_CHECKING, Literal, TypedDict
 from urllib.parse import quote_plus
 
 from django.conf import settings
-from django.core.mail import EmailMultiAlternatives, send_mail
+from django.core.mail import EmailMessage, EmailMultiAlternatives, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
 from django.template.loader import render_to_string
 from django.utils import timezone
 from django.utils.safestring import mark_safe
 
 import stripe
 from celery import shared_task
+from celery.signals import worker_process_shutdown
 from celery.utils.log import get_task_logger
+from celery.utils.time import get_exponential_backoff_interval
 from sentry_sdk import configure_scope
 from stripe.error import StripeError
 
@@ -39,6 +42,68 @@ class EmailTaskException(Exception):
     pass
 
 
+# This process's open connections to email backends, by backend
+_connections: dict[str, BaseEmailBackend] = {}
+
+
+def get_pooled_connection() -> BaseEmailBackend:
+    """Return this process's connection to `settings.EMAIL_BACKEND`, opening it if needed.
+
+    The connection is kept open across tasks, so that each email doesn't pay for connecting, TLS and authentication.
+    """
+    if (connection := _connections.get(settings.EMAIL_BACKEND)) is None:
+        connection = get_connection(settings.EMAIL_BACKEND)
+        connection.open()
+        _connections[settings.EMAIL_BACKEND] = connection
+    return connection
+
+
+def close_pooled_connections(**kwargs) -> None:
+    while _connections:
+        _, connection = _connections.popitem()
+        connection.close()
+
+
+worker_process_shutdown.connect(close_pooled_connections)
+
+
+def send_messages(messages: list[EmailMessage]) -> int:
+    """Send messages over the pooled connection, one message per call to the backend.
+
+    If the server closed the connection, that's only found out when sending the next message over it, in which case
+    the connection is reopened and that message alone is sent again. Sending one message per call means the messages
+    sent before the disconnect aren't sent twice.
+
+    :return: The number of messages sent.
+    """
+    sent = 0
+    for message in messages:
+        connection = get_pooled_connection()
+        try:
+            try:
+                sent += connection.send_messages([message]) or 0
+            except SMTPServerDisconnected:
+                logger.info("Email backend connection was closed, reconnecting")
+                connection.close()
+                connection.open()
+                sent += connection.send_messages([message]) or 0
+        except (SMTPException, OSError):
+            # Start the next attempt afresh rather than on a connection in an unknown state
+            connection.close()
+            raise
+    return sent
+
+
+def make_message(
+    to: str | list[str], subject: str, message_as_text: str, message_as_html: str, from_email: str
+) -> EmailMultiAlternatives:
+    message = EmailMultiAlternatives(
+        subject=subject, body=message_as_text, from_email=from_email, to=[to] if isinstance(to, str) else to
+    )
+    message.attach_alternative(message_as_html, "text/html")
+    return message
+
+
 @shared_task(
     name="send_templated_email",
     max_retries=5,
@@ -52,18 +117,43 @@ def send_templated_email(
     logger.info("Sending email to recipient `%s` with subject `%s`", to, subject)
     with configure_scope() as scope:
         scope.user = {"email": to}
-        send_mail(
-            subject,
-            message_as_text,
-            from_email,
-            [
-                to,
-            ],
-            html_message=message_as_html,
-        )
+        send_messages([make_message(to, subject, message_as_text, message_as_html, from_email)])
         logger.info("Email sent to recipient `%s` with subject `%s`", to, subject)
 
 
+@shared_task(bind=True, name="send_templated_emails", max_retries=5)
+def send_templated_emails(
+    self,
+    recipients: list[str],
+    subject,
+    message_as_text,
+    message_as_html,
+    from_email=settings.EMAIL_DEFAULT_TRANSACTIONAL_SENDER,
+):
+    """Send the same email to each of `recipients` separately over the pooled connection.
+
+    If sending fails, the task is retried for only the recipients that haven't been sent the email yet.
+    """
+    logger.info("Sending email to %s recipients with subject `%s`", len(recipients), subject)
+    for index, to in enumerate(recipients):
+        try:
+            send_messages([make_message(to, subject, message_as_text, message_as_html, from_email)])
+        except SMTPException as exc:
+            logger.info(
+                "Email sent to %s of %s recipients with subject `%s`, retrying", index, len(recipients), subject
+            )
+            raise self.retry(
+                exc=exc,
+                args=(recipients[index:], subject, message_as_text, message_as_html, from_email),
+                kwargs={},
+                # The same backoff as `retry_backoff=True` gives the other email tasks
+                countdown=get_exponential_backoff_interval(
+                    factor=1, retries=self.request.retries, maximum=600, full_jitter=False
+                ),
+            ) from exc
+    logger.info("Email sent to %s recipients with subject `%s`", len(recipients), subject)
+
+
 class ContributionIntervals(Enum):
     ONE_TIME = ContributionInterval.ONE_TIME.value
     MONTH = ContributionInterval.MONTHLY.value
@@ -243,12 +333,16 @@ def send_receipt_email(data: SendContributionEmailData) -> None:
     logger.info("send_receipt_email: Attempting to send receipt email with the following template data %s", data)
     with configure_scope() as scope:
         scope.user = {"email": (to := data["contributor_email"])}
-        send_mail(
-            subject="Thank you for your contribution!",
-            message=render_to_string("nrh-default-contribution-confirmation-email.txt", data),
-            from_email=settings.EMAIL_DEFAULT_TRANSACTIONAL_SENDER,
-            recipient_list=[to],
-            html_message=render_to_string("nrh-default-contribution-confirmation-email.html", data),
+        send_messages(
+            [
+                make_message(
+                    to,
+                    subject="Thank you for your contribution!",
+                    message_as_text=render_to_string("nrh-default-contribution-confirmation-email.txt", data),
+                    message_as_html=render_to_string("nrh-default-contribution-confirmation-email.html", data),
+                    from_email=settings.EMAIL_DEFAULT_TRANSACTIONAL_SENDER,
+                )
+            ]
         )
 
 
@@ -279,4 +373,4 @@ def send_templated_email_with_attachment(
         )
         mail.attach_alternative(message_as_html, "text/html")
         logger.info("Sending email to recipient `%s` with subject `%s`", to, subject)
-        mail.send()
+        send_messages([mail])
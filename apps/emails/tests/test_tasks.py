@@ -1,9 +1,13 @@
 import datetime
+import os
+import time
 from dataclasses import asdict
+from smtplib import SMTPException, SMTPServerDisconnected
 from urllib.parse import quote_plus
 
 from django.conf import settings
 from django.core import mail
+from django.core.mail import EmailMessage, get_connection
 from django.template.loader import render_to_string
 
 import pytest
@@ -18,10 +22,14 @@ from apps.emails.tasks import (
     EmailTaskException,
     SendContributionEmailData,
     generate_email_data,
+    get_pooled_connection,
     get_test_magic_link,
     logger,
+    send_messages,
     send_receipt_email,
+    send_templated_email,
     send_templated_email_with_attachment,
+    send_templated_emails,
 )
 from apps.organizations.models import FiscalStatusChoices, FreePlan
 from apps.organizations.tests.factories import RevenueProgramFactory
@@ -156,7 +164,6 @@ class TestSendReceiptEmail:
             new_callable=mocker.PropertyMock,
         )
         mocker.patch("stripe.Customer.retrieve", return_value=AttrDict(name=contributor_name))
-        mock_send_mail = mocker.patch("apps.emails.tasks.send_mail")
         contribution = make_contribution_fn()
         data = generate_email_data(contribution, show_billing_history=show_billing_history)
 
@@ -173,13 +180,12 @@ class TestSendReceiptEmail:
 
         assert f"Dear {contributor_name}," if contributor_name else "Dear contributor," in email_html
 
-        mock_send_mail.assert_called_once_with(
-            subject="Thank you for your contribution!",
-            message=render_to_string("nrh-default-contribution-confirmation-email.txt", context=data),
-            from_email=settings.EMAIL_DEFAULT_TRANSACTIONAL_SENDER,
-            recipient_list=[contribution.contributor.email],
-            html_message=email_html,
-        )
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].subject == "Thank you for your contribution!"
+        assert mail.outbox[0].body == render_to_string("nrh-default-contribution-confirmation-email.txt", context=data)
+        assert mail.outbox[0].from_email == settings.EMAIL_DEFAULT_TRANSACTIONAL_SENDER
+        assert mail.outbox[0].to == [contribution.contributor.email]
+        assert mail.outbox[0].alternatives == [(email_html, "text/html")]
 
     @pytest.fixture(
         params=[
@@ -347,6 +353,7 @@ class TestSendReceiptEmail:
 
 def test_send_templated_email_with_attachment(mocker):
     email_message = mocker.patch("apps.emails.tasks.EmailMultiAlternatives")
+    mock_send_messages = mocker.patch("apps.emails.tasks.send_messages")
     send_templated_email_with_attachment(
         (to_email := "to@to.com"),
         (subject := "This is a subject"),
@@ -366,4 +373,109 @@ def test_send_templated_email_with_attachment(mocker):
         filename=file_name, content=attachment.encode(), mimetype=mimetype
     )
     email_message.return_value.attach_alternative.assert_called_once_with(msg_as_html, "text/html")
-    email_message.return_value.send.assert_called_once()
+    mock_send_messages.assert_called_once_with([email_message.return_value])
+
+
+class TestPooledConnection:
+    @pytest.fixture(autouse=True)
+    def _connections(self, mocker):
+        return mocker.patch("apps.emails.tasks._connections", {})
+
+    @pytest.fixture
+    def messages(self):
+        return [EmailMessage(subject=f"Subject {x}", body="body", to=[f"{x}@example.com"]) for x in range(5)]
+
+    def test_get_pooled_connection_is_reused(self, mocker):
+        open_spy = mocker.spy(type(get_connection()), "open")
+        assert get_pooled_connection() is get_pooled_connection()
+        open_spy.assert_called_once()
+
+    def test_send_messages_one_per_call(self, messages, mocker):
+        send_spy = mocker.spy(type(get_connection()), "send_messages")
+        assert send_messages(messages) == len(messages)
+        assert [x.args[1] for x in send_spy.call_args_list] == [[x] for x in messages]
+        assert [x.subject for x in mail.outbox] == [x.subject for x in messages]
+
+    def test_send_messages_reconnects_when_disconnected(self, messages, mocker):
+        connection = get_pooled_connection()
+        mocker.patch.object(
+            connection,
+            "send_messages",
+            side_effect=[1, 1, SMTPServerDisconnected("Connection unexpectedly closed"), 1, 1, 1],
+        )
+        close_spy = mocker.spy(connection, "close")
+        open_spy = mocker.spy(connection, "open")
+        assert send_messages(messages) == len(messages)
+        close_spy.assert_called_once()
+        open_spy.assert_called_once()
+        # Only the message being sent when the connection was found closed is sent again
+        assert [x.args[0] for x in connection.send_messages.call_args_list] == [
+            [x] for x in [*messages[:3], *messages[2:]]
+        ]
+
+    def test_send_messages_closes_connection_when_resend_fails(self, messages, mocker):
+        connection = get_pooled_connection()
+        mocker.patch.object(
+            connection,
+            "send_messages",
+            side_effect=[SMTPServerDisconnected("Connection unexpectedly closed"), SMTPException("Nope")],
+        )
+        close_spy = mocker.spy(connection, "close")
+        with pytest.raises(SMTPException):
+            send_messages(messages)
+        assert close_spy.call_count == 2
+
+    def test_send_messages_closes_connection_on_error(self, messages, mocker):
+        connection = get_pooled_connection()
+        mocker.patch.object(connection, "send_messages", side_effect=SMTPException("Nope"))
+        close_spy = mocker.spy(connection, "close")
+        with pytest.raises(SMTPException):
+            send_messages(messages)
+        close_spy.assert_called_once()
+
+    def test_send_templated_email(self):
+        send_templated_email("to@example.com", "Subject", "text", "html")
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].to == ["to@example.com"]
+        assert mail.outbox[0].alternatives == [("html", "text/html")]
+
+    def test_send_templated_emails(self):
+        send_templated_emails(recipients := ["a@example.com", "b@example.com"], "Subject", "text", "html")
+        assert [x.to for x in mail.outbox] == [[x] for x in recipients]
+        assert {x.subject for x in mail.outbox} == {"Subject"}
+
+    def test_send_templated_emails_retries_only_unsent_recipients(self, mocker):
+        recipients = ["a@example.com", "b@example.com", "c@example.com"]
+        attempted = []
+
+        def fail_second_message(messages):
+            attempted.append(messages[0].to)
+            if len(attempted) == 2:
+                raise SMTPException("Nope")
+            return send_messages(messages)
+
+        mocker.patch("apps.emails.tasks.send_messages", side_effect=fail_second_message)
+        send_templated_emails.apply(args=(recipients, "Subject", "text", "html"))
+        a, b, c = ([x] for x in recipients)
+        assert attempted == [a, b, b, c]
+        assert [x.to for x in mail.outbox] == [[x] for x in recipients]
+
+    @pytest.mark.skipif(not os.getenv("SMTP_SINK_HOST"), reason="Requires a local SMTP sink at SMTP_SINK_HOST")
+    def test_throughput_against_smtp_sink(self, settings, messages):
+        """Benchmark sending over the pooled connection vs. a connection per message.
+
+        Run a sink with e.g. `python -m smtpd -n -c DebuggingServer localhost:1025` and SMTP_SINK_HOST=localhost:1025.
+        """
+        settings.EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+        settings.EMAIL_HOST, settings.EMAIL_PORT = os.environ["SMTP_SINK_HOST"].split(":")
+        settings.EMAIL_USE_TLS = False
+        messages = messages * 40
+        start = time.perf_counter()
+        for message in messages:
+            get_connection().send_messages([message])
+        unpooled = time.perf_counter() - start
+        start = time.perf_counter()
+        assert send_messages(messages) == len(messages)
+        pooled = time.perf_counter() - start
+        print(f"Sent {len(messages)} messages in {unpooled:.3f}s unpooled, {pooled:.3f}s pooled")  # noqa: T201
+        assert pooled < unpooled
@@ -49,7 +49,11 @@ def test_upgrade_confirmation_email_html(upgrade_confirmation_email_context):
 
 @pytest.fixture
 def csv_export_template_data(settings):
-    return {"logo_url": f"{settings.SITE_URL}/static/nre_logo_black_yellow.png"}
+    return {
+        "download_url": f"{settings.SITE_URL}/api/v1/contributions/exports/token/",
+        "link_expiry_hours": 72,
+        "logo_url": f"{settings.SITE_URL}/static/nre_logo_black_yellow.png",
+    }
 
 
 def test_csv_export_email_template(csv_export_template_data):
@@ -61,3 +65,7 @@ def test_csv_export_email_template(csv_export_template_data):
     # Check that the email body does not contain the upgrade prompt
     for x in expect_missing:
         assert x not in render_to_string("nrh-contribution-csv-email-body.html", csv_export_template_data)
+    for template in ("nrh-contribution-csv-email-body.html", "nrh-contribution-csv-email-body.txt"):
+        rendered = render_to_string(template, csv_export_template_data)
+        assert csv_export_template_data["download_url"] in rendered
+        assert "This link expires in 72 hours." in rendered
@@ -0,0 +1,15 @@
+from django.db import models
+
+from apps.common.models import IndexedTimeStampedModel
+
+
+class OutboxMessage(IndexedTimeStampedModel):
+    """A Pub/Sub message that failed to publish, to be retried by `apps.google_cloud.tasks.publish_outbox_messages`."""
+
+    topic = models.CharField(max_length=255)
+    data = models.BinaryField()
+    attempts = models.PositiveIntegerField(default=1)
+    last_error = models.TextField(blank=True)
+
+    def __str__(self):
+        return f"Outbox message {self.id} for {self.topic}"
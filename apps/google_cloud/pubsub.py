@@ -1,10 +1,18 @@
+import atexit
 import logging
+from concurrent.futures import Future, wait
 from dataclasses import dataclass
+from functools import partial
 
 from django.conf import settings
+from django.db import connection, transaction
 
+from celery.signals import worker_process_shutdown
+from google.api_core.exceptions import GoogleAPIError
 from google.cloud import pubsub_v1
 
+from apps.google_cloud.models import OutboxMessage
+
 
 logger = logging.getLogger(f"{settings.DEFAULT_LOGGER}.{__name__}")
 
@@ -21,16 +29,63 @@ class Publisher:
     __instance = None
 
     def __init__(self):
-        self.client = pubsub_v1.PublisherClient(credentials=settings.GS_CREDENTIALS)
+        self.client = pubsub_v1.PublisherClient(
+            credentials=settings.GS_CREDENTIALS,
+            batch_settings=pubsub_v1.types.BatchSettings(
+                max_messages=settings.PUBSUB_BATCH_MAX_MESSAGES, max_latency=settings.PUBSUB_BATCH_MAX_LATENCY
+            ),
+        )
         self.project_id = settings.GOOGLE_CLOUD_PROJECT
+        # Futures of messages published asynchronously that haven't been published yet
+        self.pending: set[Future] = set()
 
     def publish(self, topic, message: Message):
+        """Publish a message to a topic.
+
+        If `settings.PUBSUB_PUBLISH_ASYNC`, the message is published once the current transaction commits (or right away
+        outside of one) without waiting for Pub/Sub, and None is returned. Otherwise, this waits for the message to be
+        published and returns its ID.
+        """
+        if settings.PUBSUB_PUBLISH_ASYNC:
+            transaction.on_commit(partial(self.publish_async, topic, message))
+            return None
         logger.info("Received data to publish %s", message)
         topic_path = self.client.topic_path(self.project_id, topic)
-        result = self.client.publish(topic_path, message.data).result(timeout=3)
+        result = self.client.publish(topic_path, message.data).result(timeout=settings.PUBSUB_PUBLISH_TIMEOUT)
         logger.info("Published data result with id %s to %s", result, topic)
         return result
 
+    def publish_async(self, topic, message: Message) -> Future | None:
+        """Publish a message to a topic without waiting for it to be published.
+
+        If it fails to publish, it's saved to the outbox to be retried.
+        """
+        logger.info("Received data to publish asynchronously %s", message)
+        try:
+            future = self.client.publish(self.client.topic_path(self.project_id, topic), message.data)
+        except (GoogleAPIError, RuntimeError) as exc:
+            # E.g. the client was already stopped. This runs in an on_commit callback, where raising would fail the
+            # request after its changes were committed.
+            logger.warning("Failed to publish data to %s, saving it to the outbox", topic, exc_info=True)
+            OutboxMessage.objects.create(topic=topic, data=message.data, last_error=str(exc))
+            return None
+        self.pending.add(future)
+        future.add_done_callback(partial(self._handle_published, topic, message))
+        return future
+
+    def _handle_published(self, topic, message: Message, future: Future) -> None:
+        # This is called from the client's batching thread
+        self.pending.discard(future)
+        if (error := future.exception()) is None:
+            logger.info("Published data result with id %s to %s", future.result(), topic)
+            return
+        logger.warning("Failed to publish data to %s, saving it to the outbox", topic, exc_info=error)
+        try:
+            OutboxMessage.objects.create(topic=topic, data=message.data, last_error=str(error))
+        finally:
+            # Nothing else closes the database connections of the batching thread
+            connection.close()
+
     @classmethod
     def get_instance(cls):
         """Return an instance of Publisher.
@@ -42,3 +97,23 @@ class Publisher:
         if not cls.__instance:
             cls.__instance = Publisher()
         return cls.__instance
+
+    @classmethod
+    def stop_instance(cls, **kwargs) -> None:
+        """Publish the messages the client is still batching and stop it, waiting for them to be published.
+
+        This is called on process shutdown, so that messages published asynchronously aren't lost when e.g. a uWSGI
+        worker is recycled. Any that fail to publish are saved to the outbox.
+        """
+        if not (instance := cls.__instance):
+            return
+        cls.__instance = None
+        instance.client.stop()
+        if pending := list(instance.pending):
+            logger.info("Waiting for %s messages to be published before exiting", len(pending))
+            wait(pending, timeout=settings.PUBSUB_PUBLISH_TIMEOUT)
+
+
+# uWSGI workers run atexit handlers when they're recycled, but Celery's pool processes exit without running them
+atexit.register(Publisher.stop_instance)
+worker_process_shutdown.connect(Publisher.stop_instance)
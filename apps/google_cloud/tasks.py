@@ -0,0 +1,43 @@
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from django.conf import settings
+
+from celery import shared_task
+from celery.utils.log import get_task_logger
+from google.api_core.exceptions import GoogleAPIError
+
+from apps.google_cloud.models import OutboxMessage
+from apps.google_cloud.pubsub import Publisher
+
+
+logger = get_task_logger(f"{settings.DEFAULT_LOGGER}.{__name__}")
+
+
+@shared_task
+def publish_outbox_messages() -> None:
+    """Retry publishing the oldest `settings.PUBSUB_OUTBOX_BATCH_SIZE` messages in the outbox.
+
+    Messages are published concurrently, and removed from the outbox once published. This is meant to be scheduled
+    periodically with django-celery-beat.
+    """
+    if not (messages := list(OutboxMessage.objects.order_by("created")[: settings.PUBSUB_OUTBOX_BATCH_SIZE])):
+        return
+    logger.info("Retrying %s outbox messages", len(messages))
+    client = (publisher := Publisher.get_instance()).client
+    futures = [(x, client.publish(client.topic_path(publisher.project_id, x.topic), bytes(x.data))) for x in messages]
+    published, failed = [], []
+    for message, future in futures:
+        try:
+            future.result(timeout=settings.PUBSUB_PUBLISH_TIMEOUT)
+        except (GoogleAPIError, FutureTimeoutError) as exc:
+            message.attempts += 1
+            message.last_error = str(exc)
+            failed.append(message)
+        else:
+            published.append(message.id)
+    OutboxMessage.objects.filter(id__in=published).delete()
+    OutboxMessage.objects.bulk_update(failed, ["attempts", "last_error"])
+    if failed:
+        logger.error("Failed to publish %s of %s outbox messages", len(failed), len(messages))
+    else:
+        logger.info("Published %s outbox messages", len(messages))
@@ -1,6 +1,14 @@
+import os
+from uuid import uuid4
+
+import pytest
+from google.api_core.exceptions import ServiceUnavailable
+from google.cloud import pubsub_v1
 from google.cloud.pubsub_v1 import futures
 
+from apps.google_cloud.models import OutboxMessage
 from apps.google_cloud.pubsub import Message, Publisher
+from apps.google_cloud.tasks import publish_outbox_messages
 
 
 def test_encodes_string_to_bytes():
@@ -8,6 +16,7 @@ def test_encodes_string_to_bytes():
 
 
 def test_publishes_to_google_cloud_pub_sub(mocker, settings):
+    settings.PUBSUB_PUBLISH_ASYNC = False
     publisher_client = mocker.Mock()
     settings.GOOGLE_CLOUD_PROJECT = "project"
     mocker.patch("google.cloud.pubsub_v1.PublisherClient", return_value=publisher_client)
@@ -26,3 +35,116 @@ def test_publishes_to_google_cloud_pub_sub(mocker, settings):
     assert expected == result
     publisher_client.topic_path.assert_called_once_with(settings.GOOGLE_CLOUD_PROJECT, topic)
     publisher_client.publish.assert_called_once_with(full_topic_path, message.data)
+
+
+@pytest.fixture
+def publisher(mocker, settings):
+    settings.GOOGLE_CLOUD_PROJECT = "project"
+    mocker.patch("google.cloud.pubsub_v1.PublisherClient", return_value=mocker.Mock())
+    publisher = Publisher()
+    publisher.client.topic_path.side_effect = lambda project, topic: f"projects/{project}/topics/{topic}"
+    return publisher
+
+
+def _future(result=None, error=None):
+    future = futures.Future()
+    if error:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+    return future
+
+
+@pytest.mark.django_db
+def test_publish_when_async_publishes_on_commit(publisher, settings, django_capture_on_commit_callbacks):
+    settings.PUBSUB_PUBLISH_ASYNC = True
+    publisher.client.publish.return_value = _future("id")
+    message = Message(data="some message")
+    with django_capture_on_commit_callbacks() as callbacks:
+        assert publisher.publish("topic", message) is None
+    publisher.client.publish.assert_not_called()
+    assert len(callbacks) == 1
+    callbacks[0]()
+    publisher.client.publish.assert_called_once_with("projects/project/topics/topic", message.data)
+    assert not OutboxMessage.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_publish_async_saves_failures_to_outbox(publisher):
+    publisher.client.publish.side_effect = [_future(error=ServiceUnavailable("Nope")), _future("id")]
+    publisher.publish_async("topic", Message(data="first"))
+    publisher.publish_async("topic", Message(data="second"))
+    assert not publisher.pending
+    outbox_message = OutboxMessage.objects.get()
+    assert outbox_message.topic == "topic"
+    assert bytes(outbox_message.data) == b"first"
+    assert outbox_message.attempts == 1
+    assert "Nope" in outbox_message.last_error
+
+
+@pytest.mark.django_db
+def test_publish_async_saves_synchronous_errors_to_outbox(publisher):
+    publisher.client.publish.side_effect = RuntimeError("Cannot publish on a stopped publisher.")
+    assert publisher.publish_async("topic", Message(data="data")) is None
+    outbox_message = OutboxMessage.objects.get()
+    assert bytes(outbox_message.data) == b"data"
+    assert "stopped" in outbox_message.last_error
+
+
+def test_stop_instance_publishes_pending_messages(publisher, mocker):
+    mocker.patch.object(Publisher, "_Publisher__instance", publisher)
+    publisher.pending.add(future := futures.Future())
+    publisher.client.stop.side_effect = lambda: future.set_result("id")
+    Publisher.stop_instance()
+    publisher.client.stop.assert_called_once()
+    assert future.done()
+    Publisher.stop_instance()
+    publisher.client.stop.assert_called_once()
+
+
+@pytest.mark.django_db
+def test_publish_outbox_messages(publisher, mocker, settings):
+    settings.PUBSUB_OUTBOX_BATCH_SIZE = 2
+    mocker.patch("apps.google_cloud.tasks.Publisher.get_instance", return_value=publisher)
+    first, second, third = (OutboxMessage.objects.create(topic=f"topic-{i}", data=b"data") for i in range(3))
+    publisher.client.publish.side_effect = [_future("id"), _future(error=ServiceUnavailable("Nope"))]
+    publish_outbox_messages()
+    assert publisher.client.publish.call_args_list == [
+        mocker.call("projects/project/topics/topic-0", b"data"),
+        mocker.call("projects/project/topics/topic-1", b"data"),
+    ]
+    assert set(OutboxMessage.objects.values_list("id", flat=True)) == {second.id, third.id}
+    second.refresh_from_db()
+    assert second.attempts == 2
+    assert "Nope" in second.last_error
+
+
+@pytest.mark.django_db
+def test_publish_outbox_messages_when_empty(mocker):
+    mock_get_instance = mocker.patch("apps.google_cloud.tasks.Publisher.get_instance")
+    publish_outbox_messages()
+    mock_get_instance.assert_not_called()
+
+
+@pytest.mark.skipif(
+    not os.getenv("PUBSUB_EMULATOR_HOST"), reason="Needs the Pub/Sub emulator from google_cloud_pub_sub/ running"
+)
+@pytest.mark.django_db(transaction=True)
+def test_publish_async_against_emulator(settings):
+    settings.GOOGLE_CLOUD_PROJECT = "revenue-engine"
+    publisher = Publisher()
+    topic = f"test-{uuid4()}"
+    topic_path = publisher.client.topic_path(settings.GOOGLE_CLOUD_PROJECT, topic)
+    publisher.client.create_topic(name=topic_path)
+    subscriber = pubsub_v1.SubscriberClient()
+    subscription_path = subscriber.subscription_path(settings.GOOGLE_CLOUD_PROJECT, topic)
+    subscriber.create_subscription(name=subscription_path, topic=topic_path)
+    sent = {f"message {i}".encode() for i in range(20)}
+    for future in [publisher.publish_async(topic, Message(data=x.decode())) for x in sent]:
+        future.result(timeout=10)
+    received = set()
+    while len(received) < len(sent):
+        response = subscriber.pull(subscription=subscription_path, max_messages=len(sent), timeout=10)
+        received |= {x.message.data for x in response.received_messages}
+    assert received == sent
+    assert not OutboxMessage.objects.exists()
@@ -2,14 +2,17 @@ from __future__ import annotations
 
 import logging
 import typing
+from collections.abc import Callable
 from dataclasses import dataclass
-from typing import Literal
+from typing import Literal, TypeVar
 
 from django.conf import settings
+from django.core.cache import cache
 
 import mailchimp_marketing as MailchimpMarketing
 from mailchimp_marketing.api_client import ApiClientError
 
+from apps.common.cache import cache_get, cache_set
 from apps.organizations.typings import MailchimpProductType, MailchimpSegmentName, MailchimpSegmentOptions
 
 
@@ -20,6 +23,8 @@ if typing.TYPE_CHECKING:  # pragma: no cover
 
 logger = logging.getLogger(f"{settings.DEFAULT_LOGGER}.{__name__}")
 
+T = TypeVar("T")
+
 
 class MailchimpIntegrationError(Exception):
     pass
@@ -155,7 +160,11 @@ class MailchimpSegment:
 
 
 class RevenueProgramMailchimpClient(MailchimpMarketing.Client):
-    """Mailchimp client configured to interact with a revenue program's integration, after it's been initially set up."""
+    """Mailchimp client configured to interact with a revenue program's integration, after it's been initially set up.
+
+    Entities read through the `get_` methods are cached for `settings.MAILCHIMP_CACHE_TTL` seconds, including ones that
+    aren't found. Creating an entity through the `create_` methods updates the cache.
+    """
 
     def __init__(self, rp: RevenueProgram):
         logger.info("Called for RP %s", rp.id)
@@ -204,7 +213,8 @@ class RevenueProgramMailchimpClient(MailchimpMarketing.Client):
             logger.info(
                 "Successfully created mailchimp product for RP %s, product_id %s", self.revenue_program.id, product_id
             )
-            return MailchimpProduct(**response)
+            self._set_cached(f"product:{product_id}", product := MailchimpProduct(**response))
+            return product
 
     def create_segment(self, segment_name: MailchimpSegmentName, options) -> MailchimpSegment | None:
         """Create a segment of the revenue program's Mailchimp list. This list must be previously created."""
@@ -221,7 +231,9 @@ class RevenueProgramMailchimpClient(MailchimpMarketing.Client):
             logger.info(
                 "Successfully created segment for RP %s, segment_name %s", self.revenue_program.id, segment_name
             )
-            return MailchimpSegment(**response)
+            segment = MailchimpSegment(**response)
+            self._set_cached(f"list-{self.revenue_program.mailchimp_list_id}:segment:{segment.id}", segment)
+            return segment
 
     def create_store(self) -> MailchimpStore:
         """Create a Mailchimp ecommerce store for the revenue program's Mailchimp list. This list must be previously created."""
@@ -243,55 +255,124 @@ class RevenueProgramMailchimpClient(MailchimpMarketing.Client):
             return self._handle_write_error("store", error, "create_store")
         else:
             logger.info("Successfully created store for RP %s", self.revenue_program.id)
-            return MailchimpStore(**response)
+            self._set_cached("store", store := MailchimpStore(**response))
+            return store
 
     def get_email_list(self) -> MailchimpEmailList | None:
         """Retrieve the Mailchimp list belonging to the integration, if it exists."""
         logger.debug("Called for RP %s", self.revenue_program.id)
         if not self._has_list_id():
             return None
+        logger.info("Getting list %s for RP %s", self.revenue_program.mailchimp_list_id, self.revenue_program.id)
+        # we want to log as an error if not found because in this case, something has gone wrong in that we have a
+        # list ID but it is not found on Mailchimp.  This will give us a signal in Sentry, while not blocking
+        # serialization of the revenue program.
+        return self._cached_read(
+            f"list-{self.revenue_program.mailchimp_list_id}",
+            "mailchimp email list",
+            lambda: MailchimpEmailList(**self.lists.get_list(self.revenue_program.mailchimp_list_id)),
+            log_level_on_not_found="error",
+        )
+
+    def get_email_lists(self) -> list[MailchimpEmailList]:
+        """Retrieve the Mailchimp lists of the integration's account.
+
+        See https://mailchimp.com/developer/marketing/api/lists/get-lists-info/
+        """
+        logger.debug("Called for RP %s", self.revenue_program.id)
+        key = self.get_cache_key(self.revenue_program.id, "lists")
+        if (cached := cache.get(key)) is not None:
+            return cached
         try:
-            logger.info("Getting list %s for RP %s", self.revenue_program.mailchimp_list_id, self.revenue_program.id)
-            response = self.lists.get_list(self.revenue_program.mailchimp_list_id)
-        except ApiClientError as error:
-            # we want to log as an error if not found because in this case, something has gone wrong in that we have a
-            # list ID but it is not found on Mailchimp.  This will give us a signal in Sentry, while not blocking
-            # serialization of the revenue program.
-            return self._handle_read_error("mailchimp email list", error, log_level_on_not_found="error")
-        else:
-            return MailchimpEmailList(**response)
+            logger.info(
+                "Fetching email lists from Mailchimp for RP with ID %s mc server prefix %s",
+                self.revenue_program.id,
+                self.revenue_program.mailchimp_server_prefix,
+            )
+            response = self.lists.get_all_lists(count=1000)
+        except ApiClientError as exc:
+            logger.exception(
+                "Failed to fetch email lists from Mailchimp for RP with ID %s mc server prefix %s."
+                " The error text is %s",
+                self.revenue_program.id,
+                self.revenue_program.mailchimp_server_prefix,
+                exc.text,
+            )
+            return []
+        lists = response.get("lists", [])
+        logger.debug("Response from Mailchimp containing %s list ids", len(lists))
+        cache.set(key, email_lists := [MailchimpEmailList(**x) for x in lists], timeout=settings.MAILCHIMP_CACHE_TTL)
+        return email_lists
 
     def get_product(self, product_id: str) -> MailchimpProduct | None:
         """Retrieve an ecommerce product from the revenue program's Mailchimp store, if it exists."""
         logger.debug("Called for RP %s", self.revenue_program.id)
-        try:
-            response = self.ecommerce.get_store_product(self.revenue_program.mailchimp_store_id, product_id)
-        except ApiClientError as exc:
-            return self._handle_read_error("contribution product", exc)
-        else:
-            return MailchimpProduct(**response)
+        return self._cached_read(
+            f"product:{product_id}",
+            "contribution product",
+            lambda: MailchimpProduct(
+                **self.ecommerce.get_store_product(self.revenue_program.mailchimp_store_id, product_id)
+            ),
+        )
 
     def get_segment(self, segment_id: int) -> MailchimpSegment | None:
         """Retrieve a segment of the revenue program's Mailchimp list, if it exists."""
         logger.debug("Called for RP %s", self.revenue_program.id)
         if not self._has_list_id():
             return None
-        try:
-            response = self.lists.get_segment(self.revenue_program.mailchimp_list_id, segment_id)
-        except ApiClientError as error:
-            return self._handle_read_error("contributor segment", error)
-        else:
-            return MailchimpSegment(**response)
+        return self._cached_read(
+            f"list-{self.revenue_program.mailchimp_list_id}:segment:{segment_id}",
+            "contributor segment",
+            lambda: MailchimpSegment(**self.lists.get_segment(self.revenue_program.mailchimp_list_id, segment_id)),
+        )
 
     def get_store(self) -> MailchimpStore | None:
         """Retrieve the revenue program's Mailchimp ecommerce store, if it exists."""
         logger.debug("Called for RP %s", self.revenue_program.id)
+        return self._cached_read(
+            "store",
+            "store",
+            lambda: MailchimpStore(**self.ecommerce.get_store(self.revenue_program.mailchimp_store_id)),
+        )
+
+    @staticmethod
+    def get_cache_key(rp_id: int, entity: str) -> str:
+        return f"mailchimp:rp-{rp_id}:{entity}"
+
+    @classmethod
+    def clear_cache(cls, rp_id: int) -> None:
+        """Clear the cached entities of a revenue program that aren't specific to its Mailchimp list.
+
+        Entities of a list are cached by its ID, so they don't need clearing when the revenue program's list changes.
+        """
+        entities = ["store", "lists", *(f"product:{x.as_mailchimp_product_id(rp_id)}" for x in MailchimpProductType)]
+        cache.delete_many([cls.get_cache_key(rp_id, x) for x in entities])
+
+    def _set_cached(self, entity: str, value) -> None:
+        cache_set(self.get_cache_key(self.revenue_program.id, entity), value, settings.MAILCHIMP_CACHE_TTL)
+
+    def _cached_read(
+        self,
+        entity: str,
+        description: str,
+        read: Callable[[], T],
+        log_level_on_not_found: Literal["debug", "error", "warning"] = "debug",
+    ) -> T | None:
+        """Return the cached value of an entity, or read and cache it.
+
+        Entities that aren't found are cached as None, but other errors aren't cached.
+        """
+        if (cached := cache_get(self.get_cache_key(self.revenue_program.id, entity))) is not None:
+            logger.debug("Using cached Mailchimp %s for RP %s", description, self.revenue_program.id)
+            return cached[0]
         try:
-            response = self.ecommerce.get_store(self.revenue_program.mailchimp_store_id)
-        except ApiClientError as exc:
-            return self._handle_read_error("store", exc)
-        else:
-            return MailchimpStore(**response)
+            value = read()
+        except ApiClientError as error:
+            value = self._handle_read_error(description, error, log_level_on_not_found=log_level_on_not_found)
+            if error.status_code != 404:
+                return value
+        self._set_cached(entity, value)
+        return value
 
     def _has_list_id(self, raise_if_not_present=False):
         """Check whether a revenue program has a check for Mailchimp list ID on a revenue program."""
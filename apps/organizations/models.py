@@ -1,5 +1,7 @@
 import logging
 import uuid
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict, dataclass, field
 from functools import cached_property
 
@@ -12,8 +14,8 @@ from django.utils import timezone
 import reversion
 import stripe
 from addict import Dict as AttrDict
-from mailchimp_marketing.api_client import ApiClientError
 
+from apps.common.cache import cache_delete_many, cache_get_or_set
 from apps.common.models import IndexedTimeStampedModel
 from apps.common.secret_manager import GoogleCloudSecretProvider
 from apps.common.utils import google_cloud_pub_sub_is_configured, normalize_slug
@@ -506,10 +508,6 @@ class RevenueProgram(IndexedTimeStampedModel):
     mailchimp_monthly_contributors_segment_id = models.CharField(max_length=100, null=True, blank=True)
     mailchimp_yearly_contributors_segment_id = models.CharField(max_length=100, null=True, blank=True)
     # NB: This field is stored in a secret manager, not in the database.
-    # TODO @BW: Cache value for mailchimp_access_token to avoid hitting the secret manager on every request. Also include
-    # activecampaign_access_token below
-    # DEV-3581
-    # (potentially multiple times per request)
     mailchimp_access_token = GoogleCloudSecretProvider(model_attr="mailchimp_access_token_secret_name")
 
     # API key used for ActiveCampaign integration.
@@ -523,6 +521,39 @@ class RevenueProgram(IndexedTimeStampedModel):
     def __str__(self):
         return self.name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # So that if the slug changes, what's cached for the old one can be invalidated. Going via __dict__ so as not to
+        # trigger a query if the field is deferred.
+        instance._loaded_slug = instance.__dict__.get("slug")
+        return instance
+
+    @staticmethod
+    def get_by_slug_cache_key(slug: str) -> str:
+        return f"revenue-program-by-slug:{slug}"
+
+    @classmethod
+    def get_cached_by_slug(cls, slug: str) -> "RevenueProgram | None":
+        """Return the revenue program with the slug, with its social meta selected, or None if there isn't one.
+
+        Either result is cached in Redis, and, for `settings.LOCAL_CACHE_TTL` seconds, in process in front of it. Slugs
+        without a revenue program are only cached briefly, since any Host header can be looked up. The Redis cache is
+        invalidated by signal handlers in `apps.organizations.signals` when the revenue program or its social meta change.
+        """
+        return cache_get_or_set(
+            cls.get_by_slug_cache_key(slug),
+            lambda: cls.objects.select_related("socialmeta").filter(slug=slug).first(),
+            settings.REVENUE_PROGRAM_BY_SLUG_CACHE_TTL,
+            none_timeout=settings.REVENUE_PROGRAM_BY_SLUG_NOT_FOUND_CACHE_TTL,
+            local=True,
+        )
+
+    @classmethod
+    def invalidate_cached_by_slug(cls, slugs: Iterable[str | None]) -> None:
+        if keys := [cls.get_by_slug_cache_key(x) for x in set(slugs) if x]:
+            cache_delete_many(keys, local=True)
+
     @property
     def contributor_portal_url(self):
         from apps.api.views import construct_rp_domain  # noqa: PLC0415
@@ -541,7 +572,7 @@ class RevenueProgram(IndexedTimeStampedModel):
         This is boilerplate that's necessary to make MailchimpRevenueProgramForSpaConfiguration (serializer) happy
         and easily testable.
         """
-        return asdict(self.mailchimp_email_list) if self.mailchimp_email_list else None
+        return asdict(email_list) if (email_list := self.mailchimp_email_list) else None
 
     @cached_property
     def available_mailchimp_email_lists(self) -> list[dict]:
@@ -601,23 +632,23 @@ class RevenueProgram(IndexedTimeStampedModel):
         if _segment_id := getattr(self, segment_id):
             return self.mailchimp_client.get_segment(_segment_id)
 
-    @property
+    @cached_property
     def mailchimp_one_time_contributors_segment(self) -> MailchimpSegment | None:
         return self._get_mailchimp_segment(MailchimpSegmentName.ONE_TIME_CONTRIBUTORS.as_rp_id_field())
 
-    @property
+    @cached_property
     def mailchimp_all_contributors_segment(self) -> MailchimpSegment | None:
         return self._get_mailchimp_segment(MailchimpSegmentName.ALL_CONTRIBUTORS.as_rp_id_field())
 
-    @property
+    @cached_property
     def mailchimp_recurring_contributors_segment(self) -> MailchimpSegment | None:
         return self._get_mailchimp_segment(MailchimpSegmentName.RECURRING_CONTRIBUTORS.as_rp_id_field())
 
-    @property
+    @cached_property
     def mailchimp_monthly_contributors_segment(self) -> MailchimpSegment | None:
         return self._get_mailchimp_segment(MailchimpSegmentName.MONTHLY_CONTRIBUTORS.as_rp_id_field())
 
-    @property
+    @cached_property
     def mailchimp_yearly_contributors_segment(self) -> MailchimpSegment | None:
         return self._get_mailchimp_segment(MailchimpSegmentName.YEARLY_CONTRIBUTORS.as_rp_id_field())
 
@@ -676,26 +707,29 @@ class RevenueProgram(IndexedTimeStampedModel):
                     "Couldn't create %s Mailchimp contribution product for RP %s; continuing", product_type, self.id
                 )
 
-    def ensure_mailchimp_contributor_segment(
-        self,
-        segment_name: MailchimpSegmentName,
-    ) -> None:
-        """Ensure that a Mailchimp segment exists for this revenue program."""
+    def ensure_mailchimp_contributor_segment(self, segment_name: MailchimpSegmentName, save: bool = True) -> str | None:
+        """Ensure that a Mailchimp segment exists for this revenue program.
+
+        :param save: Whether to save the ID of a created segment. If not, saving it is up to the caller.
+        :return: The name of the field set to the ID of a created segment, if one was created.
+        """
         if getattr(self, segment_name.as_rp_field(), None):
             logger.info("Segment already exists for RP %s", self.id)
-        else:
-            try:
-                segment = self.mailchimp_client.create_segment(segment_name, segment_name.get_segment_options())
-            except MailchimpIntegrationError:
-                logger.exception("Couldn't create Mailchimp %s segment for RP %s; continuing", segment_name, self.id)
-            else:
-                logger.info("%s segment created for RP %s", segment_name, self.id)
-                rp_segment_id = segment_name.as_rp_id_field()
-                setattr(self, rp_segment_id, segment.id)
-                logger.info("Saving Mailchimp %s for RP %s", rp_segment_id, self.id)
-                with reversion.create_revision():
-                    self.save(update_fields={rp_segment_id, "modified"})
-                    reversion.set_comment(f"ensure_mailchimp_segment updated {rp_segment_id}")
+            return None
+        try:
+            segment = self.mailchimp_client.create_segment(segment_name, segment_name.get_segment_options())
+        except MailchimpIntegrationError:
+            logger.exception("Couldn't create Mailchimp %s segment for RP %s; continuing", segment_name, self.id)
+            return None
+        logger.info("%s segment created for RP %s", segment_name, self.id)
+        rp_segment_id = segment_name.as_rp_id_field()
+        setattr(self, rp_segment_id, segment.id)
+        if save:
+            logger.info("Saving Mailchimp %s for RP %s", rp_segment_id, self.id)
+            with reversion.create_revision():
+                self.save(update_fields={rp_segment_id, "modified"})
+                reversion.set_comment(f"ensure_mailchimp_segment updated {rp_segment_id}")
+        return rp_segment_id
 
     def ensure_mailchimp_entities(self) -> None:
         """Ensure that all Mailchimp entities are created for this revenue program.
@@ -713,13 +747,30 @@ class RevenueProgram(IndexedTimeStampedModel):
           - One-time contributors
           - Monthly contributors
           - Yearly contributors
+
+        Segments only depend on the email list, so they're ensured concurrently with the store. Products belong to the
+        store, so they're ensured concurrently once it exists. The IDs of created segments are saved together at the end,
+        even if ensuring another entity fails.
         """
         logger.info("Ensuring mailchimp entities for RP %s", self.id)
-        self.ensure_mailchimp_store()
-        for product in [x for x in MailchimpProductType if x != MailchimpProductType.RECURRING]:
-            self.ensure_mailchimp_contribution_product(product)
-        for segment in MailchimpSegmentName:
-            self.ensure_mailchimp_contributor_segment(segment)
+        products = [x for x in MailchimpProductType if x != MailchimpProductType.RECURRING]
+        # At most one request per entity is in flight, which stays within Mailchimp's limit of 10 concurrent connections
+        with ThreadPoolExecutor(max_workers=len(products) + len(MailchimpSegmentName)) as executor:
+            segments = [
+                executor.submit(self.ensure_mailchimp_contributor_segment, x, save=False) for x in MailchimpSegmentName
+            ]
+            try:
+                self.ensure_mailchimp_store()
+                list(executor.map(self.ensure_mailchimp_contribution_product, products))
+            finally:
+                if update_fields := {x.result() for x in segments if not x.exception() and x.result()}:
+                    logger.info("Saving Mailchimp segment IDs for RP %s", self.id)
+                    with reversion.create_revision():
+                        self.save(update_fields={*update_fields, "modified"})
+                        reversion.set_comment(f"ensure_mailchimp_entities updated {', '.join(sorted(update_fields))}")
+        for segment in segments:
+            # Raise the first error ensuring a segment, if any (for instance, a rate limit error to retry on)
+            segment.result()
 
     def publish_revenue_program_activecampaign_configuration_complete(self):
         """Publish a message to the `RP_ACTIVECAMPAIGN_CONFIGURATION_COMPLETE_TOPIC` topic."""
@@ -806,35 +857,14 @@ class RevenueProgram(IndexedTimeStampedModel):
 
     @cached_property
     def mailchimp_email_lists(self) -> list[MailchimpEmailList]:
-        """Retrieve Mailchimp email lists for this RP, if any.
-
-        See https://mailchimp.com/developer/marketing/api/lists/get-lists-info/
-        """
+        """Retrieve Mailchimp email lists for this RP, if any."""
         logger.info("Called for rp %s", self.id)
         if not self.mailchimp_integration_connected:
             logger.debug(
                 "Mailchimp integration not connected for this revenue program (%s), returning empty list", self.id
             )
             return []
-        try:
-            logger.info(
-                "Fetching email lists from Mailchimp for RP with ID %s mc server prefix %s",
-                self.id,
-                self.mailchimp_server_prefix,
-            )
-            response = self.mailchimp_client.lists.get_all_lists(count=1000)
-            lists = response.get("lists", [])
-            logger.debug("Response from Mailchimp containing %s list ids", len(lists))
-            return [MailchimpEmailList(**x) for x in lists]
-        except ApiClientError as exc:
-            logger.exception(
-                "Failed to fetch email lists from Mailchimp for RP with ID %s mc server prefix %s."
-                " The error text is %s",
-                self.id,
-                self.mailchimp_server_prefix,
-                exc.text,
-            )
-            return []
+        return self.mailchimp_client.get_email_lists()
 
     def clean_fields(self, **kwargs):
         if not self.id:
@@ -916,8 +946,8 @@ class RevenueProgram(IndexedTimeStampedModel):
             self.mailchimp_access_token_secret_name,
             self.id,
         )
-        # Note, we should confirm DEV-3581 doesn't cause any issues with this line if we end up doing that ticket.
         del self.mailchimp_access_token  # This will delete the secret from Google Cloud Secrets Manager if it exists
+        RevenueProgramMailchimpClient.clear_cache(self.id)
         logger.info("Setting mailchimp_server_prefix to None for rp_id=[%s]", self.id)
         with reversion.create_revision():
             self.mailchimp_server_prefix = None
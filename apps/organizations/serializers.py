@@ -8,6 +8,7 @@ import requests
 import reversion
 from rest_framework import serializers
 
+from apps.api.serializers import SparseFieldsetSerializerMixin
 from apps.organizations.models import (
     Benefit,
     BenefitLevel,
@@ -332,12 +333,32 @@ class ActiveCampaignRevenueProgramForSwitchboardSerializer(BaseActiveCampaignRev
         ]
 
 
-class RevenueProgramSerializer(UpdateFieldsBaseSerializer):
+class RevenueProgramSerializer(SparseFieldsetSerializerMixin, UpdateFieldsBaseSerializer):
     """RevenueProgram serializer you should consider updating."""
 
     slug = serializers.SlugField(required=False)
     transactional_email_style = serializers.SerializerMethodField()
 
+    # These are used in view layer db queries to reduce footprint.
+    _ONLIES = (
+        "id",
+        "name",
+        "slug",
+        "tax_id",
+        "fiscal_status",
+        "fiscal_sponsor_name",
+        "contact_phone",
+        "contact_email",
+    )
+    _ONLIES_BY_FIELD = {
+        "transactional_email_style": (
+            "organization__plan_name",
+            "default_donation_page__header_logo",
+            "default_donation_page__header_logo_alt_text",
+            "default_donation_page__styles__styles",
+        ),
+    }
+
     class Meta:
         model = RevenueProgram
         fields = (
@@ -8,6 +8,7 @@ from django.dispatch import receiver
 
 import reversion
 
+from apps.common.cache import invalidate_now_and_on_commit
 from apps.common.models import SocialMeta
 from apps.organizations.models import CorePlan, Organization, RevenueProgram
 from apps.organizations.tasks import setup_mailchimp_entities_for_rp_mailing_list
@@ -180,3 +181,22 @@ def handle_set_default_donation_page_on_select_core_plan(
             reversion.set_comment("handle_set_default_donation_page_on_select_core_plan set default_donation_page")
     else:
         logger.warning("No donation pages found for RP %s, can't set default donation page", rp.id)
+
+
+@receiver(post_save, sender=RevenueProgram)
+@receiver(post_delete, sender=RevenueProgram)
+def invalidate_revenue_program_cached_by_slug(sender, instance: RevenueProgram, **kwargs) -> None:
+    # Unknown slugs are cached too, so this covers new revenue programs and renames to a previously requested slug
+    invalidate_now_and_on_commit(
+        RevenueProgram.invalidate_cached_by_slug, {instance.slug, getattr(instance, "_loaded_slug", None)}
+    )
+
+
+@receiver(post_save, sender=SocialMeta)
+@receiver(post_delete, sender=SocialMeta)
+def invalidate_revenue_program_cached_by_slug_for_social_meta(sender, instance: SocialMeta, **kwargs) -> None:
+    if instance.revenue_program_id:
+        invalidate_now_and_on_commit(
+            RevenueProgram.invalidate_cached_by_slug,
+            set(RevenueProgram.objects.filter(id=instance.revenue_program_id).values_list("slug", flat=True)),
+        )
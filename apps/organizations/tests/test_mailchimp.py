@@ -146,6 +146,27 @@ class TestRevenueProgramMailchimpClient:
         client = RevenueProgramMailchimpClient(mc_connected_rp)
         assert client.get_email_list() is None
 
+    def test_get_email_lists_happy_path(self, mc_connected_rp, mailchimp_email_list_from_api, mocker):
+        client = RevenueProgramMailchimpClient(mc_connected_rp)
+        mocker.patch.object(client.lists, "get_all_lists", return_value={"lists": [mailchimp_email_list_from_api]})
+        assert client.get_email_lists() == [MailchimpEmailList(**mailchimp_email_list_from_api)]
+        assert client.get_email_lists() == [MailchimpEmailList(**mailchimp_email_list_from_api)]
+        client.lists.get_all_lists.assert_called_once_with(count=1000)
+
+    def test_get_email_lists_api_error(self, mc_connected_rp, mocker):
+        client = RevenueProgramMailchimpClient(mc_connected_rp)
+        mocker.patch.object(client.lists, "get_all_lists", side_effect=ApiClientError(error_text := "Ruh roh"))
+        log_spy = mocker.spy(mailchimp_logger, "exception")
+        assert client.get_email_lists() == []
+        log_spy.assert_called_once_with(
+            "Failed to fetch email lists from Mailchimp for RP with ID %s mc server prefix %s. The error text is %s",
+            mc_connected_rp.id,
+            mc_connected_rp.mailchimp_server_prefix,
+            error_text,
+        )
+        assert client.get_email_lists() == []
+        assert client.lists.get_all_lists.call_count == 2
+
     def test_get_product_happy_path(self, mc_connected_rp, mailchimp_product_from_api, mocker):
         client = RevenueProgramMailchimpClient(mc_connected_rp)
         mocker.patch.object(client.ecommerce, "get_store_product", return_value=mailchimp_product_from_api)
@@ -205,3 +226,93 @@ class TestRevenueProgramMailchimpClient:
         with pytest.raises(MailchimpRateLimitError):
             client._handle_write_error("test-entity", ApiClientError("test-error", 429), "some-caller")
         logger_spy.assert_called_with("Mailchimp rate limit exceeded for RP %s, raising exception", mc_connected_rp.id)
+
+    def test_reads_are_cached(
+        self, mc_connected_rp, mailchimp_store_from_api, mailchimp_contributor_segment_from_api, mocker
+    ):
+        client = RevenueProgramMailchimpClient(mc_connected_rp)
+        mocker.patch.object(client.ecommerce, "get_store", return_value=mailchimp_store_from_api)
+        mocker.patch.object(client.lists, "get_segment", return_value=mailchimp_contributor_segment_from_api)
+        assert client.get_store() == MailchimpStore(**mailchimp_store_from_api)
+        assert client.get_segment(123) == MailchimpSegment(**mailchimp_contributor_segment_from_api)
+        # A new client, as a later request would have
+        client = RevenueProgramMailchimpClient(mc_connected_rp)
+        mocker.patch.object(client.ecommerce, "get_store")
+        mocker.patch.object(client.lists, "get_segment")
+        assert client.get_store() == MailchimpStore(**mailchimp_store_from_api)
+        assert client.get_segment(123) == MailchimpSegment(**mailchimp_contributor_segment_from_api)
+        client.ecommerce.get_store.assert_not_called()
+        client.lists.get_segment.assert_not_called()
+        # Segments are cached by list
+        client.lists.get_segment.return_value = mailchimp_contributor_segment_from_api
+        mc_connected_rp.mailchimp_list_id = "other-list"
+        client.get_segment(123)
+        client.lists.get_segment.assert_called_once_with("other-list", 123)
+
+    @pytest.mark.parametrize(("status_code", "cached"), [(404, True), (500, False)])
+    def test_read_errors_are_cached_when_not_found(self, status_code, cached, mc_connected_rp, mocker):
+        client = RevenueProgramMailchimpClient(mc_connected_rp)
+        mocker.patch.object(client.ecommerce, "get_store", side_effect=ApiClientError("test-error", status_code))
+        assert client.get_store() is None
+        assert client.get_store() is None
+        assert client.ecommerce.get_store.call_count == (1 if cached else 2)
+
+    def test_read_rate_limit_error_is_not_cached(self, mc_connected_rp, mailchimp_store_from_api, mocker):
+        client = RevenueProgramMailchimpClient(mc_connected_rp)
+        mocker.patch.object(client.ecommerce, "get_store", side_effect=ApiClientError("test-error", 429))
+        with pytest.raises(MailchimpRateLimitError):
+            client.get_store()
+        client.ecommerce.get_store.side_effect = None
+        client.ecommerce.get_store.return_value = mailchimp_store_from_api
+        assert client.get_store() == MailchimpStore(**mailchimp_store_from_api)
+
+    def test_creates_update_cache(
+        self,
+        mc_connected_rp,
+        mailchimp_store_from_api,
+        mailchimp_product_from_api,
+        mailchimp_contributor_segment_from_api,
+        mocker,
+    ):
+        mocker.patch(
+            "apps.organizations.models.RevenueProgram.payment_provider",
+            return_value=mocker.MagicMock(currency="usd"),
+            new_callable=mocker.PropertyMock,
+        )
+        client = RevenueProgramMailchimpClient(mc_connected_rp)
+        not_found = ApiClientError("test-error", 404)
+        mocker.patch.object(client.ecommerce, "get_store", side_effect=not_found)
+        mocker.patch.object(client.ecommerce, "get_store_product", side_effect=not_found)
+        mocker.patch.object(client.lists, "get_segment", side_effect=not_found)
+        mocker.patch.object(client.ecommerce, "add_store", return_value=mailchimp_store_from_api)
+        mocker.patch.object(client.ecommerce, "add_store_product", return_value=mailchimp_product_from_api)
+        mocker.patch.object(client.lists, "create_segment", return_value=mailchimp_contributor_segment_from_api)
+        product_id = MailchimpProductType.ONE_TIME.as_mailchimp_product_id(mc_connected_rp.id)
+        segment_id = mailchimp_contributor_segment_from_api["id"]
+        assert client.get_store() is None
+        assert client.get_product(product_id) is None
+        assert client.get_segment(segment_id) is None
+        store = client.create_store()
+        product = client.create_product(MailchimpProductType.ONE_TIME)
+        segment = client.create_segment(MailchimpSegmentName.ALL_CONTRIBUTORS, {})
+        assert client.get_store() == store
+        assert client.get_product(product_id) == product
+        assert client.get_segment(segment_id) == segment
+        client.ecommerce.get_store.assert_called_once()
+        client.ecommerce.get_store_product.assert_called_once()
+        client.lists.get_segment.assert_called_once()
+
+    def test_clear_cache(self, mc_connected_rp, mailchimp_store_from_api, mailchimp_product_from_api, mocker):
+        client = RevenueProgramMailchimpClient(mc_connected_rp)
+        mocker.patch.object(client.ecommerce, "get_store", return_value=mailchimp_store_from_api)
+        mocker.patch.object(client.ecommerce, "get_store_product", return_value=mailchimp_product_from_api)
+        mocker.patch.object(client.lists, "get_all_lists", return_value={"lists": []})
+        product_id = MailchimpProductType.MONTHLY.as_mailchimp_product_id(mc_connected_rp.id)
+        for _ in range(2):
+            client.get_store()
+            client.get_product(product_id)
+            client.get_email_lists()
+            RevenueProgramMailchimpClient.clear_cache(mc_connected_rp.id)
+        assert client.ecommerce.get_store.call_count == 2
+        assert client.ecommerce.get_store_product.call_count == 2
+        assert client.lists.get_all_lists.call_count == 2
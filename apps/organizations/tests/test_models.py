@@ -2,6 +2,7 @@ from dataclasses import asdict
 from datetime import timedelta
 
 from django.conf import settings
+from django.core.cache import cache, caches
 from django.core.exceptions import ValidationError
 from django.db.models.deletion import ProtectedError
 from django.test import override_settings
@@ -11,7 +12,6 @@ import faker
 import pytest
 import pytest_mock
 import stripe
-from mailchimp_marketing.api_client import ApiClientError
 from stripe import ApplePayDomain
 from stripe.error import StripeError
 
@@ -342,6 +342,56 @@ class TestRevenueProgram:
         t = RevenueProgram()
         assert None is t.stripe_account_id
 
+    @pytest.mark.usefixtures("_clear_cache")
+    def test_get_cached_by_slug(self, revenue_program, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            cached = RevenueProgram.get_cached_by_slug(revenue_program.slug)
+            assert cached == revenue_program
+            assert cached.socialmeta == revenue_program.socialmeta
+        with django_assert_num_queries(0):
+            assert RevenueProgram.get_cached_by_slug(revenue_program.slug) == revenue_program
+        caches[settings.LOCAL_CACHE].clear()
+        with django_assert_num_queries(0):
+            assert RevenueProgram.get_cached_by_slug(revenue_program.slug) == revenue_program
+        with django_assert_num_queries(1):
+            assert RevenueProgram.get_cached_by_slug("nope") is None
+        with django_assert_num_queries(0):
+            assert RevenueProgram.get_cached_by_slug("nope") is None
+
+    @pytest.mark.usefixtures("_clear_cache")
+    def test_get_cached_by_slug_caches_not_found_briefly(self, revenue_program, settings, mocker):
+        cache_set = mocker.spy(cache, "set")
+        RevenueProgram.get_cached_by_slug(revenue_program.slug)
+        RevenueProgram.get_cached_by_slug("nope")
+        assert cache_set.call_args_list == [
+            mocker.call(
+                RevenueProgram.get_by_slug_cache_key(revenue_program.slug),
+                (revenue_program,),
+                timeout=settings.REVENUE_PROGRAM_BY_SLUG_CACHE_TTL,
+            ),
+            mocker.call(
+                RevenueProgram.get_by_slug_cache_key("nope"),
+                (None,),
+                timeout=settings.REVENUE_PROGRAM_BY_SLUG_NOT_FOUND_CACHE_TTL,
+            ),
+        ]
+
+    @pytest.mark.usefixtures("_clear_cache")
+    def test_cached_by_slug_invalidation(self, revenue_program):
+        old_slug = revenue_program.slug
+        RevenueProgram.get_cached_by_slug(old_slug)
+        RevenueProgram.get_cached_by_slug("new-slug")
+        revenue_program.socialmeta.title = "New title"
+        revenue_program.socialmeta.save()
+        assert RevenueProgram.get_cached_by_slug(old_slug).socialmeta.title == "New title"
+        revenue_program = RevenueProgram.objects.get(pk=revenue_program.pk)
+        revenue_program.slug = "new-slug"
+        revenue_program.save()
+        assert RevenueProgram.get_cached_by_slug(old_slug) is None
+        assert RevenueProgram.get_cached_by_slug("new-slug") == revenue_program
+        revenue_program.delete()
+        assert RevenueProgram.get_cached_by_slug("new-slug") is None
+
     def test_clean_fields(self):
         t = RevenueProgramFactory(name="B o %")
         t.clean_fields()
@@ -423,9 +473,9 @@ class TestRevenueProgram:
         mock_get_client.return_value.access_secret_version.return_value.payload.data = b"something"
         revenue_program = RevenueProgramFactory(mailchimp_server_prefix="something")
         mock_mc_client = mocker.patch("apps.organizations.models.RevenueProgramMailchimpClient")
-        return_val = {"lists": [mailchimp_email_list_from_api]}
-        mock_mc_client.return_value.lists.get_all_lists.return_value = return_val
-        assert revenue_program.mailchimp_email_lists == [MailchimpEmailList(**mailchimp_email_list_from_api)]
+        return_val = [MailchimpEmailList(**mailchimp_email_list_from_api)]
+        mock_mc_client.return_value.get_email_lists.return_value = return_val
+        assert revenue_program.mailchimp_email_lists == return_val
 
     def test_mailchimp_email_lists_property_when_integration_not_connected(self, mocker, revenue_program, settings):
         logger_spy = mocker.spy(logger, "debug")
@@ -437,30 +487,11 @@ class TestRevenueProgram:
         )
         assert revenue_program.mailchimp_email_lists == []
         mock_mc_client.assert_not_called()
-        mock_mc_client.return_value.lists.get_all_lists.assert_not_called()
         assert logger_spy.call_args == mocker.call(
             "Mailchimp integration not connected for this revenue program (%s), returning empty list",
             revenue_program.id,
         )
 
-    def test_mailchimp_email_lists_property_when_mailchimp_api_error(self, revenue_program, mocker):
-        mocker.patch(
-            "apps.organizations.models.RevenueProgram.mailchimp_integration_connected",
-            return_value=True,
-            new_callable=mocker.PropertyMock,
-        )
-        mock_mc_client = mocker.patch("apps.organizations.models.RevenueProgramMailchimpClient")
-        mock_mc_client.return_value.lists.get_all_lists.side_effect = ApiClientError(error_text := "Ruh roh")
-        mock_mc_client.return_value.lists.get_all_lists.return_value = {"lists": [{"id": "123", "name": "test"}]}
-        log_spy = mocker.spy(logger, "exception")
-        assert revenue_program.mailchimp_email_lists == []
-        log_spy.assert_called_once_with(
-            "Failed to fetch email lists from Mailchimp for RP with ID %s mc server prefix %s. The error text is %s",
-            revenue_program.id,
-            revenue_program.mailchimp_server_prefix,
-            error_text,
-        )
-
     @pytest.mark.parametrize("enabled", [True, False])
     def test_activecampaign_access_token(self, enabled, revenue_program, settings, mocker):
         settings.ENABLE_GOOGLE_CLOUD_SECRET_MANAGER = enabled
@@ -564,7 +595,7 @@ class TestRevenueProgram:
             live_donation_page.revenue_program.delete()
         assert protected_error.value.args[0] == (
             "Cannot delete some instances of model 'RevenueProgram' because they are referenced "
-            "through protected foreign keys: 'DonationPage.revenue_program'."
+            "through protected foreign keys: 'DonationPage.revenue_program', 'Contribution.effective_revenue_program'."
         )
 
     def test_can_delete_when_no_downstream_contributions_and_cascades(self, live_donation_page):
@@ -810,7 +841,7 @@ class TestRevenueProgram:
 
         mocker.patch.object(revenue_program, "ensure_mailchimp_store")
         mocker.patch.object(revenue_program, "ensure_mailchimp_contribution_product")
-        mocker.patch.object(revenue_program, "ensure_mailchimp_contributor_segment")
+        mocker.patch.object(revenue_program, "ensure_mailchimp_contributor_segment", return_value=None)
         revenue_program.ensure_mailchimp_entities()
         assert revenue_program.ensure_mailchimp_store.called
         assert revenue_program.ensure_mailchimp_contribution_product.call_count == 3
@@ -824,15 +855,65 @@ class TestRevenueProgram:
         assert revenue_program.ensure_mailchimp_contributor_segment.call_count == 5
         revenue_program.ensure_mailchimp_contributor_segment.assert_has_calls(
             [
-                mocker.call(MailchimpSegmentName.ALL_CONTRIBUTORS),
-                mocker.call(MailchimpSegmentName.ONE_TIME_CONTRIBUTORS),
-                mocker.call(MailchimpSegmentName.MONTHLY_CONTRIBUTORS),
-                mocker.call(MailchimpSegmentName.YEARLY_CONTRIBUTORS),
-                mocker.call(MailchimpSegmentName.RECURRING_CONTRIBUTORS),
+                mocker.call(MailchimpSegmentName.ALL_CONTRIBUTORS, save=False),
+                mocker.call(MailchimpSegmentName.ONE_TIME_CONTRIBUTORS, save=False),
+                mocker.call(MailchimpSegmentName.MONTHLY_CONTRIBUTORS, save=False),
+                mocker.call(MailchimpSegmentName.YEARLY_CONTRIBUTORS, save=False),
+                mocker.call(MailchimpSegmentName.RECURRING_CONTRIBUTORS, save=False),
             ],
             any_order=True,
         )
 
+    @pytest.fixture
+    def mc_client_creating_segments(self, mocker):
+        patched_client = mocker.patch("apps.organizations.models.RevenueProgramMailchimpClient")
+        patched_client.return_value.get_product.return_value = None
+        patched_client.return_value.get_segment.return_value = None
+        patched_client.return_value.create_segment.side_effect = lambda name, options: mocker.Mock(id=f"{name}-id")
+        return patched_client
+
+    def test_ensure_mailchimp_entities_saves_segment_ids_once(
+        self, mc_connected_rp: RevenueProgram, mc_client_creating_segments, mocker: pytest_mock.MockerFixture
+    ):
+        save_spy = mocker.spy(RevenueProgram, "save")
+        mc_connected_rp.ensure_mailchimp_entities()
+        save_spy.assert_called_once_with(
+            mc_connected_rp, update_fields={*(x.as_rp_id_field() for x in MailchimpSegmentName), "modified"}
+        )
+        assert mc_client_creating_segments.return_value.create_product.call_count == 3
+        mc_connected_rp.refresh_from_db()
+        for segment_name in MailchimpSegmentName:
+            assert getattr(mc_connected_rp, segment_name.as_rp_id_field()) == f"{segment_name}-id"
+
+    def test_ensure_mailchimp_entities_saves_segment_ids_when_store_fails(
+        self, mc_connected_rp: RevenueProgram, mc_client_creating_segments, mocker: pytest_mock.MockerFixture
+    ):
+        mc_client_creating_segments.return_value.get_store.return_value = None
+        mc_client_creating_segments.return_value.create_store.side_effect = MailchimpIntegrationError("test-error")
+        with pytest.raises(MailchimpIntegrationError):
+            mc_connected_rp.ensure_mailchimp_entities()
+        mc_client_creating_segments.return_value.create_product.assert_not_called()
+        mc_connected_rp.refresh_from_db()
+        for segment_name in MailchimpSegmentName:
+            assert getattr(mc_connected_rp, segment_name.as_rp_id_field()) == f"{segment_name}-id"
+
+    def test_ensure_mailchimp_entities_when_segment_rate_limited(
+        self, mc_connected_rp: RevenueProgram, mc_client_creating_segments, mocker: pytest_mock.MockerFixture
+    ):
+        def create_segment(name, options):
+            if name == MailchimpSegmentName.ALL_CONTRIBUTORS:
+                raise MailchimpRateLimitError()
+            return mocker.Mock(id=f"{name}-id")
+
+        mc_client_creating_segments.return_value.create_segment.side_effect = create_segment
+        with pytest.raises(MailchimpRateLimitError):
+            mc_connected_rp.ensure_mailchimp_entities()
+        mc_connected_rp.refresh_from_db()
+        assert mc_connected_rp.mailchimp_all_contributors_segment_id is None
+        assert (
+            mc_connected_rp.mailchimp_yearly_contributors_segment_id == f"{MailchimpSegmentName.YEARLY_CONTRIBUTORS}-id"
+        )
+
     @pytest.mark.parametrize("mc_product_type", MailchimpProductType)
     @pytest.mark.parametrize(
         "mc_connected",
@@ -1123,7 +1204,24 @@ class TestRevenueProgramMailchimpSegments:
         patched_client = mocker.patch("apps.organizations.models.RevenueProgramMailchimpClient")
         patched_client.return_value.get_segment.return_value = None
         patched_client.return_value.create_segment.side_effect = MailchimpIntegrationError("test-error")
-        mc_connected_rp.ensure_mailchimp_contributor_segment(segment_name)
+        assert mc_connected_rp.ensure_mailchimp_contributor_segment(segment_name) is None
+
+    @pytest.mark.parametrize("save", [True, False])
+    def test_ensure_mailchimp_contributor_segment_save(
+        self,
+        save: bool,
+        segment_name: MailchimpSegmentName,
+        mc_connected_rp: RevenueProgram,
+        mocker: pytest_mock.MockerFixture,
+    ):
+        patched_client = mocker.patch("apps.organizations.models.RevenueProgramMailchimpClient")
+        patched_client.return_value.get_segment.return_value = None
+        patched_client.return_value.create_segment.return_value = mocker.MagicMock(id="test-new-id")
+        save_spy = mocker.spy(RevenueProgram, "save")
+        field = segment_name.as_rp_id_field()
+        assert mc_connected_rp.ensure_mailchimp_contributor_segment(segment_name, save=save) == field
+        assert getattr(mc_connected_rp, field) == "test-new-id"
+        assert save_spy.called is save
 
 
 class TestPaymentProvider:
@@ -153,7 +153,7 @@ class TestMailchimpRevenueProgramForSpaConfiguration:
     def test_has_right_fields_and_values(self, mc_connected_rp, mocker, mailchimp_email_list_from_api):
         mock_client = mocker.patch("apps.organizations.models.RevenueProgramMailchimpClient")
         mock_client.return_value.get_email_list.return_value = MailchimpEmailList(**mailchimp_email_list_from_api)
-        mock_client.return_value.lists.get_all_lists.return_value = {"lists": [mailchimp_email_list_from_api]}
+        mock_client.return_value.get_email_lists.return_value = [MailchimpEmailList(**mailchimp_email_list_from_api)]
         mc_connected_rp.mailchimp_list_id = mailchimp_email_list_from_api["id"]
         mc_connected_rp.save()
         serializer = MailchimpRevenueProgramForSpaConfiguration(mc_connected_rp)
@@ -1,7 +1,9 @@
 import json
 
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.template.loader import render_to_string
+from django.test.utils import CaptureQueriesContext
 
 import pytest
 import stripe
@@ -39,8 +41,10 @@ from apps.organizations.models import (
 from apps.organizations.serializers import (
     MailchimpRevenueProgramForSpaConfiguration,
     MailchimpRevenueProgramForSwitchboard,
+    RevenueProgramSerializer,
 )
 from apps.organizations.tests.factories import OrganizationFactory, RevenueProgramFactory
+from apps.organizations.typings import MailchimpProductType
 from apps.organizations.views.revengine import (
     FREE_TO_CORE_UPGRADE_EMAIL_SUBJECT,
     OrganizationViewSet,
@@ -384,30 +388,29 @@ class TestOrganizationViewSet:
         )
         organization.refresh_from_db()
         assert organization.roleassignment_set.filter(role_type="org_admin").count() == size
-        mock_send_email = mocker.patch("apps.emails.tasks.send_templated_email.delay")
+        mock_send_emails = mocker.patch("apps.emails.tasks.send_templated_emails.delay")
         OrganizationViewSet.send_upgrade_success_confirmation_email(organization)
         org_admin_emails = (
             organization.roleassignment_set.filter(role_type="org_admin")
             .values_list("user__email", flat=True)
             .distinct("user__email")
         )
-        assert mock_send_email.call_count == len(org_admin_emails)
-        for n, x in enumerate(org_admin_emails):
-            expected_context = {
-                "logo_url": f"{settings.SITE_URL}/static/nre_logo_black_yellow.png",
-                "plus_icon": f"{settings.SITE_URL}/static/plus-icon.png",
-                "mail_icon": f"{settings.SITE_URL}/static/mail-icon.png",
-                "paint_icon": f"{settings.SITE_URL}/static/paint-icon.png",
-                "check_icon": f"{settings.SITE_URL}/static/check-icon.png",
-                "mailchimp_integration_url": mailchimp_url,
-                "upgrade_days_wait": settings.UPGRADE_DAYS_WAIT,
-            }
-            assert mock_send_email.call_args_list[n] == mocker.call(
-                to=x,
-                subject=FREE_TO_CORE_UPGRADE_EMAIL_SUBJECT,
-                message_as_text=render_to_string("upgrade-confirmation.txt", context=expected_context),
-                message_as_html=render_to_string("upgrade-confirmation.html", context=expected_context),
-            )
+        expected_context = {
+            "logo_url": f"{settings.SITE_URL}/static/nre_logo_black_yellow.png",
+            "plus_icon": f"{settings.SITE_URL}/static/plus-icon.png",
+            "mail_icon": f"{settings.SITE_URL}/static/mail-icon.png",
+            "paint_icon": f"{settings.SITE_URL}/static/paint-icon.png",
+            "check_icon": f"{settings.SITE_URL}/static/check-icon.png",
+            "mailchimp_integration_url": mailchimp_url,
+            "upgrade_days_wait": settings.UPGRADE_DAYS_WAIT,
+        }
+        mock_send_emails.assert_called_once_with(
+            recipients=list(org_admin_emails),
+            subject=FREE_TO_CORE_UPGRADE_EMAIL_SUBJECT,
+            message_as_text=render_to_string("upgrade-confirmation.txt", context=expected_context),
+            message_as_html=render_to_string("upgrade-confirmation.html", context=expected_context),
+        )
+        assert len(mock_send_emails.call_args.kwargs["recipients"]) == size
 
     def test_generate_integrations_management_url(self, organization, settings):
         assert (
@@ -778,6 +781,27 @@ class TestRevenueProgramViewSet:
             # tested elsewhere and proven to be valid. Here, we just need to show that it gets called.
             assert spy.call_count == 1
 
+    def test_list_queries_do_not_grow_with_revenue_programs(self, api_client, superuser, live_donation_page):
+        live_donation_page.revenue_program.default_donation_page = live_donation_page
+        live_donation_page.revenue_program.save()
+        api_client.force_authenticate(superuser)
+        with CaptureQueriesContext(connection) as one_rp:
+            api_client.get(reverse("revenue-program-list"))
+        RevenueProgramFactory.create_batch(size=3)
+        with CaptureQueriesContext(connection) as four_rps:
+            response = api_client.get(reverse("revenue-program-list"))
+        assert len(response.json()) == 4
+        assert len(four_rps) == len(one_rp)
+        for x in response.json():
+            assert x == RevenueProgramSerializer(RevenueProgram.objects.get(pk=x["id"])).data
+
+    def test_list_with_fields_and_cursor(self, api_client, superuser):
+        RevenueProgramFactory.create_batch(size=3)
+        api_client.force_authenticate(superuser)
+        response = api_client.get(reverse("revenue-program-list"), {"fields": "id,slug", "cursor": ""})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["results"] == list(RevenueProgram.objects.order_by("pk").values("id", "slug"))
+
     def test_list_when_unexpected_user(self, unsupported_user, api_client):
         """Show that unexpected users cannot retrieve any revenue programs."""
         RevenueProgramFactory.create_batch(size=2)
@@ -1050,6 +1074,49 @@ class TestRevenueProgramViewSet:
         response = api_client.get(reverse("revenue-program-mailchimp", args=(revenue_program.id,)))
         assert response.status_code == status.HTTP_200_OK
 
+    @pytest.mark.usefixtures("_clear_cache")
+    def test_mailchimp_makes_one_request_per_entity(
+        self, api_client, superuser, mc_connected_rp, mailchimp_store_from_api, mailchimp_product_from_api, mocker
+    ):
+        mock_get_store = mocker.patch(
+            "mailchimp_marketing.api.ecommerce_api.EcommerceApi.get_store", return_value=mailchimp_store_from_api
+        )
+        mock_get_product = mocker.patch(
+            "mailchimp_marketing.api.ecommerce_api.EcommerceApi.get_store_product",
+            return_value=mailchimp_product_from_api,
+        )
+        api_client.force_authenticate(superuser)
+        for _ in range(2):
+            response = api_client.get(reverse("revenue-program-mailchimp", args=(mc_connected_rp.id,)))
+            assert response.status_code == status.HTTP_200_OK
+            assert response.json()["mailchimp_store"] == mailchimp_store_from_api
+        mock_get_store.assert_called_once()
+        assert mock_get_product.call_count == len(MailchimpProductType)
+
+    @pytest.mark.usefixtures("_clear_cache")
+    def test_mailchimp_configure_patch_makes_one_request_per_entity(
+        self, mc_connected_rp, hub_admin_user, api_client, mocker, mailchimp_email_list_from_api
+    ):
+        mock_get_list = mocker.patch(
+            "mailchimp_marketing.api.lists_api.ListsApi.get_list", return_value=mailchimp_email_list_from_api
+        )
+        mock_get_all_lists = mocker.patch(
+            "mailchimp_marketing.api.lists_api.ListsApi.get_all_lists",
+            return_value={"lists": [mailchimp_email_list_from_api]},
+        )
+        mc_connected_rp.mailchimp_list_id = None
+        mc_connected_rp.save()
+        api_client.force_authenticate(hub_admin_user)
+        response = api_client.patch(
+            reverse("revenue-program-mailchimp-configure", args=(mc_connected_rp.id,)),
+            data={"mailchimp_list_id": mailchimp_email_list_from_api["id"]},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["chosen_mailchimp_email_list"] == mailchimp_email_list_from_api
+        assert response.json()["available_mailchimp_email_lists"] == [mailchimp_email_list_from_api]
+        mock_get_list.assert_called_once()
+        mock_get_all_lists.assert_called_once()
+
 
 class FakeStripeProduct:
     def __init__(self, id_):
@@ -19,6 +19,8 @@ from rest_framework.reverse import reverse
 from stripe.error import StripeError
 
 from apps.api.authentication import JWTHttpOnlyCookieAuthentication
+from apps.api.mixins import ProjectedListViewSetMixin
+from apps.api.pagination import OptInCursorPaginationMixin
 from apps.api.permissions import (
     HasFlaggedAccessToMailchimp,
     HasRoleAssignment,
@@ -34,6 +36,7 @@ from apps.emails.tasks import (
     make_send_test_magic_link_email_data,
     send_receipt_email,
     send_templated_email,
+    send_templated_emails,
 )
 from apps.organizations import serializers
 from apps.organizations.models import CorePlan, FreePlan, Organization, RevenueProgram
@@ -135,29 +138,27 @@ class OrganizationViewSet(
     @classmethod
     def send_upgrade_success_confirmation_email(cls, org: Organization):
         logger.info("`send_upgrade_success_confirmation_email` running")
-        # TODO @BW: Refactor `send_templated_email` to accomodate a list of recipients
-        # DEV-3777
-        for to in (
+        recipients = list(
             org.roleassignment_set.filter(role_type=Roles.ORG_ADMIN.value)
             .values_list("user__email", flat=True)
             .distinct("user__email")
-        ):
-            context = {
-                "logo_url": f"{settings.SITE_URL}/static/nre_logo_black_yellow.png",
-                "plus_icon": f"{settings.SITE_URL}/static/plus-icon.png",
-                "mail_icon": f"{settings.SITE_URL}/static/mail-icon.png",
-                "paint_icon": f"{settings.SITE_URL}/static/paint-icon.png",
-                "check_icon": f"{settings.SITE_URL}/static/check-icon.png",
-                "mailchimp_integration_url": cls.generate_integrations_management_url(org),
-                "upgrade_days_wait": settings.UPGRADE_DAYS_WAIT,
-            }
-            logger.info("Sending upgrade confirmation email to %s", to)
-            send_templated_email.delay(
-                to=to,
-                subject=FREE_TO_CORE_UPGRADE_EMAIL_SUBJECT,
-                message_as_text=render_to_string("upgrade-confirmation.txt", context=context),
-                message_as_html=render_to_string("upgrade-confirmation.html", context=context),
-            )
+        )
+        context = {
+            "logo_url": f"{settings.SITE_URL}/static/nre_logo_black_yellow.png",
+            "plus_icon": f"{settings.SITE_URL}/static/plus-icon.png",
+            "mail_icon": f"{settings.SITE_URL}/static/mail-icon.png",
+            "paint_icon": f"{settings.SITE_URL}/static/paint-icon.png",
+            "check_icon": f"{settings.SITE_URL}/static/check-icon.png",
+            "mailchimp_integration_url": cls.generate_integrations_management_url(org),
+            "upgrade_days_wait": settings.UPGRADE_DAYS_WAIT,
+        }
+        logger.info("Sending upgrade confirmation email to %s", recipients)
+        send_templated_emails.delay(
+            recipients=recipients,
+            subject=FREE_TO_CORE_UPGRADE_EMAIL_SUBJECT,
+            message_as_text=render_to_string("upgrade-confirmation.txt", context=context),
+            message_as_html=render_to_string("upgrade-confirmation.html", context=context),
+        )
 
     @classmethod
     def upgrade_from_free_to_core(cls, org: Organization, event: stripe.Event) -> None:
@@ -217,7 +218,12 @@ class OrganizationViewSet(
         return Response(status=status.HTTP_200_OK)
 
 
-class RevenueProgramViewSet(FilterForSuperUserOrRoleAssignmentUserMixin, viewsets.ModelViewSet):
+class RevenueProgramViewSet(
+    OptInCursorPaginationMixin,
+    ProjectedListViewSetMixin,
+    FilterForSuperUserOrRoleAssignmentUserMixin,
+    viewsets.ModelViewSet,
+):
     model = RevenueProgram
     permission_classes = [
         IsAuthenticated,
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand, CommandParser
+from django.db.models import Q
+
+from apps.element_media.models import MediaImage
+from apps.element_media.tasks import generate_media_image_renditions
+from apps.pages.models import DonationPage
+from apps.pages.tasks import generate_page_image_renditions
+
+
+class Command(BaseCommand):
+    """Queue rendition generation for page images and media images that don't have current renditions.
+
+    Renditions are generated when images are uploaded or changed, so this is for backfilling images that predate them.
+    Until then, page thumbnails fall back to sorl thumbnails. This command is idempotent.
+    """
+
+    help = "Queue generation of responsive image renditions for pages and media images that lack them."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many pages and media images would have renditions generated",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.HTTP_INFO("Running `generate_image_renditions`"))
+        image_fields = Q()
+        for field in DonationPage.IMAGE_RENDITION_FIELDS:
+            image_fields |= ~Q(**{field: ""}) & Q(**{f"{field}__isnull": False})
+        pages = (
+            DonationPage.objects.filter(image_fields)
+            .only("id", "image_renditions", *DonationPage.IMAGE_RENDITION_FIELDS)
+            .order_by("id")
+        )
+        page_ids = [x.id for x in pages.iterator(chunk_size=1000) if x.stale_image_rendition_fields]
+        media_image_ids = list(
+            MediaImage.objects.filter(renditions={})
+            .exclude(Q(image="") | Q(image__isnull=True))
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        if not options["dry_run"]:
+            for page_id in page_ids:
+                generate_page_image_renditions.delay(page_id)
+            for media_image_id in media_image_ids:
+                generate_media_image_renditions.delay(media_image_id)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"`generate_image_renditions` is done, {'would queue' if options['dry_run'] else 'queued'} renditions"
+                f" for {len(page_ids)} pages and {len(media_image_ids)} media images"
+            )
+        )
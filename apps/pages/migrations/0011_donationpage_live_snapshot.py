@@ -0,0 +1,24 @@
+# Generated by Django 4.2.23 on 2026-10-19 02:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pages", "DEV-3960_add_locale_to_page"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="donationpage",
+            name="live_snapshot",
+            field=models.FileField(
+                blank=True,
+                editable=False,
+                help_text="Static JSON snapshot of the page's live payload, kept up to date while the page is live",
+                max_length=255,
+                upload_to="",
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.23 on 2026-10-19 03:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pages", "0011_donationpage_live_snapshot"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="donationpage",
+            name="image_renditions",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text="Responsive renditions of the page's images, by field, with the name of the image they were made from",
+            ),
+        ),
+    ]
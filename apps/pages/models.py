@@ -1,7 +1,15 @@
 import datetime
+import hashlib
+import json
 import logging
+import uuid
+from collections.abc import Iterable
 
 from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.utils import timezone
 
@@ -77,9 +85,24 @@ class DonationPage(IndexedTimeStampedModel):
     thank_you_redirect = models.URLField(
         blank=True, help_text="If not using default Thank You page, add link to orgs Thank You page here"
     )
+    live_snapshot = models.FileField(
+        blank=True,
+        editable=False,
+        max_length=255,
+        help_text="Static JSON snapshot of the page's live payload, kept up to date while the page is live",
+    )
+    image_renditions = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Responsive renditions of the page's images, by field, with the name of the image they were made from",
+    )
 
     objects = PagesAppManager.from_queryset(PagesAppQuerySet)()
 
+    IMAGE_RENDITION_FIELDS = ("graphic", "header_bg_image", "header_logo")
+    IMAGE_RENDITION_LOCATION = "page-image-renditions"
+
     class Meta:
         constraints = [
             models.UniqueConstraint(fields=["revenue_program", "name"], name="unique_name"),
@@ -110,6 +133,164 @@ class DonationPage(IndexedTimeStampedModel):
         hostname = ".".join(settings.SITE_URL.replace(http_scheme, "").split(".")[-2:])
         return f"{http_scheme}{self.revenue_program.slug}.{hostname}/{self.slug}"
 
+    @staticmethod
+    def get_live_detail_cache_key(revenue_program_slug: str, page_slug: str | None) -> str:
+        # Slugs can't contain ":", so distinct (revenue program slug, page slug) pairs can't share a key
+        return f"live-page-detail:{revenue_program_slug}:{page_slug or ''}"
+
+    @staticmethod
+    def get_live_detail_version_keys(
+        revenue_program_ids: Iterable[int | None], page_ids: Iterable[int | None]
+    ) -> list[str]:
+        return [f"live-page-detail-version:rp:{x}" for x in revenue_program_ids if x is not None] + [
+            f"live-page-detail-version:page:{x}" for x in page_ids if x is not None
+        ]
+
+    @classmethod
+    def invalidate_cached_live_detail(
+        cls, revenue_program_ids: Iterable[int | None] = (), page_ids: Iterable[int | None] = ()
+    ) -> None:
+        """Make cached live payloads of the given pages, and of all pages of the given revenue programs, stale.
+
+        Cached payloads are keyed by slugs, which can change, so rather than deleting them, this replaces the version
+        tokens they were cached with.
+        """
+        if keys := cls.get_live_detail_version_keys(set(revenue_program_ids), set(page_ids)):
+            cache.set_many(dict.fromkeys(keys, uuid.uuid4().hex), timeout=None)
+
+    @classmethod
+    def get_live_detail_versions(cls, revenue_program_id: int, page_id: int) -> list[str]:
+        """Return the current version tokens for a page's cached live payload, creating any that are missing."""
+        keys = cls.get_live_detail_version_keys([revenue_program_id], [page_id])
+        versions = cache.get_many(keys)
+        if len(versions) < len(keys):
+            for key in keys:
+                if key not in versions:
+                    # `add` rather than `set`, so that we don't clobber a token set concurrently by an invalidation
+                    cache.add(key, uuid.uuid4().hex, timeout=None)
+            versions = cache.get_many(keys)
+        return [versions.get(x) for x in keys]
+
+    @classmethod
+    def get_cached_live_detail(cls, revenue_program_slug: str | None, page_slug: str | None) -> dict | None:
+        """Return the cached live payload and its ETag for the slugs, if cached and not invalidated since."""
+        if not revenue_program_slug:
+            return None
+        if not (cached := cache.get(cls.get_live_detail_cache_key(revenue_program_slug, page_slug))):
+            return None
+        keys = cls.get_live_detail_version_keys([cached["revenue_program_id"]], [cached["page_id"]])
+        versions = cache.get_many(keys)
+        if [versions.get(x) for x in keys] != cached["versions"]:
+            return None
+        return cached
+
+    def cache_live_detail(
+        self, revenue_program_slug: str, page_slug: str | None, versions: list[str], data: dict
+    ) -> dict:
+        """Cache the page's serialized live payload under the slugs it was requested by, and return it with its ETag.
+
+        `versions` must be fetched with `get_live_detail_versions` before `data` is serialized, so that an invalidation
+        racing with serialization leaves the cached payload stale rather than current.
+        """
+        digest = self.get_live_detail_digest(data)
+        cached = {
+            "revenue_program_id": self.revenue_program_id,
+            "page_id": self.id,
+            "versions": versions,
+            "data": data,
+            "etag": f'"{digest}"',
+            # The snapshot is only served in place of the payload if it was rendered from the same data
+            "snapshot_url": (
+                self.live_snapshot.url if self.live_snapshot.name == self.get_live_snapshot_name(digest) else None
+            ),
+        }
+        cache.set(
+            self.get_live_detail_cache_key(revenue_program_slug, page_slug),
+            cached,
+            timeout=settings.PAGE_LIVE_DETAIL_CACHE_TTL,
+        )
+        return cached
+
+    @staticmethod
+    def get_live_detail_digest(data: dict) -> str:
+        return hashlib.sha256(json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True).encode()).hexdigest()[:32]
+
+    def get_live_snapshot_name(self, digest: str) -> str:
+        # Snapshots are named by their content, so a new payload always gets a new URL and CDNs can cache them forever
+        return f"{settings.PAGE_LIVE_SNAPSHOT_STORAGE_LOCATION}/{self.id}/{digest}.json"
+
+    @property
+    def is_servable_live(self) -> bool:
+        """Whether the page can be served by `live_detail`, i.e. is published and its RP can take payments."""
+        payment_provider = self.revenue_program.payment_provider if self.revenue_program else None
+        return bool(self.is_live and payment_provider and payment_provider.is_verified_with_default_provider())
+
+    def update_live_snapshot(self) -> None:
+        """Render the page's live payload to a static JSON file in storage, or remove it if the page isn't live.
+
+        This doesn't send signals, since the page's data doesn't change.
+        """
+        from apps.pages.serializers import DonationPageFullDetailSerializer  # noqa: PLC0415 vs. circular import
+
+        previous = self.live_snapshot.name
+        name = ""
+        if self.is_servable_live:
+            data = DonationPageFullDetailSerializer(instance=self, context={"live": True}).data
+            if (name := self.get_live_snapshot_name(self.get_live_detail_digest(data))) != previous:
+                content = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True)
+                name = default_storage.save(name, ContentFile(content.encode()))
+        if name == previous:
+            return
+        logger.info("Updating live snapshot of page %s from %s to %s", self.id, previous or None, name or None)
+        DonationPage.objects.filter(pk=self.pk).update(live_snapshot=name)
+        self.live_snapshot.name = name
+        if previous:
+            default_storage.delete(previous)
+        # So that the cached payload picks up the new snapshot
+        self.invalidate_cached_live_detail(page_ids=[self.id])
+
+    def get_current_image_renditions(self, field: str) -> dict[str, dict[str, str]]:
+        """Names of the renditions of an image field, if they were made from its current image."""
+        renditions = self.image_renditions.get(field) or {}
+        image = getattr(self, field)
+        return renditions.get("sizes", {}) if image and renditions.get("source") == image.name else {}
+
+    @property
+    def stale_image_rendition_fields(self) -> list[str]:
+        """Image fields whose renditions weren't made from their current image (or that have renditions but no image)."""
+        return [
+            x
+            for x in self.IMAGE_RENDITION_FIELDS
+            if (getattr(self, x).name or None) != (self.image_renditions.get(x) or {}).get("source")
+        ]
+
+    def update_image_renditions(self) -> None:
+        """Generate renditions of the page's images that don't have current ones, and delete stale renditions.
+
+        This doesn't send signals, since only the renditions change.
+        """
+        from apps.element_media.models import (  # noqa: PLC0415 vs. circular import
+            delete_renditions,
+            generate_renditions,
+        )
+
+        if not (stale := self.stale_image_rendition_fields):
+            return
+        renditions = dict(self.image_renditions)
+        previous = [renditions.pop(x)["sizes"] for x in stale if x in renditions]
+        for field in stale:
+            if image := getattr(self, field):
+                renditions[field] = {
+                    "source": image.name,
+                    "sizes": generate_renditions(image, f"{self.IMAGE_RENDITION_LOCATION}/{self.id}"),
+                }
+        logger.info("Updating image renditions of page %s for %s", self.id, ", ".join(stale))
+        DonationPage.objects.filter(pk=self.pk).update(image_renditions=renditions)
+        self.image_renditions = renditions
+        for sizes in previous:
+            delete_renditions(sizes)
+        signals.invalidate_cached_live_detail(page_ids=[self.id])
+
     def set_default_logo(self):
         """Use DefaultPageLogo.logo as self.header_logo.
 
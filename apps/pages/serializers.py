@@ -5,16 +5,19 @@ from typing import Literal
 
 from django.conf import settings
 from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.files.storage import default_storage
 from django.utils import timezone
 
 import pydantic
 from drf_extra_fields.relations import PresentablePrimaryKeyRelatedField
 from rest_framework import serializers
 from rest_framework.validators import UniqueTogetherValidator
-from sorl_thumbnail_serializer.fields import HyperlinkedSorlImageField
+from sorl.thumbnail import get_thumbnail
 
+from apps.api.serializers import SparseFieldsetSerializerMixin
 from apps.common.validators import ValidateFkReferenceOwnership
 from apps.config.validators import GENERIC_SLUG_DENIED_MSG, validate_slug_against_denylist
+from apps.element_media.models import get_rendition_urls, get_smallest_rendition
 from apps.organizations.models import Organization, RevenueProgram
 from apps.organizations.serializers import (
     BenefitLevelDetailSerializer,
@@ -31,9 +34,10 @@ logger = logging.getLogger(f"{settings.DEFAULT_LOGGER}.{__name__}")
 
 class StyleInlineSerializer(serializers.ModelSerializer):
     def to_representation(self, instance):
-        styles = instance.styles if instance.styles else {}
         representation = super().to_representation(instance)
-        representation.update(**styles)
+        # Style properties are flattened into the representation too, unless a sparse fieldset leaves out styles
+        if "styles" in self.fields:
+            representation.update(**(instance.styles or {}))
         return representation
 
     class Meta:
@@ -47,7 +51,7 @@ class StyleInlineSerializer(serializers.ModelSerializer):
         )
 
 
-class StyleListSerializer(StyleInlineSerializer):
+class StyleListSerializer(SparseFieldsetSerializerMixin, StyleInlineSerializer):
     revenue_program = PresentablePrimaryKeyRelatedField(
         queryset=RevenueProgram.objects.all(),
         presentation_serializer=RevenueProgramInlineSerializer,
@@ -56,6 +60,21 @@ class StyleListSerializer(StyleInlineSerializer):
     )
     used_live = serializers.SerializerMethodField()
 
+    # These are used in view layer db queries to reduce footprint.
+    _ONLIES = (
+        "id",
+        "created",
+        "modified",
+        "name",
+        "styles",
+        *(
+            f"revenue_program__{x}"
+            for x in RevenueProgramInlineSerializer.Meta.fields
+            if x != "payment_provider_stripe_verified"
+        ),
+        "revenue_program__payment_provider__stripe_verified",
+    )
+
     class Meta:
         model = Style
         fields = (
@@ -73,6 +92,9 @@ class StyleListSerializer(StyleInlineSerializer):
         ]
 
     def get_used_live(self, obj):
+        # Lists annotate this, see `apps.pages.views.StyleViewSet`
+        if hasattr(obj, "used_live"):
+            return obj.used_live
         return DonationPage.objects.filter(styles=obj, published_date__lte=timezone.now()).exists()
 
     def to_internal_value(self, data):
@@ -137,6 +159,28 @@ LOCALE_MAP = {
 }
 
 
+def _build_absolute_uri(url: str, context: dict) -> str:
+    return request.build_absolute_uri(url) if (request := context.get("request")) else url
+
+
+class ImageThumbnailField(serializers.ReadOnlyField):
+    """URL of the smallest precomputed rendition of a page image.
+
+    Until its renditions exist, this falls back to a 300px sorl thumbnail, as served before renditions were introduced.
+    """
+
+    def __init__(self, image_field: str, **kwargs):
+        self.image_field = image_field
+        super().__init__(source="*", **kwargs)
+
+    def to_representation(self, value: DonationPage) -> str | None:
+        if not (image := getattr(value, self.image_field)):
+            return None
+        if sizes := value.get_current_image_renditions(self.image_field):
+            return _build_absolute_uri(default_storage.url(get_smallest_rendition(sizes)["original"]), self.context)
+        return _build_absolute_uri(get_thumbnail(image, "300").url, self.context)
+
+
 class DonationPageFullDetailSerializer(serializers.ModelSerializer):
     # these settings enable auto-generation for name
     name = serializers.CharField(max_length=PAGE_NAME_MAX_LENGTH, allow_blank=True, allow_null=True, required=False)
@@ -162,9 +206,10 @@ class DonationPageFullDetailSerializer(serializers.ModelSerializer):
     header_logo = serializers.ImageField(allow_empty_file=True, allow_null=True, required=False)
     header_logo_alt_text = serializers.CharField(max_length=255, allow_blank=True, allow_null=True, required=False)
 
-    graphic_thumbnail = HyperlinkedSorlImageField("300", source="graphic", read_only=True)
-    header_bg_image_thumbnail = HyperlinkedSorlImageField("300", source="header_bg_image", read_only=True)
-    header_logo_thumbnail = HyperlinkedSorlImageField("300", source="header_logo", read_only=True)
+    graphic_thumbnail = ImageThumbnailField("graphic")
+    header_bg_image_thumbnail = ImageThumbnailField("header_bg_image")
+    header_logo_thumbnail = ImageThumbnailField("header_logo")
+    image_renditions = serializers.SerializerMethodField(method_name="get_image_renditions")
 
     revenue_program_is_nonprofit = serializers.SerializerMethodField(method_name="get_revenue_program_is_nonprofit")
 
@@ -182,7 +227,8 @@ class DonationPageFullDetailSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = DonationPage
-        fields = "__all__"
+        # The snapshot is rendered from this serializer's output, so it can't be part of it
+        exclude = ("live_snapshot",)
         validators = [
             ValidateFkReferenceOwnership(fk_attribute="styles", model=DonationPage),
             ValidateFkReferenceOwnership(fk_attribute="revenue_program", model=DonationPage),
@@ -191,6 +237,17 @@ class DonationPageFullDetailSerializer(serializers.ModelSerializer):
     def get_plan(self, obj):
         return asdict(obj.revenue_program.organization.plan)
 
+    def get_image_renditions(self, obj) -> dict[str, dict[str, dict[str, str]]]:
+        """URLs of the current responsive renditions of the page's images, by field, width, and then format."""
+        renditions = {}
+        for field in DonationPage.IMAGE_RENDITION_FIELDS:
+            if sizes := obj.get_current_image_renditions(field):
+                renditions[field] = {
+                    width: {fmt: _build_absolute_uri(url, self.context) for fmt, url in formats.items()}
+                    for width, formats in get_rendition_urls(sizes).items()
+                }
+        return renditions
+
     def create(self, validated_data):
         """Create a name on the fly for page if one not provided in validated data."""
         if not validated_data.get("name"):
@@ -478,21 +535,24 @@ _DONATION_PAGE_LIST_FIELDS = (
 )
 
 
-class DonationPageListSerializer(serializers.ModelSerializer):
+class DonationPageListSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """Expected usage is representing lists of donation pages in api/v1/pages/.
 
     The primary consumer of this page at time of this comment is the SPA, and specifically
     the pages list view in the org dashboard.
 
-    Note that at present, pagination is not enabled for this serializer, and superusers and hub
-    admins get all pages as currently configured. See [DEV-4030](https://news-revenue-hub.atlassian.net/browse/DEV-4030) for
-    further discussion.
+    Note that pagination is opt-in for this serializer's list (see `OptInCursorPaginationMixin`), so unless they ask for
+    pages, superusers and hub admins get all pages. See [DEV-4030](https://news-revenue-hub.atlassian.net/browse/DEV-4030)
+    for further discussion.
     """
 
     revenue_program = RevenueProgramForDonationPageListSerializer()
 
     # These are used in view layer db queries to reduce footprint.
-    _ONLIES = _DONATION_PAGE_LIST_FIELDS
+    _ONLIES = (
+        *(x for x in _DONATION_PAGE_LIST_FIELDS if x != "revenue_program"),
+        *(f"revenue_program__{x}" for x in RevenueProgramForDonationPageListSerializer.Meta.fields),
+    )
 
     class Meta:
         model = DonationPage
@@ -1,9 +1,14 @@
 import json
 import logging
+from collections.abc import Iterable
+from functools import partial
 
 from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import Signal, receiver
 
+from apps.common.cache import invalidate_now_and_on_commit
 from apps.common.utils import google_cloud_pub_sub_is_configured
 from apps.google_cloud.pubsub import Message, Publisher
 
@@ -42,3 +47,98 @@ def donation_page_page_published_handler(sender, instance, **kwargs) -> None:
         google_cloud_pub_sub_is_configured(),
         settings.PAGE_PUBLISHED_TOPIC,
     )
+
+
+def invalidate_cached_live_detail(
+    revenue_program_ids: Iterable[int | None] = (), page_ids: Iterable[int | None] = ()
+) -> None:
+    """Invalidate cached live page payloads, and update live snapshots (if enabled) once the transaction commits."""
+    from apps.pages.models import DonationPage  # noqa: PLC0415 vs. circular import
+    from apps.pages.tasks import update_live_page_snapshots  # noqa: PLC0415 vs. circular import
+
+    revenue_program_ids, page_ids = {x for x in revenue_program_ids if x is not None}, set(page_ids)
+    invalidate_now_and_on_commit(DonationPage.invalidate_cached_live_detail, revenue_program_ids, page_ids)
+    if settings.PAGE_LIVE_SNAPSHOTS_ENABLED:
+        transaction.on_commit(
+            partial(
+                update_live_page_snapshots.delay, revenue_program_ids=list(revenue_program_ids), page_ids=list(page_ids)
+            )
+        )
+
+
+def _get_revenue_program_ids(**filters) -> list[int]:
+    from apps.organizations.models import RevenueProgram  # noqa: PLC0415 vs. circular import
+
+    return list(RevenueProgram.objects.filter(**filters).values_list("id", flat=True))
+
+
+@receiver(post_save, sender="pages.DonationPage")
+@receiver(post_delete, sender="pages.DonationPage")
+def invalidate_live_detail_for_page(sender, instance, **kwargs) -> None:
+    # The revenue program's payloads are invalidated too, because its default page (served when no page slug is given)
+    # may fall back to whichever page is first.
+    invalidate_cached_live_detail([instance.revenue_program_id], [instance.id])
+
+
+@receiver(post_delete, sender="pages.DonationPage")
+def delete_live_snapshot_for_page(sender, instance, **kwargs) -> None:
+    if instance.live_snapshot:
+        transaction.on_commit(partial(instance.live_snapshot.delete, save=False))
+
+
+@receiver(post_save, sender="pages.DonationPage")
+def generate_image_renditions_for_page(sender, instance, **kwargs) -> None:
+    from apps.pages.tasks import generate_page_image_renditions  # noqa: PLC0415 vs. circular import
+
+    if instance.stale_image_rendition_fields:
+        transaction.on_commit(partial(generate_page_image_renditions.delay, instance.id))
+
+
+@receiver(post_delete, sender="pages.DonationPage")
+def delete_image_renditions_for_page(sender, instance, **kwargs) -> None:
+    from apps.element_media.models import delete_renditions  # noqa: PLC0415 vs. circular import
+
+    for renditions in instance.image_renditions.values():
+        transaction.on_commit(partial(delete_renditions, renditions["sizes"]))
+
+
+@receiver(post_save, sender="pages.Style")
+@receiver(pre_delete, sender="pages.Style")
+def invalidate_live_detail_for_style(sender, instance, **kwargs) -> None:
+    # On delete, this has to run before pages' references to the style are nulled, which doesn't send signals
+    from apps.pages.models import DonationPage  # noqa: PLC0415 vs. circular import
+
+    invalidate_cached_live_detail(page_ids=DonationPage.objects.filter(styles=instance).values_list("id", flat=True))
+
+
+@receiver(post_save, sender="organizations.RevenueProgram")
+@receiver(post_delete, sender="organizations.RevenueProgram")
+def invalidate_live_detail_for_revenue_program(sender, instance, **kwargs) -> None:
+    invalidate_cached_live_detail([instance.id])
+
+
+@receiver(post_save, sender="organizations.Organization")
+def invalidate_live_detail_for_organization(sender, instance, **kwargs) -> None:
+    # Payloads include the organization and its plan, which determines which page elements are shown
+    invalidate_cached_live_detail(_get_revenue_program_ids(organization=instance))
+
+
+@receiver(post_save, sender="organizations.PaymentProvider")
+@receiver(pre_delete, sender="organizations.PaymentProvider")
+def invalidate_live_detail_for_payment_provider(sender, instance, **kwargs) -> None:
+    # On delete, this has to run before revenue programs' references to the payment provider are nulled
+    invalidate_cached_live_detail(_get_revenue_program_ids(payment_provider=instance))
+
+
+@receiver(post_save, sender="organizations.Benefit")
+@receiver(post_delete, sender="organizations.Benefit")
+@receiver(post_save, sender="organizations.BenefitLevel")
+@receiver(post_delete, sender="organizations.BenefitLevel")
+def invalidate_live_detail_for_benefits(sender, instance, **kwargs) -> None:
+    invalidate_cached_live_detail([instance.revenue_program_id])
+
+
+@receiver(post_save, sender="organizations.BenefitLevelBenefit")
+@receiver(post_delete, sender="organizations.BenefitLevelBenefit")
+def invalidate_live_detail_for_benefit_level_benefit(sender, instance, **kwargs) -> None:
+    invalidate_cached_live_detail(_get_revenue_program_ids(benefitlevel__id=instance.benefit_level_id))
@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.db.models import Q
+
+from celery import shared_task
+from celery.utils.log import get_task_logger
+
+from apps.pages.models import DonationPage
+
+
+logger = get_task_logger(f"{settings.DEFAULT_LOGGER}.{__name__}")
+
+
+@shared_task
+def update_live_page_snapshots(revenue_program_ids: list[int], page_ids: list[int]) -> None:
+    """Update the live snapshots of the given pages and of all pages of the given revenue programs.
+
+    Only pages that are published or already have a snapshot are considered, since others can't need a change.
+    """
+    pages = (
+        DonationPage.objects.filter(Q(id__in=page_ids) | Q(revenue_program_id__in=revenue_program_ids))
+        .filter(Q(published_date__isnull=False) | ~Q(live_snapshot=""))
+        .select_related("revenue_program__organization", "revenue_program__payment_provider", "styles")
+        .order_by("id")
+    )
+    for page in pages:
+        page.update_live_snapshot()
+    logger.info("Updated live snapshots for %s pages", len(pages))
+
+
+@shared_task
+def generate_page_image_renditions(page_id: int) -> None:
+    if not (page := DonationPage.objects.filter(pk=page_id).first()):
+        logger.warning("Page %s no longer exists, not generating image renditions", page_id)
+        return
+    page.update_image_renditions()
@@ -0,0 +1,50 @@
+from uuid import uuid4
+
+from django.core.management import call_command
+
+import pytest
+
+from apps.element_media.models import MediaImage
+from apps.pages.tests.factories import DonationPageFactory
+
+
+@pytest.mark.django_db
+class TestGenerateImageRenditions:
+
+    @pytest.fixture(autouse=True)
+    def _media_root(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+
+    @pytest.fixture
+    def pages(self, test_jpeg_file):
+        without_renditions = DonationPageFactory(graphic=test_jpeg_file)
+        with_renditions = DonationPageFactory(graphic=test_jpeg_file)
+        with_renditions.update_image_renditions()
+        return without_renditions, with_renditions
+
+    @pytest.fixture
+    def media_images(self, pages, test_jpeg_file):
+        without_renditions = MediaImage.objects.create(spa_key=uuid4(), page_id=pages[0], image=test_jpeg_file)
+        with_renditions = MediaImage.objects.create(spa_key=uuid4(), page_id=pages[0], image=test_jpeg_file)
+        with_renditions.update_renditions()
+        return without_renditions, with_renditions
+
+    @pytest.fixture
+    def page_task(self, mocker):
+        return mocker.patch("apps.pages.tasks.generate_page_image_renditions.delay")
+
+    @pytest.fixture
+    def media_image_task(self, mocker):
+        return mocker.patch("apps.element_media.tasks.generate_media_image_renditions.delay")
+
+    def test_queues_images_without_current_renditions(self, pages, media_images, page_task, media_image_task):
+        call_command("generate_image_renditions")
+        queued_page_ids = {x.args[0] for x in page_task.call_args_list}
+        assert pages[0].id in queued_page_ids
+        assert pages[1].id not in queued_page_ids
+        media_image_task.assert_called_once_with(media_images[0].id)
+
+    def test_dry_run(self, pages, media_images, page_task, media_image_task):
+        call_command("generate_image_renditions", dry_run=True)
+        page_task.assert_not_called()
+        media_image_task.assert_not_called()
@@ -2,6 +2,7 @@ import datetime
 import json
 
 from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
 from django.db.models.deletion import ProtectedError
 from django.utils import timezone
 
@@ -14,6 +15,7 @@ from apps.google_cloud.pubsub import Message
 from apps.organizations.tests.factories import RevenueProgramFactory
 from apps.pages import defaults
 from apps.pages.models import DefaultPageLogo, DonationPage, Style, _get_screenshot_upload_path
+from apps.pages.serializers import DonationPageFullDetailSerializer
 from apps.pages.tests.factories import DonationPageFactory, FontFactory, StyleFactory
 from apps.users.choices import Roles
 
@@ -212,6 +214,114 @@ class TestDonationPage:
         else:
             mock_publisher.publish.assert_not_called()
 
+    def test_cached_live_detail(self, live_donation_page):
+        rp = live_donation_page.revenue_program
+        assert DonationPage.get_cached_live_detail(rp.slug, live_donation_page.slug) is None
+        versions = DonationPage.get_live_detail_versions(rp.id, live_donation_page.id)
+        assert DonationPage.get_live_detail_versions(rp.id, live_donation_page.id) == versions
+        cached = live_donation_page.cache_live_detail(rp.slug, live_donation_page.slug, versions, {"foo": "bar"})
+        assert cached["data"] == {"foo": "bar"}
+        assert cached["etag"].startswith('"')
+        assert DonationPage.get_cached_live_detail(rp.slug, live_donation_page.slug) == cached
+        assert DonationPage.get_cached_live_detail(rp.slug, None) is None
+        assert DonationPage.get_cached_live_detail(None, live_donation_page.slug) is None
+        # A different payload gets a different ETag
+        assert live_donation_page.cache_live_detail(rp.slug, None, versions, {"foo": "baz"})["etag"] != cached["etag"]
+
+    @pytest.mark.parametrize("by", ["revenue_program", "page"])
+    def test_invalidate_cached_live_detail(self, by, live_donation_page):
+        rp = live_donation_page.revenue_program
+        versions = DonationPage.get_live_detail_versions(rp.id, live_donation_page.id)
+        live_donation_page.cache_live_detail(rp.slug, live_donation_page.slug, versions, {"foo": "bar"})
+        other_page = DonationPageFactory()
+        other_page.cache_live_detail(
+            other_page.revenue_program.slug,
+            other_page.slug,
+            DonationPage.get_live_detail_versions(other_page.revenue_program_id, other_page.id),
+            {"foo": "bar"},
+        )
+        if by == "revenue_program":
+            DonationPage.invalidate_cached_live_detail(revenue_program_ids=[rp.id, None])
+        else:
+            DonationPage.invalidate_cached_live_detail(page_ids=[live_donation_page.id])
+        assert DonationPage.get_cached_live_detail(rp.slug, live_donation_page.slug) is None
+        assert DonationPage.get_live_detail_versions(rp.id, live_donation_page.id) != versions
+        assert DonationPage.get_cached_live_detail(other_page.revenue_program.slug, other_page.slug) is not None
+
+    @pytest.fixture
+    def snapshot_storage(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+
+    def test_update_live_snapshot(self, live_donation_page, snapshot_storage, settings):
+        live_donation_page.update_live_snapshot()
+        name = live_donation_page.live_snapshot.name
+        assert name.startswith(f"{settings.PAGE_LIVE_SNAPSHOT_STORAGE_LOCATION}/{live_donation_page.id}/")
+        assert DonationPage.objects.get(pk=live_donation_page.pk).live_snapshot.name == name
+        data = DonationPageFullDetailSerializer(instance=live_donation_page, context={"live": True}).data
+        with default_storage.open(name) as f:
+            assert json.load(f) == json.loads(json.dumps(data))
+        assert name == live_donation_page.get_live_snapshot_name(DonationPage.get_live_detail_digest(data))
+        # Rendering the same payload again doesn't write a new snapshot
+        live_donation_page.update_live_snapshot()
+        assert live_donation_page.live_snapshot.name == name
+        live_donation_page.heading = "A new heading"
+        live_donation_page.save()
+        live_donation_page.update_live_snapshot()
+        assert live_donation_page.live_snapshot.name != name
+        assert default_storage.exists(live_donation_page.live_snapshot.name)
+        assert not default_storage.exists(name)
+
+    @pytest.mark.parametrize(
+        "make_unservable",
+        [
+            lambda page: setattr(page, "published_date", None),
+            lambda page: setattr(page.revenue_program.payment_provider, "stripe_verified", False),
+        ],
+    )
+    def test_update_live_snapshot_when_not_servable(self, make_unservable, live_donation_page, snapshot_storage):
+        live_donation_page.update_live_snapshot()
+        name = live_donation_page.live_snapshot.name
+        make_unservable(live_donation_page)
+        assert live_donation_page.is_servable_live is False
+        live_donation_page.update_live_snapshot()
+        assert not live_donation_page.live_snapshot
+        assert not DonationPage.objects.get(pk=live_donation_page.pk).live_snapshot
+        assert not default_storage.exists(name)
+
+    def test_cache_live_detail_snapshot_url(self, live_donation_page, snapshot_storage):
+        rp = live_donation_page.revenue_program
+        data = DonationPageFullDetailSerializer(instance=live_donation_page, context={"live": True}).data
+        versions = DonationPage.get_live_detail_versions(rp.id, live_donation_page.id)
+        assert live_donation_page.cache_live_detail(rp.slug, None, versions, data)["snapshot_url"] is None
+        live_donation_page.update_live_snapshot()
+        cached = live_donation_page.cache_live_detail(rp.slug, None, versions, data)
+        assert cached["snapshot_url"] == live_donation_page.live_snapshot.url
+        # A snapshot rendered from other data isn't served in place of the payload
+        assert live_donation_page.cache_live_detail(rp.slug, None, versions, {"foo": "bar"})["snapshot_url"] is None
+
+    def test_update_image_renditions(self, live_donation_page, snapshot_storage, test_jpeg_file, mocker):
+        live_donation_page.graphic = test_jpeg_file
+        live_donation_page.save()
+        invalidate = mocker.patch("apps.pages.signals.invalidate_cached_live_detail")
+        assert live_donation_page.stale_image_rendition_fields == ["graphic"]
+        assert live_donation_page.get_current_image_renditions("graphic") == {}
+        live_donation_page.update_image_renditions()
+        assert live_donation_page.stale_image_rendition_fields == []
+        sizes = live_donation_page.get_current_image_renditions("graphic")
+        assert sizes.keys() == {"300", "600", "640"}
+        assert all(default_storage.exists(x) for formats in sizes.values() for x in formats.values())
+        assert (
+            DonationPage.objects.get(pk=live_donation_page.pk).image_renditions == live_donation_page.image_renditions
+        )
+        invalidate.assert_called_once_with(page_ids=[live_donation_page.id])
+        # Replacing or clearing the image makes its renditions stale, and they're deleted when updated
+        live_donation_page.graphic = None
+        live_donation_page.save()
+        assert live_donation_page.stale_image_rendition_fields == ["graphic"]
+        live_donation_page.update_image_renditions()
+        assert live_donation_page.image_renditions == {}
+        assert not any(default_storage.exists(x) for formats in sizes.values() for x in formats.values())
+
 
 @pytest.mark.django_db
 class TestStyle:
@@ -2,11 +2,13 @@ import json
 from dataclasses import asdict
 from pathlib import Path
 
+from django.core.files.storage import default_storage
 from django.utils import timezone
 
 import pytest
 from rest_framework import serializers
 from rest_framework.test import APIRequestFactory
+from sorl.thumbnail import get_thumbnail
 
 from apps.config.tests.factories import DenyListWordFactory
 from apps.config.validators import GENERIC_SLUG_DENIED_MSG
@@ -45,6 +47,7 @@ class TestDonationPageFullDetailSerializer:
             "header_logo_alt_text",
             "heading",
             "id",
+            "image_renditions",
             "locale",
             "modified",
             "name",
@@ -66,6 +69,31 @@ class TestDonationPageFullDetailSerializer:
         plan_keys = set(asdict(FreePlan).keys())
         assert plan_keys == serializer.data["plan"].keys()
 
+    def test_image_thumbnails_and_renditions(self, live_donation_page, settings, tmp_path, test_jpeg_file):
+        settings.MEDIA_ROOT = tmp_path
+        live_donation_page.graphic = test_jpeg_file
+        live_donation_page.header_logo = None
+        live_donation_page.save()
+        request = APIRequestFactory().get("/")
+        data = DonationPageFullDetailSerializer(instance=live_donation_page, context={"request": request}).data
+        # Until renditions are generated, a sorl thumbnail is used
+        assert data["graphic_thumbnail"] == request.build_absolute_uri(
+            get_thumbnail(live_donation_page.graphic, "300").url
+        )
+        assert data["graphic_thumbnail"] != request.build_absolute_uri(live_donation_page.graphic.url)
+        assert data["header_logo_thumbnail"] is None
+        assert data["image_renditions"] == {}
+        live_donation_page.update_image_renditions()
+        data = DonationPageFullDetailSerializer(instance=live_donation_page, context={"request": request}).data
+        sizes = live_donation_page.image_renditions["graphic"]["sizes"]
+        assert data["graphic_thumbnail"] == request.build_absolute_uri(default_storage.url(sizes["300"]["original"]))
+        assert data["image_renditions"] == {
+            "graphic": {
+                width: {fmt: request.build_absolute_uri(default_storage.url(name)) for fmt, name in formats.items()}
+                for width, formats in sizes.items()
+            }
+        }
+
     def test_create_creates_name_on_fly_when_not_provided(self, revenue_program, hub_admin_user):
         revenue_program.organization.plan_name = Plans.PLUS
         revenue_program.organization.save()
@@ -1,12 +1,17 @@
 import json
 
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
 import pytest
 
 from apps.google_cloud.pubsub import Message
-from apps.organizations.tests.factories import RevenueProgramFactory
-from apps.pages.signals import donation_page_page_published_handler
+from apps.organizations.models import BenefitLevelBenefit
+from apps.organizations.tests.factories import BenefitFactory, BenefitLevelFactory, RevenueProgramFactory
+from apps.pages.models import DonationPage
+from apps.pages.signals import donation_page_page_published_handler, invalidate_cached_live_detail
 from apps.pages.signals import settings as signals_settings
-from apps.pages.tests.factories import DonationPageFactory
+from apps.pages.tests.factories import DonationPageFactory, StyleFactory
 
 
 PAGE_TOPIC = "page-topic"
@@ -42,3 +47,117 @@ def test_donation_page_page_published_handler(gcloud_configured, topic, mocker):
         }
 
         publish_handler.return_value.publish.assert_called_once_with(topic, Message(data=json.dumps(expected_payload)))
+
+
+@pytest.mark.django_db
+class TestLiveDetailInvalidation:
+    @pytest.fixture
+    def page(self, live_donation_page):
+        live_donation_page.styles = StyleFactory(revenue_program=live_donation_page.revenue_program)
+        live_donation_page.save()
+        return live_donation_page
+
+    @pytest.fixture
+    def cached_page(self, page):
+        page.cache_live_detail(
+            page.revenue_program.slug,
+            page.slug,
+            DonationPage.get_live_detail_versions(page.revenue_program_id, page.id),
+            {"foo": "bar"},
+        )
+        assert DonationPage.get_cached_live_detail(page.revenue_program.slug, page.slug) is not None
+        return page
+
+    @pytest.mark.parametrize(
+        "change",
+        [
+            lambda page: page.save(),
+            lambda page: page.delete(),
+            lambda page: page.styles.save(),
+            lambda page: page.styles.delete(),
+            lambda page: page.revenue_program.save(),
+            lambda page: page.revenue_program.organization.save(),
+            lambda page: page.revenue_program.payment_provider.save(),
+            lambda page: page.revenue_program.payment_provider.delete(),
+            lambda page: BenefitFactory(revenue_program=page.revenue_program),
+            lambda page: BenefitLevelFactory(revenue_program=page.revenue_program),
+            # The payload cached under the old revenue program's slug is invalidated when a page moves
+            lambda page: setattr(page, "revenue_program", RevenueProgramFactory()) or page.save(),
+        ],
+    )
+    def test_invalidates(self, change, cached_page):
+        slugs = (cached_page.revenue_program.slug, cached_page.slug)
+        change(cached_page)
+        assert DonationPage.get_cached_live_detail(*slugs) is None
+
+    def test_benefit_level_benefit_change_invalidates(self, page):
+        benefit = BenefitFactory(revenue_program=page.revenue_program)
+        benefit_level = BenefitLevelFactory(revenue_program=page.revenue_program)
+        page.cache_live_detail(
+            page.revenue_program.slug,
+            page.slug,
+            DonationPage.get_live_detail_versions(page.revenue_program_id, page.id),
+            {"foo": "bar"},
+        )
+        BenefitLevelBenefit.objects.create(benefit=benefit, benefit_level=benefit_level, order=1)
+        assert DonationPage.get_cached_live_detail(page.revenue_program.slug, page.slug) is None
+
+    def test_unrelated_change_does_not_invalidate(self, cached_page):
+        DonationPageFactory().save()
+        StyleFactory().save()
+        assert DonationPage.get_cached_live_detail(cached_page.revenue_program.slug, cached_page.slug) is not None
+
+    def test_invalidates_again_on_commit(self, mocker, django_capture_on_commit_callbacks):
+        spy = mocker.spy(DonationPage, "invalidate_cached_live_detail")
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            invalidate_cached_live_detail([1], [2])
+            assert spy.call_count == 1
+        assert len(callbacks) == 1
+        assert spy.call_count == 2
+        spy.assert_called_with({1}, {2})
+
+    @pytest.mark.parametrize("enabled", [True, False])
+    def test_updates_live_snapshots_on_commit(self, enabled, settings, mocker, django_capture_on_commit_callbacks):
+        settings.PAGE_LIVE_SNAPSHOTS_ENABLED = enabled
+        mock_delay = mocker.patch("apps.pages.tasks.update_live_page_snapshots.delay")
+        with django_capture_on_commit_callbacks(execute=True):
+            invalidate_cached_live_detail([1, None], [2])
+            mock_delay.assert_not_called()
+        if enabled:
+            mock_delay.assert_called_once_with(revenue_program_ids=[1], page_ids=[2])
+        else:
+            mock_delay.assert_not_called()
+
+    def test_deletes_live_snapshot_with_page(self, page, settings, tmp_path, django_capture_on_commit_callbacks):
+        settings.MEDIA_ROOT = tmp_path
+        page.live_snapshot.name = default_storage.save("page-snapshots/1/abc.json", ContentFile(b"{}"))
+        page.save()
+        with django_capture_on_commit_callbacks(execute=True):
+            page.delete()
+        assert not default_storage.exists("page-snapshots/1/abc.json")
+
+
+@pytest.mark.django_db
+class TestImageRenditions:
+    def test_generates_when_image_changes(
+        self, settings, tmp_path, test_jpeg_file, mocker, django_capture_on_commit_callbacks
+    ):
+        settings.MEDIA_ROOT = tmp_path
+        mock_delay = mocker.patch("apps.pages.tasks.generate_page_image_renditions.delay")
+        with django_capture_on_commit_callbacks(execute=True):
+            page = DonationPageFactory()
+        mock_delay.assert_not_called()
+        with django_capture_on_commit_callbacks(execute=True):
+            page.header_bg_image = test_jpeg_file
+            page.save()
+        mock_delay.assert_called_once_with(page.id)
+
+    def test_deletes_renditions_with_page(self, settings, tmp_path, test_jpeg_file, django_capture_on_commit_callbacks):
+        settings.MEDIA_ROOT = tmp_path
+        page = DonationPageFactory(header_logo=test_jpeg_file)
+        page.update_image_renditions()
+        names = [x for formats in page.image_renditions["header_logo"]["sizes"].values() for x in formats.values()]
+        assert all(default_storage.exists(x) for x in names)
+        with django_capture_on_commit_callbacks(execute=True):
+            page.delete()
+        assert not any(default_storage.exists(x) for x in names)
@@ -0,0 +1,33 @@
+import pytest
+
+from apps.organizations.tests.factories import RevenueProgramFactory
+from apps.pages.tasks import generate_page_image_renditions, update_live_page_snapshots
+from apps.pages.tests.factories import DonationPageFactory
+
+
+@pytest.mark.django_db
+def test_update_live_page_snapshots(live_donation_page, settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    other_page = DonationPageFactory(published=True, revenue_program=live_donation_page.revenue_program)
+    unpublished_page = DonationPageFactory(published_date=None, revenue_program=live_donation_page.revenue_program)
+    unrelated_page = DonationPageFactory(published=True, revenue_program=RevenueProgramFactory(onboarded=True))
+    update_live_page_snapshots(revenue_program_ids=[live_donation_page.revenue_program_id], page_ids=[])
+    for page in (live_donation_page, other_page):
+        page.refresh_from_db()
+        assert page.live_snapshot
+    for page in (unpublished_page, unrelated_page):
+        page.refresh_from_db()
+        assert not page.live_snapshot
+    update_live_page_snapshots(revenue_program_ids=[], page_ids=[unrelated_page.id])
+    unrelated_page.refresh_from_db()
+    assert unrelated_page.live_snapshot
+
+
+@pytest.mark.django_db
+def test_generate_page_image_renditions(settings, tmp_path, test_jpeg_file):
+    settings.MEDIA_ROOT = tmp_path
+    page = DonationPageFactory(graphic=test_jpeg_file)
+    generate_page_image_renditions(page.id)
+    page.refresh_from_db()
+    assert page.get_current_image_renditions("graphic")
+    generate_page_image_renditions(page.id + 1)
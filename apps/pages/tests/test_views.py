@@ -5,6 +5,8 @@ import string
 from io import BytesIO
 
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 import pytest
@@ -714,6 +716,28 @@ class TestPageViewSet:
         assert isinstance(response.json(), list)
         assert len(response.json()) == DonationPage.objects.count()
 
+    def test_list_with_fields_and_cursor(self, api_client, superuser):
+        DonationPageFactory.create_batch(size=3)
+        api_client.force_authenticate(superuser)
+        response = api_client.get(reverse("donationpage-list"), {"fields": "id,name", "cursor": "", "page_size": 2})
+        assert response.status_code == status.HTTP_200_OK
+        assert [set(x) for x in response.json()["results"]] == [{"id", "name"}] * 2
+        next_response = api_client.get(response.json()["next"])
+        assert next_response.json()["next"] is None
+        assert sorted(x["id"] for x in response.json()["results"] + next_response.json()["results"]) == sorted(
+            DonationPage.objects.values_list("id", flat=True)
+        )
+
+    def test_list_queries_do_not_grow_with_pages(self, api_client, superuser):
+        DonationPageFactory()
+        api_client.force_authenticate(superuser)
+        with CaptureQueriesContext(connection) as one_page:
+            api_client.get(reverse("donationpage-list"))
+        DonationPageFactory.create_batch(size=3)
+        with CaptureQueriesContext(connection) as four_pages:
+            assert len(api_client.get(reverse("donationpage-list")).json()) == 4
+        assert len(four_pages) == len(one_page)
+
     @pytest.mark.parametrize(
         "plan",
         [
@@ -1011,6 +1035,74 @@ class TestPageViewSet:
             )
         )
 
+    @pytest.mark.parametrize("use_page_slug", [True, False])
+    def test_live_detail_page_is_cached(self, use_page_slug, live_donation_page, api_client, django_assert_num_queries):
+        live_donation_page.revenue_program.default_donation_page = live_donation_page
+        live_donation_page.revenue_program.save()
+        query = {"revenue_program": live_donation_page.revenue_program.slug}
+        if use_page_slug:
+            query["page"] = live_donation_page.slug
+        response = api_client.get(reverse("donationpage-live-detail"), query)
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"]
+        assert "no-cache" in response["Cache-Control"]
+        with django_assert_num_queries(0):
+            cached_response = api_client.get(reverse("donationpage-live-detail"), query)
+        assert cached_response.status_code == status.HTTP_200_OK
+        assert cached_response.json() == response.json()
+        assert cached_response["ETag"] == response["ETag"]
+
+    def test_live_detail_page_when_page_changes(self, live_donation_page, api_client):
+        query = {"revenue_program": live_donation_page.revenue_program.slug, "page": live_donation_page.slug}
+        response = api_client.get(reverse("donationpage-live-detail"), query)
+        live_donation_page.heading = "A new heading"
+        live_donation_page.save()
+        new_response = api_client.get(reverse("donationpage-live-detail"), query)
+        assert new_response.status_code == status.HTTP_200_OK
+        assert new_response.json()["heading"] == "A new heading"
+        assert new_response["ETag"] != response["ETag"]
+        live_donation_page.published_date = None
+        live_donation_page.save()
+        assert api_client.get(reverse("donationpage-live-detail"), query).status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.parametrize(
+        "make_if_none_match", [lambda etag: etag, lambda etag: f'"other", W/{etag}', lambda etag: "*"]
+    )
+    def test_live_detail_page_when_etag_matches(self, make_if_none_match, live_donation_page, api_client):
+        query = {"revenue_program": live_donation_page.revenue_program.slug, "page": live_donation_page.slug}
+        etag = api_client.get(reverse("donationpage-live-detail"), query)["ETag"]
+        response = api_client.get(
+            reverse("donationpage-live-detail"), query, HTTP_IF_NONE_MATCH=make_if_none_match(etag)
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert not response.content
+        assert response["ETag"] == etag
+
+    def test_live_detail_page_when_snapshots_enabled(self, live_donation_page, api_client, settings, tmp_path, mocker):
+        settings.MEDIA_ROOT = tmp_path
+        settings.PAGE_LIVE_SNAPSHOTS_ENABLED = True
+        mock_delay = mocker.patch("apps.pages.views.update_live_page_snapshots.delay")
+        query = {"revenue_program": live_donation_page.revenue_program.slug, "page": live_donation_page.slug}
+        # Without a current snapshot, the payload is served and rendering one is queued, once
+        for _ in range(2):
+            DonationPage.invalidate_cached_live_detail(page_ids=[live_donation_page.id])
+            response = api_client.get(reverse("donationpage-live-detail"), query)
+            assert response.status_code == status.HTTP_200_OK
+        mock_delay.assert_called_once_with(revenue_program_ids=[], page_ids=[live_donation_page.id])
+        live_donation_page.update_live_snapshot()
+        response = api_client.get(reverse("donationpage-live-detail"), query)
+        assert response.status_code == status.HTTP_302_FOUND
+        assert response["Location"] == live_donation_page.live_snapshot.url
+        assert api_client.get(
+            reverse("donationpage-live-detail"), query, HTTP_IF_NONE_MATCH=response["ETag"]
+        ).status_code == (status.HTTP_304_NOT_MODIFIED)
+
+    def test_live_detail_page_when_etag_does_not_match(self, live_donation_page, api_client):
+        query = {"revenue_program": live_donation_page.revenue_program.slug, "page": live_donation_page.slug}
+        response = api_client.get(reverse("donationpage-live-detail"), query, HTTP_IF_NONE_MATCH='"stale"')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["id"] == live_donation_page.id
+
     @pytest.mark.parametrize("make_query", [lambda page: {}, lambda page: {"page": page.slug}])
     def test_live_detail_page_missing_rp_query_param(self, make_query, live_donation_page, api_client):
         url = reverse("donationpage-live-detail")
@@ -1486,6 +1578,24 @@ class TestStyleViewSet:
             # once for call above to create `query`, and once when called in view layer
             assert spy.call_count == 2
 
+    def test_list_queries_do_not_grow_with_styles(self, api_client, superuser, live_donation_page):
+        live_donation_page.styles = StyleFactory()
+        live_donation_page.save()
+        api_client.force_authenticate(superuser)
+        with CaptureQueriesContext(connection) as one_style:
+            response = api_client.get(reverse("style-list"))
+        assert [x["used_live"] for x in response.json()] == [True]
+        StyleFactory.create_batch(size=3)
+        with CaptureQueriesContext(connection) as four_styles:
+            response = api_client.get(reverse("style-list"))
+        assert sorted(x["used_live"] for x in response.json()) == [False, False, False, True]
+        assert len(four_styles) == len(one_style)
+
+    def test_list_with_fields(self, api_client, superuser, style):
+        api_client.force_authenticate(superuser)
+        response = api_client.get(reverse("style-list"), {"fields": "id,name"})
+        assert response.json() == [{"id": style.id, "name": style.name}]
+
     def test_list_when_unauthorized_user(self, unexpected_user, api_client):
         """Show list behavior when an unauthorized user tries to access."""
         StyleFactory.create_batch(size=2)
@@ -1,8 +1,13 @@
 import logging
 
 from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
 from django.utils.decorators import method_decorator
+from django.utils.http import parse_etags
 from django.views.decorators.csrf import ensure_csrf_cookie
 
 import django_filters
@@ -12,6 +17,8 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from reversion.views import RevisionMixin
 
+from apps.api.mixins import ProjectedListViewSetMixin
+from apps.api.pagination import OptInCursorPaginationMixin
 from apps.api.permissions import HasRoleAssignment
 from apps.common.views import FilterForSuperUserOrRoleAssignmentUserMixin
 from apps.element_media.models import MediaImage
@@ -19,6 +26,7 @@ from apps.organizations.models import RevenueProgram
 from apps.pages import serializers
 from apps.pages.filters import StyleFilter
 from apps.pages.models import DonationPage, Font, Style
+from apps.pages.tasks import update_live_page_snapshots
 from apps.public.permissions import IsActiveSuperUser
 
 
@@ -114,7 +122,13 @@ class PageFullDetailHelper:
             raise PageDetailError("RevenueProgram does not have a fully verified payment provider")
 
 
-class PageViewSet(FilterForSuperUserOrRoleAssignmentUserMixin, RevisionMixin, viewsets.ModelViewSet):
+class PageViewSet(
+    OptInCursorPaginationMixin,
+    ProjectedListViewSetMixin,
+    FilterForSuperUserOrRoleAssignmentUserMixin,
+    RevisionMixin,
+    viewsets.ModelViewSet,
+):
     """Contribution pages exposed through API.
 
     Only superusers and users with role assignments are meant to have access. Results of lists are filtered
@@ -131,9 +145,9 @@ class PageViewSet(FilterForSuperUserOrRoleAssignmentUserMixin, RevisionMixin, vi
     ]
     ordering_fields = ["username", "email"]
     ordering = ["published_date", "name"]
-    # We don't expect orgs to have a huge number of pages here.
-    # In the future, we may wish to turn pagination back on (which will require frontend changes) if
-    # pages are ever accessed via api and not restricted by org.
+    # We don't expect orgs to have a huge number of pages here, so lists are only paginated when clients opt in with a
+    # cursor (which superusers and hub admins, who see every org's pages, should). Lists load only the fields
+    # `DonationPageListSerializer` needs, narrowed to those requested with the `fields` query parameter, if any.
     pagination_class = None
 
     # we don't allow put
@@ -145,6 +159,8 @@ class PageViewSet(FilterForSuperUserOrRoleAssignmentUserMixin, RevisionMixin, vi
     def get_serializer_class(self):
         if self.action in ("partial_update", "create", "retrieve"):
             return serializers.DonationPageFullDetailSerializer
+        if self.action == "list":
+            return serializers.DonationPageListSerializer
 
     @method_decorator(ensure_csrf_cookie)
     @action(detail=False, methods=["get"], permission_classes=[], authentication_classes=[], url_path="live-detail")
@@ -152,12 +168,42 @@ class PageViewSet(FilterForSuperUserOrRoleAssignmentUserMixin, RevisionMixin, vi
         """Request when a published page needs to be viewed.
 
         Permission and authentication classes are reset because meant to be open access.
+
+        The serialized page is cached until the page or something in its payload changes (see `apps.pages.signals`), and
+        responses have an ETag so that browsers and the CDN can revalidate with If-None-Match. If live snapshots are
+        enabled, this redirects to the page's current snapshot, and queues rendering one if there isn't one.
         """
-        try:
-            donation_page = PageFullDetailHelper(request, live=True)
-            return Response(donation_page.get_data(), status=status.HTTP_200_OK)
-        except PageDetailError as exc:
-            return Response({"detail": exc.message}, status=exc.status)
+        cached = DonationPage.get_cached_live_detail(request.GET.get("revenue_program"), request.GET.get("page"))
+        if cached is None:
+            try:
+                donation_page = PageFullDetailHelper(request, live=True)
+            except PageDetailError as exc:
+                return Response({"detail": exc.message}, status=exc.status)
+            page = donation_page.donation_page
+            cached = page.cache_live_detail(
+                donation_page.revenue_program_slug,
+                donation_page.page_slug,
+                DonationPage.get_live_detail_versions(page.revenue_program_id, page.id),
+                donation_page.get_data(),
+            )
+            if (
+                settings.PAGE_LIVE_SNAPSHOTS_ENABLED
+                and not cached["snapshot_url"]
+                # Don't queue the same rendering for every request that misses the cache until it's done
+                and cache.add(f"live-page-snapshot-queued-{page.id}", True, timeout=60)
+            ):
+                update_live_page_snapshots.delay(revenue_program_ids=[], page_ids=[page.id])
+        if {cached["etag"], "*"} & {
+            x.removeprefix("W/") for x in parse_etags(request.headers.get("If-None-Match", ""))
+        }:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        elif settings.PAGE_LIVE_SNAPSHOTS_ENABLED and cached.get("snapshot_url"):
+            response = Response(status=status.HTTP_302_FOUND, headers={"Location": cached["snapshot_url"]})
+        else:
+            response = Response(cached["data"], status=status.HTTP_200_OK)
+        response["ETag"] = cached["etag"]
+        patch_cache_control(response, no_cache=True)
+        return response
 
     @action(detail=False, methods=["get"], url_path="draft-detail")
     def draft_detail(self, request):
@@ -220,22 +266,14 @@ class PageViewSet(FilterForSuperUserOrRoleAssignmentUserMixin, RevisionMixin, vi
         page.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
-    def list(self, request):
-        """List all available pages for the current user.
 
-        NB: This method assumes that any queryset filtering vis-a-vis user role and identity has
-        already been done upstream in get_queryset.
-
-        In order to optimize for query performance, we limit returned fields with .only (which we configure the
-        serializer to define, as that's the place where these field references are maintained)
-        """
-        serializer = serializers.DonationPageListSerializer
-        qs = self.get_queryset().only(*serializer._ONLIES)
-        serialized = serializer(qs, many=True)
-        return Response(serialized.data)
-
-
-class StyleViewSet(FilterForSuperUserOrRoleAssignmentUserMixin, RevisionMixin, viewsets.ModelViewSet):
+class StyleViewSet(
+    OptInCursorPaginationMixin,
+    ProjectedListViewSetMixin,
+    FilterForSuperUserOrRoleAssignmentUserMixin,
+    RevisionMixin,
+    viewsets.ModelViewSet,
+):
     """Contribution Page Template styles exposed through API.
 
     Only superusers and users with role assignments are meant to have access. Results of lists are filtered
@@ -256,6 +294,16 @@ class StyleViewSet(FilterForSuperUserOrRoleAssignmentUserMixin, RevisionMixin, v
     def get_queryset(self):
         return self.filter_queryset_for_superuser_or_ra()
 
+    def get_list_queryset(self, queryset):
+        # So that `StyleListSerializer.get_used_live` doesn't query for each style
+        return (
+            super()
+            .get_list_queryset(queryset)
+            .annotate(
+                used_live=Exists(DonationPage.objects.filter(styles=OuterRef("pk"), published_date__lte=timezone.now()))
+            )
+        )
+
 
 class FontViewSet(viewsets.ReadOnlyModelViewSet):
     model = Font
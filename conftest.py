@@ -23,7 +23,8 @@ from pathlib import Path
 from random import choice, randint, uniform
 from zoneinfo import ZoneInfo
 
-from django.core.cache import cache
+from django.conf import settings
+from django.core.cache import cache, caches
 from django.core.files.images import ImageFile
 from django.utils import timezone
 
@@ -972,6 +973,7 @@ def balance_transaction_for_one_time_charge():
 @pytest.fixture
 def _clear_cache():
     cache.clear()
+    caches[settings.LOCAL_CACHE].clear()
 
 
 @pytest.fixture
@@ -93,6 +93,11 @@ MEDIA_LOCATION = os.getenv("MEDIA_LOCATION", "")
 STORAGES = {
     "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
     "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    # Contribution exports hold contributors' personal data, so they're kept out of the publicly served media storage
+    "contribution_exports": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+        "OPTIONS": {"location": BASE_DIR / "private" / "contribution-exports", "base_url": None},
+    },
 }
 
 # Google cloud
@@ -102,8 +107,20 @@ GOOGLE_CLOUD_PROJECT_ID = os.getenv("GS_PROJECT_ID", None)
 ENABLE_PUBSUB = os.getenv("ENABLE_PUBSUB", "false").lower() == "true"
 PAGE_PUBLISHED_TOPIC = os.getenv("PAGE_PUBLISHED_TOPIC", None)
 NEW_USER_TOPIC = os.getenv("NEW_USER_TOPIC", None)
+# When PUBSUB_PUBLISH_ASYNC, messages are published after the current transaction commits, without waiting for Pub/Sub,
+# and are batched by the client for up to PUBSUB_BATCH_MAX_LATENCY seconds or PUBSUB_BATCH_MAX_MESSAGES messages. Messages
+# that fail to publish are saved to an outbox. Before turning this on, add a periodic task for
+# `apps.google_cloud.tasks.publish_outbox_messages` in django-celery-beat (e.g. every minute), which retries them.
+PUBSUB_PUBLISH_ASYNC = os.getenv("PUBSUB_PUBLISH_ASYNC", "false").lower() == "true"
+PUBSUB_BATCH_MAX_MESSAGES = int(os.getenv("PUBSUB_BATCH_MAX_MESSAGES", 100))
+PUBSUB_BATCH_MAX_LATENCY = float(os.getenv("PUBSUB_BATCH_MAX_LATENCY", 0.05))
+PUBSUB_PUBLISH_TIMEOUT = int(os.getenv("PUBSUB_PUBLISH_TIMEOUT", 3))
+PUBSUB_OUTBOX_BATCH_SIZE = int(os.getenv("PUBSUB_OUTBOX_BATCH_SIZE", 500))
 #   Secret Manager
 ENABLE_GOOGLE_CLOUD_SECRET_MANAGER = os.getenv("ENABLE_GOOGLE_CLOUD_SECRET_MANAGER", "false").lower() == "true"
+# Secret values are cached in Redis (and briefly in process, see LOCAL_CACHE) for this many seconds. Writes through
+# GoogleCloudSecretProvider update the cache, so this only bounds staleness from changes made outside of the app.
+GOOGLE_CLOUD_SECRET_CACHE_TTL = int(os.getenv("GOOGLE_CLOUD_SECRET_CACHE_TTL", 60 * 5))
 
 GS_CREDENTIALS = __ensure_gs_credentials(
     gs_service_account_raw=os.getenv("GS_SERVICE_ACCOUNT", None),
@@ -130,6 +147,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "django_celery_beat",
     "django_filters",
     "django_json_widget",
@@ -249,6 +267,18 @@ STRIPE_TRANSACTIONS_IMPORT_CACHE_TTL = int(
     os.getenv("STRIPE_TRANSACTIONS_IMPORT_CACHE_TTL", 60 * 60 * 25)  # default is 25 hours
 )
 
+# Per-process cache in front of Redis for small, hot lookups. Entries can't be invalidated from other processes, so they
+# expire after LOCAL_CACHE_TTL seconds.
+LOCAL_CACHE = "local"
+LOCAL_CACHE_TTL = int(os.getenv("LOCAL_CACHE_TTL", 30))
+LOCAL_CACHE_MAX_ENTRIES = int(os.getenv("LOCAL_CACHE_MAX_ENTRIES", 1000))
+# Revenue programs looked up by slug (i.e., by subdomain) are cached for this many seconds. The cache is invalidated when
+# a revenue program or its social meta change, so this only bounds staleness from writes that bypass signals.
+REVENUE_PROGRAM_BY_SLUG_CACHE_TTL = int(os.getenv("REVENUE_PROGRAM_BY_SLUG_CACHE_TTL", 60 * 60 * 24))
+# Slugs without a revenue program are cached for only this many seconds, so that requests for arbitrary subdomains can't
+# fill the cache.
+REVENUE_PROGRAM_BY_SLUG_NOT_FOUND_CACHE_TTL = int(os.getenv("REVENUE_PROGRAM_BY_SLUG_NOT_FOUND_CACHE_TTL", 60))
+
 REDIS_URL = os.getenv("REDIS_TLS_URL", os.getenv("REDIS_URL", "redis://redis:6379"))
 
 
@@ -278,6 +308,11 @@ CACHES = {
         **base_cache_config,
         "OPTIONS": {**base_cache_config["OPTIONS"], "KEY_PREFIX": STRIPE_TRANSACTIONS_IMPORT_CACHE},
     },
+    LOCAL_CACHE: {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "TIMEOUT": LOCAL_CACHE_TTL,
+        "OPTIONS": {"MAX_ENTRIES": LOCAL_CACHE_MAX_ENTRIES},
+    },
 }
 
 
@@ -341,6 +376,12 @@ SENTRY_DSN_BACKEND = os.getenv("SENTRY_DSN_BACKEND")
 SENTRY_ENABLE_PII = os.getenv("SENTRY_ENABLE_PII", "true").lower() == "true"
 SENTRY_PROFILING_SAMPLE_RATE = float(os.getenv("SENTRY_PROFILING_SAMPLE_RATE", "0.1"))
 
+### Metrics Settings
+# See `apps.common.metrics`. Metrics are only logged (at debug level) unless STATSD_HOST is set.
+STATSD_HOST = os.getenv("STATSD_HOST", "")
+STATSD_PORT = int(os.getenv("STATSD_PORT", 8125))
+STATSD_PREFIX = os.getenv("STATSD_PREFIX", "revengine")
+
 
 ### REST_FRAMEWORK Settings
 REST_FRAMEWORK = {
@@ -476,6 +517,10 @@ WEBHOOK_URL = r"^revengine-stripe-webhook/"
 STRIPE_CORE_PRODUCT_ID = os.getenv("STRIPE_CORE_PRODUCT_ID", "")
 STRIPE_OAUTH_SCOPE = "read_write"
 STRIPE_LIVE_MODE = os.getenv("STRIPE_LIVE_MODE", "false").lower() == "true"
+# How long to remember that a contributions webhook event has been processed, so that replaying events (see
+# `replay_stripe_events` management command) can skip it. Stripe only keeps events for 30 days.
+STRIPE_PROCESSED_EVENT_RECORD_TTL = int(os.getenv("STRIPE_PROCESSED_EVENT_RECORD_TTL", 60 * 60 * 24 * 30))
+
 # The following values that end in `_UPGRADES` are for interacting with Stripe to create and manage contributions
 STRIPE_LIVE_SECRET_KEY_CONTRIBUTIONS = os.getenv("STRIPE_LIVE_SECRET_KEY_CONTRIBUTIONS", "")
 STRIPE_TEST_SECRET_KEY_CONTRIBUTIONS = os.getenv("STRIPE_TEST_SECRET_KEY_CONTRIBUTIONS", "")
@@ -491,6 +536,27 @@ STRIPE_WEBHOOK_EVENTS_CONTRIBUTIONS = [
     "charge.refunded",
     "charge.succeeded",
 ]
+# Celery queue and priority used to process contributions webhooks, by Stripe event type. Events that drive receipts
+# and contribution status changes are time-sensitive and shouldn't wait behind bursts of low-value events like
+# `invoice.upcoming`. Each class can be consumed by its own worker pool (`celery --app=revengine worker -Q <queue>`).
+# Both queues default to Celery's default queue, so a single worker keeps processing everything until separate pools
+# are configured. NB: with the Redis broker, lower priority values are consumed first.
+STRIPE_WEBHOOK_QUEUE_TIME_SENSITIVE = os.getenv("STRIPE_WEBHOOK_QUEUE_TIME_SENSITIVE", "celery")
+STRIPE_WEBHOOK_QUEUE_BULK = os.getenv("STRIPE_WEBHOOK_QUEUE_BULK", "celery")
+STRIPE_WEBHOOK_ROUTE_TIME_SENSITIVE = {"queue": STRIPE_WEBHOOK_QUEUE_TIME_SENSITIVE, "priority": 0}
+STRIPE_WEBHOOK_ROUTE_BULK = {"queue": STRIPE_WEBHOOK_QUEUE_BULK, "priority": 9}
+# Event types not listed here are routed with STRIPE_WEBHOOK_ROUTE_BULK
+STRIPE_WEBHOOK_EVENT_ROUTES = {
+    "payment_intent.canceled": STRIPE_WEBHOOK_ROUTE_TIME_SENSITIVE,
+    "payment_intent.payment_failed": STRIPE_WEBHOOK_ROUTE_TIME_SENSITIVE,
+    "customer.subscription.updated": STRIPE_WEBHOOK_ROUTE_TIME_SENSITIVE,
+    "customer.subscription.deleted": STRIPE_WEBHOOK_ROUTE_TIME_SENSITIVE,
+    "invoice.payment_succeeded": STRIPE_WEBHOOK_ROUTE_TIME_SENSITIVE,
+    "charge.refunded": STRIPE_WEBHOOK_ROUTE_TIME_SENSITIVE,
+    "charge.succeeded": STRIPE_WEBHOOK_ROUTE_TIME_SENSITIVE,
+    "invoice.upcoming": STRIPE_WEBHOOK_ROUTE_BULK,
+    "payment_method.attached": STRIPE_WEBHOOK_ROUTE_BULK,
+}
 
 # The following values that end in `_UPGRADES` are for interacting with Stripe to manage org upgrades
 STRIPE_LIVE_SECRET_KEY_UPGRADES = os.getenv("STRIPE_LIVE_SECRET_KEY_UPGRADES", "")
@@ -514,6 +580,10 @@ HOOKDECK_STRIPE_WEBHOOK_SOURCE_UPGRADES = os.getenv("HOOKDECK_STRIPE_WEBHOOK_SOU
 HEALTHCHECK_URL_AUTO_ACCEPT_FLAGGED_PAYMENTS = os.getenv("HEALTHCHECK_URL_AUTO_ACCEPT_FLAGGED_PAYMENTS")
 HEALTHCHECK_URL_MARK_ABANDONED_CARTS = os.getenv("HEALTHCHECK_URL_MARK_ABANDONED_CARTS", "")
 HEALTHCHECK_URL_PROCESS_STRIPE_WEBHOOK_TASK = os.getenv("HEALTHCHECK_URL_PROCESS_STRIPE_WEBHOOK_TASK", "")
+# `process_stripe_webhook_task` runs for every webhook, so we ping its healthcheck at most once per this many seconds.
+HEALTHCHECK_PROCESS_STRIPE_WEBHOOK_TASK_MIN_INTERVAL = int(
+    os.getenv("HEALTHCHECK_PROCESS_STRIPE_WEBHOOK_TASK_MIN_INTERVAL", 60)
+)
 
 
 ### Google Tag Manager ID
@@ -554,6 +624,23 @@ METADATA_MAX_SWAG_CHOICES_LENGTH = 255
 # this delta is less than 6.5 days to be safe.
 FLAGGED_PAYMENT_AUTO_ACCEPT_DELTA = 3
 
+# Contribution CSV exports are written to the "contribution_exports" storage (see STORAGES), and emailed as a download
+# link that expires after this many hours. Exports are deleted once their link expires by the
+# `apps.contributions.tasks.delete_expired_contribution_exports` task, which must be scheduled with django-celery-beat
+# (hourly is plenty). Contributions are read from the database this many at a time.
+CONTRIBUTION_EXPORT_LINK_EXPIRY = int(os.getenv("CONTRIBUTION_EXPORT_LINK_EXPIRY", 72))
+CONTRIBUTION_EXPORT_CHUNK_SIZE = int(os.getenv("CONTRIBUTION_EXPORT_CHUNK_SIZE", 2000))
+# Pending or running export jobs not updated in this many seconds are considered dead, and no longer block identical
+# export requests.
+EXPORT_JOB_STALE_AFTER = int(os.getenv("EXPORT_JOB_STALE_AFTER", 60 * 60))
+# Serialized live donation pages are cached for this many seconds. The cache is invalidated when a page or the models
+# its payload is built from change, so this only bounds staleness from writes that bypass signals.
+PAGE_LIVE_DETAIL_CACHE_TTL = int(os.getenv("PAGE_LIVE_DETAIL_CACHE_TTL", 60 * 60))
+# When enabled, live donation pages are rendered to static JSON snapshots in file storage whenever they change, and the
+# live page detail endpoint redirects to the current snapshot, so that it can be served from storage or a CDN.
+PAGE_LIVE_SNAPSHOTS_ENABLED = os.getenv("PAGE_LIVE_SNAPSHOTS_ENABLED", "false").lower() == "true"
+PAGE_LIVE_SNAPSHOT_STORAGE_LOCATION = os.getenv("PAGE_LIVE_SNAPSHOT_STORAGE_LOCATION", "page-snapshots")
+
 ## Contributor page / auth Settings.
 CONTRIBUTOR_PORTAL_URL = "portal/"
 # Magic Link URL
@@ -565,6 +652,12 @@ CONTRIBUTOR_MAGIC_LINK_REQUEST_THROTTLE_RATE = os.getenv("CONTRIBUTOR_MAGIC_LINK
 CONTRIBUTOR_ID_CLAIM = "contrib_id"
 CONTRIBUTOR_SHORT_TOKEN_LIFETIME = timedelta(minutes=15)
 CONTRIBUTOR_LONG_TOKEN_LIFETIME = timedelta(hours=3)
+# Contributor impact totals shown in the portal are cached for this many seconds. The cache is invalidated when a
+# contributor's contributions or payments change, so this only bounds staleness from writes that bypass signals.
+CONTRIBUTOR_IMPACT_CACHE_TTL = int(os.getenv("CONTRIBUTOR_IMPACT_CACHE_TTL", 60 * 60 * 24))
+# Daily revenue rollups are refreshed by a task queued once payments commit, with at most one queued per revenue program
+# and day. If a queued refresh never runs, another can be queued for that day after this many seconds.
+DAILY_REVENUE_ROLLUP_REFRESH_PENDING_TTL = int(os.getenv("DAILY_REVENUE_ROLLUP_REFRESH_PENDING_TTL", 60 * 10))
 
 # Name of cookie used to store contributor auth key.
 AUTH_COOKIE_KEY = "Authorization"
@@ -637,6 +730,9 @@ STRIPE_ACCOUNT_LINK_RETURN_BASE_URL = os.getenv("STRIPE_ACCOUNT_LINK_RETURN_BASE
 # These `MAILCHIMP_` values are used by code that makes requests to mailchimp on behalf of org users
 MAILCHIMP_CLIENT_ID = os.getenv("MAILCHIMP_CLIENT_ID", None)
 MAILCHIMP_CLIENT_SECRET = os.getenv("MAILCHIMP_CLIENT_SECRET", None)
+# Mailchimp entities read on behalf of revenue programs are cached for this many seconds. Entities created by revengine
+# update the cache, so this only bounds staleness from changes made in Mailchimp itself.
+MAILCHIMP_CACHE_TTL = int(os.getenv("MAILCHIMP_CACHE_TTL", 60))
 
 # see https://mailchimp.com/developer/release-notes/message-search-rate-limit-now-enforced/#:~:text=We're%20now%20enforcing%20the,of%20the%20original%2020%20requests.
 MAILCHIMP_RATE_LIMIT_RETRY_WAIT_SECONDS = 60
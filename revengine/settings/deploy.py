@@ -60,6 +60,19 @@ STORAGES = {
     },
     # Store static files, like SPA assets, locally.
     "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    # Store contribution exports in their own private bucket, apart from the publicly served media. The bucket should also
+    # have a lifecycle rule deleting objects older than CONTRIBUTION_EXPORT_LINK_EXPIRY (rounded up to whole days), as a
+    # backstop for the `delete_expired_contribution_exports` task.
+    "contribution_exports": {
+        "BACKEND": "storages.backends.gcloud.GoogleCloudStorage",
+        "OPTIONS": {
+            "bucket_name": os.getenv("CONTRIBUTION_EXPORT_BUCKET_NAME", "rev-engine-contribution-exports"),
+            "project_id": GS_PROJECT_ID,
+            "querystring_auth": True,
+            "credentials": GS_CREDENTIALS,
+            "default_acl": GS_DEFAULT_ACL,
+        },
+    },
 }
 
 ### React SPA index.html
@@ -105,6 +118,14 @@ if BROKER_URL.startswith("rediss"):
         "ssl_cert_reqs": ssl.CERT_NONE,
     }
 
+# Required for the `priority` option of `apply_async` to be honored by the Redis broker. See
+# https://docs.celeryq.dev/en/stable/userguide/routing.html#redis-message-priorities
+BROKER_TRANSPORT_OPTIONS = {
+    "priority_steps": list(range(10)),
+    "sep": ":",
+    "queue_order_strategy": "priority",
+}
+
 CELERYBEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
 CELERY_HIJACK_ROOT_LOGGER = False
 
@@ -5,7 +5,6 @@ import pytest
 from bs4 import BeautifulSoup as bs4
 
 from apps.common.models import SocialMeta
-from apps.organizations.models import RevenueProgram
 from apps.organizations.tests.factories import RevenueProgramFactory
 from revengine.views import ReactAppView
 
@@ -14,7 +13,7 @@ def test_spa_revenue_program_does_not_exist(client, mocker):
     logger_info = mocker.patch("revengine.views.logger.info")
     with (
         mocker.patch("revengine.views.get_subdomain_from_request", return_value="nogood_subdomain"),
-        mocker.patch("revengine.views.RevenueProgram.objects.get", side_effect=RevenueProgram.DoesNotExist),
+        mocker.patch("revengine.views.RevenueProgram.get_cached_by_slug", return_value=None),
     ):
         response = client.get(reverse("index"))
         # ReactAppView._get_revenue_program_from_subdomain() just logs.
@@ -25,12 +24,26 @@ def test_spa_revenue_program_does_not_exist(client, mocker):
 @pytest.mark.django_db
 def test_spa_revenue_program_exist(client, mocker):
     mocker.patch("revengine.views.get_subdomain_from_request", return_value="subdomain")
-    mocker.patch("revengine.views.RevenueProgram.objects.get", return_value=RevenueProgramFactory())
+    mocker.patch("revengine.views.RevenueProgram.get_cached_by_slug", return_value=RevenueProgramFactory())
     response = client.get(reverse("index"))
     # ReactAppView._is_valid_rp_subdomain is True, so no 404 status code.
     assert response.status_code == 200
 
 
+@pytest.mark.django_db
+def test_spa_revenue_program_is_cached(client, mocker, django_assert_num_queries):
+    rp = RevenueProgramFactory()
+    mocker.patch("revengine.views.get_subdomain_from_request", return_value=rp.slug)
+    with django_assert_num_queries(1):
+        response = client.get(reverse("index"))
+    assert response.status_code == 200
+    assert rp.name in response.content.decode()
+    with django_assert_num_queries(0):
+        response = client.get(reverse("index"))
+    assert response.status_code == 200
+    assert rp.name in response.content.decode()
+
+
 def test_no_subdomains(client, mocker):
     mocker.patch("revengine.views.get_subdomain_from_request", return_value=None)
     response = client.get(reverse("index"))
@@ -50,10 +50,9 @@ class ReactAppView(TemplateView):
 
     def _get_revenue_program_from_subdomain(self):
         if subdomain := get_subdomain_from_request(self.request):
-            try:
-                return RevenueProgram.objects.get(slug=subdomain)
-            except RevenueProgram.DoesNotExist:
-                logger.info('ReactAppView failed to retrieve RevenueProgram by subdomain "%s"', subdomain)
+            if revenue_program := RevenueProgram.get_cached_by_slug(subdomain):
+                return revenue_program
+            logger.info('ReactAppView failed to retrieve RevenueProgram by subdomain "%s"', subdomain)
 
     def _add_social_media_context(self, revenue_program, context):
         try:
@@ -67,16 +66,13 @@ class ReactAppView(TemplateView):
 
     def _is_valid_rp_subdomain(self):
         if subdomain := get_subdomain_from_request(self.request):
-            try:
-                RevenueProgram.objects.get(slug=subdomain)
-            except RevenueProgram.DoesNotExist:
-                logger.info(
-                    'ReactAppView failed to retrieve RevenueProgram by subdomain "%s". Returning Page Not Found (404) Status',
-                    subdomain,
-                )
-                return False
-            else:
+            if RevenueProgram.get_cached_by_slug(subdomain):
                 return True
+            logger.info(
+                'ReactAppView failed to retrieve RevenueProgram by subdomain "%s". Returning Page Not Found (404) Status',
+                subdomain,
+            )
+            return False
 
         # If there is no subdomain, it is a non-RP subdomain like "engine.fundjournalism.org"
         # so we default to True